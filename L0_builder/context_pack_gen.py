@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
@@ -12,6 +11,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from sdslv2_builder.context_pack import extract_context_pack
+from sdslv2_builder.git_meta import GIT_MISSING, REV_EMPTY, git_head
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.input_hash import compute_input_hash
 
@@ -35,19 +35,13 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
 
 
 def _git_rev(project_root: Path) -> tuple[str, str | None]:
-    try:
-        result = subprocess.run(
-            ["git", "-C", str(project_root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-        )
-    except FileNotFoundError:
+    rev, error = git_head(project_root)
+    if error == GIT_MISSING:
         return "UNKNOWN", "E_CONTEXT_PACK_SOURCE_REV_GIT_MISSING"
-    if result.returncode != 0:
-        return "UNKNOWN", "E_CONTEXT_PACK_SOURCE_REV_MISSING"
-    rev = result.stdout.strip()
-    if not rev:
+    if error == REV_EMPTY:
         return "UNKNOWN", "E_CONTEXT_PACK_SOURCE_REV_EMPTY"
+    if rev is None:
+        return "UNKNOWN", "E_CONTEXT_PACK_SOURCE_REV_MISSING"
     return rev, None
 
 
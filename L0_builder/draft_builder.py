@@ -5,7 +5,6 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -14,28 +13,13 @@ sys.path.insert(0, str(ROOT))
 
 from sdslv2_builder.draft_schema import normalize_draft, REQUIRED_TOP_KEYS
 from sdslv2_builder.errors import Diagnostic
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.op_yaml import load_yaml, dump_yaml
 from sdslv2_builder.schema_versions import DRAFT_SCHEMA_VERSION
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _diag_to_dict(diags: list[Diagnostic]) -> list[dict]:
     return [d.to_dict() for d in diags]
 
@@ -206,7 +190,7 @@ def main() -> int:
         data["scope"] = {"kind": scope_kind, "value": scope_value}
 
     data["generator_id"] = args.generator_id or data.get("generator_id", "")
-    data["source_rev"] = _git_rev(project_root)
+    data["source_rev"] = git_rev(project_root)
 
     try:
         input_hash = compute_input_hash(
@@ -38,7 +38,7 @@ def _ensure_under_root(path: Path, root: Path, code: str) -> bool:
     return True
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="Draft YAML path")
     ap.add_argument(
@@ -46,7 +46,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); input can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     drafts_root = project_root / "drafts"
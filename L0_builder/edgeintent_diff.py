@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import difflib
 import sys
 from pathlib import Path
 
@@ -14,6 +13,7 @@ sys.path.insert(0, str(ROOT))
 from sdslv2_builder.intent_schema import normalize_intent
 from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
 from sdslv2_builder.op_yaml import load_yaml
+from sdslv2_builder.span_diff import line_diff
 
 EDGEINTENT_KIND = "EdgeIntent"
 
@@ -209,13 +209,7 @@ def main() -> int:
     if preview_path.exists():
         old_lines = preview_path.read_text(encoding="utf-8").splitlines()
 
-    diff = difflib.unified_diff(
-        old_lines,
-        new_lines,
-        fromfile=str(preview_path),
-        tofile=str(preview_path),
-        lineterm="",
-    )
+    diff = line_diff(old_lines, new_lines, str(preview_path), str(preview_path))
     output = "\n".join(diff)
     if output:
         print(output)
@@ -5,7 +5,6 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -13,6 +12,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from sdslv2_builder.errors import Diagnostic
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.intent_schema import normalize_intent, REQUIRED_TOP_KEYS
@@ -20,21 +20,6 @@ from sdslv2_builder.op_yaml import dump_yaml, load_yaml_with_duplicates
 from sdslv2_builder.schema_versions import INTENT_SCHEMA_VERSION
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _diag_to_dict(diags: list[Diagnostic]) -> list[dict]:
     return [d.to_dict() for d in diags]
 
@@ -221,7 +206,7 @@ def main() -> int:
         data["scope"] = {"kind": scope_kind, "value": scope_value}
 
     data["generator_id"] = args.generator_id or data.get("generator_id", "")
-    data["source_rev"] = _git_rev(project_root)
+    data["source_rev"] = git_rev(project_root)
 
     try:
         input_hash = compute_input_hash(
@@ -5,9 +5,7 @@
 from __future__ import annotations
 
 import argparse
-import difflib
 import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -15,12 +13,14 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
 from sdslv2_builder.op_yaml import dump_yaml
 from sdslv2_builder.refs import RELID_RE
 from sdslv2_builder.schema_versions import INTENT_SCHEMA_VERSION
+from sdslv2_builder.span_diff import line_diff
 
 TOOL_NAME = "intent_template_gen"
 STAGE = "L0"
@@ -73,21 +73,6 @@ def _emit_result(
         print(summary, file=sys.stderr)
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _strip_quotes(value: str | None) -> str | None:
     if value is None:
         return None
@@ -254,7 +239,7 @@ def main() -> int:
     inputs = [_rel_path(project_root, input_path)]
     outputs = [_rel_path(project_root, diff_out)]
     diff_paths = [_rel_path(project_root, diff_out)]
-    source_rev = _build_source_rev(_git_rev(project_root), args.generator_id)
+    source_rev = _build_source_rev(git_rev(project_root), args.generator_id)
 
     if topo_root.is_symlink() or _has_symlink_parent(topo_root, project_root):
         _emit_result(
@@ -551,13 +536,7 @@ def main() -> int:
             diags.extend(file_diags)
             continue
         new_text = dump_yaml(payload)
-        diff = difflib.unified_diff(
-            old_text.splitlines(),
-            new_text.splitlines(),
-            fromfile=str(out_path),
-            tofile=str(out_path),
-            lineterm="",
-        )
+        diff = line_diff(old_text.splitlines(), new_text.splitlines(), str(out_path), str(out_path))
         chunk = "\n".join(diff)
         if chunk:
             output_chunks.append(chunk)
@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -13,6 +11,8 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L0_builder.topology_resolution import analyze_topology_files
+from sdslv2_builder.errors import print_diagnostics
+from sdslv2_builder.git_meta import GIT_MISSING, REV_EMPTY, git_head
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.op_yaml import dump_yaml
@@ -84,19 +84,13 @@ def _collect_files(project_root: Path, inputs: list[str]) -> list[Path] | None:
 
 
 def _git_rev(project_root: Path) -> tuple[str, str | None]:
-    try:
-        result = subprocess.run(
-            ["git", "-C", str(project_root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-        )
-    except FileNotFoundError:
+    rev, error = git_head(project_root)
+    if error == GIT_MISSING:
         return "UNKNOWN", "E_GAP_REPORT_SOURCE_REV_GIT_MISSING"
-    if result.returncode != 0:
-        return "UNKNOWN", "E_GAP_REPORT_SOURCE_REV_MISSING"
-    rev = result.stdout.strip()
-    if not rev:
+    if error == REV_EMPTY:
         return "UNKNOWN", "E_GAP_REPORT_SOURCE_REV_EMPTY"
+    if rev is None:
+        return "UNKNOWN", "E_GAP_REPORT_SOURCE_REV_MISSING"
     return rev, None
 
 
@@ -122,8 +116,7 @@ def main() -> int:
 
     hard_diags, _, gaps = analyze_topology_files(project_root, files)
     if hard_diags:
-        payload = [d.to_dict() for d in hard_diags]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+        print_diagnostics(hard_diags)
         return 2
 
     out_path = _resolve_path(project_root, args.out)
@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
@@ -12,7 +11,7 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import load_yaml
 
 
@@ -40,8 +39,7 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _read_str_list(
@@ -4,9 +4,7 @@
 from __future__ import annotations
 
 import argparse
-import difflib
 import json
-import subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -14,12 +12,15 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+from sdslv2_builder.edit_buffer import EditBuffer
 from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import InputHashResult, compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.lint import DIRECTION_VOCAB, _capture_metadata, _parse_metadata_pairs
 from sdslv2_builder.op_yaml import DuplicateKey, load_yaml_with_duplicates
 from sdslv2_builder.refs import RELID_RE, parse_internal_ref
+from sdslv2_builder.span_diff import edit_diff
 
 PLACEHOLDERS = {"none", "null", "tbd", "opaque"}
 TOOL_NAME = "topology_channel_builder"
@@ -180,21 +181,6 @@ def _dup_path(prefix: str, dup: DuplicateKey) -> str:
     return dup.path
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _build_source_rev(git_rev: str, generator_id: str) -> str:
     return f"{git_rev}|gen:{generator_id}"
 
@@ -560,7 +546,7 @@ def main() -> int:
         return 2
 
     input_hash = None
-    source_rev = _build_source_rev(_git_rev(project_root), args.generator_id)
+    source_rev = _build_source_rev(git_rev(project_root), args.generator_id)
     try:
         input_hash = compute_input_hash(
             project_root,
@@ -671,7 +657,7 @@ def main() -> int:
         if diags:
             continue
 
-        replacements: list[tuple[int, int, str]] = []
+        edits = EditBuffer(text)
         for edge_idx, edge in enumerate(edges):
             meta_map = edge["meta_map"]
             edge_id = _strip_quotes(meta_map.get("id") or "")
@@ -706,9 +692,7 @@ def main() -> int:
                     continue
                 new_meta = _insert_fields(edge["meta"], [("channel", spec.channel)])
                 if new_meta != edge["meta"]:
-                    replacements.append(
-                        (edge["start_offset"], edge["end_offset"], new_meta)
-                    )
+                    edits.replace(edge["start_offset"], edge["end_offset"], new_meta)
             else:
                 if channel is None or _is_placeholder(channel):
                     _diag(
@@ -729,17 +713,19 @@ def main() -> int:
                         json_pointer("topology", rel_path, "edges", str(edge_idx), "channel"),
                     )
 
-        if replacements:
-            new_text = text
-            for start, end, new_meta in sorted(replacements, key=lambda item: item[0], reverse=True):
-                new_text = new_text[:start] + new_meta + new_text[end:]
-            diff = difflib.unified_diff(
-                text.splitlines(),
-                new_text.splitlines(),
-                fromfile=str(path),
-                tofile=str(path),
-                lineterm="",
-            )
+        if edits:
+            try:
+                diff = edit_diff(edits, str(path), str(path))
+            except ValueError as exc:
+                _diag(
+                    diags,
+                    "E_TOPOLOGY_CHANNEL_EDIT_CONFLICT",
+                    "edge channel edits overlap",
+                    "non-overlapping @Edge metadata",
+                    str(exc),
+                    json_pointer("topology", rel_path),
+                )
+                continue
             diffs.append("\n".join(diff))
 
     unused_diags: list[Diagnostic] = []
@@ -6,7 +6,6 @@ from __future__ import annotations
 
 import argparse
 import csv
-import difflib
 import json
 import sys
 from pathlib import Path
@@ -14,12 +13,14 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+from sdslv2_builder.edit_buffer import EditBuffer
 from sdslv2_builder.errors import Diagnostic, json_pointer
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
 from sdslv2_builder.op_yaml import DuplicateKey, load_yaml_with_duplicates
 from sdslv2_builder.refs import RELID_RE
+from sdslv2_builder.span_diff import edit_diff
 
 TOOL_NAME = "topology_enricher"
 STAGE = "L0"
@@ -780,7 +781,7 @@ def main() -> int:
         text = path.read_text(encoding="utf-8")
         lines = text.splitlines()
         offsets = _line_offsets(lines)
-        replacements: list[tuple[int, int, str]] = []
+        edits = EditBuffer(text)
         for idx, line in enumerate(lines):
             if not line.lstrip().startswith("@Node"):
                 continue
@@ -814,7 +815,7 @@ def main() -> int:
             start_offset = offsets[idx] + brace_idx
             end_offset = start_offset + len(meta)
             new_meta = _insert_fields(meta, additions)
-            replacements.append((start_offset, end_offset, new_meta))
+            edits.replace(start_offset, end_offset, new_meta)
 
         if diags:
             _emit_result(
@@ -828,19 +829,30 @@ def main() -> int:
             )
             return 2
 
-        if not replacements:
+        if not edits:
             continue
 
-        new_text = text
-        for start, end, replacement in sorted(replacements, key=lambda item: item[0], reverse=True):
-            new_text = new_text[:start] + replacement + new_text[end:]
-        diff = difflib.unified_diff(
-            text.splitlines(),
-            new_text.splitlines(),
-            fromfile=str(path),
-            tofile=str(path),
-            lineterm="",
-        )
+        try:
+            diff = edit_diff(edits, str(path), str(path))
+        except ValueError as exc:
+            _emit_result(
+                "fail",
+                [
+                    Diagnostic(
+                        code="E_TOPOLOGY_ENRICH_EDIT_CONFLICT",
+                        message="node enrichments overlap",
+                        expected="non-overlapping @Node metadata",
+                        got=str(exc),
+                        path=json_pointer("input", _rel_path(project_root, path)),
+                    )
+                ],
+                inputs,
+                outputs,
+                diff_paths,
+                input_hash=input_hash.input_hash,
+                summary=f"{TOOL_NAME}: overlapping edits",
+            )
+            return 2
         chunk = "\n".join(diff)
         if chunk:
             output_chunks.append(chunk)
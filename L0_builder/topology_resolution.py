@@ -5,8 +5,9 @@ from pathlib import Path
 import re
 
 from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items, DIRECTION_VOCAB
+from sdslv2_builder.lint import _split_list_items, DIRECTION_VOCAB
 from sdslv2_builder.refs import RELID_RE, parse_contract_ref, parse_internal_ref
+from sdslv2_builder.sdsl_ast import SdslDocument, parse_file
 from sdslv2_builder.op_yaml import load_yaml
 
 
@@ -24,7 +25,6 @@ class GapItem:
 
 
 PROFILE_REL_PATH = Path("policy") / "resolution_profile.yaml"
-ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
 
 
 def _strip_quotes(value: str | None) -> str | None:
@@ -55,37 +55,11 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
     return False
 
 
-def _iter_annotations(lines: list[str]) -> list[tuple[str, dict[str, str] | None, int, int, list[str]]]:
-    annotations: list[tuple[str, dict[str, str] | None, int, int, list[str]]] = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.lstrip()
-        if not stripped.startswith("@"):
-            i += 1
-            continue
-        match = ANNOTATION_KIND_RE.match(stripped)
-        if match:
-            kind = match.group("kind")
-        else:
-            kind = stripped.split(None, 1)[0][1:]
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            annotations.append((kind, None, i, i, []))
-            i += 1
-            continue
-        meta, end_line = _capture_metadata(lines, i, brace_idx)
-        meta = meta.strip()
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        dupes: list[str] = []
-        for key, value in pairs:
-            if key in meta_map and key not in dupes:
-                dupes.append(key)
-            meta_map[key] = value
-        annotations.append((kind, meta_map, i, end_line, dupes))
-        i = end_line + 1
-    return annotations
+def _iter_annotations(doc: SdslDocument) -> list[tuple[str, dict[str, str] | None, int, int, list[str]]]:
+    return [
+        (ann.kind, ann.meta_dict(), ann.start_line, ann.end_line, list(ann.dupes))
+        for ann in doc.blocks
+    ]
 
 
 def _emit_diag(
@@ -234,15 +208,6 @@ def _load_resolution_profile(project_root: Path, diags: list[Diagnostic]) -> dic
     return data
 
 
-def _first_stmt_line(lines: list[str]) -> int | None:
-    for idx, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        return idx
-    return None
-
-
 def analyze_topology_files(
     project_root: Path,
     files: list[Path],
@@ -315,7 +280,7 @@ def analyze_topology_files(
     for path in sorted(files, key=lambda p: p.as_posix()):
         rel_path = path.resolve().relative_to(project_root.resolve()).as_posix()
         try:
-            text = path.read_text(encoding="utf-8")
+            doc = parse_file(path)
         except (OSError, UnicodeDecodeError) as exc:
             _emit_diag(
                 hard_diags,
@@ -326,9 +291,9 @@ def analyze_topology_files(
                 json_pointer(),
             )
             continue
-        lines = text.splitlines()
-        annotations = _iter_annotations(lines)
-        first_stmt = _first_stmt_line(lines)
+        lines = doc.lines
+        annotations = _iter_annotations(doc)
+        first_stmt = doc.first_stmt
 
         profile = None
         stage = None
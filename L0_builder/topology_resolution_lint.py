@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -12,7 +11,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L0_builder.topology_resolution import analyze_topology_files
-from sdslv2_builder.errors import Diagnostic
+from sdslv2_builder.errors import Diagnostic, print_diagnostics
 
 
 def _has_symlink_parent(path: Path, stop: Path) -> bool:
@@ -34,8 +33,7 @@ def _ensure_under_root(path: Path, root: Path, code: str) -> bool:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _collect_files(project_root: Path, inputs: list[str]) -> list[Path] | None:
@@ -76,7 +74,7 @@ def _collect_files(project_root: Path, inputs: list[str]) -> list[Path] | None:
     return files
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", action="append", required=True, help="Topology .sdsl2 file or directory")
     ap.add_argument(
@@ -89,7 +87,7 @@ def main() -> int:
         action="store_true",
         help="Treat missing resolution fields as failure",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     files = _collect_files(project_root, args.input)
@@ -6,7 +6,6 @@ from __future__ import annotations
 import argparse
 import difflib
 import json
-import subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -17,6 +16,7 @@ sys.path.insert(0, str(ROOT))
 from sdslv2_builder.contract import Decl
 from sdslv2_builder.contract_writer import _format_decl
 from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import InputHashResult, compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
@@ -128,21 +128,6 @@ def _dup_path(prefix: str, dup: DuplicateKey) -> str:
     return dup.path
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _build_source_rev(git_rev: str, generator_id: str) -> str:
     return f"{git_rev}|gen:{generator_id}"
 
@@ -568,7 +553,7 @@ def main() -> int:
         )
         return 2
 
-    source_rev = _build_source_rev(_git_rev(project_root), args.generator_id)
+    source_rev = _build_source_rev(git_rev(project_root), args.generator_id)
     profile_diags: list[Diagnostic] = []
     profile = _load_profile(project_root, profile_diags)
     if profile_path.exists():
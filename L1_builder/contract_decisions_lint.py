@@ -4,14 +4,13 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import load_yaml
 from sdslv2_builder.refs import (
     CONTRACT_TOKEN_RE,
@@ -37,8 +36,7 @@ def _diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _is_placeholder(value: object) -> bool:
@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 import re
@@ -12,7 +11,7 @@ import re
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import load_yaml
 
 
@@ -32,8 +31,7 @@ def _emit_diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _has_symlink_parent(path: Path, stop: Path) -> bool:
@@ -387,7 +385,7 @@ def _read_error_model(
     return error_code_id, retry_policy_id, error_format, retry_format
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", action="append", required=True, help="Contract .sdsl2 file or directory")
     ap.add_argument(
@@ -395,7 +393,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); inputs can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     files, file_diags = _collect_contract_files(project_root, args.input)
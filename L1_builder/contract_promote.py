@@ -4,9 +4,7 @@
 from __future__ import annotations
 
 import argparse
-import difflib
-import json
-import re
+from bisect import bisect_left
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -17,10 +15,12 @@ sys.path.insert(0, str(ROOT))
 from L1_builder.contract_decisions_lint import parse_contract_decisions_file
 from sdslv2_builder.contract import Decl, Rule
 from sdslv2_builder.contract_writer import _format_decl, _format_rule
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
+from sdslv2_builder.edit_buffer import EditBuffer
+from sdslv2_builder.errors import print_diagnostics
 from sdslv2_builder.refs import parse_contract_ref, parse_internal_ref, parse_ssot_ref
+from sdslv2_builder.sdsl_ast import SdslDocument, parse_file, parse_lines, strict_annotations
+from sdslv2_builder.span_diff import edit_diff
 
-ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
 DECL_KINDS = {"Structure", "Interface", "Function", "Const", "Type"}
 
 
@@ -55,35 +55,20 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
     return False
 
 
-def _first_statement(lines: list[str]) -> int | None:
-    for idx, line in enumerate(lines):
-        if line.strip() == "" or line.lstrip().startswith("//"):
-            continue
-        return idx
-    return None
-
-
-def _file_header(lines: list[str]) -> tuple[int, int, dict[str, str]]:
-    file_lines = [idx for idx, line in enumerate(lines) if line.lstrip().startswith("@File")]
-    if not file_lines:
+def _file_header(doc: SdslDocument) -> tuple[int, int, dict[str, str]]:
+    headers = [ann for ann in doc.annotations if ann.raw_kind.startswith("File")]
+    if not headers:
         raise ValueError("E_CONTRACT_PROMOTE_FILE_HEADER_MISSING")
-    if len(file_lines) > 1:
+    if len(headers) > 1:
         raise ValueError("E_CONTRACT_PROMOTE_FILE_HEADER_DUPLICATE")
-    first = _first_statement(lines)
-    if first is not None and file_lines[0] != first:
+    header = headers[0]
+    if doc.first_stmt is not None and header.start_line != doc.first_stmt:
         raise ValueError("E_CONTRACT_PROMOTE_FILE_HEADER_NOT_FIRST")
-    idx = file_lines[0]
-    brace_idx = lines[idx].find("{")
-    if brace_idx == -1:
+    if header.meta is None:
         raise ValueError("E_CONTRACT_PROMOTE_FILE_HEADER_INVALID")
-    meta, end_line = _capture_metadata(lines, idx, brace_idx)
-    pairs = _parse_metadata_pairs(meta)
-    meta_map: dict[str, str] = {}
-    for key, value in pairs:
-        if key in meta_map:
-            raise ValueError("E_CONTRACT_PROMOTE_DUPLICATE_KEY")
-        meta_map[key] = value
-    return idx, end_line, meta_map
+    if header.dupes:
+        raise ValueError("E_CONTRACT_PROMOTE_DUPLICATE_KEY")
+    return header.start_line, header.end_line, dict(header.meta)
 
 
 def _strip_quotes(value: str | None) -> str | None:
@@ -95,30 +80,11 @@ def _strip_quotes(value: str | None) -> str | None:
     return value
 
 
-def _parse_annotations(lines: list[str]) -> list[tuple[str, dict[str, str], int, int]]:
-    annotations: list[tuple[str, dict[str, str], int, int]] = []
-    for idx, line in enumerate(lines):
-        stripped = line.lstrip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        if not stripped.startswith("@"):
-            continue
-        match = ANNOTATION_KIND_RE.match(stripped)
-        if not match:
-            continue
-        kind = match.group("kind")
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            raise ValueError(f"E_CONTRACT_PROMOTE_METADATA_MISSING: line {idx + 1}")
-        meta, end_line = _capture_metadata(lines, idx, brace_idx)
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        for key, value in pairs:
-            if key in meta_map:
-                raise ValueError(f"E_CONTRACT_PROMOTE_DUPLICATE_KEY: line {idx + 1} key {key}")
-            meta_map[key] = value
-        annotations.append((kind, meta_map, idx, end_line))
-    return annotations
+def _parse_annotations(doc: SdslDocument) -> list[tuple[str, dict[str, str], int, int]]:
+    return [
+        (ann.kind, dict(ann.meta or {}), ann.start_line, ann.end_line)
+        for ann in strict_annotations(doc, "E_CONTRACT_PROMOTE")
+    ]
 
 
 def _find_decl_end(lines: list[str], start: int) -> int:
@@ -132,7 +98,7 @@ def _find_decl_end(lines: list[str], start: int) -> int:
 
 
 def _collect_blocks(lines: list[str]) -> list[Block]:
-    annotations = _parse_annotations(lines)
+    annotations = _parse_annotations(parse_lines(lines))
     blocks: list[Block] = []
     for kind, meta, start, end_meta in annotations:
         rel_id = _strip_quotes(meta.get("id")) or ""
@@ -176,8 +142,7 @@ def _find_target_contract_file(project_root: Path, scope: dict[str, str]) -> Pat
             continue
         if _has_symlink_parent(path, ssot_root):
             raise ValueError("E_CONTRACT_PROMOTE_SCOPE_SYMLINK")
-        lines = path.read_text(encoding="utf-8").splitlines()
-        _, _, meta = _file_header(lines)
+        _, _, meta = _file_header(parse_file(path))
         profile = _strip_quotes(meta.get("profile")) or ""
         id_prefix = _strip_quotes(meta.get("id_prefix")) or ""
         if profile != "contract":
@@ -232,7 +197,7 @@ def _build_rule_lines(item: dict[str, object]) -> list[str]:
 
 
 def _insert_blocks_in_order(
-    new_lines: list[str],
+    edits: EditBuffer,
     blocks: list[Block],
     new_items: list[dict[str, object]],
     build_lines,
@@ -245,38 +210,23 @@ def _insert_blocks_in_order(
         existing_ids = [b.rel_id for b in block_items]
         if existing_ids != sorted(existing_ids):
             raise ValueError(f"E_CONTRACT_PROMOTE_{block_kind.upper()}_ORDER_INVALID")
+        slots: list[tuple[int, int, list[str] | None]] = [(b.start, b.end, None) for b in block_items]
         for item in new_items:
             rel_id = str(item.get("id", ""))
-            idx = 0
-            while idx < len(existing_ids) and existing_ids[idx] < rel_id:
-                idx += 1
-            insert_at = block_items[idx - 1].end + 1 if idx > 0 else block_items[0].start
-            block_lines = build_lines(item)
-            new_lines[insert_at:insert_at] = block_lines
-            for j in range(idx, len(block_items)):
-                block_items[j] = Block(
-                    kind=block_items[j].kind,
-                    rel_id=block_items[j].rel_id,
-                    start=block_items[j].start + len(block_lines),
-                    end=block_items[j].end + len(block_lines),
-                )
-            block_items.insert(
-                idx,
-                Block(
-                    kind=block_kind,
-                    rel_id=rel_id,
-                    start=insert_at,
-                    end=insert_at + len(block_lines) - 1,
-                ),
-            )
+            idx = bisect_left(existing_ids, rel_id)
+            insert_at = slots[idx - 1][1] + 1 if idx > 0 else slots[0][0]
+            slots.insert(idx, (insert_at, insert_at - 1, build_lines(item)))
             existing_ids.insert(idx, rel_id)
+        for insert_at, _, block_lines in slots:
+            if block_lines is not None:
+                edits.insert(insert_at, block_lines)
         return
 
     insert_at = insert_at_default
     block_lines: list[str] = []
     for item in sorted(new_items, key=lambda i: str(i.get("id", ""))):
         block_lines.extend(build_lines(item))
-    new_lines[insert_at:insert_at] = block_lines
+    edits.insert(insert_at, block_lines)
 
 
 def main() -> int:
@@ -327,8 +277,7 @@ def main() -> int:
 
     decisions, diags = parse_contract_decisions_file(decisions_path, project_root)
     if diags:
-        payload = [d.to_dict() for d in diags]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+        print_diagnostics(diags)
         return 2
     scope = decisions.get("scope", {})
     try:
@@ -340,9 +289,10 @@ def main() -> int:
         print("E_CONTRACT_PROMOTE_SCOPE_SYMLINK", file=sys.stderr)
         return 2
 
-    lines = target_path.read_text(encoding="utf-8").splitlines()
+    doc = parse_file(target_path)
+    lines = list(doc.lines)
     try:
-        file_start, file_end, file_meta = _file_header(lines)
+        file_start, file_end, file_meta = _file_header(doc)
         profile = _strip_quotes(file_meta.get("profile")) or ""
         if profile != "contract":
             print("E_CONTRACT_PROMOTE_PROFILE_INVALID", file=sys.stderr)
@@ -387,7 +337,7 @@ def main() -> int:
         print("E_CONTRACT_PROMOTE_NO_CHANGE", file=sys.stderr)
         return 2
 
-    new_lines = list(lines)
+    edits = EditBuffer(lines)
 
     if decl_blocks:
         first_non_structure = min(
@@ -398,7 +348,7 @@ def main() -> int:
     else:
         insert_struct_at = docmeta_end + 1
     _insert_blocks_in_order(
-        new_lines,
+        edits,
         blocks,
         sorted(new_structures, key=lambda i: str(i.get("id", ""))),
         _build_structure_lines,
@@ -415,23 +365,15 @@ def main() -> int:
     else:
         insert_rule_at = docmeta_end + 1
 
-    updated_blocks = _collect_blocks(new_lines)
     _insert_blocks_in_order(
-        new_lines,
-        updated_blocks,
+        edits,
+        blocks,
         sorted(new_rules, key=lambda i: str(i.get("id", ""))),
         _build_rule_lines,
         "Rule",
         insert_rule_at,
     )
-
-    diff = difflib.unified_diff(
-        lines,
-        new_lines,
-        fromfile=str(target_path),
-        tofile=str(target_path),
-        lineterm="",
-    )
+    diff = edit_diff(edits, str(target_path), str(target_path))
     output = "\n".join(diff)
     if not output:
         print("E_CONTRACT_PROMOTE_NO_CHANGE", file=sys.stderr)
@@ -4,16 +4,15 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.refs import RELID_RE, parse_contract_ref, parse_internal_ref
+from sdslv2_builder.sdsl_ast import SdslDocument, parse_file
 from sdslv2_builder.op_yaml import load_yaml
 
 
@@ -96,36 +95,14 @@ def _ensure_under_root(path: Path, root: Path, code: str) -> bool:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
-def _iter_annotations(lines: list[str]) -> list[tuple[str, dict[str, str] | None, int, int, list[str]]]:
-    annotations: list[tuple[str, dict[str, str] | None, int, int, list[str]]] = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if not line.lstrip().startswith("@"):
-            i += 1
-            continue
-        kind = line.lstrip().split(None, 1)[0][1:]
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            annotations.append((kind, None, i, i, []))
-            i += 1
-            continue
-        meta, end_line = _capture_metadata(lines, i, brace_idx)
-        meta = meta.strip()
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        dupes: list[str] = []
-        for key, value in pairs:
-            if key in meta_map and key not in dupes:
-                dupes.append(key)
-            meta_map[key] = value
-        annotations.append((kind, meta_map, i, end_line, dupes))
-        i = end_line + 1
-    return annotations
+def _iter_annotations(doc: SdslDocument) -> list[tuple[str, dict[str, str] | None, int, int, list[str]]]:
+    return [
+        (ann.raw_kind, ann.meta_dict(), ann.start_line, ann.end_line, list(ann.dupes))
+        for ann in doc.blocks
+    ]
 
 
 def _check_placeholders(
@@ -195,7 +172,7 @@ def _emit_diag(diags: list[Diagnostic], code: str, message: str, expected: str,
 
 def _check_file(path: Path, diags: list[Diagnostic], profile: dict[str, object] | None) -> None:
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
+        doc = parse_file(path)
     except (OSError, UnicodeDecodeError) as exc:
         _emit_diag(
             diags,
@@ -206,7 +183,7 @@ def _check_file(path: Path, diags: list[Diagnostic], profile: dict[str, object]
             json_pointer(),
         )
         return
-    annotations = _iter_annotations(lines)
+    annotations = _iter_annotations(doc)
 
     decl_counts = {kind: 0 for kind in DECL_KINDS}
     rule_count = 0
@@ -543,7 +520,7 @@ def _check_file(path: Path, diags: list[Diagnostic], profile: dict[str, object]
                         )
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", action="append", required=True, help="Contract .sdsl2 file or directory")
     ap.add_argument(
@@ -556,7 +533,7 @@ def main() -> int:
         action="store_true",
         help="Treat missing resolution fields as failure",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     files = _collect_files(project_root, args.input)
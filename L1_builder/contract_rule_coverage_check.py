@@ -4,23 +4,22 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
-import re
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L1_builder.decisions_lint import parse_decisions_file
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.lint import _split_list_items
 from sdslv2_builder.op_yaml import load_yaml
+from sdslv2_builder.project_model import decision_table
 from sdslv2_builder.refs import RELID_RE, parse_contract_ref, parse_internal_ref
+from sdslv2_builder.sdsl_ast import SdslDocument, parse_file
 
 
 PROFILE_REL_PATH = Path("policy") / "contract_resolution_profile.yaml"
-ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
 
 
 def _emit_diag(
@@ -35,8 +34,7 @@ def _emit_diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _strip_quotes(value: str | None) -> str | None:
@@ -72,46 +70,11 @@ def _ensure_under_root(path: Path, root: Path, code: str) -> bool:
     return True
 
 
-def _iter_annotations(lines: list[str]) -> list[tuple[str, dict[str, str] | None, int, int, list[str]]]:
-    annotations: list[tuple[str, dict[str, str] | None, int, int, list[str]]] = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.lstrip()
-        if not stripped.startswith("@"):
-            i += 1
-            continue
-        match = ANNOTATION_KIND_RE.match(stripped)
-        if match:
-            kind = match.group("kind")
-        else:
-            kind = stripped.split(None, 1)[0][1:]
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            annotations.append((kind, None, i, i, []))
-            i += 1
-            continue
-        meta, end_line = _capture_metadata(lines, i, brace_idx)
-        meta = meta.strip()
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        dupes: list[str] = []
-        for key, value in pairs:
-            if key in meta_map and key not in dupes:
-                dupes.append(key)
-            meta_map[key] = value
-        annotations.append((kind, meta_map, i, end_line, dupes))
-        i = end_line + 1
-    return annotations
-
-
-def _first_stmt_line(lines: list[str]) -> int | None:
-    for idx, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        return idx
-    return None
+def _iter_annotations(doc: SdslDocument) -> list[tuple[str, dict[str, str] | None, int, int, list[str]]]:
+    return [
+        (ann.kind, ann.meta_dict(), ann.start_line, ann.end_line, list(ann.dupes))
+        for ann in doc.blocks
+    ]
 
 
 def _parse_rule_bind(value: str | None) -> object | None:
@@ -428,7 +391,7 @@ def _parse_contract_list(
     return tokens
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", action="append", required=True, help="Contract .sdsl2 file or directory")
     ap.add_argument(
@@ -446,7 +409,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); inputs can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     files, file_diags = _collect_contract_files(project_root, args.input)
@@ -539,15 +502,7 @@ def main() -> int:
         _print_diags(profile_diags)
         return 2
 
-    decision_edges = decisions.get("edges", []) if isinstance(decisions, dict) else []
-    decision_contracts: set[str] = set()
-    for edge in decision_edges:
-        if isinstance(edge, dict):
-            refs = edge.get("contract_refs")
-            if isinstance(refs, list):
-                for ref in refs:
-                    if isinstance(ref, str):
-                        decision_contracts.add(ref)
+    decision_contracts = decision_table(decisions).by_contract
 
     declared_contracts: set[str] = set()
     rule_contracts: set[str] = set()
@@ -556,7 +511,7 @@ def main() -> int:
 
     for path in sorted(files, key=lambda p: p.as_posix()):
         try:
-            lines = path.read_text(encoding="utf-8").splitlines()
+            doc = parse_file(path)
         except (OSError, UnicodeDecodeError) as exc:
             _emit_diag(
                 profile_diags,
@@ -567,8 +522,8 @@ def main() -> int:
                 json_pointer(),
             )
             continue
-        annotations = _iter_annotations(lines)
-        first_stmt = _first_stmt_line(lines)
+        annotations = _iter_annotations(doc)
+        first_stmt = doc.first_stmt
 
         file_headers = [(meta, idx) for kind, meta, idx, _, _ in annotations if kind == "File" and meta is not None]
         if not file_headers:
@@ -8,7 +8,6 @@ import argparse
 import difflib
 import json
 import re
-import subprocess
 import sys
 from pathlib import Path
 
@@ -18,7 +17,9 @@ sys.path.insert(0, str(ROOT))
 from L1_builder.decisions_lint import parse_decisions_file
 from sdslv2_builder.contract import ContractModel, Decl, DocMeta
 from sdslv2_builder.contract_writer import write_contract
+from sdslv2_builder.edit_buffer import EditBuffer
 from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
@@ -102,21 +103,6 @@ def _rel_path(project_root: Path, path: Path) -> str:
         return str(path)
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _build_source_rev(git_rev: str, generator_id: str) -> str:
     return f"{git_rev}|gen:{generator_id}"
 
@@ -268,8 +254,9 @@ def _upsert_doc_meta(text: str, desc_value: str, diags: list[Diagnostic]) -> tup
             new_meta = _upsert_desc(meta, desc_value)
             if new_meta == meta:
                 return text, False
-            new_text = text[:start_offset] + new_meta + text[end_offset:]
-            return new_text, True
+            edits = EditBuffer(text)
+            edits.replace(start_offset, end_offset, new_meta)
+            return edits.render(), True
         if stripped.startswith("@File"):
             continue
     # No DocMeta found: insert after first non-empty/comment line (usually @File).
@@ -279,8 +266,9 @@ def _upsert_doc_meta(text: str, desc_value: str, diags: list[Diagnostic]) -> tup
         multiline=False,
     )
     docmeta_line = f"@DocMeta {meta}"
-    new_lines = lines[:insert_at] + [docmeta_line] + lines[insert_at:]
-    return "\n".join(new_lines) + ("\n" if text.endswith("\n") else ""), True
+    edits = EditBuffer(lines)
+    edits.insert(insert_at, [docmeta_line])
+    return "\n".join(edits.render()) + ("\n" if text.endswith("\n") else ""), True
 
 
 def _collect_contract_decls(
@@ -469,7 +457,7 @@ def main() -> int:
     inputs = [_rel_path(project_root, decisions_path)]
     outputs = [_rel_path(project_root, out_path), _rel_path(project_root, diff_out)]
     diff_paths = [_rel_path(project_root, diff_out)]
-    source_rev = _build_source_rev(_git_rev(project_root), args.generator_id)
+    source_rev = _build_source_rev(git_rev(project_root), args.generator_id)
     if not decisions_path.exists():
         _emit_result(
             "fail",
@@ -697,7 +685,7 @@ def main() -> int:
         )
         return 2
 
-    generator_desc = f"gen:{args.generator_id};rev:{_git_rev(project_root)};input:{input_hash.input_hash}"
+    generator_desc = f"gen:{args.generator_id};rev:{git_rev(project_root)};input:{input_hash.input_hash}"
 
     existing = _collect_contract_decls(contract_root, diags)
     if diags:
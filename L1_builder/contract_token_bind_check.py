@@ -4,16 +4,17 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
+from sdslv2_builder.disk_cache import check_persist
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.lint import _split_list_items
 from sdslv2_builder.refs import parse_contract_ref, parse_internal_ref
+from sdslv2_builder.token_index import FileTokens, TokenIndex
 
 
 def _strip_quotes(value: str | None) -> str | None:
@@ -44,35 +45,14 @@ def _ensure_under_root(path: Path, root: Path, code: str) -> bool:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
-def _iter_annotations(lines: list[str]) -> list[tuple[str, dict[str, str] | None, int, int, list[str]]]:
-    annotations: list[tuple[str, dict[str, str] | None, int, int, list[str]]] = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if not line.lstrip().startswith("@"):
-            i += 1
-            continue
-        kind = line.lstrip().split(None, 1)[0][1:]
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            annotations.append((kind, None, i, i, []))
-            i += 1
-            continue
-        meta, end_line = _capture_metadata(lines, i, brace_idx)
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        dupes: list[str] = []
-        for key, value in pairs:
-            if key in meta_map and key not in dupes:
-                dupes.append(key)
-            meta_map[key] = value
-        annotations.append((kind, meta_map, i, end_line, dupes))
-        i = end_line + 1
-    return annotations
+def _iter_annotations(entry: FileTokens) -> list[tuple[str, dict[str, str] | None, int, list[str]]]:
+    return [
+        (block.kind, dict(block.fields) if block.has_meta else None, block.line, list(block.dupes))
+        for block in entry.blocks
+    ]
 
 
 def _collect_files(project_root: Path, root: Path, code_prefix: str) -> list[Path] | None:
@@ -157,10 +137,10 @@ def _collect_contract_tokens_from_list(
     return tokens
 
 
-def _collect_topology_tokens(path: Path, diags: list[Diagnostic]) -> set[str]:
+def _collect_topology_tokens(index: TokenIndex, path: Path, diags: list[Diagnostic]) -> set[str]:
     tokens: set[str] = set()
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
+        text = path.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError) as exc:
         _emit_diag(
             diags,
@@ -172,7 +152,7 @@ def _collect_topology_tokens(path: Path, diags: list[Diagnostic]) -> set[str]:
         )
         return tokens
     try:
-        annotations = _iter_annotations(lines)
+        annotations = _iter_annotations(index.entry(path, text))
     except Exception as exc:
         _emit_diag(
             diags,
@@ -184,7 +164,7 @@ def _collect_topology_tokens(path: Path, diags: list[Diagnostic]) -> set[str]:
         )
         return tokens
     edge_index = 0
-    for kind, meta, idx, _, dupes in annotations:
+    for kind, meta, idx, dupes in annotations:
         if kind != "Edge":
             continue
         if meta is None:
@@ -223,10 +203,10 @@ def _collect_topology_tokens(path: Path, diags: list[Diagnostic]) -> set[str]:
     return tokens
 
 
-def _collect_contract_tokens(path: Path, diags: list[Diagnostic]) -> set[str]:
+def _collect_contract_tokens(index: TokenIndex, path: Path, diags: list[Diagnostic]) -> set[str]:
     tokens: set[str] = set()
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
+        text = path.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError) as exc:
         _emit_diag(
             diags,
@@ -238,7 +218,7 @@ def _collect_contract_tokens(path: Path, diags: list[Diagnostic]) -> set[str]:
         )
         return tokens
     try:
-        annotations = _iter_annotations(lines)
+        annotations = _iter_annotations(index.entry(path, text))
     except Exception as exc:
         _emit_diag(
             diags,
@@ -249,7 +229,7 @@ def _collect_contract_tokens(path: Path, diags: list[Diagnostic]) -> set[str]:
             json_pointer(),
         )
         return tokens
-    for _, meta, idx, _, dupes in annotations:
+    for _, meta, idx, dupes in annotations:
         if meta is None:
             _emit_diag(
                 diags,
@@ -314,12 +294,12 @@ def _collect_contract_tokens(path: Path, diags: list[Diagnostic]) -> set[str]:
     return tokens
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--project-root", default=None, help="Project root (defaults to repo root)")
     ap.add_argument("--topology-root", default="sdsl2/topology", help="Topology root under project")
     ap.add_argument("--contract-root", default="sdsl2/contract", help="Contract root under project")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     topo_root = (project_root / args.topology_root).resolve()
@@ -338,13 +318,15 @@ def main() -> int:
         return 2
 
     diags: list[Diagnostic] = []
+    index = TokenIndex(project_root, persist=check_persist())
     used_tokens: set[str] = set()
     for path in topo_files:
-        used_tokens.update(_collect_topology_tokens(path, diags))
+        used_tokens.update(_collect_topology_tokens(index, path, diags))
 
     declared_tokens: set[str] = set()
     for path in contract_files:
-        declared_tokens.update(_collect_contract_tokens(path, diags))
+        declared_tokens.update(_collect_contract_tokens(index, path, diags))
+    index.save()
 
     for token in sorted(used_tokens):
         if token not in declared_tokens:
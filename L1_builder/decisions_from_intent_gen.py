@@ -7,7 +7,6 @@ from __future__ import annotations
 import argparse
 import difflib
 import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -15,6 +14,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.intent_schema import normalize_intent
 from sdslv2_builder.io_atomic import atomic_write_text
@@ -97,21 +97,6 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
     return False
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _build_source_link(
     user_link: str,
     generator_id: str,
@@ -473,7 +458,7 @@ def main() -> int:
         )
         return 2
 
-    source_rev = _git_rev(project_root)
+    source_rev = git_rev(project_root)
     source_link = _build_source_link(
         args.source_link,
         args.generator_id,
@@ -4,21 +4,21 @@
 from __future__ import annotations
 
 import argparse
-import json
-import re
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import DIRECTION_VOCAB, _capture_metadata, _parse_metadata_pairs
+from sdslv2_builder.disk_cache import check_persist
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.lint import DIRECTION_VOCAB
 from sdslv2_builder.op_yaml import load_yaml
 from sdslv2_builder.refs import CONTRACT_TOKEN_RE, RELID_RE
+from sdslv2_builder.scope_index import ScopeEntry, ScopeIndex
+from sdslv2_builder.sdsl_ast import SdslDocument, parse_text
 
 PLACEHOLDERS = {"none", "tbd", "opaque"}
-ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
 
 
 def _diag(
@@ -35,8 +35,7 @@ def _diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _is_placeholder(value: object) -> bool:
@@ -75,41 +74,31 @@ def _strip_quotes(value: str | None) -> str | None:
     return value
 
 
-def _parse_annotations(lines: list[str]) -> list[tuple[str, dict[str, str]]] | None:
+def _parse_annotations(doc: SdslDocument) -> list[tuple[str, dict[str, str]]] | None:
     annotations: list[tuple[str, dict[str, str]]] = []
-    for idx, line in enumerate(lines):
-        stripped = line.lstrip()
-        if stripped == "" or stripped.startswith("//"):
+    for ann in doc.annotations:
+        if not ann.kind_matched:
             continue
-        if not stripped.startswith("@"):
-            continue
-        match = ANNOTATION_KIND_RE.match(stripped)
-        if not match:
-            continue
-        kind = match.group("kind")
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            if kind == "Node":
-                return None
-            continue
-        try:
-            meta, _ = _capture_metadata(lines, idx, brace_idx)
-        except ValueError:
-            if kind == "Node":
+        if ann.meta is None or ann.dupes:
+            if ann.kind == "Node":
                 return None
-            continue
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        for key, value in pairs:
-            if key in meta_map:
-                if kind == "Node":
-                    return None
+            if ann.meta is None:
                 continue
-            meta_map[key] = value
-        annotations.append((kind, meta_map))
+        meta_map: dict[str, str] = {}
+        for key, value in ann.pairs:
+            meta_map.setdefault(key, value)
+        annotations.append((ann.kind, meta_map))
     return annotations
 
 
+def _describe_topology(path: Path) -> ScopeEntry:
+    annotations = _parse_annotations(parse_text(path.read_text(encoding="utf-8")))
+    if annotations is None:
+        return ScopeEntry(frozenset(), "", annotation_error="E_DECISIONS_SCOPE_INVALID")
+    nodes = frozenset((_strip_quotes(meta.get("id")) or "") for kind, meta in annotations if kind == "Node")
+    return ScopeEntry(nodes, "")
+
+
 def _count_component_scope_matches(
     project_root: Path,
     rel_id: str,
@@ -137,6 +126,7 @@ def _count_component_scope_matches(
         )
         return -1
     count = 0
+    index = ScopeIndex(project_root, "decisions_lint", _describe_topology, persist=check_persist())
     for path in sorted(ssot_root.rglob("*.sdsl2")):
         if not path.is_file():
             continue
@@ -151,7 +141,7 @@ def _count_component_scope_matches(
             )
             return -1
         try:
-            text = path.read_text(encoding="utf-8")
+            entry = index.entry(path)
         except (OSError, UnicodeDecodeError) as exc:
             _diag(
                 diags,
@@ -162,8 +152,7 @@ def _count_component_scope_matches(
                 json_pointer("scope", "value"),
             )
             return -1
-        annotations = _parse_annotations(text.splitlines())
-        if annotations is None:
+        if entry.annotation_error:
             _diag(
                 diags,
                 "E_DECISIONS_SCOPE_INVALID",
@@ -173,13 +162,9 @@ def _count_component_scope_matches(
                 json_pointer("scope", "value"),
             )
             return -1
-        for kind, meta in annotations:
-            if kind != "Node":
-                continue
-            node_id = _strip_quotes(meta.get("id")) or ""
-            if node_id == rel_id:
-                count += 1
-                break
+        if rel_id in entry.nodes:
+            count += 1
+    index.save()
     return count
 
 
@@ -308,7 +293,7 @@ def parse_decisions_file(
 ) -> tuple[dict[str, object] | None, list[Diagnostic]]:
     diags: list[Diagnostic] = []
     try:
-        data = load_yaml(path)
+        data = load_yaml(path, frozen=True)
     except Exception as exc:
         _diag(
             diags,
@@ -622,7 +607,7 @@ def parse_decisions_file(
     return {"scope": scope, "edges": edges}, diags
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="decisions/edges.yaml")
     ap.add_argument(
@@ -635,7 +620,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); input can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     path = _resolve_path(project_root, args.input)
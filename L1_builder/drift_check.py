@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
-import re
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -14,11 +12,13 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L1_builder.decisions_lint import parse_decisions_file
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
+from sdslv2_builder.disk_cache import check_persist
+from sdslv2_builder.errors import Diagnostic, DiagnosticSink, diagnostic_sink, json_pointer, print_diagnostics
+from sdslv2_builder.lint import _split_list_items
+from sdslv2_builder.project_model import decision_table
 from sdslv2_builder.refs import parse_internal_ref
-
-ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
+from sdslv2_builder.scope_index import ScopeEntry, ScopeIndex
+from sdslv2_builder.sdsl_ast import SdslDocument, parse_file, strict_annotations
 
 
 @dataclass(frozen=True)
@@ -30,13 +30,12 @@ class EdgeBlock:
     contract_refs: tuple[str, ...]
 
 
-def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got: str, path: str) -> None:
+def _diag(diags: list[Diagnostic] | DiagnosticSink, code: str, message: str, expected: str, got: str, path: str) -> None:
     diags.append(Diagnostic(code=code, message=message, expected=expected, got=got, path=path))
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _resolve_path(project_root: Path, raw: str) -> Path:
@@ -62,61 +61,27 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
     return False
 
 
-def _parse_annotations(lines: list[str]) -> list[tuple[str, dict[str, str], int, int]]:
-    annotations: list[tuple[str, dict[str, str], int, int]] = []
-    for idx, line in enumerate(lines):
-        stripped = line.lstrip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        if not stripped.startswith("@"):
-            continue
-        match = ANNOTATION_KIND_RE.match(stripped)
-        if not match:
-            continue
-        kind = match.group("kind")
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            raise ValueError(f"E_DRIFT_METADATA_MISSING: line {idx + 1}")
-        meta, end_line = _capture_metadata(lines, idx, brace_idx)
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        for key, value in pairs:
-            if key in meta_map:
-                raise ValueError(f"E_DRIFT_DUPLICATE_KEY: line {idx + 1} key {key}")
-            meta_map[key] = value
-        annotations.append((kind, meta_map, idx, end_line))
-    return annotations
-
-
-def _first_statement(lines: list[str]) -> int | None:
-    for idx, line in enumerate(lines):
-        if line.strip() == "" or line.lstrip().startswith("//"):
-            continue
-        return idx
-    return None
+def _parse_annotations(doc: SdslDocument) -> list[tuple[str, dict[str, str], int, int]]:
+    return [
+        (ann.kind, dict(ann.meta or {}), ann.start_line, ann.end_line)
+        for ann in strict_annotations(doc, "E_DRIFT")
+    ]
 
 
-def _find_file_header(lines: list[str]) -> dict[str, str]:
-    file_lines = [idx for idx, line in enumerate(lines) if line.lstrip().startswith("@File")]
-    if not file_lines:
+def _find_file_header(doc: SdslDocument) -> dict[str, str]:
+    headers = [ann for ann in doc.annotations if ann.raw_kind.startswith("File")]
+    if not headers:
         raise ValueError("E_DRIFT_FILE_HEADER_MISSING")
-    if len(file_lines) > 1:
+    if len(headers) > 1:
         raise ValueError("E_DRIFT_FILE_HEADER_DUPLICATE")
-    first = _first_statement(lines)
-    if first is not None and file_lines[0] != first:
+    header = headers[0]
+    if doc.first_stmt is not None and header.start_line != doc.first_stmt:
         raise ValueError("E_DRIFT_FILE_HEADER_NOT_FIRST")
-    idx = file_lines[0]
-    brace_idx = lines[idx].find("{")
-    if brace_idx == -1:
+    if header.meta is None:
         raise ValueError("E_DRIFT_FILE_HEADER_INVALID")
-    meta, _ = _capture_metadata(lines, idx, brace_idx)
-    pairs = _parse_metadata_pairs(meta)
-    meta_map: dict[str, str] = {}
-    for key, value in pairs:
-        if key in meta_map:
-            raise ValueError(f"E_DRIFT_DUPLICATE_KEY: line {idx + 1} key {key}")
-        meta_map[key] = value
-    return meta_map
+    if header.dupes:
+        raise ValueError(f"E_DRIFT_DUPLICATE_KEY: line {header.start_line + 1} key {header.dupes[0]}")
+    return dict(header.meta)
 
 
 def _strip_quotes(value: str | None) -> str | None:
@@ -179,8 +144,18 @@ def _missing_contract_refs(annotations: list[tuple[str, dict[str, str], int, int
     return missing
 
 
-def _edge_tuple(edge_id: str, from_id: str, to_id: str, direction: str, contract_refs: list[str]) -> tuple[str, str, str, str, tuple[str, ...]]:
-    return (edge_id, from_id, to_id, direction, tuple(contract_refs))
+def _describe_topology(path: Path) -> ScopeEntry:
+    doc = parse_file(path)
+    try:
+        annotations = _parse_annotations(doc)
+    except ValueError as exc:
+        return ScopeEntry(frozenset(), "", annotation_error=str(exc))
+    nodes = frozenset((_strip_quotes(meta.get("id")) or "") for kind, meta, _, _ in annotations if kind == "Node")
+    try:
+        meta = _find_file_header(doc)
+    except ValueError as exc:
+        return ScopeEntry(nodes, "", header_error=str(exc))
+    return ScopeEntry(nodes, _strip_quotes(meta.get("id_prefix")) or "")
 
 
 def _find_target_file_by_scope(project_root: Path, scope: dict[str, str]) -> Path:
@@ -209,6 +184,7 @@ def _find_target_file_by_scope(project_root: Path, scope: dict[str, str]) -> Pat
     except ValueError as exc:
         raise ValueError("E_DRIFT_SCOPE_SYMLINK") from exc
 
+    index = ScopeIndex(project_root, "drift_check", _describe_topology, persist=check_persist())
     for path in sorted(ssot_root.rglob("*.sdsl2")):
         if not path.is_file() or path.is_symlink():
             continue
@@ -222,23 +198,24 @@ def _find_target_file_by_scope(project_root: Path, scope: dict[str, str]) -> Pat
                 break
             if parent.is_symlink():
                 raise ValueError("E_DRIFT_SCOPE_SYMLINK")
-        lines = path.read_text(encoding="utf-8").splitlines()
-        annotations = _parse_annotations(lines)
-        nodes = {(_strip_quotes(meta.get("id")) or "") for kind, meta, _, _ in annotations if kind == "Node"}
+        entry = index.entry(path)
+        if entry.annotation_error:
+            raise ValueError(entry.annotation_error)
         if kind == "component":
-            if value in nodes:
+            if value in entry.nodes:
                 candidates.append(path)
         if kind == "id_prefix":
-            meta = _find_file_header(lines)
-            id_prefix = _strip_quotes(meta.get("id_prefix")) or ""
-            if id_prefix == value:
+            if entry.header_error:
+                raise ValueError(entry.header_error)
+            if entry.id_prefix == value:
                 candidates.append(path)
+    index.save()
     if len(candidates) != 1:
         raise ValueError("E_DRIFT_SCOPE_AMBIGUOUS")
     return candidates[0]
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--decisions-path",
@@ -255,7 +232,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); inputs can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     decisions_path = _resolve_path(project_root, args.decisions_path)
@@ -294,9 +271,9 @@ def main() -> int:
         print("E_DRIFT_SCOPE_SYMLINK", file=sys.stderr)
         return 2
 
-    lines = target_path.read_text(encoding="utf-8").splitlines()
+    doc = parse_file(target_path)
     try:
-        file_meta = _find_file_header(lines)
+        file_meta = _find_file_header(doc)
     except ValueError as exc:
         print(str(exc), file=sys.stderr)
         return 2
@@ -306,7 +283,7 @@ def main() -> int:
         return 2
 
     try:
-        annotations = _parse_annotations(lines)
+        annotations = _parse_annotations(doc)
     except ValueError as exc:
         print(str(exc), file=sys.stderr)
         return 2
@@ -321,36 +298,25 @@ def main() -> int:
         return 2
     edges = _parse_edges(annotations)
 
-    topo_by_id = {edge.edge_id: edge for edge in edges}
-    topo_tuples = {
-        _edge_tuple(edge.edge_id, edge.from_id, edge.to_id, edge.direction, list(edge.contract_refs))
+    topo_pairs = [
+        (edge.edge_id, (edge.edge_id, edge.from_id, edge.to_id, edge.direction, edge.contract_refs))
         for edge in edges
-    }
+    ]
+    topo_by_id = dict(topo_pairs)
+    topo_tuples = {tup for _, tup in topo_pairs}
 
-    decision_edges = decisions.get("edges", []) if isinstance(decisions, dict) else []
-    decision_tuples = set()
-    decision_by_id = {}
-    for edge in decision_edges:
-        if not isinstance(edge, dict):
-            continue
-        edge_id = edge.get("id")
-        from_id = edge.get("from")
-        to_id = edge.get("to")
-        direction = edge.get("direction")
-        contract_refs = edge.get("contract_refs", [])
-        if not all(isinstance(x, str) for x in [edge_id, from_id, to_id, direction]):
-            continue
-        if not isinstance(contract_refs, list):
-            contract_refs = []
-        refs = [ref for ref in contract_refs if isinstance(ref, str)]
-        tup = _edge_tuple(edge_id, from_id, to_id, direction, refs)
-        decision_tuples.add(tup)
-        decision_by_id[edge_id] = tup
-
-    drift_diags: list[Diagnostic] = []
+    table = decision_table(decisions)
+    decision_tuples = {table.row(row) for row in range(len(table))}
+    decision_by_id = {edge_id: table.row(row) for edge_id, row in table.unique_rows()}
+
+    unique_ids = len(decision_by_id) == len(decision_tuples) and len(topo_by_id) == len(topo_pairs)
+    if unique_ids and decision_tuples == topo_tuples:
+        return 0
+
+    drift_diags = diagnostic_sink()
     for edge_id, tup in decision_by_id.items():
-        topo_edge = topo_by_id.get(edge_id)
-        if topo_edge is None:
+        topo_tup = topo_by_id.get(edge_id)
+        if topo_tup is None:
             _diag(
                 drift_diags,
                 "E_DRIFT_DECISION_NOT_REFLECTED",
@@ -360,13 +326,6 @@ def main() -> int:
                 json_pointer("edges", edge_id),
             )
             continue
-        topo_tup = _edge_tuple(
-            topo_edge.edge_id,
-            topo_edge.from_id,
-            topo_edge.to_id,
-            topo_edge.direction,
-            list(topo_edge.contract_refs),
-        )
         if topo_tup != tup:
             _diag(
                 drift_diags,
@@ -377,20 +336,19 @@ def main() -> int:
                 json_pointer("edges", edge_id),
             )
 
-    for edge in edges:
-        tup = _edge_tuple(edge.edge_id, edge.from_id, edge.to_id, edge.direction, list(edge.contract_refs))
+    for edge_id, tup in topo_pairs:
         if tup not in decision_tuples:
             _diag(
                 drift_diags,
                 "E_DRIFT_MANUAL_EDGE",
                 "SSOT edge missing from decisions",
                 "matching EdgeDecision",
-                edge.edge_id,
-                json_pointer("ssot_edges", edge.edge_id),
+                edge_id,
+                json_pointer("ssot_edges", edge_id),
             )
 
     if drift_diags:
-        _print_diags(drift_diags)
+        drift_diags.close()
         return 2
     return 0
 
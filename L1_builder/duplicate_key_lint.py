@@ -4,14 +4,13 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import DuplicateKey, load_yaml_with_duplicates
 
 
@@ -27,8 +26,7 @@ def _diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _has_symlink_parent(path: Path, stop: Path) -> bool:
@@ -85,7 +83,7 @@ def _format_got(path: Path, dup: DuplicateKey, project_root: Path) -> str:
     return f"{rel} line {dup.line} key {dup.key}"
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", action="append", required=True, help="YAML file or directory path.")
     ap.add_argument(
@@ -93,7 +91,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); inputs can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     files, diags = _collect_inputs(args.input, project_root)
@@ -104,7 +102,7 @@ def main() -> int:
     dup_diags: list[Diagnostic] = []
     for path in files:
         try:
-            _, duplicates = load_yaml_with_duplicates(path, allow_duplicates=True)
+            _, duplicates = load_yaml_with_duplicates(path, allow_duplicates=True, frozen=True)
         except Exception as exc:
             _diag(
                 dup_diags,
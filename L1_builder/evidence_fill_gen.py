@@ -7,7 +7,6 @@ from __future__ import annotations
 import argparse
 import difflib
 import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -18,6 +17,7 @@ from L1_builder.decisions_lint import parse_decisions_file
 from L1_builder.evidence_lint import validate_evidence_data
 from L1_builder.evidence_repair import _compute_hash
 from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.op_yaml import DuplicateKey, dump_yaml, load_yaml_with_duplicates
@@ -96,21 +96,6 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
     return False
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _build_source_rev(git_rev: str, generator_id: str) -> str:
     return f"{git_rev}|gen:{generator_id}"
 
@@ -284,7 +269,7 @@ def main() -> int:
         )
         return 2
 
-    source_rev = _build_source_rev(_git_rev(project_root), args.generator_id)
+    source_rev = _build_source_rev(git_rev(project_root), args.generator_id)
     diags = []
     updated: dict[str, object] = {}
     validated_data = validated
@@ -4,17 +4,16 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from dataclasses import dataclass
-from hashlib import sha256
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.evidence_hash import HASH_OK, HASH_READ, hash_locators
 from sdslv2_builder.op_yaml import load_yaml
 
 LOCATOR_RE = re.compile(r"^L(?P<start>\d+)-L(?P<end>\d+)$|^H:(?P<head>[^#]+)#L(?P<start_h>\d+)-L(?P<end_h>\d+)$")
@@ -43,8 +42,7 @@ def _diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _resolve_path(project_root: Path, raw: str) -> Path:
@@ -83,30 +81,13 @@ def _parse_locator(value: str) -> Locator | None:
     )
 
 
-def _normalize_text(text: str) -> str:
-    return text.replace("\r\n", "\n").replace("\r", "\n")
-
-
-def _compute_content_hash(path: Path, locator: Locator) -> str:
-    text = path.read_text(encoding="utf-8")
-    normalized = _normalize_text(text)
-    lines = normalized.split("\n")
-    if locator.start < 1 or locator.end < locator.start or locator.end > len(lines):
-        raise ValueError("E_EVIDENCE_LOCATOR_RANGE")
-    selected = lines[locator.start - 1 : locator.end]
-    trimmed = [line.rstrip(" \t") for line in selected]
-    payload = "\n".join(trimmed)
-    digest = sha256(payload.encode("utf-8")).hexdigest()
-    return f"sha256:{digest}"
-
-
-def _hash_for_item(
+def _resolve_item(
     project_root: Path,
     source_path: str,
     locator_str: str,
     path_ref: str,
     diags: list[Diagnostic],
-) -> str | None:
+) -> tuple[Path, Locator] | None:
     if not isinstance(source_path, str) or not source_path.strip():
         _diag(diags, "E_EVIDENCE_SOURCE_INVALID", "source_path required", "path", str(source_path), path_ref)
         return None
@@ -162,27 +143,46 @@ def _hash_for_item(
     if source.is_symlink() or _has_symlink_parent(source, project_root):
         _diag(diags, "E_EVIDENCE_SOURCE_SYMLINK", "source_path must not be symlink", "non-symlink", str(source), path_ref)
         return None
-    try:
-        return _compute_content_hash(source, locator)
-    except (OSError, UnicodeDecodeError) as exc:
+    return source, locator
+
+
+def _hash_result(result: tuple[str, str], locator_str: str, path_ref: str, diags: list[Diagnostic]) -> str | None:
+    kind, value = result
+    if kind == HASH_OK:
+        return value
+    if kind == HASH_READ:
         _diag(
             diags,
             "E_EVIDENCE_SOURCE_READ_FAILED",
             "source_path must be readable UTF-8 file",
             "readable UTF-8 file",
-            str(exc),
+            value,
             path_ref,
         )
         return None
-    except ValueError as exc:
-        _diag(diags, str(exc), "locator in range", "valid range", locator_str, path_ref)
+    _diag(diags, "E_EVIDENCE_LOCATOR_RANGE", "locator in range", "valid range", locator_str, path_ref)
+    return None
+
+
+def _hash_for_item(
+    project_root: Path,
+    source_path: str,
+    locator_str: str,
+    path_ref: str,
+    diags: list[Diagnostic],
+) -> str | None:
+    resolved = _resolve_item(project_root, source_path, locator_str, path_ref, diags)
+    if resolved is None:
         return None
+    source, locator = resolved
+    (result,) = hash_locators([(source, locator.start, locator.end)])
+    return _hash_result(result, locator_str, path_ref, diags)
 
 
-def _verify_evidence_file(project_root: Path, evidence_path: Path) -> int:
+def _verify_evidence_file(project_root: Path, evidence_path: Path, jobs: int = 1) -> int:
     diags: list[Diagnostic] = []
     try:
-        data = load_yaml(evidence_path)
+        data = load_yaml(evidence_path, frozen=True)
     except Exception as exc:
         _diag(
             diags,
@@ -204,54 +204,77 @@ def _verify_evidence_file(project_root: Path, evidence_path: Path) -> int:
         _print_diags(diags)
         return 2
 
+    entries: list[tuple[list[Diagnostic], tuple[Path, Locator] | None, dict, str, str]] = []
     for decision_id, items in evidence.items():
         if not isinstance(items, list):
+            item_diags: list[Diagnostic] = []
             _diag(
-                diags,
+                item_diags,
                 "E_EVIDENCE_SCHEMA_INVALID",
                 "evidence list must be list",
                 "list",
                 type(items).__name__,
                 json_pointer("evidence", str(decision_id)),
             )
+            entries.append((item_diags, None, {}, str(decision_id), ""))
             continue
         for idx, item in enumerate(items):
+            item_diags = []
             if not isinstance(item, dict):
                 _diag(
-                    diags,
+                    item_diags,
                     "E_EVIDENCE_SCHEMA_INVALID",
                     "evidence item must be object",
                     "object",
                     type(item).__name__,
                     json_pointer("evidence", str(decision_id), str(idx)),
                 )
+                entries.append((item_diags, None, {}, str(decision_id), str(idx)))
                 continue
-            source_path = item.get("source_path", "")
-            locator = item.get("locator", "")
-            expected_hash = item.get("content_hash", "")
             path_ref = json_pointer("evidence", str(decision_id), str(idx))
-            actual = _hash_for_item(project_root, source_path, locator, path_ref, diags)
-            if actual is None:
-                continue
-            if not isinstance(expected_hash, str) or not expected_hash.startswith("sha256:"):
-                _diag(
-                    diags,
-                    "E_EVIDENCE_FIELD_INVALID",
-                    "content_hash must start with sha256:",
-                    "sha256:<hex>",
-                    str(expected_hash),
-                    json_pointer("evidence", str(decision_id), str(idx), "content_hash"),
-                )
-                continue
-            if actual != expected_hash:
-                _diag(
-                    diags,
-                    "E_EVIDENCE_HASH_MISMATCH",
-                    "content_hash mismatch",
-                    expected_hash,
-                    actual,
-                    json_pointer("evidence", str(decision_id), str(idx), "content_hash"),
-                )
+            resolved = _resolve_item(
+                project_root,
+                item.get("source_path", ""),
+                item.get("locator", ""),
+                path_ref,
+                item_diags,
+            )
+            entries.append((item_diags, resolved, item, str(decision_id), str(idx)))
+
+    requests = [
+        (resolved[0], resolved[1].start, resolved[1].end)
+        for _, resolved, _, _, _ in entries
+        if resolved is not None
+    ]
+    results = iter(hash_locators(requests, jobs=jobs))
+    for item_diags, resolved, item, decision_id, idx in entries:
+        diags.extend(item_diags)
+        if resolved is None:
+            continue
+        path_ref = json_pointer("evidence", decision_id, idx)
+        actual = _hash_result(next(results), item.get("locator", ""), path_ref, diags)
+        if actual is None:
+            continue
+        expected_hash = item.get("content_hash", "")
+        if not isinstance(expected_hash, str) or not expected_hash.startswith("sha256:"):
+            _diag(
+                diags,
+                "E_EVIDENCE_FIELD_INVALID",
+                "content_hash must start with sha256:",
+                "sha256:<hex>",
+                str(expected_hash),
+                json_pointer("evidence", decision_id, idx, "content_hash"),
+            )
+            continue
+        if actual != expected_hash:
+            _diag(
+                diags,
+                "E_EVIDENCE_HASH_MISMATCH",
+                "content_hash mismatch",
+                expected_hash,
+                actual,
+                json_pointer("evidence", decision_id, idx, "content_hash"),
+            )
 
     if diags:
         _print_diags(diags)
@@ -274,6 +297,12 @@ def main() -> int:
     ap.add_argument("--source-path", default=None, help="Source file path (repo-relative)")
     ap.add_argument("--locator", default=None, help="Locator (Lx-Ly or H:...#Lx-Ly) on normalized text")
     ap.add_argument("--verify", default=None, help="Evidence YAML path to verify")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for --verify; claims are grouped by source_path (default: 1)",
+    )
     ap.add_argument(
         "--project-root",
         default=None,
@@ -302,7 +331,7 @@ def main() -> int:
         if _has_symlink_parent(evidence_path, project_root):
             print("E_EVIDENCE_INPUT_SYMLINK_PARENT", file=sys.stderr)
             return 2
-        return _verify_evidence_file(project_root, evidence_path)
+        return _verify_evidence_file(project_root, evidence_path, jobs=args.jobs)
 
     if not args.source_path or not args.locator:
         print("E_EVIDENCE_HASH_ARGS_MISSING", file=sys.stderr)
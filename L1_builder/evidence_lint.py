@@ -13,8 +13,9 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L1_builder.decisions_lint import parse_decisions_file
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import load_yaml
+from sdslv2_builder.project_model import decision_table
 from sdslv2_builder.refs import CONTRACT_TOKEN_RE
 
 PLACEHOLDERS = {"none", "tbd", "opaque"}
@@ -37,8 +38,7 @@ def _diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _is_placeholder(value: object) -> bool:
@@ -192,8 +192,7 @@ def validate_evidence_data(
             json_pointer("evidence"),
         )
 
-    decision_edges = decisions.get("edges", [])
-    decision_ids = {edge["id"] for edge in decision_edges if isinstance(edge, dict)}
+    decision_ids = decision_table(decisions).by_id
 
     for key in evidence.keys():
         if key not in decision_ids:
@@ -489,7 +488,7 @@ def validate_evidence_data(
     return data, diags
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--decisions-path",
@@ -511,7 +510,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); inputs can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     decisions_path = _resolve_path(project_root, args.decisions_path)
@@ -559,7 +558,7 @@ def main() -> int:
             return 2
 
     try:
-        data = load_yaml(evidence_path)
+        data = load_yaml(evidence_path, frozen=True)
     except Exception as exc:
         diags: list[Diagnostic] = []
         _diag(
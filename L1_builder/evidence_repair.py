@@ -5,10 +5,8 @@ from __future__ import annotations
 
 import argparse
 import difflib
-import json
 import re
 import sys
-from hashlib import sha256
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -16,7 +14,8 @@ sys.path.insert(0, str(ROOT))
 
 from L1_builder.decisions_lint import parse_decisions_file
 from L1_builder.evidence_lint import validate_evidence_data
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.evidence_hash import HASH_OK, HASH_READ, hash_locators
 from sdslv2_builder.op_yaml import load_yaml, dump_yaml
 
 LOCATOR_RE = re.compile(r"^L(?P<start>\d+)-L(?P<end>\d+)$|^H:(?P<head>[^#]+)#L(?P<start_h>\d+)-L(?P<end_h>\d+)$")
@@ -29,8 +28,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _resolve_path(project_root: Path, raw: str) -> Path:
@@ -71,30 +69,13 @@ def _parse_locator(value: str) -> Locator | None:
     return Locator(start=int(m.group("start_h")), end=int(m.group("end_h")))
 
 
-def _normalize_text(text: str) -> str:
-    return text.replace("\r\n", "\n").replace("\r", "\n")
-
-
-def _compute_content_hash(path: Path, locator: Locator) -> str:
-    text = path.read_text(encoding="utf-8")
-    normalized = _normalize_text(text)
-    lines = normalized.split("\n")
-    if locator.start < 1 or locator.end < locator.start or locator.end > len(lines):
-        raise ValueError("E_EVIDENCE_REPAIR_LOCATOR_RANGE")
-    selected = lines[locator.start - 1 : locator.end]
-    trimmed = [line.rstrip(" \t") for line in selected]
-    payload = "\n".join(trimmed)
-    digest = sha256(payload.encode("utf-8")).hexdigest()
-    return f"sha256:{digest}"
-
-
-def _compute_hash(
+def _resolve_item(
     project_root: Path,
     source_path: str,
     locator_str: str,
     diags: list[Diagnostic],
     path_ref: str,
-) -> str | None:
+) -> tuple[Path, Locator] | None:
     if not isinstance(source_path, str) or not source_path.strip():
         _diag(diags, "E_EVIDENCE_REPAIR_SOURCE_INVALID", "source_path required", "path", str(source_path), path_ref)
         return None
@@ -150,24 +131,43 @@ def _compute_hash(
     if source.is_symlink() or _has_symlink_parent(source, project_root):
         _diag(diags, "E_EVIDENCE_REPAIR_SOURCE_SYMLINK", "source_path must not be symlink", "non-symlink", str(source), path_ref)
         return None
-    try:
-        return _compute_content_hash(source, locator)
-    except (OSError, UnicodeDecodeError) as exc:
+    return source, locator
+
+
+def _hash_result(result: tuple[str, str], locator_str: str, diags: list[Diagnostic], path_ref: str) -> str | None:
+    kind, value = result
+    if kind == HASH_OK:
+        return value
+    if kind == HASH_READ:
         _diag(
             diags,
             "E_EVIDENCE_REPAIR_SOURCE_READ_FAILED",
             "source_path must be readable UTF-8 file",
             "readable UTF-8 file",
-            str(exc),
+            value,
             path_ref,
         )
         return None
-    except ValueError as exc:
-        _diag(diags, str(exc), "locator in range", "valid range", locator_str, path_ref)
+    _diag(diags, "E_EVIDENCE_REPAIR_LOCATOR_RANGE", "locator in range", "valid range", locator_str, path_ref)
+    return None
+
+
+def _compute_hash(
+    project_root: Path,
+    source_path: str,
+    locator_str: str,
+    diags: list[Diagnostic],
+    path_ref: str,
+) -> str | None:
+    resolved = _resolve_item(project_root, source_path, locator_str, diags, path_ref)
+    if resolved is None:
         return None
+    source, locator = resolved
+    (result,) = hash_locators([(source, locator.start, locator.end)])
+    return _hash_result(result, locator_str, diags, path_ref)
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--decisions-path",
@@ -199,7 +199,13 @@ def main() -> int:
         action="store_true",
         help="Exit 0 even when a diff is produced",
     )
-    args = ap.parse_args()
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for hashing; claims are grouped by source_path (default: 1)",
+    )
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     decisions_path = _resolve_path(project_root, args.decisions_path)
@@ -273,7 +279,7 @@ def main() -> int:
         print("E_EVIDENCE_REPAIR_SCHEMA_INVALID", file=sys.stderr)
         return 2
 
-    changed = False
+    entries: list[tuple[list[Diagnostic], tuple[Path, Locator] | None, dict, str]] = []
     for decision_id, items in evidence.items():
         if not isinstance(items, list):
             continue
@@ -283,12 +289,27 @@ def main() -> int:
             source_path = item.get("source_path", "")
             locator = item.get("locator", "")
             path_ref = json_pointer("evidence", str(decision_id), str(idx))
-            actual = _compute_hash(project_root, source_path, locator, diags, path_ref)
-            if actual is None:
-                continue
-            if item.get("content_hash") != actual:
-                item["content_hash"] = actual
-                changed = True
+            item_diags: list[Diagnostic] = []
+            resolved = _resolve_item(project_root, source_path, locator, item_diags, path_ref)
+            entries.append((item_diags, resolved, item, path_ref))
+
+    requests = [
+        (resolved[0], resolved[1].start, resolved[1].end)
+        for _, resolved, _, _ in entries
+        if resolved is not None
+    ]
+    results = iter(hash_locators(requests, jobs=args.jobs))
+    changed = False
+    for item_diags, resolved, item, path_ref in entries:
+        diags.extend(item_diags)
+        if resolved is None:
+            continue
+        actual = _hash_result(next(results), item.get("locator", ""), diags, path_ref)
+        if actual is None:
+            continue
+        if item.get("content_hash") != actual:
+            item["content_hash"] = actual
+            changed = True
 
     if diags:
         _print_diags(diags)
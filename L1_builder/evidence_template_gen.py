@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -13,26 +11,12 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L1_builder.decisions_lint import parse_decisions_file
+from sdslv2_builder.errors import print_diagnostics
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.op_yaml import dump_yaml
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _resolve_path(base: Path, raw: str) -> Path:
     path = Path(raw)
     if not path.is_absolute():
@@ -109,8 +93,7 @@ def main() -> int:
 
     decisions, diags = parse_decisions_file(decisions_path, project_root)
     if diags:
-        payload = [d.to_dict() for d in diags]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+        print_diagnostics(diags)
         return 2
 
     try:
@@ -153,7 +136,7 @@ def main() -> int:
 
     data = {
         "schema_version": "1.0",
-        "source_rev": _git_rev(ROOT),
+        "source_rev": git_rev(ROOT),
         "input_hash": input_hash.input_hash,
         "scope": decisions.get("scope", {}),
         "evidence": evidence_map,
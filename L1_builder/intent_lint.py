@@ -4,14 +4,13 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.intent_schema import normalize_intent
 from sdslv2_builder.op_yaml import load_yaml_with_duplicates
 
@@ -21,8 +20,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _resolve_path(project_root: Path, raw: str) -> Path:
@@ -150,7 +148,7 @@ def _lint_file(path: Path) -> tuple[dict[str, object] | None, list[Diagnostic]]:
     return normalized, diags
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", action="append", required=True, help="Intent YAML file or directory")
     ap.add_argument(
@@ -168,7 +166,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); inputs can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     intent_root = (project_root / "drafts" / "intent").resolve()
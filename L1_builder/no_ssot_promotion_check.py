@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import sys
 from pathlib import Path
@@ -12,7 +11,7 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic
+from sdslv2_builder.errors import Diagnostic, print_diagnostics
 
 
 def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got: str, path: str) -> None:
@@ -20,8 +19,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _walk_no_symlink(root: Path, diags: list[Diagnostic]) -> None:
@@ -113,14 +111,14 @@ def _check_exception_path(project_root: Path, diags: list[Diagnostic]) -> None:
         )
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--project-root",
         default=None,
         help="Project root (defaults to repo root); checks apply under this root",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     sdsl2_root = project_root / "sdsl2"
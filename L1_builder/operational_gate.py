@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
-import subprocess
 import sys
 from datetime import date
 from pathlib import Path
@@ -14,6 +12,10 @@ import re
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+from sdslv2_builder.errors import print_diagnostics
+from sdslv2_builder.gate_cache import GateCache
+from sdslv2_builder.gate_exec import diag_stop, run_cached
+from sdslv2_builder.gate_profile import GateProfile
 from sdslv2_builder.op_yaml import load_yaml
 from sdslv2_builder.policy_utils import get_gate_severity, load_policy
 
@@ -59,7 +61,7 @@ def _collect_exception_overrides(project_root: Path, today: date) -> set[str]:
     except ValueError:
         return overrides
     try:
-        data = load_yaml(exceptions_path)
+        data = load_yaml(exceptions_path, frozen=True)
     except Exception:
         return overrides
     if not isinstance(data, dict):
@@ -93,22 +95,36 @@ def _run_gate(
     verbose: bool,
     exception_overrides: set[str],
     default_severity: str | None = None,
+    isolate: bool = False,
+    cache: GateCache | None = None,
+    inputs: tuple[str, ...] = (),
+    profile: GateProfile | None = None,
 ) -> int:
     if verbose:
         print("+", " ".join(cmd))
-    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=ROOT)
-    if proc.stdout:
-        print(proc.stdout, end="")
-    if proc.stderr:
-        print(proc.stderr, end="", file=sys.stderr)
-    if proc.returncode == 0:
-        return 0
     if gate_key is None:
         severity = "FAIL"
     else:
         severity = get_gate_severity(policy, gate_key, default=default_severity or "FAIL")
     if gate_key and gate_key in exception_overrides and severity == "FAIL":
         severity = "DIAG"
+    name = gate_key or Path(cmd[1]).stem
+    profile_path = profile.pstats_path(name) if profile is not None else None
+    stop = diag_stop(cmd) if severity == "FAIL" else None
+    proc = run_cached(name, cmd, ROOT, inputs, isolate=isolate, cache=cache, profile_path=profile_path, stop=stop)
+    status = cache.pop_status(name) if cache is not None else None
+    if verbose and status:
+        print(f"[CACHE {status}] {name}")
+    if profile is not None:
+        profile.record(name, cmd, inputs, proc, status)
+    if proc.stdout:
+        print(proc.stdout, end="")
+    if proc.stderr:
+        print(proc.stderr, end="", file=sys.stderr)
+    if proc.stopped is not None:
+        print(f"[STOP] {name}: {proc.stopped}", file=sys.stderr)
+    if proc.returncode == 0:
+        return 0
     if severity in {"DIAG", "IGNORE"}:
         print(f"[{severity}] {gate_key}", file=sys.stderr)
         return 0
@@ -134,98 +150,15 @@ def _list_draft_files(drafts_root: Path) -> list[Path]:
     return files
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser()
-    ap.add_argument(
-        "--project-root",
-        default=None,
-        help="Project root (defaults to repo root); inputs can be relative to it",
-    )
-    ap.add_argument(
-        "--decisions-path",
-        default="decisions/edges.yaml",
-        help="decisions/edges.yaml path",
-    )
-    ap.add_argument(
-        "--evidence-path",
-        default="decisions/evidence.yaml",
-        help="decisions/evidence.yaml path",
-    )
-    ap.add_argument(
-        "--allow-nonstandard-path",
-        action="store_true",
-        help="Allow decisions/evidence paths outside standard locations",
-    )
-    ap.add_argument(
-        "--determinism-manifest",
-        default=None,
-        help="Run determinism_check.py with this manifest",
-    )
-    ap.add_argument(
-        "--ssot-registry",
-        default="OUTPUT/ssot/ssot_registry.json",
-        help="SSOT registry path for token_registry_check",
-    )
-    ap.add_argument(
-        "--contract-registry",
-        default="OUTPUT/ssot/contract_registry.json",
-        help="Contract registry path for token_registry_check",
-    )
-    ap.add_argument(
-        "--evidence-repair-out",
-        default=None,
-        help="Write evidence repair diff to this path (default: stdout)",
-    )
-    ap.add_argument(
-        "--policy-path",
-        default=None,
-        help="Explicit policy path for gate severities",
-    )
-    ap.add_argument(
-        "--fail-on-unresolved",
-        action="store_true",
-        help="Treat UNRESOLVED token registry targets as failure",
-    )
-    ap.add_argument(
-        "--exceptions-target",
-        action="append",
-        default=[],
-        help="Gate key to downgrade to DIAG when exceptions are active",
-    )
-    ap.add_argument(
-        "--today",
-        default=None,
-        help="YYYY-MM-DD for exceptions.yaml evaluation",
-    )
-    ap.add_argument("--verbose", action="store_true", help="Print commands")
-    args = ap.parse_args()
-
-    project_root = Path(args.project_root).resolve() if args.project_root else ROOT
+def _run_gates(
+    args: argparse.Namespace,
+    project_root: Path,
+    policy: dict,
+    exception_overrides: set[str],
+    cache: GateCache,
+    profile: GateProfile,
+) -> int:
     py = sys.executable
-    policy_path = Path(args.policy_path) if args.policy_path else None
-    policy_result = load_policy(policy_path, project_root)
-    if policy_result.diagnostics:
-        payload = [d.to_dict() for d in policy_result.diagnostics]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
-    policy = policy_result.policy
-
-    exception_overrides: set[str] = set()
-    if args.exceptions_target:
-        if args.today is None:
-            print("E_L1_EXCEPTIONS_TODAY_REQUIRED", file=sys.stderr)
-            return 2
-        today = _parse_date(args.today)
-        if today is None:
-            print("E_L1_EXCEPTIONS_TODAY_INVALID", file=sys.stderr)
-            return 2
-        active_overrides = _collect_exception_overrides(project_root, today)
-        requested = set(args.exceptions_target)
-        missing = sorted(requested - active_overrides)
-        if missing:
-            print(f"E_L1_EXCEPTIONS_NOT_ACTIVE:{','.join(missing)}", file=sys.stderr)
-            return 2
-        exception_overrides = requested
-
     topo_cmd = [
         py,
         str(ROOT / "L0_builder" / "topology_resolution_lint.py"),
@@ -235,7 +168,17 @@ def main() -> int:
         str(project_root),
         "--fail-on-missing",
     ]
-    if _run_gate(topo_cmd, "topology_resolution", policy, args.verbose, exception_overrides) != 0:
+    if _run_gate(
+        topo_cmd,
+        "topology_resolution",
+        policy,
+        args.verbose,
+        exception_overrides,
+        isolate=args.isolate,
+        cache=cache,
+        inputs=("sdsl2/topology",),
+        profile=profile,
+    ) != 0:
         return 2
 
     dup_cmd = [
@@ -256,7 +199,18 @@ def main() -> int:
         "--project-root",
         str(project_root),
     ]
-    if _run_gate(dup_cmd, "duplicate_keys", policy, args.verbose, exception_overrides, default_severity="DIAG") != 0:
+    if _run_gate(
+        dup_cmd,
+        "duplicate_keys",
+        policy,
+        args.verbose,
+        exception_overrides,
+        default_severity="DIAG",
+        isolate=args.isolate,
+        cache=cache,
+        inputs=("drafts", "decisions", args.decisions_path, args.evidence_path),
+        profile=profile,
+    ) != 0:
         return 2
     drafts_root = project_root / "drafts"
     for draft_path in _list_draft_files(drafts_root):
@@ -268,7 +222,17 @@ def main() -> int:
             "--project-root",
             str(project_root),
         ]
-        if _run_gate(cmd, "draft_schema", policy, args.verbose, exception_overrides) != 0:
+        if _run_gate(
+            cmd,
+            "draft_schema",
+            policy,
+            args.verbose,
+            exception_overrides,
+            isolate=args.isolate,
+            cache=cache,
+            inputs=("drafts",),
+            profile=profile,
+        ) != 0:
             return 2
 
     intent_root = drafts_root / "intent"
@@ -284,7 +248,17 @@ def main() -> int:
         ]
         if args.allow_nonstandard_path:
             cmd.append("--allow-nonstandard-path")
-        if _run_gate(cmd, "intent_schema", policy, args.verbose, exception_overrides) != 0:
+        if _run_gate(
+            cmd,
+            "intent_schema",
+            policy,
+            args.verbose,
+            exception_overrides,
+            isolate=args.isolate,
+            cache=cache,
+            inputs=("drafts/intent", "sdsl2"),
+            profile=profile,
+        ) != 0:
             return 2
 
     schema_cmd = [
@@ -297,7 +271,17 @@ def main() -> int:
         "--project-root",
         str(project_root),
     ]
-    if _run_gate(schema_cmd, "schema_migration", policy, args.verbose, exception_overrides) != 0:
+    if _run_gate(
+        schema_cmd,
+        "schema_migration",
+        policy,
+        args.verbose,
+        exception_overrides,
+        isolate=args.isolate,
+        cache=cache,
+        inputs=("drafts", "decisions", args.decisions_path, args.evidence_path),
+        profile=profile,
+    ) != 0:
         return 2
 
     decisions_cmd = [
@@ -310,7 +294,17 @@ def main() -> int:
     ]
     if args.allow_nonstandard_path:
         decisions_cmd.append("--allow-nonstandard-path")
-    if _run_gate(decisions_cmd, "decisions_schema", policy, args.verbose, exception_overrides) != 0:
+    if _run_gate(
+        decisions_cmd,
+        "decisions_schema",
+        policy,
+        args.verbose,
+        exception_overrides,
+        isolate=args.isolate,
+        cache=cache,
+        inputs=(args.decisions_path, "sdsl2/topology"),
+        profile=profile,
+    ) != 0:
         return 2
 
     evidence_cmd = [
@@ -325,7 +319,15 @@ def main() -> int:
     ]
     if args.allow_nonstandard_path:
         evidence_cmd.append("--allow-nonstandard-path")
-    if _run_gate(evidence_cmd, "evidence_coverage", policy, args.verbose, exception_overrides) != 0:
+    if _run_gate(
+        evidence_cmd,
+        "evidence_coverage",
+        policy,
+        args.verbose,
+        exception_overrides,
+        isolate=args.isolate,
+        profile=profile,
+    ) != 0:
         return 2
 
     repair_cmd = [
@@ -342,7 +344,15 @@ def main() -> int:
         repair_cmd.append("--allow-nonstandard-path")
     if args.evidence_repair_out:
         repair_cmd.extend(["--out", args.evidence_repair_out])
-    if _run_gate(repair_cmd, "evidence_repair", policy, args.verbose, exception_overrides) != 0:
+    if _run_gate(
+        repair_cmd,
+        "evidence_repair",
+        policy,
+        args.verbose,
+        exception_overrides,
+        isolate=args.isolate,
+        profile=profile,
+    ) != 0:
         return 2
 
     readiness_cmd = [
@@ -357,7 +367,15 @@ def main() -> int:
     ]
     if args.allow_nonstandard_path:
         readiness_cmd.append("--allow-nonstandard-path")
-    if _run_gate(readiness_cmd, "readiness_check", policy, args.verbose, exception_overrides) != 0:
+    if _run_gate(
+        readiness_cmd,
+        "readiness_check",
+        policy,
+        args.verbose,
+        exception_overrides,
+        isolate=args.isolate,
+        profile=profile,
+    ) != 0:
         return 2
 
     contract_resolution_cmd = [
@@ -376,6 +394,10 @@ def main() -> int:
         args.verbose,
         exception_overrides,
         default_severity="DIAG",
+        isolate=args.isolate,
+        cache=cache,
+        inputs=("sdsl2/contract",),
+        profile=profile,
     ) != 0:
         return 2
 
@@ -398,6 +420,10 @@ def main() -> int:
         args.verbose,
         exception_overrides,
         default_severity="DIAG",
+        isolate=args.isolate,
+        cache=cache,
+        inputs=("sdsl2/contract", args.decisions_path),
+        profile=profile,
     ) != 0:
         return 2
 
@@ -416,6 +442,10 @@ def main() -> int:
         args.verbose,
         exception_overrides,
         default_severity="DIAG",
+        isolate=args.isolate,
+        cache=cache,
+        inputs=("sdsl2/contract",),
+        profile=profile,
     ) != 0:
         return 2
 
@@ -432,6 +462,10 @@ def main() -> int:
         args.verbose,
         exception_overrides,
         default_severity="DIAG",
+        isolate=args.isolate,
+        cache=cache,
+        inputs=("sdsl2",),
+        profile=profile,
     ) != 0:
         return 2
 
@@ -441,7 +475,15 @@ def main() -> int:
         "--project-root",
         str(project_root),
     ]
-    if _run_gate(no_ssot_cmd, "no_ssot_promotion", policy, args.verbose, exception_overrides) != 0:
+    if _run_gate(
+        no_ssot_cmd,
+        "no_ssot_promotion",
+        policy,
+        args.verbose,
+        exception_overrides,
+        isolate=args.isolate,
+        profile=profile,
+    ) != 0:
         return 2
 
     token_cmd = [
@@ -457,7 +499,17 @@ def main() -> int:
     if args.fail_on_unresolved:
         token_cmd.append("--fail-on-unresolved")
     token_gate_key = None if args.fail_on_unresolved else "token_registry"
-    if _run_gate(token_cmd, token_gate_key, policy, args.verbose, exception_overrides) != 0:
+    if _run_gate(
+        token_cmd,
+        token_gate_key,
+        policy,
+        args.verbose,
+        exception_overrides,
+        isolate=args.isolate,
+        cache=cache,
+        inputs=("sdsl2", "OUTPUT/ssot", args.ssot_registry, args.contract_registry),
+        profile=profile,
+    ) != 0:
         return 2
 
     if args.determinism_manifest:
@@ -467,11 +519,138 @@ def main() -> int:
             "--manifest",
             args.determinism_manifest,
         ]
-        if _run_gate(determinism_cmd, "determinism", policy, args.verbose, exception_overrides) != 0:
+        if _run_gate(
+            determinism_cmd,
+            "determinism",
+            policy,
+            args.verbose,
+            exception_overrides,
+            isolate=args.isolate,
+            profile=profile,
+        ) != 0:
             return 2
 
     return 0
 
 
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--project-root",
+        default=None,
+        help="Project root (defaults to repo root); inputs can be relative to it",
+    )
+    ap.add_argument(
+        "--decisions-path",
+        default="decisions/edges.yaml",
+        help="decisions/edges.yaml path",
+    )
+    ap.add_argument(
+        "--evidence-path",
+        default="decisions/evidence.yaml",
+        help="decisions/evidence.yaml path",
+    )
+    ap.add_argument(
+        "--allow-nonstandard-path",
+        action="store_true",
+        help="Allow decisions/evidence paths outside standard locations",
+    )
+    ap.add_argument(
+        "--determinism-manifest",
+        default=None,
+        help="Run determinism_check.py with this manifest",
+    )
+    ap.add_argument(
+        "--ssot-registry",
+        default="OUTPUT/ssot/ssot_registry.json",
+        help="SSOT registry path for token_registry_check",
+    )
+    ap.add_argument(
+        "--contract-registry",
+        default="OUTPUT/ssot/contract_registry.json",
+        help="Contract registry path for token_registry_check",
+    )
+    ap.add_argument(
+        "--evidence-repair-out",
+        default=None,
+        help="Write evidence repair diff to this path (default: stdout)",
+    )
+    ap.add_argument(
+        "--policy-path",
+        default=None,
+        help="Explicit policy path for gate severities",
+    )
+    ap.add_argument(
+        "--fail-on-unresolved",
+        action="store_true",
+        help="Treat UNRESOLVED token registry targets as failure",
+    )
+    ap.add_argument(
+        "--exceptions-target",
+        action="append",
+        default=[],
+        help="Gate key to downgrade to DIAG when exceptions are active",
+    )
+    ap.add_argument(
+        "--today",
+        default=None,
+        help="YYYY-MM-DD for exceptions.yaml evaluation",
+    )
+    ap.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each gate in a fresh subprocess instead of in-process",
+    )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run every gate instead of replaying results from OUTPUT/.gate_cache",
+    )
+    ap.add_argument(
+        "--profile",
+        action="store_true",
+        help="Dump cProfile stats per in-process gate under OUTPUT/.gate_profile",
+    )
+    ap.add_argument(
+        "--profile-summary",
+        action="store_true",
+        help="Print a per-gate timing table to stderr, slowest first",
+    )
+    ap.add_argument("--verbose", action="store_true", help="Print commands")
+    args = ap.parse_args(argv)
+
+    project_root = Path(args.project_root).resolve() if args.project_root else ROOT
+    policy_path = Path(args.policy_path) if args.policy_path else None
+    policy_result = load_policy(policy_path, project_root)
+    if policy_result.diagnostics:
+        print_diagnostics(policy_result.diagnostics)
+    policy = policy_result.policy
+    base_inputs = ("policy", ".sdsl", args.policy_path) if args.policy_path else ("policy", ".sdsl")
+    cache = GateCache(project_root, enabled=not args.no_cache, base_inputs=base_inputs)
+
+    exception_overrides: set[str] = set()
+    if args.exceptions_target:
+        if args.today is None:
+            print("E_L1_EXCEPTIONS_TODAY_REQUIRED", file=sys.stderr)
+            return 2
+        today = _parse_date(args.today)
+        if today is None:
+            print("E_L1_EXCEPTIONS_TODAY_INVALID", file=sys.stderr)
+            return 2
+        active_overrides = _collect_exception_overrides(project_root, today)
+        requested = set(args.exceptions_target)
+        missing = sorted(requested - active_overrides)
+        if missing:
+            print(f"E_L1_EXCEPTIONS_NOT_ACTIVE:{','.join(missing)}", file=sys.stderr)
+            return 2
+        exception_overrides = requested
+
+    profile = GateProfile("operational_gate", project_root, pstats=args.profile)
+    try:
+        return _run_gates(args, project_root, policy, exception_overrides, cache, profile)
+    finally:
+        profile.finish(summary=args.profile_summary)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import difflib
-import json
 import re
 import sys
 from dataclasses import dataclass
@@ -15,10 +13,12 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L1_builder.decisions_lint import parse_decisions_file
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
+from sdslv2_builder.edit_buffer import EditBuffer
+from sdslv2_builder.errors import print_diagnostics
+from sdslv2_builder.lint import _capture_metadata, _split_list_items
 from sdslv2_builder.refs import parse_internal_ref
-
-ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
+from sdslv2_builder.sdsl_ast import SdslDocument, parse_file, strict_annotations
+from sdslv2_builder.span_diff import edit_diff
 
 
 @dataclass(frozen=True)
@@ -55,59 +55,25 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
     return False
 
 
-def _parse_annotations(lines: list[str]) -> list[tuple[str, dict[str, str], int, int]]:
-    annotations: list[tuple[str, dict[str, str], int, int]] = []
-    for idx, line in enumerate(lines):
-        stripped = line.lstrip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        if not stripped.startswith("@"):
-            continue
-        match = ANNOTATION_KIND_RE.match(stripped)
-        if not match:
-            continue
-        kind = match.group("kind")
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            raise ValueError(f"E_PROMOTE_METADATA_MISSING: line {idx + 1}")
-        meta, end_line = _capture_metadata(lines, idx, brace_idx)
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        for key, value in pairs:
-            if key in meta_map:
-                raise ValueError(f"E_PROMOTE_DUPLICATE_KEY: line {idx + 1} key {key}")
-            meta_map[key] = value
-        annotations.append((kind, meta_map, idx, end_line))
-    return annotations
-
-
-def _first_statement(lines: list[str]) -> int | None:
-    for idx, line in enumerate(lines):
-        if line.strip() == "" or line.lstrip().startswith("//"):
-            continue
-        return idx
-    return None
+def _parse_annotations(doc: SdslDocument) -> list[tuple[str, dict[str, str], int, int]]:
+    return [
+        (ann.kind, dict(ann.meta or {}), ann.start_line, ann.end_line)
+        for ann in strict_annotations(doc, "E_PROMOTE")
+    ]
 
 
-def _find_file_header(lines: list[str]) -> tuple[int, int, dict[str, str]]:
-    file_lines = [idx for idx, line in enumerate(lines) if line.lstrip().startswith("@File")]
-    if not file_lines:
+def _find_file_header(doc: SdslDocument) -> tuple[int, int, dict[str, str]]:
+    headers = [ann for ann in doc.annotations if ann.raw_kind.startswith("File")]
+    if not headers:
         raise ValueError("E_PROMOTE_FILE_HEADER_MISSING")
-    if len(file_lines) > 1:
+    if len(headers) > 1:
         raise ValueError("E_PROMOTE_FILE_HEADER_DUPLICATE")
-    first = _first_statement(lines)
-    if first is not None and file_lines[0] != first:
+    header = headers[0]
+    if doc.first_stmt is not None and header.start_line != doc.first_stmt:
         raise ValueError("E_PROMOTE_FILE_HEADER_NOT_FIRST")
-    idx = file_lines[0]
-    brace_idx = lines[idx].find("{")
-    if brace_idx == -1:
+    if header.meta is None:
         raise ValueError("E_PROMOTE_FILE_HEADER_INVALID")
-    meta, end_line = _capture_metadata(lines, idx, brace_idx)
-    pairs = _parse_metadata_pairs(meta)
-    meta_map: dict[str, str] = {}
-    for key, value in pairs:
-        meta_map[key] = value
-    return idx, end_line, meta_map
+    return header.start_line, header.end_line, dict(header.meta)
 
 
 def _strip_quotes(value: str | None) -> str | None:
@@ -196,15 +162,15 @@ def _format_edge_lines(edge: dict[str, object]) -> list[str]:
     return lines
 
 
-def _update_file_stage(lines: list[str], start: int, end: int, stage_value: str) -> None:
+def _update_file_stage(edits: EditBuffer, lines: list[str], start: int, end: int, stage_value: str) -> None:
     stage_pattern = re.compile(r'stage\s*(?::\s*)?"[^"]*"')
     if start == end:
         line = lines[start]
         if stage_pattern.search(line):
-            lines[start] = stage_pattern.sub(f'stage:"{stage_value}"', line)
+            edits.replace(start, start + 1, [stage_pattern.sub(f'stage:"{stage_value}"', line)])
             return
         if "}" in line:
-            lines[start] = line.replace("}", f', stage:"{stage_value}" }}', 1)
+            edits.replace(start, start + 1, [line.replace("}", f', stage:"{stage_value}" }}', 1)])
         return
 
     stage_line = None
@@ -213,12 +179,12 @@ def _update_file_stage(lines: list[str], start: int, end: int, stage_value: str)
             stage_line = idx
             break
     if stage_line is not None:
-        lines[stage_line] = stage_pattern.sub(f'stage:"{stage_value}"', lines[stage_line])
+        edits.replace(stage_line, stage_line + 1, [stage_pattern.sub(f'stage:"{stage_value}"', lines[stage_line])])
         return
     for idx in range(end, start - 1, -1):
         if "}" in lines[idx]:
             indent = " " * (len(lines[idx]) - len(lines[idx].lstrip(" ")))
-            lines.insert(idx, f'{indent}  stage:"{stage_value}",')
+            edits.insert(idx, [f'{indent}  stage:"{stage_value}",'])
             return
 
 
@@ -289,14 +255,14 @@ def _find_target_file_by_scope(
                 break
             if parent.is_symlink():
                 raise ValueError("E_PROMOTE_SCOPE_SYMLINK")
-        lines = path.read_text(encoding="utf-8").splitlines()
-        annotations = _parse_annotations(lines)
+        doc = parse_file(path)
+        annotations = _parse_annotations(doc)
         nodes = _parse_nodes(annotations)
         if kind == "component":
             if value in nodes:
                 candidates.append(path)
         if kind == "id_prefix":
-            file_idx, _, meta = _find_file_header(lines)
+            file_idx, _, meta = _find_file_header(doc)
             file_idx = file_idx
             _ = file_idx
             id_prefix = _strip_quotes(meta.get("id_prefix")) or ""
@@ -355,8 +321,7 @@ def main() -> int:
 
     decisions, diags = parse_decisions_file(decisions_path, project_root)
     if diags:
-        payload = [d.to_dict() for d in diags]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+        print_diagnostics(diags)
         return 2
 
     scope = decisions.get("scope", {})
@@ -369,15 +334,16 @@ def main() -> int:
         print("E_PROMOTE_SCOPE_SYMLINK", file=sys.stderr)
         return 2
 
-    lines = target_path.read_text(encoding="utf-8").splitlines()
+    doc = parse_file(target_path)
+    lines = list(doc.lines)
     try:
-        annotations = _parse_annotations(lines)
+        annotations = _parse_annotations(doc)
         for kind, _, _, _ in annotations:
             if kind in {"EdgeIntent", "Flow"}:
                 print("E_PROMOTE_FORBIDDEN_KIND", file=sys.stderr)
                 return 2
 
-        file_start, file_end, file_meta = _find_file_header(lines)
+        file_start, file_end, file_meta = _find_file_header(doc)
         profile = _strip_quotes(file_meta.get("profile")) or ""
         stage = _strip_quotes(file_meta.get("stage")) or ""
         if profile != "topology":
@@ -429,62 +395,33 @@ def main() -> int:
         print("E_PROMOTE_NO_CHANGE", file=sys.stderr)
         return 2
 
-    new_lines = list(lines)
+    edits = EditBuffer(lines)
     if stage == "L0":
-        _update_file_stage(new_lines, file_start, file_end, "L1")
+        _update_file_stage(edits, lines, file_start, file_end, "L1")
 
     new_edges_sorted = sorted(new_edges, key=lambda e: str(e.get("id", "")))
     if edges:
         edge_blocks = sorted(edges, key=lambda e: e.start)
         existing_ids = [e.edge_id for e in edge_blocks]
+        slots: list[tuple[int, int, list[str] | None]] = [(e.start, e.end, None) for e in edge_blocks]
+        idx = 0
         for edge in new_edges_sorted:
             edge_id = edge.get("id", "")
-            idx = 0
             while idx < len(existing_ids) and existing_ids[idx] < edge_id:
                 idx += 1
-            if idx == 0:
-                insert_at = edge_blocks[0].start
-            else:
-                insert_at = edge_blocks[idx - 1].end + 1
-            block = _format_edge_lines(edge)
-            new_lines[insert_at:insert_at] = block
-            for j in range(idx, len(edge_blocks)):
-                edge_blocks[j] = EdgeBlock(
-                    edge_id=edge_blocks[j].edge_id,
-                    from_id=edge_blocks[j].from_id,
-                    to_id=edge_blocks[j].to_id,
-                    direction=edge_blocks[j].direction,
-                    contract_refs=edge_blocks[j].contract_refs,
-                    start=edge_blocks[j].start + len(block),
-                    end=edge_blocks[j].end + len(block),
-                )
-            edge_blocks.insert(
-                idx,
-                EdgeBlock(
-                    edge_id=edge_id,
-                    from_id=edge.get("from", ""),
-                    to_id=edge.get("to", ""),
-                    direction=edge.get("direction", ""),
-                    contract_refs=tuple(edge.get("contract_refs", [])),
-                    start=insert_at,
-                    end=insert_at + len(block) - 1,
-                ),
-            )
+            insert_at = slots[idx - 1][1] + 1 if idx > 0 else slots[0][0]
+            slots.insert(idx, (insert_at, insert_at - 1, _format_edge_lines(edge)))
             existing_ids.insert(idx, edge_id)
+        for insert_at, _, block in slots:
+            if block is not None:
+                edits.insert(insert_at, block)
     else:
-        insert_at = _find_insert_index_after_nodes(new_lines)
+        insert_at = _find_insert_index_after_nodes(lines)
         block_lines: list[str] = []
         for edge in new_edges_sorted:
             block_lines.extend(_format_edge_lines(edge))
-        new_lines[insert_at:insert_at] = block_lines
-
-    diff = difflib.unified_diff(
-        lines,
-        new_lines,
-        fromfile=str(target_path),
-        tofile=str(target_path),
-        lineterm="",
-    )
+        edits.insert(insert_at, block_lines)
+    diff = edit_diff(edits, str(target_path), str(target_path))
     output = "\n".join(diff)
     if not output:
         print("E_PROMOTE_NO_CHANGE", file=sys.stderr)
@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -13,9 +12,10 @@ sys.path.insert(0, str(ROOT))
 
 from L1_builder.decisions_lint import parse_decisions_file
 from L1_builder.evidence_lint import validate_evidence_data
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.lint import DIRECTION_VOCAB
 from sdslv2_builder.op_yaml import load_yaml
+from sdslv2_builder.project_model import decision_table, evidence_table
 from sdslv2_builder.refs import CONTRACT_TOKEN_RE, RELID_RE
 
 PLACEHOLDERS = {"None", "TBD", "Opaque"}
@@ -35,8 +35,7 @@ def _diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _resolve_path(project_root: Path, raw: str) -> Path:
@@ -450,7 +449,7 @@ def _validate_intent_data(data: dict, path: Path) -> tuple[dict[str, object], li
     return {"scope": {"kind": scope_kind, "value": scope_value}, "intents": intents}, diags
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--decisions-path",
@@ -472,7 +471,7 @@ def main() -> int:
         default=None,
         help="Project root (defaults to repo root); inputs can be relative to it",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     decisions_path = _resolve_path(project_root, args.decisions_path)
@@ -519,7 +518,7 @@ def main() -> int:
             print("E_READINESS_EVIDENCE_NOT_STANDARD_PATH", file=sys.stderr)
             return 2
 
-    evidence_data = load_yaml(evidence_path)
+    evidence_data = load_yaml(evidence_path, frozen=True)
     _, evidence_diags = validate_evidence_data(evidence_data, decisions, project_root)
     if evidence_diags:
         _print_diags(evidence_diags)
@@ -531,10 +530,7 @@ def main() -> int:
         return 2
 
     decisions_scope = decisions.get("scope", {})
-    decisions_edges = decisions.get("edges", [])
-    decision_by_id = {
-        edge["id"]: edge for edge in decisions_edges if isinstance(edge, dict)
-    }
+    table = decision_table(decisions)
 
     intents_by_scope_id: dict[tuple[str, str, str], dict[str, object]] = {}
     for entry in intents_files:
@@ -569,8 +565,8 @@ def main() -> int:
 
     diags: list[Diagnostic] = []
 
-    evidence_map = evidence_data.get("evidence", {}) if isinstance(evidence_data, dict) else {}
-    for decision_id, edge in decision_by_id.items():
+    evidence = evidence_table(evidence_data)
+    for decision_id, row in table.unique_rows():
         scope_key = (
             decisions_scope.get("kind", ""),
             decisions_scope.get("value", ""),
@@ -587,7 +583,7 @@ def main() -> int:
                 json_pointer("edge_intents_proposed"),
             )
         else:
-            if intent.get("from") != edge.get("from") or intent.get("to") != edge.get("to"):
+            if intent.get("from") != table.from_ids[row] or intent.get("to") != table.to_ids[row]:
                 _diag(
                     diags,
                     "E_READINESS_INTENT_MISMATCH",
@@ -597,8 +593,7 @@ def main() -> int:
                     json_pointer("edge_intents_proposed"),
                 )
 
-        evidence_items = evidence_map.get(decision_id, [])
-        if not evidence_items:
+        if not evidence.has_items(decision_id):
             _diag(
                 diags,
                 "E_READINESS_EVIDENCE_MISSING",
@@ -608,24 +603,10 @@ def main() -> int:
                 json_pointer("evidence", str(decision_id)),
             )
             continue
-        contract_refs = edge.get("contract_refs", [])
-        claims = []
-        for item in evidence_items:
-            if isinstance(item, dict):
-                for claim in item.get("claims", []):
-                    if isinstance(claim, dict):
-                        claims.append(claim)
-        for ref in contract_refs:
-            if not CONTRACT_TOKEN_RE.match(str(ref)):
+        for ref in table.contract_refs[row]:
+            if not CONTRACT_TOKEN_RE.match(ref):
                 continue
-            matched = any(
-                isinstance(c, dict)
-                and c.get("kind") == "contract_ref"
-                and c.get("decision_id") == decision_id
-                and c.get("value") == ref
-                for c in claims
-            )
-            if not matched:
+            if not evidence.has_contract_claim(decision_id, ref):
                 _diag(
                     diags,
                     "E_READINESS_EVIDENCE_COVERAGE",
@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
@@ -12,7 +11,7 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import load_yaml
 
 VERSION_RE = re.compile(r"^(?P<major>\d+)\.(?P<minor>\d+)$")
@@ -23,8 +22,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _resolve_path(project_root: Path, raw: str) -> Path:
@@ -176,7 +174,7 @@ def _check_group(name: str, files: list[Path], diags: list[Diagnostic]) -> None:
             )
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--project-root",
@@ -203,7 +201,7 @@ def main() -> int:
         default="policy/exceptions.yaml",
         help="policy/exceptions.yaml path",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     diags: list[Diagnostic] = []
@@ -5,19 +5,24 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
+from sdslv2_builder.disk_cache import check_persist
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import load_yaml
-from sdslv2_builder.refs import parse_contract_ref, parse_ssot_ref
-
-ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
+from sdslv2_builder.pointer_resolver import (
+    POINTER_BAD_INDEX,
+    POINTER_MISSING,
+    POINTER_NOT_INDEXABLE,
+    POINTER_OUT_OF_RANGE,
+    PointerStatus,
+    resolve_pointers,
+)
+from sdslv2_builder.token_index import TokenIndex
 
 
 def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got: str, path: str) -> None:
@@ -25,8 +30,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _resolve_path(project_root: Path, raw: str) -> Path:
@@ -65,68 +69,13 @@ def _is_explicit_empty_registry(data: object) -> bool:
     return False
 
 
-def _parse_annotations(lines: list[str]) -> list[tuple[str, dict[str, str], int, int]]:
-    annotations: list[tuple[str, dict[str, str], int, int]] = []
-    for idx, line in enumerate(lines):
-        stripped = line.lstrip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        if not stripped.startswith("@"):
-            continue
-        match = ANNOTATION_KIND_RE.match(stripped)
-        if not match:
-            continue
-        kind = match.group("kind")
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            raise ValueError(f"E_TOKEN_REGISTRY_METADATA_MISSING: line {idx + 1}")
-        meta, end_line = _capture_metadata(lines, idx, brace_idx)
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        for key, value in pairs:
-            if key in meta_map:
-                raise ValueError(f"E_TOKEN_REGISTRY_DUPLICATE_KEY: line {idx + 1} key {key}")
-            meta_map[key] = value
-        annotations.append((kind, meta_map, idx, end_line))
-    return annotations
-
-
-def _strip_quotes(value: str | None) -> str | None:
-    if value is None:
-        return None
-    value = value.strip()
-    if len(value) >= 2 and value[0] == value[-1] == '"':
-        return value[1:-1]
-    return value
-
-
-def _extract_tokens_from_value(value: str) -> tuple[set[str], set[str]]:
-    contract_tokens: set[str] = set()
-    ssot_tokens: set[str] = set()
-    items: list[str]
-    if value.strip().startswith("[") and value.strip().endswith("]"):
-        items = _split_list_items(value)
-    else:
-        items = [value]
-    for item in items:
-        raw = _strip_quotes(item) or ""
-        contract = parse_contract_ref(raw)
-        if contract:
-            contract_tokens.add(contract.token)
-        ssot = parse_ssot_ref(raw)
-        if ssot:
-            ssot_tokens.add(ssot.token)
-    return contract_tokens, ssot_tokens
-
-
 def _collect_tokens_from_files(
+    project_root: Path,
     root: Path,
     diags: list[Diagnostic],
 ) -> tuple[set[str], set[str]]:
-    contract_tokens: set[str] = set()
-    ssot_tokens: set[str] = set()
     if not root.exists():
-        return contract_tokens, ssot_tokens
+        return set(), set()
     if root.is_symlink() or _has_symlink_parent(root, root.parent):
         _diag(
             diags,
@@ -136,7 +85,8 @@ def _collect_tokens_from_files(
             str(root),
             json_pointer(),
         )
-        return contract_tokens, ssot_tokens
+        return set(), set()
+    index = TokenIndex(project_root, persist=check_persist())
     for path in sorted(root.rglob("*.sdsl2")):
         if not path.is_file():
             continue
@@ -150,9 +100,8 @@ def _collect_tokens_from_files(
                 json_pointer(),
             )
             continue
-        text = path.read_text(encoding="utf-8")
         try:
-            annotations = _parse_annotations(text.splitlines())
+            entry = index.entry(path, path.read_text(encoding="utf-8"))
         except ValueError as exc:
             _diag(
                 diags,
@@ -163,12 +112,17 @@ def _collect_tokens_from_files(
                 path.as_posix(),
             )
             continue
-        for _, meta, _, _ in annotations:
-            for value in meta.values():
-                contract, ssot = _extract_tokens_from_value(value)
-                contract_tokens.update(contract)
-                ssot_tokens.update(ssot)
-    return contract_tokens, ssot_tokens
+        if entry.strict_error is not None:
+            _diag(
+                diags,
+                "E_TOKEN_REGISTRY_PARSE_FAILED",
+                "annotation parse failed",
+                "valid @Kind { ... } metadata",
+                f"E_TOKEN_REGISTRY_{entry.strict_error}",
+                path.as_posix(),
+            )
+    index.save()
+    return set(index.occurrences("CONTRACT.", strict=True)), set(index.occurrences("SSOT.", strict=True))
 
 
 def _extract_tokens_from_registry(data: object, prefix: str) -> set[str]:
@@ -292,189 +246,161 @@ def _decode_json_pointer(pointer: str) -> list[str] | None:
     return decoded
 
 
-def _validate_target(
-    project_root: Path,
-    token: str,
-    target: str,
-    hard_diags: list[Diagnostic],
-    soft_diags: list[Diagnostic],
-    fail_on_unresolved: bool,
-) -> None:
-    if target == "UNRESOLVED#/":
-        if fail_on_unresolved:
-            _diag(
-                hard_diags,
-                "E_TOKEN_REGISTRY_TARGET_UNRESOLVED",
-                "registry target unresolved",
-                "resolved target",
-                target,
-                json_pointer("targets", token),
-            )
-        else:
-            _diag(
-                soft_diags,
-                "E_TOKEN_REGISTRY_TARGET_UNRESOLVED",
-                "registry target unresolved",
-                "resolved target",
-                target,
-                json_pointer("targets", token),
-            )
-        return
-    if "#" not in target:
-        _diag(
-            hard_diags,
-            "E_TOKEN_REGISTRY_TARGET_INVALID",
-            "target must contain #",
-            "<path>#/<json_pointer>",
-            target,
-            json_pointer("targets", token),
-        )
-        return
-    path_part, pointer = target.split("#", 1)
-    if not path_part or path_part.startswith("/") or ".." in Path(path_part).parts:
-        _diag(
-            hard_diags,
-            "E_TOKEN_REGISTRY_TARGET_INVALID",
-            "target path must be repo-relative",
-            "repo-relative path",
-            target,
-            json_pointer("targets", token),
-        )
-        return
-    if not pointer.startswith("/"):
-        _diag(
-            hard_diags,
-            "E_TOKEN_REGISTRY_TARGET_INVALID",
-            "json_pointer must start with '/'",
-            "#/<json_pointer>",
-            target,
-            json_pointer("targets", token),
-        )
-        return
-    if not path_part.endswith(".json"):
-        _diag(
-            hard_diags,
-            "E_TOKEN_REGISTRY_TARGET_INVALID",
-            "target path must be .json",
-            "*.json",
-            target,
-            json_pointer("targets", token),
-        )
-        return
+def _load_target_document(project_root: Path, path_part: str) -> tuple[object, tuple[str, str, str, str] | None]:
     path = _resolve_path(project_root, path_part)
     try:
         _ensure_inside(project_root, path, "E_TOKEN_REGISTRY_TARGET_OUTSIDE_PROJECT")
     except ValueError as exc:
-        _diag(
-            hard_diags,
-            str(exc),
-            "target path under project_root",
-            "project_root/...",
-            str(path),
-            json_pointer("targets", token),
-        )
-        return
+        return None, (str(exc), "target path under project_root", "project_root/...", str(path))
     if path.is_symlink() or _has_symlink_parent(path, project_root):
-        _diag(
-            hard_diags,
-            "E_TOKEN_REGISTRY_TARGET_SYMLINK",
-            "target path must not be symlink",
-            "non-symlink",
-            str(path),
-            json_pointer("targets", token),
-        )
-        return
+        return None, ("E_TOKEN_REGISTRY_TARGET_SYMLINK", "target path must not be symlink", "non-symlink", str(path))
     if not path.exists():
-        _diag(
-            hard_diags,
-            "E_TOKEN_REGISTRY_TARGET_FILE_NOT_FOUND",
-            "target file not found",
-            "existing file",
-            str(path),
-            json_pointer("targets", token),
-        )
-        return
+        return None, ("E_TOKEN_REGISTRY_TARGET_FILE_NOT_FOUND", "target file not found", "existing file", str(path))
     if not path.is_file():
-        _diag(
-            hard_diags,
-            "E_TOKEN_REGISTRY_TARGET_FILE_NOT_FILE",
-            "target path must be file",
-            "file",
-            str(path),
-            json_pointer("targets", token),
-        )
-        return
+        return None, ("E_TOKEN_REGISTRY_TARGET_FILE_NOT_FILE", "target path must be file", "file", str(path))
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
+        return None, ("E_TOKEN_REGISTRY_TARGET_JSON_INVALID", "target file must be valid JSON", "valid JSON", str(exc))
+    return data, None
+
+
+def _pointer_diag(
+    diags: list[Diagnostic],
+    token: str,
+    target: str,
+    pointer: str,
+    status: PointerStatus,
+) -> None:
+    if status.code == POINTER_MISSING:
         _diag(
-            hard_diags,
-            "E_TOKEN_REGISTRY_TARGET_JSON_INVALID",
-            "target file must be valid JSON",
-            "valid JSON",
-            str(exc),
+            diags,
+            "E_TOKEN_REGISTRY_TARGET_POINTER_MISSING",
+            "json_pointer target missing",
+            pointer,
+            target,
             json_pointer("targets", token),
         )
-        return
-    segments = _decode_json_pointer(pointer)
-    if segments is None:
+    elif status.code == POINTER_BAD_INDEX:
         _diag(
-            hard_diags,
+            diags,
             "E_TOKEN_REGISTRY_TARGET_POINTER_INVALID",
-            "json_pointer invalid",
-            "#/<json_pointer>",
+            "json_pointer index invalid",
+            "integer index",
+            status.detail,
+            json_pointer("targets", token),
+        )
+    elif status.code == POINTER_OUT_OF_RANGE:
+        _diag(
+            diags,
+            "E_TOKEN_REGISTRY_TARGET_POINTER_MISSING",
+            "json_pointer index out of range",
+            pointer,
             target,
             json_pointer("targets", token),
         )
-        return
-    current: object = data
-    for segment in segments:
-        if isinstance(current, dict):
-            if segment not in current:
-                _diag(
-                    hard_diags,
-                    "E_TOKEN_REGISTRY_TARGET_POINTER_MISSING",
-                    "json_pointer target missing",
-                    pointer,
-                    target,
-                    json_pointer("targets", token),
-                )
-                return
-            current = current[segment]
-            continue
-        if isinstance(current, list):
-            if not segment.isdigit():
-                _diag(
-                    hard_diags,
-                    "E_TOKEN_REGISTRY_TARGET_POINTER_INVALID",
-                    "json_pointer index invalid",
-                    "integer index",
-                    segment,
-                    json_pointer("targets", token),
-                )
-                return
-            idx = int(segment)
-            if idx < 0 or idx >= len(current):
-                _diag(
-                    hard_diags,
-                    "E_TOKEN_REGISTRY_TARGET_POINTER_MISSING",
-                    "json_pointer index out of range",
-                    pointer,
-                    target,
-                    json_pointer("targets", token),
-                )
-                return
-            current = current[idx]
-            continue
+    elif status.code == POINTER_NOT_INDEXABLE:
         _diag(
-            hard_diags,
+            diags,
             "E_TOKEN_REGISTRY_TARGET_POINTER_INVALID",
             "json_pointer target not indexable",
             "object or list",
-            type(current).__name__,
+            status.detail,
             json_pointer("targets", token),
         )
-        return
+
+
+def _validate_targets(
+    project_root: Path,
+    entries: list[tuple[str, str]],
+    hard_diags: list[Diagnostic],
+    soft_diags: list[Diagnostic],
+    fail_on_unresolved: bool,
+) -> None:
+    slots: list[tuple[list[Diagnostic], list[Diagnostic]]] = []
+    documents: dict[str, tuple[object, tuple[str, str, str, str] | None]] = {}
+    pending: dict[str, list[tuple[int, str, str, str, list[str]]]] = {}
+    for token, target in entries:
+        hard: list[Diagnostic] = []
+        soft: list[Diagnostic] = []
+        slots.append((hard, soft))
+        if target == "UNRESOLVED#/":
+            _diag(
+                hard if fail_on_unresolved else soft,
+                "E_TOKEN_REGISTRY_TARGET_UNRESOLVED",
+                "registry target unresolved",
+                "resolved target",
+                target,
+                json_pointer("targets", token),
+            )
+            continue
+        if "#" not in target:
+            _diag(
+                hard,
+                "E_TOKEN_REGISTRY_TARGET_INVALID",
+                "target must contain #",
+                "<path>#/<json_pointer>",
+                target,
+                json_pointer("targets", token),
+            )
+            continue
+        path_part, pointer = target.split("#", 1)
+        if not path_part or path_part.startswith("/") or ".." in Path(path_part).parts:
+            _diag(
+                hard,
+                "E_TOKEN_REGISTRY_TARGET_INVALID",
+                "target path must be repo-relative",
+                "repo-relative path",
+                target,
+                json_pointer("targets", token),
+            )
+            continue
+        if not pointer.startswith("/"):
+            _diag(
+                hard,
+                "E_TOKEN_REGISTRY_TARGET_INVALID",
+                "json_pointer must start with '/'",
+                "#/<json_pointer>",
+                target,
+                json_pointer("targets", token),
+            )
+            continue
+        if not path_part.endswith(".json"):
+            _diag(
+                hard,
+                "E_TOKEN_REGISTRY_TARGET_INVALID",
+                "target path must be .json",
+                "*.json",
+                target,
+                json_pointer("targets", token),
+            )
+            continue
+        if path_part not in documents:
+            documents[path_part] = _load_target_document(project_root, path_part)
+        failure = documents[path_part][1]
+        if failure is not None:
+            _diag(hard, *failure, json_pointer("targets", token))
+            continue
+        segments = _decode_json_pointer(pointer)
+        if segments is None:
+            _diag(
+                hard,
+                "E_TOKEN_REGISTRY_TARGET_POINTER_INVALID",
+                "json_pointer invalid",
+                "#/<json_pointer>",
+                target,
+                json_pointer("targets", token),
+            )
+            continue
+        pending.setdefault(path_part, []).append((len(slots) - 1, token, target, pointer, segments))
+
+    for path_part, items in pending.items():
+        statuses = resolve_pointers(documents[path_part][0], [item[4] for item in items])
+        for (idx, token, target, pointer, _), status in zip(items, statuses):
+            _pointer_diag(slots[idx][0], token, target, pointer, status)
+    for hard, soft in slots:
+        hard_diags.extend(hard)
+        soft_diags.extend(soft)
 
 
 def _load_registry_tokens(
@@ -511,7 +437,7 @@ def _load_registry_tokens(
     return tokens, entries
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--project-root",
@@ -533,7 +459,7 @@ def main() -> int:
         action="store_true",
         help="Treat UNRESOLVED#/ targets as failure",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     ssot_registry = _resolve_path(project_root, args.ssot_registry)
@@ -559,7 +485,7 @@ def main() -> int:
     )
 
     ssot_root = project_root / "sdsl2"
-    contract_used, ssot_used = _collect_tokens_from_files(ssot_root, hard_diags)
+    contract_used, ssot_used = _collect_tokens_from_files(project_root, ssot_root, hard_diags)
 
     if not ssot_used and not ssot_tokens:
         ssot_tokens = set()
@@ -588,10 +514,13 @@ def main() -> int:
                 json_pointer("contract_tokens", token),
             )
 
-    for token, target in ssot_entries:
-        _validate_target(project_root, token, target, hard_diags, soft_diags, args.fail_on_unresolved)
-    for token, target in contract_entries:
-        _validate_target(project_root, token, target, hard_diags, soft_diags, args.fail_on_unresolved)
+    _validate_targets(
+        project_root,
+        [*ssot_entries, *contract_entries],
+        hard_diags,
+        soft_diags,
+        args.fail_on_unresolved,
+    )
 
     if hard_diags:
         _print_diags(hard_diags + soft_diags)
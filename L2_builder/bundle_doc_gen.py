@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
@@ -12,6 +11,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
+from sdslv2_builder.git_meta import GIT_MISSING, REV_EMPTY, git_head
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.op_yaml import dump_yaml, load_yaml
@@ -36,19 +36,13 @@ def _quote(value: str) -> str:
 
 
 def _git_rev(project_root: Path) -> tuple[str, str | None]:
-    try:
-        result = subprocess.run(
-            ["git", "-C", str(project_root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-        )
-    except FileNotFoundError:
+    rev, error = git_head(project_root)
+    if error == GIT_MISSING:
         return "UNKNOWN", "E_BUNDLE_DOC_SOURCE_REV_GIT_MISSING"
-    if result.returncode != 0:
-        return "UNKNOWN", "E_BUNDLE_DOC_SOURCE_REV_MISSING"
-    rev = result.stdout.strip()
-    if not rev:
+    if error == REV_EMPTY:
         return "UNKNOWN", "E_BUNDLE_DOC_SOURCE_REV_EMPTY"
+    if rev is None:
+        return "UNKNOWN", "E_BUNDLE_DOC_SOURCE_REV_MISSING"
     return rev, None
 
 
@@ -133,7 +127,7 @@ def _load_supplementary_yaml(path: Path, key: str) -> list[str]:
     return text.splitlines() if text else ["[]"]
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--context-pack", default=DEFAULT_CONTEXT, help="Context Pack path.")
     ap.add_argument("--out", default=DEFAULT_OUT, help="Bundle Doc output path.")
@@ -151,7 +145,7 @@ def main() -> int:
         help="Include decisions/edges.yaml in input_hash (default: excluded).",
     )
     ap.add_argument("--include-policy", action="store_true", help="Include policy files in input_hash.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     output_root = project_root / "OUTPUT"
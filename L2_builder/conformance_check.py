@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -13,7 +11,9 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.disk_cache import check_persist
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.git_meta import git_head
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
 from sdslv2_builder.op_yaml import load_yaml
@@ -26,19 +26,14 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _git_rev(project_root: Path) -> str:
-    result = subprocess.run(
-        ["git", "-C", str(project_root), "rev-parse", "HEAD"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
+    rev, _ = git_head(project_root)
+    if rev is None:
         raise ValueError("E_CONFORMANCE_SOURCE_REV_MISSING")
-    return result.stdout.strip()
+    return rev
 
 
 def _find_metadata_brace(lines: list[str], start_idx: int) -> tuple[int, int] | None:
@@ -92,13 +87,13 @@ def _collect_ids(lines: list[str], kind: str, diags: list[Diagnostic]) -> list[s
     return ids
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", default=DEFAULT_INPUT, help="Skeleton file path.")
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
     ap.add_argument("--no-decisions", action="store_true", help="Exclude decisions/edges.yaml from input_hash.")
     ap.add_argument("--check-source-rev", action="store_true", help="Check source_rev against git.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     output_root = project_root / "OUTPUT"
@@ -153,7 +148,11 @@ def main() -> int:
             _diag(diags, "E_CONFORMANCE_SOURCE_REV_MISMATCH", "source_rev mismatch", current, str(source_rev), json_pointer("source_rev"))
 
     try:
-        result = compute_input_hash(project_root, include_decisions=not args.no_decisions)
+        result = compute_input_hash(
+            project_root,
+            include_decisions=not args.no_decisions,
+            persist=check_persist(),
+        )
     except Exception as exc:
         print(f"E_CONFORMANCE_INPUT_HASH_FAILED:{exc}", file=sys.stderr)
         return 2
@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import argparse
-import subprocess
+from concurrent.futures import ProcessPoolExecutor
 import sys
 from pathlib import Path
 
@@ -12,11 +12,13 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.context_pack import extract_context_pack
+from sdslv2_builder.context_pack import index_error, load_topology_index, render_context_pack, resolve_target
+from sdslv2_builder.git_meta import GIT_MISSING, REV_EMPTY, git_head
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.input_hash import compute_input_hash
 
 DEFAULT_OUT = "OUTPUT/context_pack.yaml"
+DEFAULT_BATCH_DIR = "OUTPUT/context_packs"
 GENERATOR_ID = "L2_builder.context_pack_gen"
 
 
@@ -26,35 +28,85 @@ def _quote(value: str) -> str:
 
 
 def _git_rev(project_root: Path) -> tuple[str, str | None]:
-    try:
-        result = subprocess.run(
-            ["git", "-C", str(project_root), "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-        )
-    except FileNotFoundError:
+    rev, error = git_head(project_root)
+    if error == GIT_MISSING:
         return "UNKNOWN", "E_CONTEXT_PACK_SOURCE_REV_GIT_MISSING"
-    if result.returncode != 0:
-        return "UNKNOWN", "E_CONTEXT_PACK_SOURCE_REV_MISSING"
-    rev = result.stdout.strip()
-    if not rev:
+    if error == REV_EMPTY:
         return "UNKNOWN", "E_CONTEXT_PACK_SOURCE_REV_EMPTY"
+    if rev is None:
+        return "UNKNOWN", "E_CONTEXT_PACK_SOURCE_REV_MISSING"
     return rev, None
 
 
-def main() -> int:
+def _read_targets(path: Path) -> list[str]:
+    targets: list[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        item = line.strip()
+        if not item or item.startswith("#"):
+            continue
+        targets.append(item)
+    return list(dict.fromkeys(targets))
+
+
+def _render_chunk(task: tuple[str, str, list[str], int]) -> list[str]:
+    input_path, project_root, targets, hops = task
+    index = load_topology_index(Path(input_path), Path(project_root))
+    return [render_context_pack(index, target, hops) for target in targets]
+
+
+def _render_all(
+    input_path: Path,
+    project_root: Path,
+    targets: list[str],
+    hops: int,
+    jobs: int,
+) -> list[str]:
+    if jobs <= 1 or len(targets) <= 1:
+        return _render_chunk((str(input_path), str(project_root), targets, hops))
+    size = max(1, -(-len(targets) // (jobs * 4)))
+    tasks = [
+        (str(input_path), str(project_root), targets[idx : idx + size], hops)
+        for idx in range(0, len(targets), size)
+    ]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [content for chunk in pool.map(_render_chunk, tasks) for content in chunk]
+
+
+def _check_output_dir(project_root: Path, out_dir: Path) -> str | None:
+    output_root = project_root / "OUTPUT"
+    if output_root.is_symlink() or has_symlink_parent(output_root, project_root):
+        return "E_CONTEXT_PACK_OUTPUT_SYMLINK"
+    if out_dir.is_symlink() or has_symlink_parent(out_dir, project_root):
+        return "E_CONTEXT_PACK_OUTPUT_SYMLINK"
+    if out_dir.exists() and not out_dir.is_dir():
+        return "E_CONTEXT_PACK_OUTPUT_PARENT_NOT_DIR"
+    return None
+
+
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="Topology .sdsl2 file path (SSOT).")
-    ap.add_argument("--target", required=True, help="Target @Node.<RELID>.")
+    group = ap.add_mutually_exclusive_group(required=True)
+    group.add_argument("--target", help="Target @Node.<RELID>.")
+    group.add_argument(
+        "--all-targets",
+        action="store_true",
+        help="Generate a pack for every @Node in the input (written to OUTPUT/context_packs/<RELID>.yaml).",
+    )
+    group.add_argument(
+        "--targets-file",
+        help="File listing one @Node.<RELID> per line (written to OUTPUT/context_packs/<RELID>.yaml).",
+    )
     ap.add_argument("--hops", type=int, default=1, help="Neighbor hops (>=0).")
     ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (OUTPUT/context_pack.yaml) or '-' for stdout.")
+    ap.add_argument("--jobs", type=int, default=1, help="Render batch packs on N worker processes.")
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
     ap.add_argument(
         "--allow-unknown-source-rev",
         action="store_true",
         help="Allow UNKNOWN source_rev when git rev is unavailable.",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     if args.hops < 0:
@@ -91,8 +143,37 @@ def main() -> int:
         print("E_CONTEXT_PACK_INPUT_NOT_SSOT", file=sys.stderr)
         return 2
 
+    output_root = project_root / "OUTPUT"
     try:
-        content = extract_context_pack(input_path, args.target, args.hops)
+        index = load_topology_index(input_path, project_root)
+        if args.target:
+            targets = [args.target]
+        elif args.all_targets:
+            error = index_error(index)
+            if error:
+                raise ValueError(error)
+            targets = [f"@Node.{rel_id}" for rel_id in sorted(index.node_ids, key=index.canon_id)]
+        else:
+            raw_targets = Path(args.targets_file)
+            if not raw_targets.is_absolute():
+                raw_targets = project_root / raw_targets
+            if raw_targets.is_symlink() or has_symlink_parent(raw_targets, project_root):
+                print("E_CONTEXT_PACK_TARGETS_FILE_SYMLINK", file=sys.stderr)
+                return 2
+            targets_path = resolve_path(project_root, args.targets_file)
+            ensure_inside(project_root, targets_path, "E_CONTEXT_PACK_TARGETS_FILE_OUTSIDE_PROJECT")
+            if has_symlink_parent(targets_path, project_root):
+                print("E_CONTEXT_PACK_TARGETS_FILE_SYMLINK", file=sys.stderr)
+                return 2
+            if not targets_path.is_file():
+                print(f"E_CONTEXT_PACK_TARGETS_FILE_NOT_FOUND: {targets_path}", file=sys.stderr)
+                return 2
+            targets = _read_targets(targets_path)
+            if not targets:
+                print("E_CONTEXT_PACK_TARGETS_EMPTY", file=sys.stderr)
+                return 2
+        rel_ids = [index.node_ids[resolve_target(index, target)] for target in targets]
+        contents = _render_all(input_path, project_root, targets, args.hops, args.jobs)
     except ValueError as exc:
         print(str(exc), file=sys.stderr)
         return 2
@@ -129,14 +210,34 @@ def main() -> int:
         supplement_lines.append(f"  - {_quote(item)}")
     supplement = "\n".join(supplement_lines) + "\n"
 
-    content = content if content.endswith("\n") else content + "\n"
-    output = content + supplement
+    outputs = [(content if content.endswith("\n") else content + "\n") + supplement for content in contents]
 
     if args.out == "-":
-        print(output, end="")
+        print("".join(outputs), end="")
         return 0
 
-    output_root = project_root / "OUTPUT"
+    if not args.target:
+        if resolve_path(project_root, args.out) != (project_root / DEFAULT_OUT).resolve():
+            print("E_CONTEXT_PACK_OUTPUT_PATH_INVALID", file=sys.stderr)
+            return 2
+        out_dir = project_root / DEFAULT_BATCH_DIR
+        code = _check_output_dir(project_root, out_dir)
+        if code:
+            print(code, file=sys.stderr)
+            return 2
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for rel_id, output in zip(rel_ids, outputs):
+            try:
+                atomic_write_text(out_dir / f"{rel_id}.yaml", output, symlink_code="E_CONTEXT_PACK_OUTPUT_SYMLINK")
+            except ValueError as exc:
+                print(str(exc), file=sys.stderr)
+                return 2
+            except OSError as exc:
+                print(f"E_CONTEXT_PACK_WRITE_FAILED:{exc}", file=sys.stderr)
+                return 2
+        return 0
+
+    output = outputs[0]
     if output_root.is_symlink() or has_symlink_parent(output_root, project_root):
         print("E_CONTEXT_PACK_OUTPUT_SYMLINK", file=sys.stderr)
         return 2
@@ -5,19 +5,19 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
-from hashlib import sha256
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.git_meta import git_rev
+from sdslv2_builder.input_hash import hash_inputs
 from sdslv2_builder.io_atomic import atomic_write_text
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
 from sdslv2_builder.op_yaml import load_yaml
 from sdslv2_builder.refs import parse_contract_ref
+from sdslv2_builder.token_index import TokenIndex
 
 DEFAULT_EDGES = "decisions/edges.yaml"
 DEFAULT_CONTRACTS = "decisions/contracts.yaml"
@@ -30,24 +30,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
-
-
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
+    print_diagnostics(diags)
 
 
 def _ensure_inside(project_root: Path, path: Path, code: str) -> None:
@@ -68,54 +51,6 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
     return False
 
 
-def _normalize_text(text: str) -> str:
-    return text.replace("\r\n", "\n").replace("\r", "\n")
-
-
-def _rel_path(root: Path, path: Path) -> str:
-    rel = path.resolve().relative_to(root.resolve())
-    return rel.as_posix()
-
-
-def _content_hash(path: Path) -> str:
-    text = path.read_text(encoding="utf-8")
-    normalized = _normalize_text(text)
-    return sha256(normalized.encode("utf-8")).hexdigest()
-
-
-def _compute_input_hash(project_root: Path, inputs: list[Path]) -> str:
-    parts: list[str] = []
-    for path in sorted(dict.fromkeys(inputs), key=lambda p: _rel_path(project_root, p)):
-        rel = _rel_path(project_root, path)
-        digest = _content_hash(path)
-        parts.append(f"{rel}\n{digest}\n")
-    payload = "".join(parts)
-    digest = sha256(payload.encode("utf-8")).hexdigest()
-    return f"sha256:{digest}"
-
-
-def _strip_quotes(value: str) -> str:
-    raw = value.strip()
-    if len(raw) >= 2 and raw[0] == raw[-1] == '"':
-        return raw[1:-1]
-    return raw
-
-
-def _extract_tokens_from_value(value: str) -> set[str]:
-    items: list[str]
-    if value.strip().startswith("[") and value.strip().endswith("]"):
-        items = _split_list_items(value)
-    else:
-        items = [value]
-    tokens: set[str] = set()
-    for item in items:
-        raw = _strip_quotes(item)
-        ref = parse_contract_ref(raw)
-        if ref:
-            tokens.add(ref.token)
-    return tokens
-
-
 def _collect_tokens_from_edges(path: Path, diags: list[Diagnostic]) -> set[str]:
     tokens: set[str] = set()
     if not path.exists():
@@ -307,11 +242,10 @@ def _collect_tokens_from_contracts(path: Path, diags: list[Diagnostic]) -> set[s
 
 
 def _collect_tokens_from_sdsl(project_root: Path, diags: list[Diagnostic]) -> tuple[set[str], list[Path]]:
-    tokens: set[str] = set()
     inputs: list[Path] = []
     root = project_root / "sdsl2"
     if not root.exists():
-        return tokens, inputs
+        return set(), inputs
     if root.is_symlink() or _has_symlink_parent(root, project_root):
         _diag(
             diags,
@@ -321,7 +255,8 @@ def _collect_tokens_from_sdsl(project_root: Path, diags: list[Diagnostic]) -> tu
             str(root),
             json_pointer(),
         )
-        return tokens, inputs
+        return set(), inputs
+    index = TokenIndex(project_root)
     for path in sorted(root.rglob("*.sdsl2")):
         if not path.is_file():
             continue
@@ -336,7 +271,7 @@ def _collect_tokens_from_sdsl(project_root: Path, diags: list[Diagnostic]) -> tu
             )
             continue
         try:
-            lines = path.read_text(encoding="utf-8").splitlines()
+            text = path.read_text(encoding="utf-8")
         except OSError as exc:
             _diag(
                 diags,
@@ -348,29 +283,9 @@ def _collect_tokens_from_sdsl(project_root: Path, diags: list[Diagnostic]) -> tu
             )
             continue
         inputs.append(path)
-        for idx, line in enumerate(lines):
-            stripped = line.lstrip()
-            if stripped == "" or stripped.startswith("//") or not stripped.startswith("@"):
-                continue
-            brace_idx = line.find("{")
-            if brace_idx == -1:
-                continue
-            try:
-                meta, _ = _capture_metadata(lines, idx, brace_idx)
-                pairs = _parse_metadata_pairs(meta)
-            except ValueError as exc:
-                _diag(
-                    diags,
-                    "E_CONTRACT_DEF_SDSL_PARSE_FAILED",
-                    "metadata parse failed",
-                    "valid @Kind { ... } metadata",
-                    str(exc),
-                    path.as_posix(),
-                )
-                continue
-            for _, value in pairs:
-                tokens.update(_extract_tokens_from_value(value))
-    return tokens, inputs
+        index.entry(path, text)
+    index.save()
+    return set(index.occurrences("CONTRACT.")), inputs
 
 
 def _escape_pointer(segment: str) -> str:
@@ -382,7 +297,7 @@ def _write_json(path: Path, payload: dict, symlink_code: str) -> None:
     atomic_write_text(path, text, symlink_code=symlink_code)
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--project-root", default=None, help="Project root (defaults to repo root)")
     ap.add_argument("--edges", default=DEFAULT_EDGES, help="decisions/edges.yaml path")
@@ -392,7 +307,7 @@ def main() -> int:
     ap.add_argument("--schema-version", default="1.0", help="schema_version for definitions")
     ap.add_argument("--source-rev", default=None, help="Override git source_rev")
     ap.add_argument("--allow-unknown-source-rev", action="store_true", help="Allow UNKNOWN source_rev")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     output_root = project_root / "OUTPUT"
@@ -439,7 +354,7 @@ def main() -> int:
 
     source_rev = (args.source_rev or "").strip()
     if not source_rev:
-        source_rev = _git_rev(project_root)
+        source_rev = git_rev(project_root)
     if source_rev == "UNKNOWN" and not args.allow_unknown_source_rev:
         print("E_CONTRACT_DEF_SOURCE_REV_UNKNOWN", file=sys.stderr)
         return 2
@@ -467,7 +382,7 @@ def main() -> int:
         token: {"summary": "Referenced by decisions/sdsl2"} for token in tokens
     }
 
-    input_hash = _compute_input_hash(project_root, input_files)
+    input_hash = hash_inputs(project_root, input_files)
     payload = {
         "schema_version": args.schema_version,
         "source_rev": source_rev,
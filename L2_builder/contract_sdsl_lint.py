@@ -4,17 +4,18 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
+from typing import Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
+from sdslv2_builder.errors import Diagnostic, diagnostic_sink, json_pointer
+from sdslv2_builder.line_stream import LineSource, LineWindow, file_source
+from sdslv2_builder.lint import _capture_metadata_window, _parse_metadata_pairs
 from sdslv2_builder.refs import RELID_RE
 
 KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
@@ -37,11 +38,6 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
     diags.append(Diagnostic(code=code, message=message, expected=expected, got=got, path=path))
 
 
-def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
-
-
 def _strip_quotes(value: str) -> str:
     value = value.strip()
     if len(value) >= 2 and value[0] == value[-1] == '"':
@@ -92,23 +88,31 @@ def _strip_block_comments(text: str, in_block: bool) -> tuple[str, bool]:
     return "".join(out), in_block
 
 
-def _first_stmt_line(lines: list[str]) -> int | None:
-    for idx, line in enumerate(lines):
+def _file_meta(source: LineSource, diags: list[Diagnostic]) -> tuple[str | None, str | None, str | None]:
+    first_file: int | None = None
+    file_count = 0
+    first_stmt: int | None = None
+    meta = None
+    window = LineWindow(source())
+    for idx, line in window:
         stripped = line.strip()
-        if stripped == "" or stripped.startswith("//"):
+        if first_stmt is None and stripped != "" and not stripped.startswith("//"):
+            first_stmt = idx
+        if not line.lstrip().startswith("@File"):
             continue
-        return idx
-    return None
-
+        file_count += 1
+        if first_file is not None:
+            continue
+        first_file = idx
+        brace_idx = line.find("{")
+        if brace_idx != -1:
+            meta, _, _ = _capture_metadata_window(window, idx, brace_idx)
 
-def _file_meta(lines: list[str], diags: list[Diagnostic]) -> tuple[str | None, str | None, str | None]:
-    file_lines = [idx for idx, line in enumerate(lines) if line.lstrip().startswith("@File")]
-    if not file_lines:
+    if first_file is None:
         _diag(diags, "E_FILE_HEADER_MISSING", "Missing @File header", "@File", "missing", json_pointer())
         return None, None, None
 
-    first_stmt = _first_stmt_line(lines)
-    if first_stmt is not None and file_lines[0] != first_stmt:
+    if first_stmt is not None and first_file != first_stmt:
         _diag(
             diags,
             "E_FILE_HEADER_NOT_FIRST",
@@ -117,7 +121,7 @@ def _file_meta(lines: list[str], diags: list[Diagnostic]) -> tuple[str | None, s
             "later statement",
             json_pointer(),
         )
-    if len(file_lines) > 1:
+    if file_count > 1:
         _diag(
             diags,
             "E_FILE_HEADER_DUPLICATE",
@@ -127,12 +131,8 @@ def _file_meta(lines: list[str], diags: list[Diagnostic]) -> tuple[str | None, s
             json_pointer(),
         )
 
-    idx = file_lines[0]
-    line = lines[idx]
-    brace_idx = line.find("{")
-    if brace_idx == -1:
+    if meta is None:
         return None, None, None
-    meta, _ = _capture_metadata(lines, idx, brace_idx)
     pairs = _parse_metadata_pairs(meta)
     profile = None
     id_prefix = None
@@ -147,9 +147,33 @@ def _file_meta(lines: list[str], diags: list[Diagnostic]) -> tuple[str | None, s
     return profile, id_prefix, stage
 
 
-def _check_placeholders(lines: list[str], diags: list[Diagnostic]) -> None:
+def _check_kinds(source: LineSource) -> Iterator[Diagnostic]:
+    for idx, line in enumerate(source()):
+        match = KIND_RE.match(line)
+        if not match:
+            continue
+        kind = match.group("kind")
+        if kind == "EdgeIntent":
+            yield Diagnostic(
+                code="ADD_EDGEINTENT_PROFILE",
+                message="@EdgeIntent forbidden outside topology",
+                expected="no @EdgeIntent",
+                got="@EdgeIntent",
+                path=json_pointer("annotations", str(idx)),
+            )
+        if kind not in CONTRACT_KINDS:
+            yield Diagnostic(
+                code="E_PROFILE_KIND_FORBIDDEN",
+                message="Kind not allowed for contract profile",
+                expected=",".join(sorted(CONTRACT_KINDS)),
+                got=kind,
+                path=json_pointer("annotations", str(idx)),
+            )
+
+
+def _check_placeholders(source: LineSource) -> Iterator[Diagnostic]:
     in_block = False
-    for idx, line in enumerate(lines):
+    for idx, line in enumerate(source()):
         stripped = line.strip()
         if stripped == "" or stripped.startswith("//"):
             continue
@@ -160,22 +184,20 @@ def _check_placeholders(lines: list[str], diags: list[Diagnostic]) -> None:
             line = line.split("//", 1)[0]
         candidate = _strip_strings(line)
         if PLACEHOLDER_RE.search(candidate):
-            _diag(
-                diags,
-                "ADD_PLACEHOLDER_IN_SDSL",
-                "Placeholder not allowed in SDSL statements",
-                "no placeholders",
-                stripped,
-                json_pointer("statements", str(idx)),
+            yield Diagnostic(
+                code="ADD_PLACEHOLDER_IN_SDSL",
+                message="Placeholder not allowed in SDSL statements",
+                expected="no placeholders",
+                got=stripped,
+                path=json_pointer("statements", str(idx)),
             )
 
 
-def check_file(path: Path) -> list[Diagnostic]:
+def check_file(path: Path) -> Iterator[Diagnostic]:
+    source = file_source(path)
     diags: list[Diagnostic] = []
-    text = path.read_text(encoding="utf-8")
-    lines = text.splitlines()
 
-    profile, id_prefix, stage = _file_meta(lines, diags)
+    profile, id_prefix, stage = _file_meta(source, diags)
 
     if stage is not None:
         _diag(
@@ -216,32 +238,9 @@ def check_file(path: Path) -> list[Diagnostic]:
             json_pointer("file_header", "id_prefix"),
         )
 
-    for idx, line in enumerate(lines):
-        match = KIND_RE.match(line)
-        if not match:
-            continue
-        kind = match.group("kind")
-        if kind == "EdgeIntent":
-            _diag(
-                diags,
-                "ADD_EDGEINTENT_PROFILE",
-                "@EdgeIntent forbidden outside topology",
-                "no @EdgeIntent",
-                "@EdgeIntent",
-                json_pointer("annotations", str(idx)),
-            )
-        if kind not in CONTRACT_KINDS:
-            _diag(
-                diags,
-                "E_PROFILE_KIND_FORBIDDEN",
-                "Kind not allowed for contract profile",
-                ",".join(sorted(CONTRACT_KINDS)),
-                kind,
-                json_pointer("annotations", str(idx)),
-            )
-
-    _check_placeholders(lines, diags)
-    return diags
+    yield from diags
+    yield from _check_kinds(source)
+    yield from _check_placeholders(source)
 
 
 def iter_sdsl_files(path: Path, project_root: Path) -> list[Path]:
@@ -256,11 +255,11 @@ def iter_sdsl_files(path: Path, project_root: Path) -> list[Path]:
     )
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", action="append", required=True, help="File or directory path.")
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root for path resolution.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
 
@@ -294,12 +293,12 @@ def main() -> int:
             print("E_CONTRACT_LINT_INPUT_OUTSIDE_PROJECT", file=sys.stderr)
             return 2
 
-    all_diags: list[Diagnostic] = []
+    sink = diagnostic_sink()
     for path in files:
-        all_diags.extend(check_file(path))
+        sink.extend(check_file(path))
 
-    if all_diags:
-        _print_diags(all_diags)
+    if sink.total:
+        sink.close()
         return 2
     return 0
 
@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from datetime import date
@@ -15,7 +14,7 @@ sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
 from sdslv2_builder.addendum_policy import load_addendum_policy
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import load_yaml_with_duplicates
 
 INPUT_HASH_RE = re.compile(r"^sha256:[0-9a-f]{64}$")
@@ -30,8 +29,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _parse_date(value: str) -> date | None:
@@ -44,14 +42,14 @@ def _parse_date(value: str) -> date | None:
         return None
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", default="policy/exceptions.yaml", help="Exception file path.")
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
     ap.add_argument("--policy-path", default=None, help="Explicit policy path.")
     ap.add_argument("--allow-nonstandard-path", action="store_true", help="Allow non-standard exception path.")
     ap.add_argument("--today", default=None, help="Override current date (YYYY-MM-DD).")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     input_path = resolve_path(project_root, args.input)
@@ -90,7 +88,7 @@ def main() -> int:
         )
 
     try:
-        data, duplicates = load_yaml_with_duplicates(input_path, allow_duplicates=True)
+        data, duplicates = load_yaml_with_duplicates(input_path, allow_duplicates=True, frozen=True)
     except Exception as exc:
         _diag(diags, "E_EXCEPTION_PARSE_FAILED", "exceptions.yaml parse failed", "valid YAML", str(exc), json_pointer())
         _print_diags(diags)
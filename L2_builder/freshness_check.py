@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -13,7 +11,9 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.disk_cache import check_persist
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.git_meta import git_head
 from sdslv2_builder.input_hash import compute_input_hash
 
 DEFAULT_INPUT = "OUTPUT/bundle_doc.yaml"
@@ -24,19 +24,14 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _git_rev(project_root: Path) -> str:
-    result = subprocess.run(
-        ["git", "-C", str(project_root), "rev-parse", "HEAD"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
+    rev, _ = git_head(project_root)
+    if rev is None:
         raise ValueError("E_FRESHNESS_SOURCE_REV_MISSING")
-    return result.stdout.strip()
+    return rev
 
 
 def _parse_provenance(lines: list[str]) -> dict[str, object] | None:
@@ -83,7 +78,7 @@ def _parse_provenance(lines: list[str]) -> dict[str, object] | None:
     return data
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", default=DEFAULT_INPUT, help="Bundle Doc path.")
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
@@ -96,7 +91,7 @@ def main() -> int:
     ap.add_argument("--include-policy", action="store_true", help="Include policy files in input_hash.")
     ap.add_argument("--allow-missing", action="store_true", help="Return OK if bundle doc missing.")
     ap.add_argument("--check-source-rev", action="store_true", help="Check source_rev against git.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     output_root = project_root / "OUTPUT"
@@ -182,6 +177,7 @@ def main() -> int:
             include_decisions=include_decisions,
             include_policy=args.include_policy,
             extra_inputs=extra_inputs,
+            persist=check_persist(),
         )
     except Exception as exc:
         print(f"E_FRESHNESS_INPUT_HASH_FAILED:{exc}", file=sys.stderr)
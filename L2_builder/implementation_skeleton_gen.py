@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
-import subprocess
 import sys
 from pathlib import Path
 
@@ -13,7 +11,8 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.git_meta import git_head
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
 from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
@@ -24,14 +23,11 @@ GENERATOR_ID = "L2_builder.implementation_skeleton_gen"
 
 
 def _git_rev(project_root: Path) -> str:
-    result = subprocess.run(
-        ["git", "-C", str(project_root), "rev-parse", "HEAD"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
+    rev, _ = git_head(project_root)
+    if rev is None:
         raise ValueError("E_SKELETON_SOURCE_REV_MISSING")
-    return result.stdout.strip()
+    return rev
+
 
 def _diag(
     diags: list[Diagnostic],
@@ -45,8 +41,7 @@ def _diag(
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _find_metadata_brace(lines: list[str], start_idx: int) -> tuple[int, int] | None:
@@ -100,13 +95,13 @@ def _collect_ids(lines: list[str], kind: str, diags: list[Diagnostic]) -> list[s
     return ids
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
     ap.add_argument("--out", default=DEFAULT_OUT, help="Output file path.")
     ap.add_argument("--source-rev", default=None, help="Override git source_rev.")
     ap.add_argument("--no-decisions", action="store_true", help="Exclude decisions/edges.yaml from input_hash.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     output_root = project_root / "OUTPUT"
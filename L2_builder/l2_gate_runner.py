@@ -4,90 +4,152 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
-import subprocess
 import sys
 from datetime import date
 from pathlib import Path
+from typing import Callable
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, iter_diagnostics, json_pointer, print_diagnostics
+from sdslv2_builder.gate_cache import GateCache
+from sdslv2_builder.gate_exec import DiagStop, GateResult, GateSpec, diag_stop, run_gate_graph
+from sdslv2_builder.gate_profile import GateProfile
+from sdslv2_builder.gate_watch import (
+    affected_specs,
+    poll_changes,
+    reset_process_caches,
+    scope_rel,
+    snapshot,
+    watch_roots,
+)
 from sdslv2_builder.op_yaml import load_yaml
 from sdslv2_builder.policy_utils import get_gate_severity, load_policy
 
 
-def _run_gate(cmd: list[str], gate_key: str | None, policy: dict, verbose: bool, cwd: Path) -> int:
-    if verbose:
-        print("+", " ".join(cmd))
-    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
-    if proc.stdout:
-        print(proc.stdout, end="")
-    if proc.stderr:
-        print(proc.stderr, end="", file=sys.stderr)
-    if proc.returncode == 0:
-        return 0
+def _gate_outcome(result: GateResult, gate_key: str | None, policy: dict) -> tuple[int, str, str]:
+    if result.returncode == 0:
+        return 0, result.stdout, result.stderr
     severity = "FAIL" if gate_key is None else get_gate_severity(policy, gate_key)
     if severity in {"DIAG", "IGNORE"}:
-        print(f"[{severity}] {gate_key}", file=sys.stderr)
-        return 0
-    return 2
-
-
-def _run_drift_gate(cmd: list[str], policy: dict, verbose: bool, cwd: Path) -> int:
-    if verbose:
-        print("+", " ".join(cmd))
-    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
-    if proc.stdout:
-        print(proc.stdout, end="")
-    if proc.returncode == 0:
-        if proc.stderr:
-            print(proc.stderr, end="", file=sys.stderr)
-        return 0
-
-    if not proc.stderr:
-        return 2
-    try:
-        payload = json.loads(proc.stderr)
-    except json.JSONDecodeError:
-        print(proc.stderr, end="", file=sys.stderr)
-        return 2
-    if not isinstance(payload, list):
-        print(proc.stderr, end="", file=sys.stderr)
-        return 2
+        return 0, result.stdout, result.stderr + f"[{severity}] {gate_key}\n"
+    return 2, result.stdout, result.stderr
+
 
+def _allowed_drift_codes(policy: dict) -> frozenset[str]:
     drift_policy = policy.get("drift", {}) if isinstance(policy, dict) else {}
-    allow_missing = bool(drift_policy.get("allow_missing_decisions_l0")) or bool(
-        drift_policy.get("migration_window_l1")
-    )
-    allow_manual = bool(drift_policy.get("allow_manual_edges"))
-
-    for item in payload:
-        code = item.get("code") if isinstance(item, dict) else None
-        if code == "E_DRIFT_DECISION_NOT_REFLECTED":
-            if not allow_missing:
-                print(proc.stderr, end="", file=sys.stderr)
-                return 2
-            continue
-        if code == "E_DRIFT_MANUAL_EDGE":
-            if not allow_manual:
-                print(proc.stderr, end="", file=sys.stderr)
-                return 2
-            continue
-        print(proc.stderr, end="", file=sys.stderr)
-        return 2
+    allowed: set[str] = set()
+    if bool(drift_policy.get("allow_missing_decisions_l0")) or bool(drift_policy.get("migration_window_l1")):
+        allowed.add("E_DRIFT_DECISION_NOT_REFLECTED")
+    if bool(drift_policy.get("allow_manual_edges")):
+        allowed.add("E_DRIFT_MANUAL_EDGE")
+    return frozenset(allowed)
+
+
+def _drift_outcome(result: GateResult, policy: dict) -> tuple[int, str, str]:
+    if result.returncode == 0:
+        return 0, result.stdout, result.stderr
+
+    if not result.stderr or result.stopped is not None:
+        return 2, result.stdout, result.stderr
 
-    print(proc.stderr, end="", file=sys.stderr)
-    print("[DIAG] drift_check", file=sys.stderr)
+    allowed = _allowed_drift_codes(policy)
+    try:
+        for item in iter_diagnostics(result.stderr):
+            code = item.get("code") if isinstance(item, dict) else None
+            if code not in allowed:
+                return 2, result.stdout, result.stderr
+    except ValueError:
+        return 2, result.stdout, result.stderr
+
+    return 0, result.stdout, result.stderr + "[DIAG] drift_check\n"
+
+
+def _stop_rule(name: str, cmd: list[str], gate_key: str | None, policy: dict) -> DiagStop | None:
+    if name == "operational_gate":
+        return None
+    if name == "drift_check":
+        return diag_stop(cmd, _allowed_drift_codes(policy))
+    if gate_key is not None and get_gate_severity(policy, gate_key) in {"DIAG", "IGNORE"}:
+        return None
+    return diag_stop(cmd)
+
+
+def _run_gates(
+    specs: list[GateSpec],
+    gate_keys: dict[str, str | None],
+    policy: dict,
+    verbose: bool,
+    cwd: Path,
+    jobs: int,
+    isolate: bool,
+    cache: GateCache | None = None,
+    profile: GateProfile | None = None,
+) -> int:
+    def outcome(spec: GateSpec, result: GateResult) -> tuple[int, str, str]:
+        if spec.name == "drift_check":
+            return _drift_outcome(result, policy)
+        return _gate_outcome(result, gate_keys.get(spec.name), policy)
+
+    for spec, result in run_gate_graph(
+        specs,
+        cwd,
+        lambda spec, result: outcome(spec, result)[0] == 0,
+        jobs=jobs,
+        isolate=isolate,
+        cache=cache,
+        profile_dir=profile.pstats_dir if profile is not None else None,
+    ):
+        status = cache.pop_status(spec.name) if cache is not None else None
+        if verbose:
+            print("+", " ".join(spec.cmd))
+            if status:
+                print(f"[CACHE {status}] {spec.name}")
+        if profile is not None:
+            profile.record(spec.name, list(spec.cmd), spec.inputs, result, status)
+        code, stdout, stderr = outcome(spec, result)
+        if stdout:
+            print(stdout, end="")
+        if stderr:
+            print(stderr, end="", file=sys.stderr)
+        if result.stopped is not None:
+            print(f"[STOP] {spec.name}: {result.stopped}", file=sys.stderr)
+        if code != 0:
+            return 2
     return 0
 
 
+def _watch_gates(
+    specs: list[GateSpec],
+    scopes: dict[str, tuple[str, ...]],
+    base_scopes: tuple[str, ...],
+    project_root: Path,
+    interval: float,
+    run: Callable[[list[GateSpec]], int],
+) -> int:
+    roots = watch_roots(scopes, base_scopes)
+    baseline = snapshot(project_root, roots)
+    code = run(specs)
+    print(f"[WATCH] rc={code}; watching {', '.join(roots)}", file=sys.stderr)
+    try:
+        for changed in poll_changes(project_root, roots, interval, before=baseline):
+            selected = affected_specs(specs, scopes, changed, base_scopes)
+            shown = ", ".join(changed[:3]) + (f" (+{len(changed) - 3})" if len(changed) > 3 else "")
+            names = " ".join(spec.name for spec in selected)
+            print(f"[WATCH] changed {shown} -> {names or '(no gates)'}", file=sys.stderr)
+            if selected:
+                code = run(selected)
+                print(f"[WATCH] rc={code}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    return code
+
+
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
@@ -122,7 +184,7 @@ def _collect_exception_overrides(project_root: Path, today: date) -> set[str]:
     except ValueError:
         return overrides
     try:
-        data = load_yaml(exceptions_path)
+        data = load_yaml(exceptions_path, frozen=True)
     except Exception:
         return overrides
     if not isinstance(data, dict):
@@ -149,7 +211,87 @@ def _collect_exception_overrides(project_root: Path, today: date) -> set[str]:
     return overrides
 
 
-def main() -> int:
+def _check_context_args(args: argparse.Namespace, project_root: Path) -> tuple[Path | None, list[Diagnostic]]:
+    if not args.context_input or not args.context_target:
+        return None, [
+            Diagnostic(
+                code="E_L2_GATE_CONTEXT_PACK_REQUIRED",
+                message="context_input and context_target are required with --publish",
+                expected="--context-input + --context-target",
+                got="missing",
+                path=json_pointer("context"),
+            )
+        ]
+    if not isinstance(args.context_target, str) or not args.context_target.strip():
+        return None, [
+            Diagnostic(
+                code="E_L2_GATE_CONTEXT_TARGET_INVALID",
+                message="context_target must be non-empty string",
+                expected="@Node.<RELID>",
+                got=str(args.context_target),
+                path=json_pointer("context", "target"),
+            )
+        ]
+    context_input = resolve_path(project_root, args.context_input)
+    try:
+        ensure_inside(project_root, context_input, "E_L2_GATE_CONTEXT_OUTSIDE_PROJECT")
+    except ValueError:
+        return None, [
+            Diagnostic(
+                code="E_L2_GATE_CONTEXT_OUTSIDE_PROJECT",
+                message="context_input must be under project_root",
+                expected="project_root/...",
+                got=str(context_input),
+                path=json_pointer("context", "input"),
+            )
+        ]
+    topo_root = (project_root / "sdsl2" / "topology").resolve()
+    try:
+        ensure_inside(topo_root, context_input, "E_L2_GATE_CONTEXT_NOT_SSOT")
+    except ValueError:
+        return None, [
+            Diagnostic(
+                code="E_L2_GATE_CONTEXT_NOT_SSOT",
+                message="context_input must be under sdsl2/topology",
+                expected="sdsl2/topology/...",
+                got=str(context_input),
+                path=json_pointer("context", "input"),
+            )
+        ]
+    if context_input.is_symlink() or has_symlink_parent(context_input, project_root):
+        return None, [
+            Diagnostic(
+                code="E_L2_GATE_CONTEXT_INPUT_SYMLINK",
+                message="context_input must not be symlink",
+                expected="non-symlink",
+                got=str(context_input),
+                path=json_pointer("context", "input"),
+            )
+        ]
+    if not context_input.exists() or context_input.is_dir():
+        return None, [
+            Diagnostic(
+                code="E_L2_GATE_CONTEXT_INPUT_INVALID",
+                message="context_input must be an existing file",
+                expected="existing .sdsl2 file",
+                got=str(context_input),
+                path=json_pointer("context", "input"),
+            )
+        ]
+    if context_input.suffix != ".sdsl2":
+        return None, [
+            Diagnostic(
+                code="E_L2_GATE_CONTEXT_INPUT_INVALID",
+                message="context_input must be .sdsl2",
+                expected=".sdsl2",
+                got=str(context_input),
+                path=json_pointer("context", "input"),
+            )
+        ]
+    return context_input, []
+
+
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--project-root",
@@ -208,12 +350,49 @@ def main() -> int:
         default=None,
         help="Explicit policy path for gate severities",
     )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run independent gates concurrently on N worker processes",
+    )
+    ap.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each gate in a fresh subprocess instead of in-process",
+    )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run every gate instead of replaying results from OUTPUT/.gate_cache",
+    )
+    ap.add_argument(
+        "--profile",
+        action="store_true",
+        help="Dump cProfile stats per in-process gate under OUTPUT/.gate_profile",
+    )
+    ap.add_argument(
+        "--profile-summary",
+        action="store_true",
+        help="Print a per-gate timing table to stderr, slowest first",
+    )
+    ap.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running; re-run only gates whose inputs changed (mtime polling)",
+    )
+    ap.add_argument(
+        "--watch-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between change polls in --watch mode (default: 1.0)",
+    )
     ap.add_argument(
         "--verbose",
         action="store_true",
         help="Print commands",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     if args.project_root:
         raw_root = Path(args.project_root)
@@ -229,8 +408,7 @@ def main() -> int:
     policy_path = resolve_path(project_root, args.policy_path) if args.policy_path else None
     policy_result = load_policy(policy_path, project_root)
     if policy_result.diagnostics:
-        payload = [d.to_dict() for d in policy_result.diagnostics]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+        print_diagnostics(policy_result.diagnostics)
     policy = policy_result.policy
     if args.publish and not args.build_ssot:
         _print_diags(
@@ -251,6 +429,53 @@ def main() -> int:
     if today is not None:
         exception_overrides = _collect_exception_overrides(project_root, today)
 
+    base_inputs = ("policy", ".sdsl", args.policy_path) if args.policy_path else ("policy", ".sdsl")
+    cache = GateCache(project_root, enabled=not args.no_cache, base_inputs=base_inputs)
+    specs: list[GateSpec] = []
+    gate_keys: dict[str, str | None] = {}
+    watch_scopes: dict[str, tuple[str, ...]] = {}
+
+    def add_gate(
+        name: str,
+        cmd: list[str],
+        gate_key: str | None,
+        deps: tuple[str, ...] = (),
+        inputs: tuple[str, ...] = (),
+        watch: tuple[str, ...] = (),
+    ) -> None:
+        stop = _stop_rule(name, cmd, gate_key, policy)
+        specs.append(GateSpec(name=name, cmd=tuple(cmd), deps=deps, inputs=inputs, stop=stop))
+        gate_keys[name] = gate_key
+        if inputs or watch:
+            rels = [scope_rel(project_root, scope) for scope in inputs + watch]
+            watch_scopes[name] = tuple(rel for rel in rels if rel is not None)
+
+    def run_selected(selected: list[GateSpec]) -> int:
+        reset_process_caches()
+        profile = GateProfile("l2_gate_runner", project_root, pstats=args.profile)
+        try:
+            return _run_gates(
+                selected,
+                gate_keys,
+                policy,
+                args.verbose,
+                project_root,
+                args.jobs,
+                args.isolate,
+                cache,
+                profile,
+            )
+        finally:
+            profile.finish(summary=args.profile_summary)
+
+    def run_gates() -> int:
+        if not args.watch:
+            return run_selected(specs)
+        base_scopes = tuple(
+            rel for rel in (scope_rel(project_root, scope) for scope in base_inputs) if rel is not None
+        )
+        return _watch_gates(specs, watch_scopes, base_scopes, project_root, args.watch_interval, run_selected)
+
     if args.build_ssot:
         build_cmd = [
             py,
@@ -260,24 +485,27 @@ def main() -> int:
         ]
         if args.kernel_root:
             build_cmd.extend(["--kernel-root", str(kernel_root)])
-        if _run_gate(build_cmd, None, policy, args.verbose, project_root) != 0:
-            return 2
+        add_gate("build_ssot", build_cmd, None, watch=(str(kernel_root / "ssot_kernel_builder"),))
         contract_cmd = [
             py,
             str(ROOT / "L2_builder" / "contract_definitions_gen.py"),
             "--project-root",
             str(project_root),
         ]
-        if _run_gate(contract_cmd, None, policy, args.verbose, project_root) != 0:
-            return 2
+        add_gate("contract_definitions", contract_cmd, None, watch=("sdsl2", "decisions"))
         registry_cmd = [
             py,
             str(ROOT / "L2_builder" / "token_registry_gen.py"),
             "--project-root",
             str(project_root),
         ]
-        if _run_gate(registry_cmd, None, policy, args.verbose, project_root) != 0:
-            return 2
+        add_gate(
+            "token_registry",
+            registry_cmd,
+            None,
+            ("build_ssot", "contract_definitions"),
+            watch=("sdsl2",),
+        )
     elif args.publish:
         _print_diags(
             [
@@ -310,10 +538,21 @@ def main() -> int:
         l1_cmd.extend(["--policy-path", args.policy_path])
     if args.publish:
         l1_cmd.append("--fail-on-unresolved")
+    if args.isolate:
+        l1_cmd.append("--isolate")
+    if args.no_cache:
+        l1_cmd.append("--no-cache")
+    if args.profile_summary:
+        l1_cmd.append("--profile-summary")
     for gate in sorted(exception_overrides):
         l1_cmd.extend(["--exceptions-target", gate])
-    if _run_gate(l1_cmd, None, policy, args.verbose, project_root) != 0:
-        return 2
+    add_gate(
+        "operational_gate",
+        l1_cmd,
+        None,
+        ("token_registry",),
+        watch=("drafts", "decisions", "sdsl2", args.decisions_path, args.evidence_path),
+    )
 
     contract_cmd = [
         py,
@@ -323,8 +562,7 @@ def main() -> int:
         "--project-root",
         str(project_root),
     ]
-    if _run_gate(contract_cmd, "contract_sdsl", policy, args.verbose, project_root) != 0:
-        return 2
+    add_gate("contract_sdsl", contract_cmd, "contract_sdsl", inputs=("sdsl2/contract",))
 
     drift_cmd = [
         py,
@@ -336,8 +574,7 @@ def main() -> int:
     ]
     if args.allow_nonstandard_path:
         drift_cmd.append("--allow-nonstandard-path")
-    if _run_drift_gate(drift_cmd, policy, args.verbose, project_root) != 0:
-        return 2
+    add_gate("drift_check", drift_cmd, None, inputs=(args.decisions_path, "sdsl2/topology"))
 
     exception_cmd = [
         py,
@@ -347,197 +584,143 @@ def main() -> int:
         "--project-root",
         str(project_root),
     ]
-    if _run_gate(exception_cmd, "l2_exception_check", policy, args.verbose, project_root) != 0:
-        return 2
+    add_gate("exception_lint", exception_cmd, "l2_exception_check", inputs=("sdsl2",))
 
-    if args.publish:
-        source_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "ssot_kernel_source_lint.py"),
-            "--project-root",
-            str(project_root),
-        ]
-        if args.kernel_root:
-            source_cmd.extend(["--kernel-root", str(kernel_root)])
-        if _run_gate(source_cmd, "ssot_kernel_source", policy, args.verbose, project_root) != 0:
-            return 2
+    if not args.publish:
+        return run_gates()
 
-        kernel_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "ssot_kernel_lint.py"),
-            "--project-root",
-            str(project_root),
-        ]
-        if _run_gate(kernel_cmd, "ssot_kernel", policy, args.verbose, project_root) != 0:
-            return 2
+    source_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "ssot_kernel_source_lint.py"),
+        "--project-root",
+        str(project_root),
+    ]
+    if args.kernel_root:
+        source_cmd.extend(["--kernel-root", str(kernel_root)])
+    add_gate(
+        "ssot_kernel_source",
+        source_cmd,
+        "ssot_kernel_source",
+        watch=(str(kernel_root / "ssot_kernel_builder"),),
+    )
 
-        coverage_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "ssot_kernel_coverage_check.py"),
-            "--project-root",
-            str(project_root),
-        ]
-        if _run_gate(coverage_cmd, "ssot_kernel_coverage", policy, args.verbose, project_root) != 0:
-            return 2
+    kernel_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "ssot_kernel_lint.py"),
+        "--project-root",
+        str(project_root),
+    ]
+    add_gate(
+        "ssot_kernel",
+        kernel_cmd,
+        "ssot_kernel",
+        ("build_ssot",),
+        ("OUTPUT/ssot/ssot_definitions.json",),
+    )
 
-        registry_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "ssot_registry_consistency_check.py"),
-            "--project-root",
-            str(project_root),
-        ]
-        if _run_gate(registry_cmd, "ssot_registry_consistency", policy, args.verbose, project_root) != 0:
-            return 2
+    coverage_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "ssot_kernel_coverage_check.py"),
+        "--project-root",
+        str(project_root),
+    ]
+    add_gate(
+        "ssot_kernel_coverage",
+        coverage_cmd,
+        "ssot_kernel_coverage",
+        ("build_ssot",),
+        ("OUTPUT/ssot/ssot_definitions.json",),
+    )
 
-        if not args.context_input or not args.context_target:
-            _print_diags(
-                [
-                    Diagnostic(
-                        code="E_L2_GATE_CONTEXT_PACK_REQUIRED",
-                        message="context_input and context_target are required with --publish",
-                        expected="--context-input + --context-target",
-                        got="missing",
-                        path=json_pointer("context"),
-                    )
-                ]
-            )
-            return 2
-        if not isinstance(args.context_target, str) or not args.context_target.strip():
-            _print_diags(
-                [
-                    Diagnostic(
-                        code="E_L2_GATE_CONTEXT_TARGET_INVALID",
-                        message="context_target must be non-empty string",
-                        expected="@Node.<RELID>",
-                        got=str(args.context_target),
-                        path=json_pointer("context", "target"),
-                    )
-                ]
-            )
-            return 2
-        context_input = resolve_path(project_root, args.context_input)
-        try:
-            ensure_inside(project_root, context_input, "E_L2_GATE_CONTEXT_OUTSIDE_PROJECT")
-        except ValueError:
-            _print_diags(
-                [
-                    Diagnostic(
-                        code="E_L2_GATE_CONTEXT_OUTSIDE_PROJECT",
-                        message="context_input must be under project_root",
-                        expected="project_root/...",
-                        got=str(context_input),
-                        path=json_pointer("context", "input"),
-                    )
-                ]
-            )
-            return 2
-        topo_root = (project_root / "sdsl2" / "topology").resolve()
-        try:
-            ensure_inside(topo_root, context_input, "E_L2_GATE_CONTEXT_NOT_SSOT")
-        except ValueError:
-            _print_diags(
-                [
-                    Diagnostic(
-                        code="E_L2_GATE_CONTEXT_NOT_SSOT",
-                        message="context_input must be under sdsl2/topology",
-                        expected="sdsl2/topology/...",
-                        got=str(context_input),
-                        path=json_pointer("context", "input"),
-                    )
-                ]
-            )
-            return 2
-        if context_input.is_symlink() or has_symlink_parent(context_input, project_root):
-            _print_diags(
-                [
-                    Diagnostic(
-                        code="E_L2_GATE_CONTEXT_INPUT_SYMLINK",
-                        message="context_input must not be symlink",
-                        expected="non-symlink",
-                        got=str(context_input),
-                        path=json_pointer("context", "input"),
-                    )
-                ]
-            )
-            return 2
-        if not context_input.exists() or context_input.is_dir():
-            _print_diags(
-                [
-                    Diagnostic(
-                        code="E_L2_GATE_CONTEXT_INPUT_INVALID",
-                        message="context_input must be an existing file",
-                        expected="existing .sdsl2 file",
-                        got=str(context_input),
-                        path=json_pointer("context", "input"),
-                    )
-                ]
-            )
-            return 2
-        if context_input.suffix != ".sdsl2":
-            _print_diags(
-                [
-                    Diagnostic(
-                        code="E_L2_GATE_CONTEXT_INPUT_INVALID",
-                        message="context_input must be .sdsl2",
-                        expected=".sdsl2",
-                        got=str(context_input),
-                        path=json_pointer("context", "input"),
-                    )
-                ]
-            )
+    registry_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "ssot_registry_consistency_check.py"),
+        "--project-root",
+        str(project_root),
+    ]
+    add_gate(
+        "ssot_registry_consistency",
+        registry_cmd,
+        "ssot_registry_consistency",
+        ("build_ssot", "token_registry"),
+        ("OUTPUT/ssot",),
+    )
+
+    context_input, context_diags = _check_context_args(args, project_root)
+    if context_diags:
+        if args.watch:
+            _print_diags(context_diags)
             return 2
-        context_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "context_pack_gen.py"),
-            "--input",
-            str(context_input),
-            "--target",
-            str(args.context_target),
-            "--project-root",
-            str(project_root),
-        ]
-        if args.context_hops is not None:
-            context_cmd.extend(["--hops", str(args.context_hops)])
-        if _run_gate(context_cmd, None, policy, args.verbose, project_root) != 0:
+        if run_gates() != 0:
             return 2
+        _print_diags(context_diags)
+        return 2
+    context_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "context_pack_gen.py"),
+        "--input",
+        str(context_input),
+        "--target",
+        str(args.context_target),
+        "--project-root",
+        str(project_root),
+    ]
+    if args.context_hops is not None:
+        context_cmd.extend(["--hops", str(args.context_hops)])
+    add_gate("context_pack", context_cmd, None, watch=("sdsl2",))
 
-        bundle_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "bundle_doc_gen.py"),
-            "--project-root",
-            str(project_root),
-        ]
-        if _run_gate(bundle_cmd, None, policy, args.verbose, project_root) != 0:
-            return 2
+    bundle_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "bundle_doc_gen.py"),
+        "--project-root",
+        str(project_root),
+    ]
+    add_gate("bundle_doc", bundle_cmd, None, ("context_pack",), watch=("sdsl2", "decisions"))
 
-        skeleton_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "implementation_skeleton_gen.py"),
-            "--project-root",
-            str(project_root),
-        ]
-        if _run_gate(skeleton_cmd, None, policy, args.verbose, project_root) != 0:
-            return 2
+    skeleton_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "implementation_skeleton_gen.py"),
+        "--project-root",
+        str(project_root),
+    ]
+    add_gate("implementation_skeleton", skeleton_cmd, None, watch=("sdsl2",))
 
-        conformance_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "conformance_check.py"),
-            "--project-root",
-            str(project_root),
-        ]
-        if _run_gate(conformance_cmd, None, policy, args.verbose, project_root) != 0:
-            return 2
+    conformance_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "conformance_check.py"),
+        "--project-root",
+        str(project_root),
+    ]
+    add_gate(
+        "conformance",
+        conformance_cmd,
+        None,
+        ("implementation_skeleton",),
+        ("OUTPUT/implementation_skeleton.yaml", "sdsl2", "decisions"),
+    )
 
-        freshness_cmd = [
-            py,
-            str(ROOT / "L2_builder" / "freshness_check.py"),
-            "--project-root",
-            str(project_root),
-        ]
-        if _run_gate(freshness_cmd, None, policy, args.verbose, project_root) != 0:
-            return 2
+    freshness_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "freshness_check.py"),
+        "--project-root",
+        str(project_root),
+    ]
+    add_gate(
+        "freshness",
+        freshness_cmd,
+        None,
+        ("context_pack", "bundle_doc", "implementation_skeleton"),
+        (
+            "OUTPUT/bundle_doc.yaml",
+            "OUTPUT/context_pack.yaml",
+            "OUTPUT/decisions_needed.yaml",
+            "OUTPUT/diagnostics_summary.yaml",
+            "sdsl2",
+            "decisions",
+        ),
+    )
 
-    return 0
+    return run_gates()
 
 
 if __name__ == "__main__":
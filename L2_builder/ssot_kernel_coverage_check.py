@@ -12,8 +12,9 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.op_yaml import load_yaml
+from sdslv2_builder.ssot_kernel import SsotKernel, load_kernel
 
 DEFAULT_PROFILE = "policy/ssot_kernel_profile.yaml"
 DEFAULT_DEFINITIONS = "OUTPUT/ssot/ssot_definitions.json"
@@ -24,8 +25,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _decode_json_pointer(pointer: str) -> list[str] | None:
@@ -50,27 +50,10 @@ def _decode_json_pointer(pointer: str) -> list[str] | None:
     return decoded
 
 
-def _resolve_pointer(data: object, pointer: str) -> bool:
-    parts = _decode_json_pointer(pointer)
-    if parts is None:
-        return False
-    current: object = data
-    for segment in parts:
-        if isinstance(current, dict):
-            if segment not in current:
-                return False
-            current = current[segment]
-            continue
-        if isinstance(current, list):
-            if not segment.isdigit():
-                return False
-            idx = int(segment)
-            if idx < 0 or idx >= len(current):
-                return False
-            current = current[idx]
-            continue
-        return False
-    return True
+def _resolve_pointers(kernel: SsotKernel, pointers: list[str]) -> list[bool]:
+    decoded = [_decode_json_pointer(pointer) for pointer in pointers]
+    statuses = iter(kernel.resolve([parts for parts in decoded if parts is not None]))
+    return [parts is not None and next(statuses).found for parts in decoded]
 
 
 def _load_profile(project_root: Path, profile: str, diags: list[Diagnostic]) -> dict[str, object] | None:
@@ -274,12 +257,12 @@ def _load_profile(project_root: Path, profile: str, diags: list[Diagnostic]) ->
     }
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
     ap.add_argument("--profile", default=DEFAULT_PROFILE, help="Profile path.")
     ap.add_argument("--definitions", default=DEFAULT_DEFINITIONS, help="SSOT definitions JSON path.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     diags: list[Diagnostic] = []
@@ -337,7 +320,7 @@ def main() -> int:
         ])
         return 2
     try:
-        data = json.loads(raw)
+        kernel = load_kernel(project_root, raw)
     except json.JSONDecodeError as exc:
         _print_diags([
             Diagnostic(
@@ -349,29 +332,29 @@ def main() -> int:
             )
         ])
         return 2
-    if not isinstance(data, dict):
+    if not isinstance(kernel.data, dict):
         _print_diags([
             Diagnostic(
                 code="E_SSOT_COVERAGE_JSON_INVALID",
                 message="ssot_definitions.json must be JSON object",
                 expected="object",
-                got=type(data).__name__,
+                got=type(kernel.data).__name__,
                 path=json_pointer(),
             )
         ])
         return 2
 
+    checks: list[tuple[str, str, str, str]] = []
     required_paths = profile_data.get("required_paths", [])
     for idx, pointer in enumerate(required_paths):
-        if not _resolve_pointer(data, pointer):
-            _diag(
-                diags,
+        checks.append(
+            (
+                pointer,
                 "E_SSOT_COVERAGE_PATH_MISSING",
                 "required path missing in ssot_definitions",
-                pointer,
-                "missing",
                 json_pointer("required_paths", str(idx)),
             )
+        )
 
     required_artifacts = profile_data.get("required_artifacts", [])
     for item in required_artifacts:
@@ -381,15 +364,14 @@ def main() -> int:
         artifact_id = item.get("id", "")
         if not isinstance(pointer, str):
             continue
-        if not _resolve_pointer(data, pointer):
-            _diag(
-                diags,
+        checks.append(
+            (
+                pointer,
                 "E_SSOT_COVERAGE_ARTIFACT_MISSING",
                 "required artifact definition missing in ssot_definitions",
-                pointer,
-                "missing",
                 json_pointer("required_artifacts", str(artifact_id)),
             )
+        )
 
     determinism_specs = profile_data.get("determinism_specs", [])
     for item in determinism_specs:
@@ -399,15 +381,19 @@ def main() -> int:
         spec_id = item.get("id", "")
         if not isinstance(pointer, str):
             continue
-        if not _resolve_pointer(data, pointer):
-            _diag(
-                diags,
+        checks.append(
+            (
+                pointer,
                 "E_SSOT_COVERAGE_DETERMINISM_MISSING",
                 "required determinism spec missing in ssot_definitions",
-                pointer,
-                "missing",
                 json_pointer("determinism_specs", str(spec_id)),
             )
+        )
+
+    found = _resolve_pointers(kernel, [check[0] for check in checks])
+    for (pointer, code, message, path), ok in zip(checks, found):
+        if not ok:
+            _diag(diags, code, message, pointer, "missing", path)
 
     if diags:
         _print_diags(diags)
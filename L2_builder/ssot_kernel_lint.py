@@ -13,7 +13,8 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
+from sdslv2_builder.ssot_kernel import load_kernel
 
 DEFAULT_INPUT = "OUTPUT/ssot/ssot_definitions.json"
 INPUT_HASH_RE = re.compile(r"^sha256:[0-9a-f]{64}$")
@@ -24,20 +25,15 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
-def _canonical_json(data: object) -> str:
-    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")) + "\n"
-
-
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", default=DEFAULT_INPUT, help="SSOT definitions JSON path.")
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
     ap.add_argument("--allow-missing", action="store_true", help="Return OK if definitions missing.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     input_path = resolve_path(project_root, args.input)
@@ -76,7 +72,7 @@ def main() -> int:
     text = input_path.read_text(encoding="utf-8")
     normalized = text.replace("\r\n", "\n").replace("\r", "\n")
     try:
-        data = json.loads(normalized)
+        kernel = load_kernel(project_root, normalized)
     except json.JSONDecodeError as exc:
         _print_diags([
             Diagnostic(
@@ -89,6 +85,7 @@ def main() -> int:
         ])
         return 2
 
+    data = kernel.data
     diags: list[Diagnostic] = []
     if not isinstance(data, dict):
         _diag(
@@ -141,8 +138,7 @@ def main() -> int:
                 json_pointer("generator_id"),
             )
 
-    canonical = _canonical_json(data)
-    if normalized != canonical:
+    if not kernel.canonical:
         _diag(
             diags,
             "E_SSOT_KERNEL_NOT_CANONICAL",
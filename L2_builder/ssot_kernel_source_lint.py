@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
@@ -13,7 +12,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 
 DEFAULT_DEFINITIONS = "ssot_kernel_builder/ssot_definitions.ts"
 DEFAULT_RUNTIME = "ssot_kernel_builder/ssot_runtime.ts"
@@ -31,8 +30,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _strip_strings_and_comments(text: str) -> str:
@@ -248,7 +246,7 @@ def _check_runtime(text: str, diags: list[Diagnostic]) -> None:
             )
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
     ap.add_argument(
@@ -259,7 +257,7 @@ def main() -> int:
     ap.add_argument("--definitions", default=DEFAULT_DEFINITIONS, help="Definitions TS path.")
     ap.add_argument("--runtime", default=DEFAULT_RUNTIME, help="Runtime TS path.")
     ap.add_argument("--allow-missing", action="store_true", help="Return OK if inputs missing.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     if args.kernel_root:
@@ -12,8 +12,9 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from L2_builder.common import ROOT as REPO_ROOT, ensure_inside, has_symlink_parent, resolve_path
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.refs import parse_ssot_ref
+from sdslv2_builder.ssot_kernel import SsotKernel, load_kernel
 
 DEFAULT_REGISTRY = "OUTPUT/ssot/ssot_registry.json"
 DEFAULT_DEFINITIONS = "OUTPUT/ssot/ssot_definitions.json"
@@ -24,8 +25,7 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
 
 
 def _print_diags(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _decode_json_pointer(pointer: str) -> list[str] | None:
@@ -42,27 +42,10 @@ def _decode_json_pointer(pointer: str) -> list[str] | None:
     return decoded
 
 
-def _resolve_pointer(data: object, pointer: str) -> bool:
-    parts = _decode_json_pointer(pointer)
-    if parts is None:
-        return False
-    current: object = data
-    for segment in parts:
-        if isinstance(current, dict):
-            if segment not in current:
-                return False
-            current = current[segment]
-            continue
-        if isinstance(current, list):
-            if not segment.isdigit():
-                return False
-            idx = int(segment)
-            if idx < 0 or idx >= len(current):
-                return False
-            current = current[idx]
-            continue
-        return False
-    return True
+def _resolve_pointers(kernel: SsotKernel, pointers: list[str]) -> list[bool]:
+    decoded = [_decode_json_pointer(pointer) for pointer in pointers]
+    statuses = iter(kernel.resolve([parts for parts in decoded if parts is not None]))
+    return [parts is not None and next(statuses).found for parts in decoded]
 
 
 def _load_registry(data: object) -> list[tuple[str, str]]:
@@ -90,13 +73,13 @@ def _load_registry(data: object) -> list[tuple[str, str]]:
     return entries
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--project-root", default=str(REPO_ROOT), help="Project root.")
     ap.add_argument("--registry", default=DEFAULT_REGISTRY, help="SSOT registry path.")
     ap.add_argument("--definitions", default=DEFAULT_DEFINITIONS, help="SSOT definitions path.")
     ap.add_argument("--allow-missing", action="store_true", help="Return OK if inputs missing.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve()
     registry_path = resolve_path(project_root, args.registry)
@@ -164,7 +147,7 @@ def main() -> int:
         return 2
 
     try:
-        definitions_data = json.loads(definitions_path.read_text(encoding="utf-8"))
+        kernel = load_kernel(project_root, definitions_path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
         _print_diags([
             Diagnostic(
@@ -178,12 +161,15 @@ def main() -> int:
         return 2
 
     expected_path = DEFAULT_DEFINITIONS
-    diags: list[Diagnostic] = []
+    slots: list[list[Diagnostic]] = []
+    pending: list[tuple[int, str, str]] = []
     entries = _load_registry(registry_data)
     for idx, (token, target) in enumerate(entries):
+        entry_diags: list[Diagnostic] = []
+        slots.append(entry_diags)
         if not parse_ssot_ref(token):
             _diag(
-                diags,
+                entry_diags,
                 "E_SSOT_REGISTRY_TOKEN_INVALID",
                 "registry token must be SSOT.*",
                 "SSOT.*",
@@ -193,7 +179,7 @@ def main() -> int:
             continue
         if "#" not in target:
             _diag(
-                diags,
+                entry_diags,
                 "E_SSOT_REGISTRY_TARGET_INVALID",
                 "target must contain #",
                 "<path>#/<json_pointer>",
@@ -204,7 +190,7 @@ def main() -> int:
         path_part, pointer = target.split("#", 1)
         if path_part != expected_path:
             _diag(
-                diags,
+                entry_diags,
                 "E_SSOT_REGISTRY_TARGET_MISMATCH",
                 "SSOT registry target must use ssot_definitions.json",
                 expected_path,
@@ -214,7 +200,7 @@ def main() -> int:
             continue
         if not pointer.startswith("/"):
             _diag(
-                diags,
+                entry_diags,
                 "E_SSOT_REGISTRY_POINTER_INVALID",
                 "json_pointer must start with '/'",
                 "#/<json_pointer>",
@@ -222,15 +208,20 @@ def main() -> int:
                 json_pointer("entries", str(idx), "target"),
             )
             continue
-        if not _resolve_pointer(definitions_data, pointer):
+        pending.append((idx, pointer, target))
+
+    found = _resolve_pointers(kernel, [pointer for _, pointer, _ in pending])
+    for (idx, pointer, target), ok in zip(pending, found):
+        if not ok:
             _diag(
-                diags,
+                slots[idx],
                 "E_SSOT_REGISTRY_POINTER_MISSING",
                 "json_pointer target missing",
                 pointer,
                 target,
                 json_pointer("entries", str(idx), "target"),
             )
+    diags = [diag for entry_diags in slots for diag in entry_diags]
 
     if diags:
         _print_diags(diags)
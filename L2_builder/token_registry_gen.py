@@ -5,34 +5,17 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+from sdslv2_builder.git_meta import git_rev
 from sdslv2_builder.input_hash import compute_input_hash
 from sdslv2_builder.io_atomic import atomic_write_text
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
 from sdslv2_builder.op_yaml import load_yaml
-from sdslv2_builder.refs import parse_contract_ref, parse_ssot_ref
-
-
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
+from sdslv2_builder.token_index import TokenIndex
 
 
 def _resolve_path(project_root: Path, raw: str) -> Path:
@@ -58,63 +41,27 @@ def _has_symlink_parent(path: Path, stop: Path) -> bool:
     return False
 
 
-def _extract_tokens_from_value(value: str) -> tuple[set[str], set[str]]:
-    contract_tokens: set[str] = set()
-    ssot_tokens: set[str] = set()
-    items: list[str]
-    if value.strip().startswith("[") and value.strip().endswith("]"):
-        items = _split_list_items(value)
-    else:
-        items = [value]
-    for item in items:
-        raw = item.strip()
-        if len(raw) >= 2 and raw[0] == raw[-1] == '"':
-            raw = raw[1:-1]
-        contract = parse_contract_ref(raw)
-        if contract:
-            contract_tokens.add(contract.token)
-        ssot = parse_ssot_ref(raw)
-        if ssot:
-            ssot_tokens.add(ssot.token)
-    return contract_tokens, ssot_tokens
-
-
 def _collect_tokens_from_sdsl(project_root: Path) -> tuple[set[str], set[str], list[Path]]:
     ssot_root = project_root / "sdsl2"
-    contract_tokens: set[str] = set()
-    ssot_tokens: set[str] = set()
     inputs: list[Path] = []
     if not ssot_root.exists():
-        return contract_tokens, ssot_tokens, inputs
+        return set(), set(), inputs
     if ssot_root.is_symlink() or _has_symlink_parent(ssot_root, project_root):
         raise ValueError("E_REGISTRY_GEN_SSOT_SYMLINK")
+    index = TokenIndex(project_root)
     for path in sorted(ssot_root.rglob("*.sdsl2")):
         if not path.is_file():
             continue
         if path.is_symlink() or _has_symlink_parent(path, ssot_root):
             raise ValueError("E_REGISTRY_GEN_SSOT_SYMLINK")
         try:
-            lines = path.read_text(encoding="utf-8").splitlines()
+            text = path.read_text(encoding="utf-8")
         except (OSError, UnicodeDecodeError) as exc:
             raise ValueError(f"E_REGISTRY_GEN_SSOT_READ_FAILED:{exc}") from exc
         inputs.append(path)
-        for idx, line in enumerate(lines):
-            stripped = line.lstrip()
-            if stripped == "" or stripped.startswith("//") or not stripped.startswith("@"):
-                continue
-            brace_idx = line.find("{")
-            if brace_idx == -1:
-                continue
-            try:
-                meta, _ = _capture_metadata(lines, idx, brace_idx)
-            except Exception as exc:
-                raise ValueError(f"E_REGISTRY_GEN_METADATA_PARSE_FAILED:{path}:{idx + 1}:{exc}") from exc
-            pairs = _parse_metadata_pairs(meta)
-            for _, value in pairs:
-                contract, ssot = _extract_tokens_from_value(value)
-                contract_tokens.update(contract)
-                ssot_tokens.update(ssot)
-    return contract_tokens, ssot_tokens, inputs
+        index.entry(path, text)
+    index.save()
+    return set(index.occurrences("CONTRACT.")), set(index.occurrences("SSOT.")), inputs
 
 
 def _load_token_map(path: Path, prefix: str) -> dict[str, str]:
@@ -232,7 +179,7 @@ def _write_registry(
 
     payload = {
         "schema_version": "1.0",
-        "source_rev": _git_rev(project_root),
+        "source_rev": git_rev(project_root),
         "input_hash": input_hash.input_hash,
         "generator_id": generator_id,
         "entries": entries,
@@ -241,7 +188,7 @@ def _write_registry(
     atomic_write_text(path, text, symlink_code="E_REGISTRY_GEN_OUTPUT_SYMLINK")
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--project-root",
@@ -273,7 +220,7 @@ def main() -> int:
         default="OUTPUT/ssot/contract_registry.json",
         help="Output path for Contract registry (fixed under OUTPUT/ssot)",
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     output_root = project_root / "OUTPUT"
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sdslv2_builder import lint
+
+
+def _ref_capture_metadata_span(lines: list[str], start_line: int, start_col: int) -> tuple[str, int, int]:
+    depth = 0
+    in_string: str | None = None
+    escaped = False
+    out: list[str] = []
+    for li in range(start_line, len(lines)):
+        line = lines[li]
+        j = start_col if li == start_line else 0
+        while j < len(line):
+            ch = line[j]
+            if in_string is not None:
+                out.append(ch)
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == in_string:
+                    in_string = None
+                j += 1
+                continue
+            if ch in ('"', "'"):
+                in_string = ch
+                out.append(ch)
+                j += 1
+                continue
+            if ch == "/" and j + 1 < len(line) and line[j + 1] == "/":
+                break
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+            out.append(ch)
+            j += 1
+            if depth == 0:
+                return "".join(out), li, j
+        if depth > 0:
+            out.append("\n")
+    return "", start_line, start_col
+
+
+
+def _ref_parse_metadata_pairs(meta: str) -> list[tuple[str, str]]:
+    meta = meta.strip()
+    if not (meta.startswith("{") and meta.endswith("}")):
+        return []
+    inner = meta[1:-1]
+    pairs: list[tuple[str, str]] = []
+    i = 0
+    in_string: str | None = None
+    escaped = False
+    depth_brace = 0
+    depth_bracket = 0
+    depth_paren = 0
+    while i < len(inner):
+        while i < len(inner) and inner[i] in " \t\r\n,":
+            i += 1
+        if i >= len(inner):
+            break
+        key_start = i
+        while i < len(inner) and (inner[i].isalnum() or inner[i] == "_"):
+            i += 1
+        key = inner[key_start:i]
+        if not key:
+            break
+        while i < len(inner) and inner[i].isspace():
+            i += 1
+        if i >= len(inner) or inner[i] != ":":
+            break
+        i += 1
+        val_start = i
+        in_string = None
+        escaped = False
+        depth_brace = 0
+        depth_bracket = 0
+        depth_paren = 0
+        while i < len(inner):
+            ch = inner[i]
+            if in_string is not None:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == in_string:
+                    in_string = None
+                i += 1
+                continue
+            if ch in ('"', "'"):
+                in_string = ch
+                i += 1
+                continue
+            if ch == "{":
+                depth_brace += 1
+            elif ch == "}":
+                if depth_brace > 0:
+                    depth_brace -= 1
+            elif ch == "[":
+                depth_bracket += 1
+            elif ch == "]":
+                if depth_bracket > 0:
+                    depth_bracket -= 1
+            elif ch == "(":
+                depth_paren += 1
+            elif ch == ")":
+                if depth_paren > 0:
+                    depth_paren -= 1
+            if depth_brace == 0 and depth_bracket == 0 and depth_paren == 0 and ch == ",":
+                break
+            i += 1
+        value = inner[val_start:i].strip()
+        pairs.append((key, value))
+        if i < len(inner) and inner[i] == ",":
+            i += 1
+    return pairs
+
+
+def _ref_split_list_items(value: str) -> list[str]:
+    value = value.strip()
+    if not (value.startswith("[") and value.endswith("]")):
+        return []
+    inner = value[1:-1]
+    items: list[str] = []
+    i = 0
+    in_string: str | None = None
+    escaped = False
+    start = 0
+    while i < len(inner):
+        ch = inner[i]
+        if in_string is not None:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == in_string:
+                in_string = None
+            i += 1
+            continue
+        if ch in ('"', "'"):
+            in_string = ch
+            i += 1
+            continue
+        if ch == ",":
+            items.append(inner[start:i].strip())
+            i += 1
+            start = i
+            continue
+        i += 1
+    tail = inner[start:].strip()
+    if tail:
+        items.append(tail)
+    return items
+
+
+def _synthetic_lines(edges: int, refs: int) -> list[str]:
+    lines = ['@File { profile:"topology", id_prefix:"BENCH" }']
+    for idx in range(edges):
+        items = ", ".join(f'"CONTRACT.Api{idx}_{ref}"' for ref in range(refs))
+        lines.append(
+            f'@Edge {{ id:"E_{idx:05d}", from:@Node.N_{idx:05d}, to:@Node.N_{idx + 1:05d}, '
+            f'direction:"req", note:"a, \\"quoted\\" {{x}}", contract_refs:[{items}] }} // edge {idx}'
+        )
+    return lines
+
+
+def _fixture_lines() -> list[list[str]]:
+    return [
+        path.read_text(encoding="utf-8").splitlines()
+        for path in sorted((ROOT / "tests" / "goldens").rglob("*.sdsl2"))
+    ]
+
+
+def _workload(lines: list[str]) -> list[tuple[int, int]]:
+    return [(idx, line.find("{")) for idx, line in enumerate(lines) if line.lstrip().startswith("@") and "{" in line]
+
+
+def _run(impl: dict, corpus: list[tuple[list[str], list[tuple[int, int]]]]) -> list:
+    results = []
+    for lines, starts in corpus:
+        for idx, col in starts:
+            meta, end_line, end_col = impl["capture"](lines, idx, col)
+            pairs = impl["pairs"](meta)
+            items = [impl["items"](value) for _, value in pairs if value.startswith("[")]
+            results.append((meta, end_line, end_col, pairs, items))
+    return results
+
+
+def _time(impl: dict, corpus: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run(impl, corpus)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--edges", type=int, default=2000, help="Synthetic @Edge blocks (default: 2000).")
+    ap.add_argument("--refs", type=int, default=40, help="contract_refs per edge (default: 40).")
+    ap.add_argument("--repeat", type=int, default=5, help="Timing repetitions; best is reported (default: 5).")
+    args = ap.parse_args()
+    if args.edges < 0 or args.refs < 0 or args.repeat < 1:
+        print("E_BENCH_ARGS_INVALID", file=sys.stderr)
+        return 2
+
+    reference = {
+        "capture": _ref_capture_metadata_span,
+        "pairs": _ref_parse_metadata_pairs,
+        "items": _ref_split_list_items,
+    }
+    current = {
+        "capture": lint._capture_metadata_span,
+        "pairs": lint._parse_metadata_pairs,
+        "items": lint._split_list_items,
+    }
+    report: dict[str, dict] = {}
+    corpora = {
+        "goldens": [(lines, _workload(lines)) for lines in _fixture_lines()],
+        "synthetic": [(lines, _workload(lines)) for lines in [_synthetic_lines(args.edges, args.refs)]],
+    }
+    for name, corpus in corpora.items():
+        if _run(reference, corpus) != _run(current, corpus):
+            print(f"E_BENCH_RESULT_MISMATCH: {name}", file=sys.stderr)
+            return 2
+        ref_s = _time(reference, corpus, args.repeat)
+        cur_s = _time(current, corpus, args.repeat)
+        report[name] = {
+            "blocks": sum(len(starts) for _, starts in corpus),
+            "reference_s": round(ref_s, 6),
+            "current_s": round(cur_s, 6),
+            "speedup": round(ref_s / cur_s, 2) if cur_s else None,
+        }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
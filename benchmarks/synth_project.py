@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from hashlib import sha1, sha256
+import json
+import random
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sdslv2_builder.evidence_hash import hash_lines
+from sdslv2_builder.op_yaml import dump_yaml, load_yaml
+
+TEMPLATE_ROOT = ROOT / "project_testing"
+TEMPLATE_FILES = [
+    ".sdsl/policy.yaml",
+    "policy/resolution_profile.yaml",
+    "policy/ssot_kernel_profile.yaml",
+]
+CONTRACT_PROFILE_REL = "policy/contract_resolution_profile.yaml"
+TOPOLOGY_ID = "P0_T_BENCH"
+TOPOLOGY_REL = f"sdsl2/topology/{TOPOLOGY_ID}.sdsl2"
+EVIDENCE_LINES_PER_DOC = 2000
+DIRECTIONS = ["req", "rep", "pub", "sub", "call", "rw"]
+CHANNELS = ["sync_call", "async_event", "data_read", "data_write", "file_transfer"]
+NODE_KINDS = ["service", "component", "job", "db", "queue"]
+
+
+@dataclass(frozen=True)
+class Scale:
+    nodes: int
+    edges: int
+    contracts: int
+
+
+SCALES = {
+    "small": Scale(nodes=100, edges=300, contracts=4),
+    "medium": Scale(nodes=1000, edges=3000, contracts=16),
+    "large": Scale(nodes=10000, edges=30000, contracts=64),
+}
+
+
+@dataclass(frozen=True)
+class SynthEdge:
+    edge_id: str
+    from_id: str
+    to_id: str
+    direction: str
+    channel: str
+    token: str
+
+
+def node_id(idx: int) -> str:
+    return f"NODE_{idx:06d}"
+
+
+def _token(idx: int) -> str:
+    return f"BENCH_{idx:06d}"
+
+
+def _edges(scale: Scale, rng: random.Random) -> list[SynthEdge]:
+    tokens = max(1, scale.edges // 2)
+    seen: set[tuple[int, int, str]] = set()
+    edges: list[SynthEdge] = []
+    for idx in range(scale.edges):
+        while True:
+            src = idx % scale.nodes if idx < scale.nodes else rng.randrange(scale.nodes)
+            dst = rng.randrange(scale.nodes - 1)
+            if dst >= src:
+                dst += 1
+            direction = rng.choice(DIRECTIONS)
+            if (src, dst, direction) not in seen:
+                break
+        seen.add((src, dst, direction))
+        edges.append(
+            SynthEdge(
+                edge_id=f"EDGE_{idx:06d}",
+                from_id=node_id(src),
+                to_id=node_id(dst),
+                direction=direction,
+                channel=rng.choice(CHANNELS),
+                token=_token(idx % tokens),
+            )
+        )
+    return edges
+
+
+def _topology(scale: Scale, edges: list[SynthEdge]) -> str:
+    lines = [f'@File {{ profile:"topology", id_prefix:"{TOPOLOGY_ID}", stage:"L1" }}']
+    for idx in range(scale.nodes):
+        rel_id = node_id(idx)
+        kind = NODE_KINDS[idx % len(NODE_KINDS)]
+        lines.append(
+            f'@Node {{ id:"{rel_id}", kind:"{kind}", summary:"Synthetic node {idx}", io:"http:{rel_id.lower()}"}}'
+        )
+    for edge in edges:
+        lines.extend(
+            [
+                "@Edge {",
+                f'  id:"{edge.edge_id}",',
+                f"  from:@Node.{edge.from_id},",
+                f"  to:@Node.{edge.to_id},",
+                f'  direction:"{edge.direction}",',
+                "  contract_refs:[",
+                f'    "CONTRACT.{edge.token}",',
+                "  ],",
+                f'  channel:"{edge.channel}",',
+                "}",
+            ]
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _contract(index: int, tokens: list[str]) -> str:
+    lines = [
+        f'@File {{ profile:"contract", id_prefix:"P0_C_BENCH_{index:03d}" }}',
+        '@Interface { id:"API" }',
+        "interface API {",
+        "}",
+    ]
+    for token in tokens:
+        lines.append(f'@Type {{ id:"{token}", contract:["CONTRACT.{token}"] }}')
+        lines.append(f'type {token} = "UNSPECIFIED"')
+    if index == 0:
+        lines.extend(
+            [
+                '@Type { id:"ERROR_CODE" }',
+                'type ERROR_CODE = "UNSPECIFIED"',
+                '@Type { id:"RETRY_POLICY" }',
+                'type RETRY_POLICY = "UNSPECIFIED"',
+            ]
+        )
+    lines.extend(
+        [
+            "",
+            "@Rule {",
+            '  id:"AUTHZ_API",',
+            "  bind:@Interface.API,",
+            f'  contract:["CONTRACT.{tokens[0]}"],',
+            "}",
+            "@Rule {",
+            '  id:"COMPENSATION_API",',
+            "  bind:@Interface.API,",
+            f'  contract:["CONTRACT.{tokens[0]}"],',
+            "}",
+        ]
+    )
+    for token in tokens:
+        lines.extend(
+            [
+                "@Rule {",
+                f'  id:"INVARIANT_{token}",',
+                f"  bind:@Type.{token},",
+                f'  contract:["CONTRACT.{token}"],',
+                "}",
+            ]
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _evidence_docs(edges: list[SynthEdge]) -> dict[str, list[str]]:
+    docs: dict[str, list[str]] = {}
+    for idx, edge in enumerate(edges):
+        rel = f"docs/bench_evidence_{idx * 3 // EVIDENCE_LINES_PER_DOC:04d}.md"
+        lines = docs.setdefault(rel, [])
+        lines.extend(
+            [
+                f"## {edge.edge_id}",
+                f"{edge.from_id} sends {edge.direction} over {edge.channel} to {edge.to_id}.",
+                "",
+            ]
+        )
+    return docs
+
+
+def _evidence(edges: list[SynthEdge], docs: dict[str, list[str]], source_rev: str, input_hash: str) -> dict:
+    evidence: dict[str, list[dict]] = {}
+    offsets: dict[str, int] = {}
+    for idx, edge in enumerate(edges):
+        rel = f"docs/bench_evidence_{idx * 3 // EVIDENCE_LINES_PER_DOC:04d}.md"
+        start = offsets.get(rel, 0) + 1
+        offsets[rel] = start + 2
+        evidence[edge.edge_id] = [
+            {
+                "source_path": rel,
+                "locator": f"L{start}-L{start + 1}",
+                "content_hash": hash_lines(docs[rel], start, start + 1),
+                "claims": [
+                    {"kind": "edge", "decision_id": edge.edge_id},
+                    {"kind": "contract_ref", "decision_id": edge.edge_id, "value": f"CONTRACT.{edge.token}"},
+                ],
+            }
+        ]
+    return {
+        "schema_version": "1.0",
+        "source_rev": source_rev,
+        "input_hash": input_hash,
+        "scope": {"kind": "file", "value": TOPOLOGY_REL},
+        "evidence": evidence,
+    }
+
+
+def _decisions(edges: list[SynthEdge], source_rev: str, input_hash: str) -> dict:
+    return {
+        "schema_version": "1.0",
+        "provenance": {
+            "author": "BENCH",
+            "reviewed_by": "BENCH",
+            "source_link": f"gen:synth_project;rev:{source_rev};input:{input_hash}",
+        },
+        "scope": {"kind": "file", "value": TOPOLOGY_REL},
+        "edges": [
+            {
+                "id": edge.edge_id,
+                "from": edge.from_id,
+                "to": edge.to_id,
+                "direction": edge.direction,
+                "contract_refs": [f"CONTRACT.{edge.token}"],
+            }
+            for edge in edges
+        ],
+    }
+
+
+def _intent(scale: Scale, edges: list[SynthEdge], source_rev: str, input_hash: str) -> dict:
+    return {
+        "schema_version": "1.0",
+        "source_rev": source_rev,
+        "input_hash": input_hash,
+        "generator_id": "synth_project",
+        "scope": {"kind": "file", "value": TOPOLOGY_REL},
+        "nodes_proposed": [
+            {"id": node_id(idx), "kind": NODE_KINDS[idx % len(NODE_KINDS)]} for idx in range(scale.nodes)
+        ],
+        "edge_intents_proposed": [
+            {
+                "id": edge.edge_id,
+                "from": edge.from_id,
+                "to": edge.to_id,
+                "direction": edge.direction,
+                "channel": edge.channel,
+            }
+            for edge in edges
+        ],
+        "questions": [],
+        "conflicts": [],
+    }
+
+
+def _write(root: Path, rel: str, text: str) -> None:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def generate_project(root: Path, scale: Scale, seed: int = 0) -> dict[str, int]:
+    if scale.nodes < 2 or scale.edges < 1 or scale.contracts < 1:
+        raise ValueError("E_BENCH_SCALE_INVALID")
+    if scale.edges > scale.nodes * (scale.nodes - 1) * len(DIRECTIONS) // 2:
+        raise ValueError("E_BENCH_SCALE_INVALID: too many edges for node count")
+    if root.exists() and any(root.iterdir()):
+        raise ValueError(f"E_BENCH_OUT_DIR_NOT_EMPTY: {root}")
+    rng = random.Random(seed)
+    edges = _edges(scale, rng)
+    params = {"nodes": scale.nodes, "edges": scale.edges, "contracts": scale.contracts, "seed": seed}
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    source_rev = sha1(canonical.encode("utf-8")).hexdigest()
+    input_hash = "sha256:" + sha256(canonical.encode("utf-8")).hexdigest()
+
+    for rel in TEMPLATE_FILES:
+        target = root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(TEMPLATE_ROOT / rel, target)
+    profile = load_yaml(TEMPLATE_ROOT / CONTRACT_PROFILE_REL)
+    profile.pop("required_declarations", None)
+    _write(root, CONTRACT_PROFILE_REL, dump_yaml(profile))
+    (root / "OUTPUT").mkdir(parents=True, exist_ok=True)
+
+    _write(root, TOPOLOGY_REL, _topology(scale, edges))
+    tokens = sorted({edge.token for edge in edges})
+    contracts = min(scale.contracts, len(tokens))
+    for index in range(contracts):
+        chunk = tokens[index::contracts]
+        _write(root, f"sdsl2/contract/P0_C_BENCH_{index:03d}.sdsl2", _contract(index, chunk))
+
+    docs = _evidence_docs(edges)
+    for rel, lines in docs.items():
+        _write(root, rel, "\n".join(lines))
+    _write(root, "decisions/edges.yaml", dump_yaml(_decisions(edges, source_rev, input_hash)))
+    _write(root, "decisions/evidence.yaml", dump_yaml(_evidence(edges, docs, source_rev, input_hash)))
+    _write(
+        root,
+        f"drafts/intent/{TOPOLOGY_ID}_intent.yaml",
+        dump_yaml(_intent(scale, edges, source_rev, input_hash)),
+    )
+    return {**params, "contracts": contracts, "tokens": len(tokens), "docs": len(docs)}
+
+
+def init_git(root: Path) -> None:
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "bench",
+        "GIT_AUTHOR_EMAIL": "bench@example.invalid",
+        "GIT_AUTHOR_DATE": "2000-01-01T00:00:00Z",
+        "GIT_COMMITTER_NAME": "bench",
+        "GIT_COMMITTER_EMAIL": "bench@example.invalid",
+        "GIT_COMMITTER_DATE": "2000-01-01T00:00:00Z",
+    }
+    for cmd in (
+        ["git", "init", "-q", "."],
+        ["git", "add", "-A"],
+        ["git", "-c", "commit.gpgsign=false", "commit", "-q", "-m", "synthetic project"],
+    ):
+        proc = subprocess.run(cmd, cwd=root, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise ValueError(f"E_BENCH_GIT_FAILED: {' '.join(cmd)}: {proc.stderr.strip()}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out-dir", required=True, help="Empty directory for the generated project.")
+    ap.add_argument("--scale", choices=sorted(SCALES), default="small", help="Preset size (default: small).")
+    ap.add_argument("--nodes", type=int, default=None, help="Override node count.")
+    ap.add_argument("--edges", type=int, default=None, help="Override edge count.")
+    ap.add_argument("--contracts", type=int, default=None, help="Override contract file count.")
+    ap.add_argument("--seed", type=int, default=0, help="RNG seed (default: 0).")
+    ap.add_argument("--git", action="store_true", help="Commit the project into a new git repo (needed by L2 gates).")
+    args = ap.parse_args()
+
+    preset = SCALES[args.scale]
+    scale = Scale(
+        nodes=preset.nodes if args.nodes is None else args.nodes,
+        edges=preset.edges if args.edges is None else args.edges,
+        contracts=preset.contracts if args.contracts is None else args.contracts,
+    )
+    try:
+        root = Path(args.out_dir).resolve()
+        summary = generate_project(root, scale, args.seed)
+        if args.git:
+            init_git(root)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
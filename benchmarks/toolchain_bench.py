@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synth_project import SCALES, TOPOLOGY_REL, generate_project, init_git, node_id
+from sdslv2_builder import context_pack, sdsl_ast
+from sdslv2_builder.context_pack import extract_context_pack
+from sdslv2_builder.git_meta import git_rev
+from sdslv2_builder.input_hash import CACHE_ENV, compute_input_hash
+from sdslv2_builder.lint import lint_text
+from sdslv2_builder.op_yaml import clear_parse_cache, load_yaml
+
+REPORT_VERSION = "toolchain-bench-v1"
+TODAY = "2026-01-01"
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _run_cli(cmd: list[str]) -> None:
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        detail = (proc.stderr or proc.stdout).strip().splitlines()
+        raise ValueError(f"E_BENCH_RESULT_MISMATCH: {Path(cmd[1]).name} rc={proc.returncode}: {detail[:1]}")
+
+
+def _bench_scale(project: Path, repeat: int) -> dict[str, float]:
+    py = sys.executable
+    topology = project / TOPOLOGY_REL
+    topology_text = topology.read_text(encoding="utf-8")
+    target = f"@Node.{node_id(0)}"
+    timings: dict[str, float] = {}
+
+    if lint_text(topology_text, topology):
+        raise ValueError("E_BENCH_RESULT_MISMATCH: lint_text diagnostics")
+    timings["lint_text"] = _best(lambda: lint_text(topology_text, topology), repeat)
+
+    prev_mode = os.environ.get(CACHE_ENV)
+    os.environ[CACHE_ENV] = "off"
+    try:
+        timings["compute_input_hash_uncached"] = _best(
+            lambda: compute_input_hash(project, include_policy=True), repeat
+        )
+    finally:
+        if prev_mode is None:
+            os.environ.pop(CACHE_ENV, None)
+        else:
+            os.environ[CACHE_ENV] = prev_mode
+    compute_input_hash(project, include_policy=True)
+    timings["compute_input_hash_cached"] = _best(lambda: compute_input_hash(project, include_policy=True), repeat)
+
+    if f"@Node.{node_id(0)}" not in extract_context_pack(topology, target):
+        raise ValueError("E_BENCH_RESULT_MISMATCH: context pack target")
+
+    def pack_cold() -> None:
+        context_pack._INDEX_CACHE.clear()
+        sdsl_ast.clear_cache()
+        extract_context_pack(topology, target)
+
+    timings["extract_context_pack_cold"] = _best(pack_cold, repeat)
+    timings["extract_context_pack_cached"] = _best(lambda: extract_context_pack(topology, target), repeat)
+
+    yaml_paths = [project / "decisions" / "edges.yaml", project / "decisions" / "evidence.yaml"]
+
+    def load_cold() -> None:
+        clear_parse_cache()
+        for path in yaml_paths:
+            load_yaml(path, frozen=True)
+
+    timings["load_yaml_cold"] = _best(load_cold, repeat)
+
+    l2_cmd = [
+        py,
+        str(ROOT / "L2_builder" / "l2_gate_runner.py"),
+        "--project-root",
+        str(project),
+        "--kernel-root",
+        str(ROOT),
+        "--today",
+        TODAY,
+        "--build-ssot",
+        "--publish",
+        "--context-input",
+        TOPOLOGY_REL,
+        "--context-target",
+        target,
+        "--no-cache",
+    ]
+    timings["l2_gate_runner"] = _best(lambda: _run_cli(l2_cmd), repeat)
+    op_cmd = [
+        py,
+        str(ROOT / "L1_builder" / "operational_gate.py"),
+        "--project-root",
+        str(project),
+        "--today",
+        TODAY,
+        "--no-cache",
+    ]
+    timings["operational_gate"] = _best(lambda: _run_cli(op_cmd), repeat)
+    return {name: round(value, 6) for name, value in timings.items()}
+
+
+def _compare(report: dict, baseline: dict) -> dict[str, dict[str, float]]:
+    compare: dict[str, dict[str, float]] = {}
+    for scale, entry in report["scales"].items():
+        base_entry = baseline.get("scales", {}).get(scale)
+        if not isinstance(base_entry, dict) or base_entry.get("params") != entry["params"]:
+            continue
+        ratios: dict[str, float] = {}
+        for name, value in entry["timings"].items():
+            base_value = base_entry.get("timings", {}).get(name)
+            if isinstance(base_value, (int, float)) and base_value > 0:
+                ratios[name] = round(value / base_value, 3)
+        compare[scale] = ratios
+    return compare
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", default="small,medium", help="Comma-separated presets (small,medium,large).")
+    ap.add_argument("--repeat", type=int, default=3, help="Timing repetitions; best is reported (default: 3).")
+    ap.add_argument("--seed", type=int, default=0, help="Synthetic project seed (default: 0).")
+    ap.add_argument("--out", default=None, help="Also write the JSON report to this path.")
+    ap.add_argument("--baseline", default=None, help="Earlier report; adds current/baseline ratios.")
+    args = ap.parse_args()
+
+    scales = [name.strip() for name in args.scales.split(",") if name.strip()]
+    if args.repeat < 1 or not scales or any(name not in SCALES for name in scales):
+        print("E_BENCH_ARGS_INVALID", file=sys.stderr)
+        return 2
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"E_BENCH_BASELINE_INVALID: {exc}", file=sys.stderr)
+            return 2
+        if not isinstance(baseline, dict) or baseline.get("version") != REPORT_VERSION:
+            print("E_BENCH_BASELINE_INVALID: version", file=sys.stderr)
+            return 2
+
+    report: dict = {
+        "version": REPORT_VERSION,
+        "toolchain_rev": git_rev(ROOT),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "scales": {},
+    }
+    for name in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp) / "project"
+            try:
+                params = generate_project(project, SCALES[name], args.seed)
+                init_git(project)
+                timings = _bench_scale(project, args.repeat)
+            except ValueError as exc:
+                print(str(exc), file=sys.stderr)
+                return 2
+        report["scales"][name] = {"params": params, "timings": timings}
+    if baseline is not None:
+        report["compare"] = _compare(report, baseline)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
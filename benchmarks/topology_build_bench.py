@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sdslv2_builder.io_atomic import atomic_write_chunks
+from sdslv2_builder.ledger import load_ledger, validate_ledger
+from sdslv2_builder.topology import build_topology_model
+from sdslv2_builder.writer import iter_topology, write_topology
+
+DIRECTIONS = ["pub", "sub", "req", "rep", "rw", "call"]
+
+
+def _ledger_text(nodes: int, edges: int) -> str:
+    lines = [
+        "version: topology-ledger-v0.1",
+        'schema_revision: "1"',
+        "file_header:",
+        "  profile: topology",
+        "  id_prefix: P0_T_BENCH",
+        "nodes:",
+    ]
+    for idx in range(nodes):
+        lines.extend([f"  - id: NODE_{idx:06d}", "    kind: component"])
+    lines.append("edges:")
+    for idx in range(edges):
+        src = (idx * 7919) % nodes
+        dst = (idx // nodes + src + 1) % nodes
+        lines.extend(
+            [
+                f"  - from: NODE_{src:06d}",
+                f"    to: NODE_{dst:06d}",
+                f"    direction: {DIRECTIONS[idx % len(DIRECTIONS)]}",
+                "    contract_refs:",
+                f"      - CONTRACT.Api{idx % 97}",
+                f"      - CONTRACT.Evt{idx:06d}",
+            ]
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", type=int, default=2000, help="Ledger nodes (default: 2000).")
+    ap.add_argument("--edges", type=int, default=100000, help="Ledger edges (default: 100000).")
+    args = ap.parse_args()
+    if args.nodes < 2 or args.edges < 0:
+        print("E_BENCH_ARGS_INVALID", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger_path = Path(tmp) / "topology_ledger.yaml"
+        ledger_path.write_text(_ledger_text(args.nodes, args.edges), encoding="utf-8")
+        output_root = Path(tmp) / "OUTPUT"
+        output_root.mkdir()
+
+        data, load_s = _timed(lambda: load_ledger(ledger_path))
+        (topology_input, diagnostics), validate_s = _timed(lambda: validate_ledger(data, output_root))
+        del data
+        if diagnostics or topology_input is None:
+            print("E_BENCH_RESULT_MISMATCH: ledger diagnostics", file=sys.stderr)
+            return 2
+        model, model_s = _timed(lambda: build_topology_model(topology_input))
+        del topology_input
+
+        out_path = output_root / "topology.sdsl2"
+        _, stream_s = _timed(lambda: atomic_write_chunks(out_path, iter_topology(model)))
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+
+        legacy = sorted(model.edges, key=lambda e: (e.from_id, e.to_id, e.direction, tuple(e.contract_refs)))
+        keyed = sorted(model.edges, key=lambda e: e.sort_key)
+        if [e.edge_id for e in legacy] != [e.edge_id for e in keyed]:
+            print("E_BENCH_RESULT_MISMATCH: edge order", file=sys.stderr)
+            return 2
+        text, join_s = _timed(lambda: write_topology(model))
+        if out_path.read_text(encoding="utf-8") != text:
+            print("E_BENCH_RESULT_MISMATCH: streamed output", file=sys.stderr)
+            return 2
+        size = out_path.stat().st_size
+
+    report = {
+        "nodes": args.nodes,
+        "edges": args.edges,
+        "output_bytes": size,
+        "load_s": round(load_s, 6),
+        "validate_s": round(validate_s, 6),
+        "model_s": round(model_s, 6),
+        "stream_write_s": round(stream_s, 6),
+        "string_write_s": round(join_s, 6),
+        "peak_rss_mb_before_string": peak_mb,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
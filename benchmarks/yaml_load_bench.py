@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+from copy import deepcopy
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sdslv2_builder.op_yaml import clear_parse_cache, dump_yaml, load_yaml, load_yaml_with_duplicates
+
+
+def _decisions(edges: int) -> dict[str, object]:
+    return {
+        "schema_version": "1.0",
+        "provenance": {
+            "author": "BENCH",
+            "reviewed_by": "BENCH",
+            "source_link": "gen:yaml_load_bench",
+        },
+        "scope": {"kind": "file", "value": "sdsl2/topology/BENCH.sdsl2"},
+        "edges": [
+            {
+                "id": f"E_{idx:06d}",
+                "from": f"N_{idx:06d}",
+                "to": f"N_{idx + 1:06d}",
+                "direction": "req",
+                "contract_refs": [f"CONTRACT.API_{idx:06d}", f"CONTRACT.EVT_{idx:06d}"],
+            }
+            for idx in range(edges)
+        ],
+    }
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--edges", type=int, default=50000, help="EdgeDecision entries (default: 50000).")
+    ap.add_argument("--repeat", type=int, default=3, help="Timing repetitions; best is reported (default: 3).")
+    args = ap.parse_args()
+    if args.edges < 0 or args.repeat < 1:
+        print("E_BENCH_ARGS_INVALID", file=sys.stderr)
+        return 2
+
+    source = _decisions(args.edges)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "edges.yaml"
+        path.write_text(dump_yaml(source), encoding="utf-8")
+
+        def cold() -> None:
+            clear_parse_cache()
+            load_yaml_with_duplicates(path, allow_duplicates=True, frozen=True)
+
+        if load_yaml(path) != source:
+            print("E_BENCH_RESULT_MISMATCH: edges.yaml", file=sys.stderr)
+            return 2
+        cold_s = _best(cold, args.repeat)
+        cold()
+        frozen_s = _best(lambda: load_yaml(path, frozen=True), args.repeat)
+        mutable_s = _best(lambda: load_yaml(path), args.repeat)
+        tree = load_yaml(path)
+        deepcopy_s = _best(lambda: deepcopy(tree), args.repeat)
+        size = path.stat().st_size
+
+    report = {
+        "edges": args.edges,
+        "bytes": size,
+        "cold_parse_s": round(cold_s, 6),
+        "cached_frozen_s": round(frozen_s, 6),
+        "cached_mutable_s": round(mutable_s, 6),
+        "deepcopy_s": round(deepcopy_s, 6),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
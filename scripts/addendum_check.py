@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
@@ -13,7 +12,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from sdslv2_builder.addendum_policy import load_addendum_policy
-from sdslv2_builder.errors import Diagnostic, json_pointer
+from sdslv2_builder.errors import Diagnostic, json_pointer, print_diagnostics
 from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
 from sdslv2_builder.refs import RELID_RE, parse_internal_ref
 
@@ -467,8 +466,7 @@ def main() -> int:
 
     kept, failed = _filter_by_severity(diags, policy_result.policy)
     if kept:
-        payload = [d.to_dict() for d in kept]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+        print_diagnostics(kept)
     return 2 if failed else 0
 
 
@@ -12,6 +12,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from sdslv2_builder.addendum_policy import load_addendum_policy
+from sdslv2_builder.errors import print_diagnostics
 
 
 FAIL_CODES = {
@@ -30,8 +31,7 @@ def main() -> int:
     result = load_addendum_policy(policy_path, ROOT)
 
     if result.diagnostics:
-        payload = [d.to_dict() for d in result.diagnostics]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+        print_diagnostics(result.diagnostics)
 
     print(json.dumps(result.policy, ensure_ascii=False, indent=2))
 
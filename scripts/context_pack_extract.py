@@ -10,25 +10,49 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.context_pack import extract_context_pack
+from sdslv2_builder.context_pack import extract_all_context_packs, extract_context_pack
 
 
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="Topology .sdsl2 file.")
-    ap.add_argument("--target", required=True, help="Target @Node.<RELID>.")
+    group = ap.add_mutually_exclusive_group(required=True)
+    group.add_argument("--target", help="Target @Node.<RELID>.")
+    group.add_argument("--all-targets", action="store_true", help="Extract one pack per @Node in the file.")
     ap.add_argument("--hops", type=int, default=1, help="Neighbor hops (default: 1).")
     ap.add_argument("--output", help="Output file path (optional).")
+    ap.add_argument("--output-dir", help="Write <RELID>.txt per node (with --all-targets).")
+    ap.add_argument("--index-dir", help="Directory for serialized topology indexes (optional).")
     args = ap.parse_args()
     if args.hops < 0:
         print("E_CONTEXT_PACK_HOPS_INVALID", file=sys.stderr)
         return 2
-
-    try:
-        content = extract_context_pack(Path(args.input), args.target, args.hops)
-    except ValueError as exc:
-        print(str(exc), file=sys.stderr)
+    if args.output_dir and not args.all_targets:
+        print("E_CONTEXT_PACK_OUTPUT_DIR_REQUIRES_ALL_TARGETS", file=sys.stderr)
         return 2
+    index_dir = Path(args.index_dir) if args.index_dir else None
+    if index_dir is not None:
+        index_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.all_targets:
+        try:
+            packs = extract_all_context_packs(Path(args.input), args.hops, index_dir)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            return 2
+        if args.output_dir:
+            out_dir = Path(args.output_dir)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for rel_id, content in packs:
+                (out_dir / f"{rel_id}.txt").write_text(content, encoding="utf-8")
+            return 0
+        content = "".join(content for _, content in packs)
+    else:
+        try:
+            content = extract_context_pack(Path(args.input), args.target, args.hops, index_dir)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            return 2
 
     if args.output:
         Path(args.output).write_text(content, encoding="utf-8")
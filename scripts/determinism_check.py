@@ -4,31 +4,30 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
+import io
+from itertools import repeat
 import json
-import shutil
-import subprocess
 import sys
+import tempfile
+import traceback
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+from scripts.contract_builder_check import CASES as CONTRACT_FAILURE_CASES
+from scripts.contract_golden_check import CASES as CONTRACT_GOLDEN_CASES
+from sdslv2_builder.errors import BuilderError, Diagnostic
+from sdslv2_builder.lint import iter_sdsl_files, lint_file, lint_text
+from sdslv2_builder.run import build_from_ledger
 
 
 def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
-def run_cmd(cmd: list[str]) -> subprocess.CompletedProcess[str]:
-    print("+", " ".join(cmd))
-    return subprocess.run(cmd, capture_output=True, text=True)
-
-
 def load_manifest(path: Path) -> dict:
     if not path.exists():
         raise SystemExit(f"MANIFEST_NOT_FOUND: {path}")
@@ -103,12 +102,199 @@ def ensure_output_root(project_root: Path) -> Path:
     return output_root
 
 
-def cleanup_output_root(output_root: Path) -> None:
-    if output_root.exists():
-        shutil.rmtree(output_root)
+def _diag_text(diags: list[Diagnostic]) -> str:
+    payload = [diag.to_dict() for diag in diags]
+    return json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+
+
+def _failure_text() -> str:
+    stream = io.StringIO()
+    traceback.print_exc(file=stream)
+    return stream.getvalue()
+
+
+def run_contract_case(name: str) -> tuple[int, str]:
+    handler = CONTRACT_FAILURE_CASES.get(name)
+    if handler is None:
+        return 2, f"UNKNOWN_CASE: {name}\n"
+    try:
+        handler()
+    except BuilderError as err:
+        payload = [err.diagnostic.to_dict()]
+        return 2, json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+    except Exception:
+        return 1, _failure_text()
+    return 0, ""
+
+
+def render_contract(name: str) -> tuple[int, str, str]:
+    builder = CONTRACT_GOLDEN_CASES.get(name)
+    if builder is None:
+        return 2, f"UNKNOWN_CASE: {name}\n", ""
+    try:
+        return 0, builder(), ""
+    except Exception:
+        return 1, "", _failure_text()
+
 
+def render_ledger(ledger: Path, output_root: Path) -> tuple[int, str, Path | None, str | None]:
+    try:
+        output_path, text, diagnostics = build_from_ledger(ledger, output_root)
+    except Exception:
+        return 1, _failure_text(), None, None
+    if diagnostics:
+        return 2, _diag_text(diagnostics), None, None
+    if output_path is None or text is None:
+        return 2, "E_LEDGER_SCHEMA_INVALID: no topology input\n", None, None
+    return 0, "", output_path, text
+
+
+def lint_input(path: Path) -> tuple[int, str]:
+    files = iter_sdsl_files(path)
+    if not files:
+        return 2, "E_INPUT_NOT_FOUND: no .sdsl2 files\n"
+    diags: list[Diagnostic] = []
+    for file_path in files:
+        diags.extend(lint_file(file_path))
+    return (2, _diag_text(diags)) if diags else (0, "")
+
+
+def lint_output(output_path: Path, text: str) -> tuple[int, str]:
+    diags = lint_text(text, output_path)
+    return (2, _diag_text(diags)) if diags else (0, "")
+
+
+def _fail(lines: list[str], message: str, stderr: str = "") -> tuple[list[str], bool]:
+    lines.append(message)
+    if stderr.strip():
+        lines.append(stderr.strip())
+    return lines, False
+
+
+def _diags_match(stderr: str, diag_golden: Path | None) -> bool:
+    if not diag_golden:
+        return True
+    got = normalize_diags(load_diags_from_text(stderr))
+    expected = normalize_diags(load_diags_from_file(diag_golden))
+    return got == expected
+
+
+def run_case(case: dict, project_root: Path, output_root: Path) -> tuple[list[str], bool]:
+    lines: list[str] = []
+    expect = case.get("expect")
+    ledger = resolve_path(case.get("ledger", ""), project_root) if case.get("ledger") else None
+    output = resolve_path(case.get("output", ""), project_root) if case.get("output") else None
+    golden = resolve_path(case.get("golden", ""), project_root) if case.get("golden") else None
+    input_path = resolve_path(case.get("input", ""), project_root) if case.get("input") else None
+    contract_case = case.get("contract_case")
+
+    if expect:
+        phase = expect.get("phase", "run")
+        expected_code = int(expect.get("exit_code", 2))
+        diag_golden = expect.get("diagnostics_golden")
+        if diag_golden:
+            diag_golden = resolve_path(diag_golden, project_root)
+
+        if phase == "contract":
+            if not contract_case:
+                return _fail(lines, "[FAIL] contract_case missing")
+            code, stderr = run_contract_case(str(contract_case))
+            if code != expected_code:
+                return _fail(lines, f"[FAIL] contract exit code {code} != {expected_code}: {contract_case}", stderr)
+            if not _diags_match(stderr, diag_golden):
+                return _fail(lines, f"[FAIL] diagnostics mismatch: {contract_case}")
+            lines.append(f"[OK] {contract_case} (expected failure)")
+            return lines, True
+
+        if phase == "contract_success":
+            if golden is None or not golden.exists():
+                return _fail(lines, f"[FAIL] golden not found: {golden}")
+            if not golden.is_file():
+                return _fail(lines, f"[FAIL] golden is not a file: {golden}")
+            case_name = str(contract_case) if contract_case else "FULL"
+            code, first, stderr = render_contract(case_name)
+            if code != 0:
+                return _fail(lines, "[FAIL] contract success run failed", stderr)
+            code, second, stderr = render_contract(case_name)
+            if code != 0:
+                return _fail(lines, "[FAIL] contract success re-run failed", stderr)
+            if first != second:
+                return _fail(lines, "[FAIL] contract output non-deterministic")
+            if first.encode("utf-8") != golden.read_bytes():
+                return _fail(lines, f"[FAIL] contract output differs from golden: {golden}")
+            lines.append("[OK] contract golden (deterministic)")
+            return lines, True
+
+        if phase == "lint":
+            if input_path is None or not input_path.exists():
+                return _fail(lines, f"[FAIL] lint input not found: {input_path}")
+            code, stderr = lint_input(input_path)
+            if code != expected_code:
+                return _fail(lines, f"[FAIL] lint exit code {code} != {expected_code}: {input_path}", stderr)
+            if not _diags_match(stderr, diag_golden):
+                return _fail(lines, f"[FAIL] diagnostics mismatch: {input_path}")
+            lines.append(f"[OK] {input_path.name} (expected failure)")
+            return lines, True
 
-def main() -> int:
+        if ledger is None or not ledger.exists():
+            return _fail(lines, f"[FAIL] ledger not found: {ledger}")
+        with tempfile.TemporaryDirectory() as tmp:
+            work_root = Path(tmp) / "OUTPUT"
+            work_root.mkdir()
+            code, stderr, output_path, text = render_ledger(ledger, work_root)
+            if phase == "run":
+                if code != expected_code:
+                    return _fail(lines, f"[FAIL] run exit code {code} != {expected_code}: {ledger}", stderr)
+                if not _diags_match(stderr, diag_golden):
+                    return _fail(lines, f"[FAIL] diagnostics mismatch: {ledger}")
+                lines.append(f"[OK] {ledger.name} (expected failure)")
+                return lines, True
+            if code != 0 or output_path is None or text is None:
+                return _fail(lines, f"[FAIL] run failed unexpectedly: {ledger}", stderr)
+            code, stderr = lint_output(output_path, text)
+        if code != expected_code:
+            return _fail(lines, f"[FAIL] lint exit code {code} != {expected_code}: {ledger}", stderr)
+        if not _diags_match(stderr, diag_golden):
+            return _fail(lines, f"[FAIL] diagnostics mismatch: {ledger}")
+        lines.append(f"[OK] {ledger.name} (expected failure)")
+        return lines, True
+
+    if ledger is None or not ledger.exists():
+        return _fail(lines, f"[FAIL] ledger not found: {ledger}")
+    if golden is None or not golden.exists():
+        return _fail(lines, f"[FAIL] golden not found: {golden}")
+    if not golden.is_file():
+        return _fail(lines, f"[FAIL] golden is not a file: {golden}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_root = Path(tmp) / "OUTPUT"
+        work_root.mkdir()
+        code, stderr, output_path, first = render_ledger(ledger, work_root)
+        if code != 0 or output_path is None or first is None:
+            return _fail(lines, f"[FAIL] run failed: {ledger}", stderr)
+        code, stderr = lint_output(output_path, first)
+        if code != 0:
+            return _fail(lines, f"[FAIL] lint failed: {ledger}", stderr)
+        if output is None:
+            return _fail(lines, "[FAIL] output not configured for case")
+        try:
+            rel = output.resolve().relative_to(output_root)
+        except ValueError:
+            return _fail(lines, f"[FAIL] output must be under OUTPUT: {output}")
+        if output_path.resolve() != (work_root / rel).resolve():
+            return _fail(lines, f"[FAIL] output not found: {output}")
+        code, stderr, _, second = render_ledger(ledger, work_root)
+    if code != 0 or second is None:
+        return _fail(lines, f"[FAIL] re-run failed: {ledger}", stderr)
+    if sha256_text(first) != sha256_text(second):
+        return _fail(lines, f"[FAIL] non-deterministic output: {output}")
+    if first.encode("utf-8") != golden.read_bytes():
+        return _fail(lines, f"[FAIL] output differs from golden: {output}")
+    lines.append(f"[OK] {ledger.name}")
+    return lines, True
+
+
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--manifest",
@@ -120,7 +306,8 @@ def main() -> int:
         action="store_true",
         help="Exit 0 when no cases are configured.",
     )
-    args = ap.parse_args()
+    ap.add_argument("--jobs", type=int, default=1, help="Run cases in N worker processes.")
+    args = ap.parse_args(argv)
 
     manifest_path = Path(args.manifest)
     if not manifest_path.is_absolute():
@@ -138,250 +325,18 @@ def main() -> int:
         return 0 if args.allow_empty else 2
 
     failures = 0
-    py = sys.executable
-
-    for case in cases:
-        expect = case.get("expect")
-        ledger = resolve_path(case.get("ledger", ""), project_root) if case.get("ledger") else None
-        output = resolve_path(case.get("output", ""), project_root) if case.get("output") else None
-        golden = resolve_path(case.get("golden", ""), project_root) if case.get("golden") else None
-        input_path = resolve_path(case.get("input", ""), project_root) if case.get("input") else None
-        contract_case = case.get("contract_case")
-
-        if expect:
-            phase = expect.get("phase", "run")
-            expected_code = int(expect.get("exit_code", 2))
-            diag_golden = expect.get("diagnostics_golden")
-            if diag_golden:
-                diag_golden = resolve_path(diag_golden, project_root)
-
-            if phase == "contract":
-                if not contract_case:
-                    print("[FAIL] contract_case missing")
-                    failures += 1
-                    continue
-                contract_res = run_cmd([py, "scripts/contract_builder_check.py", "--case", str(contract_case)])
-                if contract_res.returncode != expected_code:
-                    print(f"[FAIL] contract exit code {contract_res.returncode} != {expected_code}: {contract_case}")
-                    if contract_res.stderr:
-                        print(contract_res.stderr.strip())
-                    failures += 1
-                    continue
-                if diag_golden:
-                    got = normalize_diags(load_diags_from_text(contract_res.stderr))
-                    expected = normalize_diags(load_diags_from_file(diag_golden))
-                    if got != expected:
-                        print(f"[FAIL] diagnostics mismatch: {contract_case}")
-                        failures += 1
-                        continue
-                print(f"[OK] {contract_case} (expected failure)")
-                continue
-
-            if phase == "contract_success":
-                if golden is None or not golden.exists():
-                    print(f"[FAIL] golden not found: {golden}")
-                    failures += 1
-                    continue
-                if not golden.is_file():
-                    print(f"[FAIL] golden is not a file: {golden}")
-                    failures += 1
-                    continue
-
-                case_name = str(contract_case) if contract_case else "FULL"
-                first = run_cmd(
-                    [
-                        py,
-                        "scripts/contract_golden_check.py",
-                        "--emit-stdout",
-                        "--case",
-                        case_name,
-                        "--golden",
-                        str(golden),
-                    ]
-                )
-                if first.returncode != 0:
-                    print("[FAIL] contract success run failed")
-                    if first.stderr:
-                        print(first.stderr.strip())
-                    failures += 1
-                    continue
-
-                second = run_cmd(
-                    [
-                        py,
-                        "scripts/contract_golden_check.py",
-                        "--emit-stdout",
-                        "--case",
-                        case_name,
-                        "--golden",
-                        str(golden),
-                    ]
-                )
-                if second.returncode != 0:
-                    print("[FAIL] contract success re-run failed")
-                    if second.stderr:
-                        print(second.stderr.strip())
-                    failures += 1
-                    continue
-
-                first_hash = sha256_text(first.stdout)
-                second_hash = sha256_text(second.stdout)
-                if first_hash != second_hash:
-                    print("[FAIL] contract output non-deterministic")
-                    failures += 1
-                    continue
-
-                if first.stdout.encode("utf-8") != golden.read_bytes():
-                    print(f"[FAIL] contract output differs from golden: {golden}")
-                    failures += 1
-                    continue
-                print("[OK] contract golden (deterministic)")
-                continue
-
-            if phase == "lint":
-                if input_path is None or not input_path.exists():
-                    print(f"[FAIL] lint input not found: {input_path}")
-                    failures += 1
-                    continue
-                lint_res = run_cmd([py, "-m", "sdslv2_builder.lint", "--input", str(input_path)])
-                if lint_res.returncode != expected_code:
-                    print(f"[FAIL] lint exit code {lint_res.returncode} != {expected_code}: {input_path}")
-                    if lint_res.stderr:
-                        print(lint_res.stderr.strip())
-                    failures += 1
-                    continue
-                if diag_golden:
-                    got = normalize_diags(load_diags_from_text(lint_res.stderr))
-                    expected = normalize_diags(load_diags_from_file(diag_golden))
-                    if got != expected:
-                        print(f"[FAIL] diagnostics mismatch: {input_path}")
-                        failures += 1
-                        continue
-                print(f"[OK] {input_path.name} (expected failure)")
-                continue
-
-            if ledger is None or not ledger.exists():
-                print(f"[FAIL] ledger not found: {ledger}")
-                failures += 1
-                continue
-
-            if output is not None:
-                cleanup_output_root(output_root)
-
-            run_res = run_cmd(
-                [py, "-m", "sdslv2_builder.run", "--ledger", str(ledger), "--out-dir", str(output_root)]
-            )
-            if phase == "run":
-                if run_res.returncode != expected_code:
-                    print(f"[FAIL] run exit code {run_res.returncode} != {expected_code}: {ledger}")
-                    if run_res.stderr:
-                        print(run_res.stderr.strip())
-                    failures += 1
-                    continue
-                if diag_golden:
-                    got = normalize_diags(load_diags_from_text(run_res.stderr))
-                    expected = normalize_diags(load_diags_from_file(diag_golden))
-                    if got != expected:
-                        print(f"[FAIL] diagnostics mismatch: {ledger}")
-                        failures += 1
-                        continue
-                print(f"[OK] {ledger.name} (expected failure)")
-                continue
-
-            if run_res.returncode != 0:
-                print(f"[FAIL] run failed unexpectedly: {ledger}")
-                if run_res.stderr:
-                    print(run_res.stderr.strip())
-                failures += 1
-                continue
-
-            lint_res = run_cmd([py, "-m", "sdslv2_builder.lint", "--input", str(output_root)])
-            if lint_res.returncode != expected_code:
-                print(f"[FAIL] lint exit code {lint_res.returncode} != {expected_code}: {ledger}")
-                if lint_res.stderr:
-                    print(lint_res.stderr.strip())
+    jobs = min(max(1, args.jobs), len(cases))
+    roots = (repeat(project_root), repeat(output_root))
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        outcomes = pool.map(run_case, cases, *roots) if pool is not None else map(run_case, cases, *roots)
+        for lines, ok in outcomes:
+            print("\n".join(lines))
+            if not ok:
                 failures += 1
-                continue
-            if diag_golden:
-                got = normalize_diags(load_diags_from_text(lint_res.stderr))
-                expected = normalize_diags(load_diags_from_file(diag_golden))
-                if got != expected:
-                    print(f"[FAIL] diagnostics mismatch: {ledger}")
-                    failures += 1
-                    continue
-            print(f"[OK] {ledger.name} (expected failure)")
-            continue
-
-        if ledger is None or not ledger.exists():
-            print(f"[FAIL] ledger not found: {ledger}")
-            failures += 1
-            continue
-        if golden is None or not golden.exists():
-            print(f"[FAIL] golden not found: {golden}")
-            failures += 1
-            continue
-        if not golden.is_file():
-            print(f"[FAIL] golden is not a file: {golden}")
-            failures += 1
-            continue
-
-        cleanup_output_root(output_root)
-
-        run_res = run_cmd([py, "-m", "sdslv2_builder.run", "--ledger", str(ledger), "--out-dir", str(output_root)])
-        if run_res.returncode != 0:
-            print(f"[FAIL] run failed: {ledger}")
-            if run_res.stderr:
-                print(run_res.stderr.strip())
-            failures += 1
-            continue
-
-        lint_res = run_cmd([py, "-m", "sdslv2_builder.lint", "--input", str(output_root)])
-        if lint_res.returncode != 0:
-            print(f"[FAIL] lint failed: {ledger}")
-            if lint_res.stderr:
-                print(lint_res.stderr.strip())
-            failures += 1
-            continue
-
-        if output is None:
-            print("[FAIL] output not configured for case")
-            failures += 1
-            continue
-        try:
-            output.resolve().relative_to(output_root)
-        except ValueError:
-            print(f"[FAIL] output must be under OUTPUT: {output}")
-            failures += 1
-            continue
-        if not output.exists():
-            print(f"[FAIL] output not found: {output}")
-            failures += 1
-            continue
-        if not output.is_file():
-            print(f"[FAIL] output is not a file: {output}")
-            failures += 1
-            continue
-
-        first_hash = sha256_file(output)
-        run_res = run_cmd([py, "-m", "sdslv2_builder.run", "--ledger", str(ledger), "--out-dir", "OUTPUT"])
-        if run_res.returncode != 0:
-            print(f"[FAIL] re-run failed: {ledger}")
-            if run_res.stderr:
-                print(run_res.stderr.strip())
-            failures += 1
-            continue
-        second_hash = sha256_file(output)
-        if first_hash != second_hash:
-            print(f"[FAIL] non-deterministic output: {output}")
-            failures += 1
-            continue
-
-        if output.read_bytes() != golden.read_bytes():
-            print(f"[FAIL] output differs from golden: {output}")
-            failures += 1
-            continue
-
-        print(f"[OK] {ledger.name}")
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
 
     return 2 if failures else 0
 
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+CODE_RE = re.compile(r'"code":\s*"([^"]+)"')
+SOFT_CODE = "E_TOKEN_REGISTRY_TARGET_UNRESOLVED"
+FORMATS = ("json", "ndjson")
+
+
+def _make_project(source: Path, dest: Path) -> None:
+    shutil.copytree(source, dest, ignore=shutil.ignore_patterns(".gate_cache", ".ssot_kernel"))
+    registry = dest / "OUTPUT" / "ssot" / "contract_registry.json"
+    data = json.loads(registry.read_text(encoding="utf-8"))
+    data["entries"][0]["target"] = "UNRESOLVED#/"
+    registry.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def _run(cmd: list[str], fmt: str) -> tuple[int, list[str], str]:
+    env = dict(os.environ)
+    env["SDSL_DIAG_FORMAT"] = fmt
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, env=env)
+    output = proc.stdout + proc.stderr
+    return proc.returncode, sorted(CODE_RE.findall(output)), output
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--project", default="project_testing", help="Project copied and given a soft diagnostic.")
+    ap.add_argument("--today", required=True, help="YYYY-MM-DD for exception_lint.")
+    args = ap.parse_args()
+
+    source = (ROOT / args.project).resolve()
+    if not source.is_dir():
+        raise SystemExit(f"PROJECT_NOT_FOUND: {source}")
+
+    runners = {
+        "operational_gate": [str(ROOT / "L1_builder" / "operational_gate.py")],
+        "l2_gate_runner": [str(ROOT / "L2_builder" / "l2_gate_runner.py"), "--kernel-root", str(ROOT)],
+    }
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, script in runners.items():
+            results: dict[str, tuple[int, list[str], str]] = {}
+            for fmt in FORMATS:
+                project = Path(tmp) / f"{name}_{fmt}"
+                _make_project(source, project)
+                cmd = [sys.executable, *script, "--project-root", str(project), "--today", args.today, "--no-cache"]
+                results[fmt] = _run(cmd, fmt)
+            for fmt, (returncode, codes, output) in results.items():
+                if SOFT_CODE not in codes:
+                    errors.append(f"{name} ({fmt}): {SOFT_CODE} not reported")
+                if "[STOP]" in output:
+                    errors.append(f"{name} ({fmt}): stopped on a soft diagnostic")
+            (json_rc, json_codes, _), (ndjson_rc, ndjson_codes, _) = results["json"], results["ndjson"]
+            if json_rc != ndjson_rc:
+                errors.append(f"{name}: rc {json_rc} (json) != {ndjson_rc} (ndjson)")
+            if json_codes != ndjson_codes:
+                errors.append(f"{name}: codes {json_codes} (json) != {ndjson_codes} (ndjson)")
+
+    if errors:
+        for error in errors:
+            print(f"[FAIL] {error}", file=sys.stderr)
+        return 1
+    print(f"[OK] json and ndjson diagnostics give the same gate results ({len(runners)} runners)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
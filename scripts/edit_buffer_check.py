@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sdslv2_builder.edit_buffer import EditBuffer
+
+Spec = tuple[int, int, object]
+
+
+def expected(base: str | list[str], specs: list[Spec]) -> str | list[str] | None:
+    ranges = [(start, end) for start, end, _ in specs]
+    for idx, (start, end) in enumerate(ranges):
+        for other_start, other_end in ranges[idx + 1 :]:
+            if max(start, other_start) < min(end, other_end):
+                return None
+            if start < other_start < end or other_start < start < other_end:
+                return None
+    result = list(base) if isinstance(base, list) else base
+    order = sorted(range(len(specs)), key=lambda idx: (specs[idx][0], specs[idx][1], idx))
+    for idx in reversed(order):
+        start, end, value = specs[idx]
+        if isinstance(result, list):
+            result[start:end] = list(value)
+        else:
+            result = result[:start] + value + result[end:]
+    return result
+
+
+def check_case(label: str, base: str | list[str], specs: list[Spec]) -> bool:
+    edits = EditBuffer(base)
+    for start, end, value in specs:
+        edits.replace(start, end, value)
+    want = expected(base, specs)
+    try:
+        got = edits.render()
+    except ValueError as exc:
+        if want is None and str(exc).startswith("E_EDIT_CONFLICT"):
+            return True
+        print(f"[FAIL] {label}: unexpected {exc}", file=sys.stderr)
+        return False
+    if want is None:
+        print(f"[FAIL] {label}: overlapping edits rendered without E_EDIT_CONFLICT", file=sys.stderr)
+        return False
+    if got != want:
+        print(f"[FAIL] {label}: render differs", file=sys.stderr)
+        print(f"  base={base!r} edits={specs!r}", file=sys.stderr)
+        return False
+    return True
+
+
+def check_errors() -> bool:
+    ok = True
+    cases = [
+        ("range", lambda: EditBuffer(["a"]).replace(1, 2, ["b"]), "E_EDIT_RANGE_INVALID"),
+        ("reversed range", lambda: EditBuffer("abc").replace(2, 1, ""), "E_EDIT_RANGE_INVALID"),
+        ("text value", lambda: EditBuffer("abc").replace(0, 1, ["x"]), "E_EDIT_VALUE_INVALID"),
+        ("line value", lambda: EditBuffer(["a"]).insert(0, "x"), "E_EDIT_VALUE_INVALID"),
+    ]
+    for label, action, code in cases:
+        try:
+            action()
+        except ValueError as exc:
+            if str(exc).startswith(code):
+                continue
+            print(f"[FAIL] {label}: got {exc}", file=sys.stderr)
+        else:
+            print(f"[FAIL] {label}: expected {code}", file=sys.stderr)
+        ok = False
+    return ok
+
+
+def random_specs(rng: random.Random, size: int, text: bool) -> list[Spec]:
+    specs: list[Spec] = []
+    for _ in range(rng.randint(0, 6)):
+        start = rng.randint(0, size)
+        end = start if rng.random() < 0.4 else rng.randint(start, min(size, start + 4))
+        if text:
+            value: object = "".join(rng.choice("xy\n") for _ in range(rng.randint(0, 3)))
+        else:
+            value = [rng.choice(["x", "y", "}"]) for _ in range(rng.randint(0, 3))]
+        specs.append((start, end, value))
+    return specs
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=5000, help="Random cases per buffer kind.")
+    ap.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = ap.parse_args()
+
+    ok = check_errors()
+    ok = check_case("same-position inserts keep order", ["a", "b"], [(1, 1, ["x"]), (1, 1, ["y"])]) and ok
+    ok = check_case("insert at replace start", "abc", [(0, 2, "X"), (0, 0, "Y")]) and ok
+    ok = check_case("insert at replace end", "abc", [(0, 2, "X"), (2, 2, "Y")]) and ok
+    ok = check_case("insert inside replace", "abc", [(0, 2, "X"), (1, 1, "Y")]) and ok
+    ok = check_case("overlapping replaces", ["a", "b", "c"], [(0, 2, ["x"]), (1, 3, ["y"])]) and ok
+
+    rng = random.Random(args.seed)
+    for case in range(args.cases):
+        lines = [rng.choice(["a", "b", "}"]) for _ in range(rng.randint(0, 12))]
+        ok = check_case(f"lines {case}", lines, random_specs(rng, len(lines), False)) and ok
+        text = "".join(rng.choice("ab}\n") for _ in range(rng.randint(0, 24)))
+        ok = check_case(f"text {case}", text, random_specs(rng, len(text), True)) and ok
+        if not ok:
+            break
+
+    if not ok:
+        return 1
+    print(f"[OK] edit_buffer matches sequential splicing ({args.cases} random cases, seed {args.seed})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
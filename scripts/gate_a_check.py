@@ -4,16 +4,17 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
+from typing import Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs
+from sdslv2_builder.errors import Diagnostic, diagnostic_sink, json_pointer
+from sdslv2_builder.line_stream import LineSource, LineWindow, file_source
+from sdslv2_builder.lint import _capture_metadata_window, _parse_metadata_pairs
 
 
 KIND_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
@@ -54,17 +55,8 @@ def _strip_quotes(value: str) -> str:
     return value
 
 
-def _first_stmt_line(lines: list[str]) -> int | None:
-    for idx, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        return idx
-    return None
-
-
 def _check_metadata(
-    lines: list[str],
+    window: LineWindow,
     line_index: int,
     line: str,
     diags: list[Diagnostic],
@@ -89,7 +81,7 @@ def _check_metadata(
             json_pointer("annotations", str(line_index)),
         )
         return None, None
-    meta, end_line = _capture_metadata(lines, line_index, brace_idx)
+    meta, _, _ = _capture_metadata_window(window, line_index, brace_idx)
     meta = meta.strip()
     if not meta or not meta.startswith("{") or not meta.endswith("}"):
         _diag(
@@ -105,18 +97,48 @@ def _check_metadata(
     return meta, {k: v for k, v in pairs}
 
 
-def check_file(path: Path) -> list[Diagnostic]:
-    text = path.read_text(encoding="utf-8")
-    lines = text.splitlines()
+def _annotation_kind(line: str) -> str | None:
+    if not line.lstrip().startswith("@"):
+        return None
+    return line.lstrip().split(None, 1)[0][1:]
+
+
+def _scan_header(source: LineSource) -> tuple[int | None, int, int | None, str | None]:
+    first_file: int | None = None
+    file_count = 0
+    first_stmt: int | None = None
+    profile = None
+    scratch: list[Diagnostic] = []
+    window = LineWindow(source())
+    for idx, line in window:
+        stripped = line.strip()
+        if first_stmt is None and stripped != "" and not stripped.startswith("//"):
+            first_stmt = idx
+        if not line.lstrip().startswith("@File"):
+            continue
+        file_count += 1
+        if first_file is None:
+            first_file = idx
+        if _annotation_kind(line) != "File":
+            continue
+        _, kv = _check_metadata(window, idx, line, scratch)
+        scratch.clear()
+        if kv is not None and kv.get("profile") is not None:
+            profile = _strip_quotes(kv["profile"])
+    return first_file, file_count, first_stmt, profile
+
+
+def check_file(path: Path) -> Iterator[Diagnostic]:
+    source = file_source(path)
     diags: list[Diagnostic] = []
 
-    file_lines = [idx for idx, line in enumerate(lines) if line.lstrip().startswith("@File")]
-    first_stmt = _first_stmt_line(lines)
+    first_file, file_count, first_stmt, profile = _scan_header(source)
 
-    if not file_lines:
+    if first_file is None:
         _diag(diags, "E_FILE_HEADER_MISSING", "Missing @File header", "@File", "missing", json_pointer())
-        return diags
-    if first_stmt is not None and file_lines[0] != first_stmt:
+        yield from diags
+        return
+    if first_stmt is not None and first_file != first_stmt:
         _diag(
             diags,
             "E_FILE_HEADER_NOT_FIRST",
@@ -125,7 +147,7 @@ def check_file(path: Path) -> list[Diagnostic]:
             "later statement",
             json_pointer(),
         )
-    if len(file_lines) > 1:
+    if file_count > 1:
         _diag(
             diags,
             "E_FILE_HEADER_DUPLICATE",
@@ -135,13 +157,21 @@ def check_file(path: Path) -> list[Diagnostic]:
             json_pointer(),
         )
 
-    profile = None
-    annotations: list[tuple[int, str, dict[str, str] | None]] = []
-
-    for idx, line in enumerate(lines):
-        if not line.lstrip().startswith("@"):
+    allowed = None
+    if profile == "contract":
+        allowed = CONTRACT_KINDS
+    elif profile == "topology":
+        allowed = TOPOLOGY_KINDS
+    forbidden: list[tuple[int, str]] = []
+
+    window = LineWindow(source())
+    for idx, line in window:
+        if diags:
+            yield from diags
+            diags.clear()
+        kind = _annotation_kind(line)
+        if kind is None:
             continue
-        kind = line.lstrip().split(None, 1)[0][1:]
         if not KIND_RE.match(kind):
             _diag(
                 diags,
@@ -152,49 +182,44 @@ def check_file(path: Path) -> list[Diagnostic]:
                 json_pointer("annotations", str(idx)),
             )
             continue
-        _, kv = _check_metadata(lines, idx, line, diags)
+        _, kv = _check_metadata(window, idx, line, diags)
         if kv is None:
             continue
-        if kind == "File":
-            raw = kv.get("profile")
-            if raw is None:
-                _diag(
-                    diags,
-                    "E_PROFILE_INVALID",
-                    "profile must be contract or topology",
-                    "contract|topology",
-                    "missing",
-                    json_pointer("file_header", "profile"),
-                )
-            else:
-                profile = _strip_quotes(raw)
-        annotations.append((idx, kind, kv))
-
-    if profile not in {"contract", "topology"}:
-        if profile is not None:
+        if kind == "File" and kv.get("profile") is None:
             _diag(
                 diags,
                 "E_PROFILE_INVALID",
                 "profile must be contract or topology",
                 "contract|topology",
-                str(profile),
+                "missing",
                 json_pointer("file_header", "profile"),
             )
-        return diags
+        if allowed is not None and kind not in allowed:
+            forbidden.append((idx, kind))
+    yield from diags
+    diags.clear()
 
-    allowed = CONTRACT_KINDS if profile == "contract" else TOPOLOGY_KINDS
-    for idx, kind, _ in annotations:
-        if kind not in allowed:
+    if allowed is None:
+        if profile is not None:
             _diag(
                 diags,
-                "E_PROFILE_KIND_FORBIDDEN",
-                "Kind not allowed for profile",
-                ",".join(sorted(allowed)),
-                kind,
-                json_pointer("annotations", str(idx)),
+                "E_PROFILE_INVALID",
+                "profile must be contract or topology",
+                "contract|topology",
+                str(profile),
+                json_pointer("file_header", "profile"),
             )
-
-    return diags
+        yield from diags
+        return
+
+    for idx, kind in forbidden:
+        yield Diagnostic(
+            code="E_PROFILE_KIND_FORBIDDEN",
+            message="Kind not allowed for profile",
+            expected=",".join(sorted(allowed)),
+            got=kind,
+            path=json_pointer("annotations", str(idx)),
+        )
 
 
 def main() -> int:
@@ -210,13 +235,12 @@ def main() -> int:
         print("E_INPUT_NOT_FOUND: no .sdsl2 files", file=sys.stderr)
         return 2
 
-    all_diags: list[Diagnostic] = []
+    sink = diagnostic_sink()
     for path in files:
-        all_diags.extend(check_file(path))
+        sink.extend(check_file(path))
 
-    if all_diags:
-        payload = [d.to_dict() for d in all_diags]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    if sink.total:
+        sink.close()
         return 2
     return 0
 
@@ -4,16 +4,19 @@
 from __future__ import annotations
 
 import argparse
-import json
+from itertools import chain
 import sys
 from pathlib import Path
+from typing import Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from sdslv2_builder.errors import Diagnostic, json_pointer
-from sdslv2_builder.lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
+from sdslv2_builder.errors import Diagnostic, diagnostic_sink, json_pointer
+from sdslv2_builder.line_stream import iter_file_lines
+from sdslv2_builder.lint import _split_list_items
 from sdslv2_builder.refs import INTERNAL_REF_RE, parse_contract_ref, parse_internal_ref, parse_ssot_ref
+from sdslv2_builder.sdsl_ast import iter_blocks
 
 
 CONTRACT_KINDS = {
@@ -60,99 +63,90 @@ def _strip_quotes(value: str) -> str:
     return value
 
 
-def _collect_entries(lines: list[str]) -> list[dict]:
-    entries: list[dict] = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if not line.lstrip().startswith("@"):
-            i += 1
-            continue
-        kind = line.lstrip().split(None, 1)[0][1:]
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            i += 1
-            continue
-        meta, end_line = _capture_metadata(lines, i, brace_idx)
-        pairs = _parse_metadata_pairs(meta)
-        kv = {k: v for k, v in pairs}
-        entries.append({"kind": kind, "kv": kv, "line": i})
-        i = end_line + 1
-    return entries
+def _iter_entries(path: Path) -> Iterator[dict]:
+    for ann in iter_blocks(iter_file_lines(path)):
+        if ann.meta is not None:
+            yield {"kind": ann.raw_kind, "kv": ann.meta_dict(), "line": ann.start_line}
 
 
-def _extract_profile(entries: list[dict], diags: list[Diagnostic]) -> str | None:
-    for entry in entries:
-        if entry["kind"] == "File":
-            profile = entry["kv"].get("profile")
-            if profile:
-                return _strip_quotes(profile)
-            _diag(
-                diags,
-                "E_PROFILE_INVALID",
-                "profile must be contract or topology",
-                "contract|topology",
-                str(profile),
-                json_pointer("file_header", "profile"),
-            )
-            return None
-    _diag(diags, "E_FILE_HEADER_MISSING", "Missing @File header", "@File", "missing", json_pointer())
-    return None
+def _anchor(entry: dict) -> str | None:
+    rel_id = entry["kv"].get("id")
+    if not rel_id:
+        return None
+    return f"@{entry['kind']}.{_strip_quotes(rel_id)}"
 
 
-def _build_anchor_set(entries: list[dict]) -> set[str]:
-    anchors: set[str] = set()
-    for entry in entries:
-        rel_id = entry["kv"].get("id")
-        if rel_id:
-            rel_id = _strip_quotes(rel_id)
-            anchors.add(f"@{entry['kind']}.{rel_id}")
-    return anchors
-
-
-def _check_bind(
-    value: str | None,
-    anchors: set[str],
-    diags: list[Diagnostic],
-    path: str,
-) -> None:
+def _bind_target(value: str | None, diags: list[Diagnostic], path: str) -> str | None:
     if not value:
         _diag(diags, "E_RULE_BIND_REQUIRED", "bind is required", "@Kind.RELID", "missing", path)
-        return
+        return None
     parsed = parse_internal_ref(value)
     if not parsed:
         _diag(diags, "E_BIND_TARGET_NOT_FOUND", "bind must be InternalRef", "@Kind.RELID", value, path)
-        return
-    if parsed.to_string() not in anchors:
-        _diag(
-            diags,
-            "E_BIND_TARGET_NOT_FOUND",
-            "bind target not found",
-            "existing InternalRef",
-            parsed.to_string(),
-            path,
+        return None
+    return parsed.to_string()
+
+
+def _resolve_binds(diags: list[Diagnostic], pending: list[tuple[int, str, str]], anchors: set[str]) -> None:
+    for position, target, path in reversed(pending):
+        if target in anchors:
+            continue
+        diags.insert(
+            position,
+            Diagnostic(
+                code="E_BIND_TARGET_NOT_FOUND",
+                message="bind target not found",
+                expected="existing InternalRef",
+                got=target,
+                path=path,
+            ),
         )
 
 
-def check_file(path: Path) -> list[Diagnostic]:
-    text = path.read_text(encoding="utf-8")
-    lines = text.splitlines()
-    entries = _collect_entries(lines)
+def check_file(path: Path) -> Iterator[Diagnostic]:
     diags: list[Diagnostic] = []
+    entries = _iter_entries(path)
 
-    profile = _extract_profile(entries, diags)
+    leading: list[dict] = []
+    profile: str | None = None
+    for entry in entries:
+        leading.append(entry)
+        if entry["kind"] != "File":
+            continue
+        raw = entry["kv"].get("profile")
+        if not raw:
+            _diag(
+                diags,
+                "E_PROFILE_INVALID",
+                "profile must be contract or topology",
+                "contract|topology",
+                str(raw),
+                json_pointer("file_header", "profile"),
+            )
+            yield from diags
+            return
+        profile = _strip_quotes(raw)
+        break
     if profile is None:
-        return diags
-
-    anchors = _build_anchor_set(entries)
+        _diag(diags, "E_FILE_HEADER_MISSING", "Missing @File header", "@File", "missing", json_pointer())
+        yield from diags
+        return
 
+    anchors: set[str] = set()
+    pending: list[tuple[int, str, str]] = []
     decl_index = 0
     dep_index = 0
     rule_index = 0
     edge_index = 0
     node_index = 0
 
-    for entry in entries:
+    for entry in chain(leading, entries):
+        if diags and not pending:
+            yield from diags
+            diags.clear()
+        anchor = _anchor(entry)
+        if anchor:
+            anchors.add(anchor)
         kind = entry["kind"]
         kv = entry["kv"]
 
@@ -178,7 +172,10 @@ def check_file(path: Path) -> list[Diagnostic]:
             continue
 
         if kind == "Rule":
-            _check_bind(kv.get("bind"), anchors, diags, json_pointer("rules", str(rule_index), "bind"))
+            bind_path = json_pointer("rules", str(rule_index), "bind")
+            target = _bind_target(kv.get("bind"), diags, bind_path)
+            if target is not None and target not in anchors:
+                pending.append((len(diags), target, bind_path))
             rule_index += 1
 
         if profile == "contract":
@@ -343,7 +340,8 @@ def check_file(path: Path) -> list[Diagnostic]:
                                 )
                 edge_index += 1
 
-    return diags
+    _resolve_binds(diags, pending, anchors)
+    yield from diags
 
 
 def main() -> int:
@@ -359,13 +357,12 @@ def main() -> int:
         print("E_INPUT_NOT_FOUND: no .sdsl2 files", file=sys.stderr)
         return 2
 
-    all_diags: list[Diagnostic] = []
+    sink = diagnostic_sink()
     for path in files:
-        all_diags.extend(check_file(path))
+        sink.extend(check_file(path))
 
-    if all_diags:
-        payload = [d.to_dict() for d in all_diags]
-        print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    if sink.total:
+        sink.close()
         return 2
     return 0
 
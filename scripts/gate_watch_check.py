@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIRS = (".gate_cache", ".input_hash_cache.json", ".ssot_kernel", ".token_index", ".topology_index")
+REV_FILES = ("OUTPUT/ssot/contract_definitions.json", "OUTPUT/ssot/ssot_registry.json")
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "gate-watch-check",
+    "GIT_AUTHOR_EMAIL": "gate-watch-check@localhost",
+    "GIT_COMMITTER_NAME": "gate-watch-check",
+    "GIT_COMMITTER_EMAIL": "gate-watch-check@localhost",
+}
+
+
+def git(project: Path, *args: str) -> str:
+    env = {**os.environ, **GIT_ENV}
+    proc = subprocess.run(["git", "-C", str(project), *args], capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise SystemExit(f"GIT_FAILED: {' '.join(args)}: {proc.stderr.strip()}")
+    return proc.stdout.strip()
+
+
+def source_revs(project: Path) -> dict[str, str | None]:
+    revs: dict[str, str | None] = {}
+    for rel in REV_FILES:
+        path = project / rel
+        if not path.is_file():
+            raise SystemExit(f"WATCH_OUTPUT_MISSING: {rel}")
+        data = json.loads(path.read_text(encoding="utf-8"))
+        revs[rel] = data.get("source_rev") if isinstance(data, dict) else None
+    return revs
+
+
+def wait_cycle(lines: queue.Queue[str | None], timeout: float) -> str:
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise SystemExit("WATCH_TIMEOUT")
+        try:
+            line = lines.get(timeout=remaining)
+        except queue.Empty:
+            raise SystemExit("WATCH_TIMEOUT") from None
+        if line is None:
+            raise SystemExit("WATCH_EXITED")
+        if line.startswith("[WATCH] rc="):
+            return line.strip()
+
+
+def commit_change(project: Path, n: int) -> str:
+    contracts = sorted((project / "sdsl2" / "contract").glob("*.sdsl2"))
+    if not contracts:
+        raise SystemExit("WATCH_CONTRACT_MISSING")
+    with contracts[0].open("a", encoding="utf-8") as handle:
+        handle.write(f"// gate_watch_check {n}\n")
+    git(project, "add", "-A")
+    git(project, "commit", "-q", "-m", f"gate_watch_check {n}")
+    return git(project, "rev-parse", "HEAD")
+
+
+def check_revs(project: Path, expected: str, label: str) -> bool:
+    ok = True
+    for rel, rev in source_revs(project).items():
+        if rev != expected:
+            print(f"[FAIL] {label}: {rel} source_rev={rev} expected={expected}", file=sys.stderr)
+            ok = False
+    if ok:
+        print(f"[OK] {label}: source_rev {expected[:12]}")
+    return ok
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--project-root", default="project_testing", help="Project copied into a temp git repo.")
+    ap.add_argument("--kernel-root", default=".", help="SSOT kernel source root.")
+    ap.add_argument("--today", required=True, help="YYYY-MM-DD for exception_lint.")
+    ap.add_argument("--cycles", type=int, default=2, help="Commits (and watch rebuilds) to check.")
+    ap.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for each watch cycle.")
+    args = ap.parse_args()
+
+    source = (ROOT / args.project_root).resolve()
+    kernel_root = (ROOT / args.kernel_root).resolve()
+    if not source.is_dir():
+        raise SystemExit(f"PROJECT_NOT_FOUND: {source}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        shutil.copytree(source, project, symlinks=True, ignore=shutil.ignore_patterns(*CACHE_DIRS, "__pycache__"))
+        git(project, "init", "-q")
+        git(project, "add", "-A")
+        git(project, "commit", "-q", "-m", "gate_watch_check base")
+        head = git(project, "rev-parse", "HEAD")
+
+        cmd = [
+            sys.executable,
+            str(ROOT / "L2_builder" / "l2_gate_runner.py"),
+            "--project-root",
+            str(project),
+            "--kernel-root",
+            str(kernel_root),
+            "--today",
+            args.today,
+            "--build-ssot",
+            "--no-cache",
+            "--watch",
+            "--watch-interval",
+            "0.2",
+        ]
+        env = {key: value for key, value in os.environ.items() if key != "SDSL_GIT_HEAD"}
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=ROOT,
+            env=env,
+        )
+        lines: queue.Queue[str | None] = queue.Queue()
+
+        def pump() -> None:
+            assert proc.stderr is not None
+            for line in proc.stderr:
+                lines.put(line)
+            lines.put(None)
+
+        threading.Thread(target=pump, daemon=True).start()
+        ok = True
+        try:
+            wait_cycle(lines, args.timeout)
+            ok = check_revs(project, head, "initial build") and ok
+            for n in range(1, args.cycles + 1):
+                time.sleep(0.5)
+                new_head = commit_change(project, n)
+                if new_head == head:
+                    raise SystemExit("GIT_HEAD_NOT_MOVED")
+                status = wait_cycle(lines, args.timeout)
+                ok = check_revs(project, new_head, f"rebuild {n} ({status})") and ok
+                head = new_head
+        finally:
+            proc.send_signal(signal.SIGINT)
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
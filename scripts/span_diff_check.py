@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import sys
+from pathlib import Path
+from typing import Iterable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sdslv2_builder.edit_buffer import EditBuffer
+from sdslv2_builder.span_diff import edit_diff, line_diff
+
+ALPHABETS = ("ab", "abc", "}{x", "abcdef", "abcdefghijklmnop")
+FIXED_LINES = (
+    (["", "", "", "c", "}", "", "", "c", "x"], ["", "", "", "", "", "c", "x"]),
+    (["a", "b", "c"], ["a", "b", "c"]),
+    ([], ["a"]),
+    (["a"], []),
+    ([], []),
+)
+
+
+def expected(a: list[str], b: list[str]) -> list[str]:
+    return list(difflib.unified_diff(a, b, fromfile="a", tofile="b", lineterm=""))
+
+
+def compare(label: str, got: Iterable[str], a: list[str], b: list[str]) -> bool:
+    if list(got) == expected(a, b):
+        return True
+    print(f"[FAIL] {label}: differs from difflib.unified_diff", file=sys.stderr)
+    print(f"  a={a!r}", file=sys.stderr)
+    print(f"  b={b!r}", file=sys.stderr)
+    return False
+
+
+def random_lines(rng: random.Random, alphabet: str, size: int) -> list[str]:
+    return [rng.choice(alphabet) for _ in range(size)]
+
+
+def structured_lines(rng: random.Random, size: int, ids: list[int]) -> list[str]:
+    lines: list[str] = []
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.5:
+            ids[0] += 1
+            lines.append(f'@Node {{ id:"N{ids[0]}" }}')
+        elif kind < 0.8:
+            lines.append(rng.choice(["}", "{", "  kind: edge"]))
+        else:
+            lines.append(f"  ref: SSOT.T{rng.randint(0, 5)}")
+    return lines
+
+
+def structured_edits(rng: random.Random, base: list[str], ids: list[int]) -> EditBuffer:
+    edits = EditBuffer(base)
+    pos = 0
+    while pos <= len(base) and len(edits) < 10:
+        start = rng.randint(pos, min(len(base), pos + rng.choice([3, 10, 60])))
+        end = rng.randint(start, min(len(base), start + 3))
+        value = rng.choice([[], structured_lines(rng, rng.randint(1, 3), ids), base[start:end] + ["}"]])
+        edits.replace(start, end, value)
+        pos = max(end, start + 1)
+    return edits
+
+
+def random_edits(rng: random.Random, base: list[str], alphabet: str) -> EditBuffer:
+    edits = EditBuffer(base)
+    pos = 0
+    while pos <= len(base) and len(edits) < 6:
+        start = rng.randint(pos, min(len(base), pos + 8))
+        end = rng.randint(start, min(len(base), start + 3))
+        edits.replace(start, end, random_lines(rng, alphabet, rng.randint(0, 3)))
+        pos = max(end, start + 1)
+    return edits
+
+
+def random_text_edits(rng: random.Random, text: str) -> EditBuffer:
+    edits = EditBuffer(text)
+    pos = 0
+    while pos <= len(text) and len(edits) < 6:
+        start = rng.randint(pos, min(len(text), pos + 12))
+        end = rng.randint(start, min(len(text), start + 4))
+        edits.replace(start, end, rng.choice(["", "\n", "}\n", "x", "@Edge {\n", "\r\n"]))
+        pos = max(end, start + 1)
+    return edits
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=3000, help="Random cases per diff mode.")
+    ap.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = ap.parse_args()
+
+    ok = True
+    for idx, (a, b) in enumerate(FIXED_LINES):
+        ok = compare(f"line_diff fixed {idx}", line_diff(a, b, "a", "b"), a, b) and ok
+    edits = EditBuffer(["}", "}", "}", ""])
+    edits.insert(2, [""])
+    ok = compare("edit_diff fixed 0", edit_diff(edits, "a", "b"), ["}", "}", "}", ""], edits.render()) and ok
+
+    rng = random.Random(args.seed)
+    for case in range(args.cases):
+        alphabet = rng.choice(ALPHABETS)
+        size = rng.randint(200, 400) if case % 20 == 0 else rng.randint(0, 30)
+        a = random_lines(rng, alphabet, size)
+        b = random_lines(rng, alphabet, rng.randint(0, size + 5))
+        ok = compare(f"line_diff random {case}", line_diff(a, b, "a", "b"), a, b) and ok
+
+        edits = random_edits(rng, a, alphabet)
+        ok = compare(f"edit_diff lines {case}", edit_diff(edits, "a", "b"), a, edits.render()) and ok
+
+        ids = [0]
+        base = structured_lines(rng, rng.randint(150, 500) if case % 4 == 0 else rng.randint(0, 30), ids)
+        edits = structured_edits(rng, base, ids)
+        ok = compare(f"edit_diff structured {case}", edit_diff(edits, "a", "b"), base, edits.render()) and ok
+
+        text = "".join(line + rng.choice(["\n", "\n", "\r\n", ""]) for line in a)
+        edits = random_text_edits(rng, text)
+        new_text = edits.render()
+        label = f"edit_diff text {case}"
+        ok = compare(label, edit_diff(edits, "a", "b"), text.splitlines(), new_text.splitlines()) and ok
+        if not ok:
+            break
+
+    if not ok:
+        return 1
+    print(f"[OK] span_diff matches difflib.unified_diff ({args.cases} random cases, seed {args.seed})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
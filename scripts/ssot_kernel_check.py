@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+from hashlib import sha256
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sdslv2_builder.pointer_resolver import resolve_pointers
+from sdslv2_builder.ssot_kernel import (
+    KERNEL_DIR_REL,
+    KERNEL_VERSION,
+    SsotKernel,
+    canonical_json,
+    clear_cache,
+    compile_kernel,
+    escape_pointer,
+    load_kernel,
+)
+
+SYNTHETIC = {
+    "schema_version": "1.0",
+    "tokens": {"SSOT.A/B": {"kind": "ref"}, "SSOT.X~Y": {"kind": "const", "value": [1, {"k": None}]}},
+    "enums": {"E": ["a", "b"], "": {"": 0}},
+}
+
+
+def _paths(value: Any, path: tuple[str, ...] = ()) -> list[tuple[str, ...]]:
+    paths = [path]
+    if isinstance(value, dict):
+        for key, item in value.items():
+            paths.extend(_paths(item, (*path, key)))
+    elif isinstance(value, list):
+        for idx, item in enumerate(value):
+            paths.extend(_paths(item, (*path, str(idx))))
+    return paths
+
+
+def _pointers(data: Any) -> list[tuple[str, ...]]:
+    pointers: list[tuple[str, ...]] = []
+    for path in _paths(data):
+        pointers.append(path)
+        pointers.append((*path, "missing"))
+        pointers.append((*path, "0"))
+        pointers.append((*path, "-1"))
+        if path:
+            pointers.append((*path[:-1], path[-1] + "x"))
+    return pointers
+
+
+def _expected_tokens(data: Any) -> dict[str, str]:
+    tokens = data.get("tokens") if isinstance(data, dict) else None
+    if not isinstance(tokens, dict):
+        return {}
+    return {token: "/tokens/" + escape_pointer(token) for token in sorted(tokens)}
+
+
+def _artifacts(project: Path) -> list[Path]:
+    kernel_dir = project / KERNEL_DIR_REL
+    return sorted(kernel_dir.glob("*.json")) if kernel_dir.is_dir() else []
+
+
+def _compare(label: str, kernel: SsotKernel, text: str) -> list[str]:
+    data = json.loads(text)
+    errors: list[str] = []
+    if kernel.digest != sha256(text.encode("utf-8")).hexdigest():
+        errors.append(f"{label}: digest mismatch")
+    if kernel.canonical != (text == canonical_json(data)):
+        errors.append(f"{label}: canonical flag mismatch")
+    if dict(kernel.tokens) != _expected_tokens(data):
+        errors.append(f"{label}: token pointers mismatch")
+    if kernel.data != data:
+        errors.append(f"{label}: data mismatch")
+    pointers = _pointers(data)
+    if kernel.resolve(pointers) != resolve_pointers(data, pointers):
+        errors.append(f"{label}: resolve differs from resolve_pointers")
+    return errors
+
+
+def _check_variant(project: Path, label: str, text: str) -> list[str]:
+    digest = sha256(text.encode("utf-8")).hexdigest()
+    errors: list[str] = []
+    clear_cache()
+    before = _artifacts(project)
+    errors.extend(_compare(f"{label} load (no artifact)", load_kernel(project, text), text))
+    if _artifacts(project) != before:
+        errors.append(f"{label}: load_kernel wrote an artifact")
+
+    clear_cache()
+    compile_kernel(project, text)
+    artifacts = _artifacts(project)
+    if [path.stem for path in artifacts] != [digest]:
+        errors.append(f"{label}: compile_kernel left {[path.name for path in artifacts]}")
+        return errors
+    payload = json.loads(artifacts[0].read_text(encoding="utf-8"))
+    if payload.get("version") != KERNEL_VERSION or set(payload) != {"version", "digest", "canonical", "tokens"}:
+        errors.append(f"{label}: artifact keys {sorted(payload)}")
+
+    clear_cache()
+    errors.extend(_compare(f"{label} load (artifact)", load_kernel(project, text), text))
+    return errors
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--definitions",
+        default="project_testing/OUTPUT/ssot/ssot_definitions.json",
+        help="ssot_definitions.json used as the base case.",
+    )
+    args = ap.parse_args()
+
+    definitions = (ROOT / args.definitions).resolve()
+    if not definitions.is_file():
+        raise SystemExit(f"DEFINITIONS_NOT_FOUND: {definitions}")
+    text = definitions.read_text(encoding="utf-8")
+    data = json.loads(text)
+    variants = [
+        ("definitions", text),
+        ("definitions indented", json.dumps(data, ensure_ascii=False, indent=2) + "\n"),
+        ("synthetic", canonical_json(SYNTHETIC)),
+        ("synthetic list root", canonical_json([SYNTHETIC, 1])),
+    ]
+
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp)
+        (project / "OUTPUT").mkdir()
+        for label, variant in variants:
+            errors.extend(_check_variant(project, label, variant))
+    clear_cache()
+
+    if errors:
+        for error in errors:
+            print(f"[FAIL] {error}", file=sys.stderr)
+        return 1
+    print(f"[OK] ssot_kernel matches direct parsing ({len(variants)} definitions variants)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
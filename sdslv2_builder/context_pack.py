@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from hashlib import sha256
 from pathlib import Path
-import re
 
-from .lint import _capture_metadata, _parse_metadata_pairs, _split_list_items, DIRECTION_VOCAB
+from .disk_cache import DiskCache
+from .gate_cache import toolchain_digest
+from .lint import _split_list_items, DIRECTION_VOCAB
 from .refs import RELID_RE, parse_contract_ref, parse_internal_ref
-
-
-ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
+from .sdsl_ast import SdslDocument, parse_text, strict_annotations
 
 
 @dataclass(frozen=True)
@@ -74,32 +74,11 @@ def _has_block_comment(text: str) -> bool:
     return False
 
 
-def _parse_annotations(lines: list[str]) -> list[tuple[str, dict[str, str], int]]:
-    annotations: list[tuple[str, dict[str, str], int]] = []
-    for idx, line in enumerate(lines):
-        stripped = line.lstrip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        if not stripped.startswith("@"):
-            continue
-        match = ANNOTATION_KIND_RE.match(stripped)
-        if not match:
-            continue
-        kind = match.group("kind")
-        brace_idx = line.find("{")
-        if brace_idx == -1:
-            raise ValueError(f"E_CONTEXT_PACK_METADATA_MISSING: line {idx + 1}")
-        meta, _ = _capture_metadata(lines, idx, brace_idx)
-        pairs = _parse_metadata_pairs(meta)
-        meta_map: dict[str, str] = {}
-        for key, value in pairs:
-            if key in meta_map:
-                raise ValueError(
-                    f"E_CONTEXT_PACK_DUPLICATE_KEY: line {idx + 1} key {key}"
-                )
-            meta_map[key] = value
-        annotations.append((kind, meta_map, idx))
-    return annotations
+def _parse_annotations(doc: SdslDocument) -> list[tuple[str, dict[str, str], int]]:
+    return [
+        (ann.kind, dict(ann.meta or {}), ann.start_line)
+        for ann in strict_annotations(doc, "E_CONTEXT_PACK")
+    ]
 
 
 def _parse_file_header(
@@ -262,68 +241,316 @@ def _format_edge_intent(intent: EdgeIntentEntry) -> str:
     return "@EdgeIntent { " + ", ".join(parts) + " }"
 
 
-def _first_stmt_line(lines: list[str]) -> int | None:
-    for idx, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped == "" or stripped.startswith("//"):
-            continue
-        return idx
-    return None
+INDEX_DIR_REL = Path("OUTPUT") / ".topology_index"
+INDEX_VERSION = "topology-index-v1"
 
 
-def extract_context_pack(path: Path, target: str, hops: int = 1) -> str:
-    text = path.read_text(encoding="utf-8")
-    if _has_block_comment(text):
-        raise ValueError("E_CONTEXT_PACK_BLOCK_COMMENT_UNSUPPORTED")
-    lines = text.splitlines()
-    annotations = _parse_annotations(lines)
-    first_stmt = _first_stmt_line(lines)
-    profile, stage, id_prefix = _parse_file_header(annotations, first_stmt)
-    if profile is None:
-        raise ValueError("E_CONTEXT_PACK_FILE_HEADER_MISSING")
-    if profile != "topology":
-        raise ValueError(f"E_CONTEXT_PACK_PROFILE_INVALID: {profile}")
-    if not id_prefix:
-        raise ValueError("E_CONTEXT_PACK_ID_PREFIX_MISSING")
-    if not RELID_RE.match(id_prefix):
-        raise ValueError("E_CONTEXT_PACK_ID_PREFIX_INVALID")
+@dataclass(frozen=True)
+class TopologyIndex:
+    digest: str
+    pre_error: str | None
+    node_error: str | None
+    graph_error: str | None
+    profile: str | None
+    stage: str | None
+    id_prefix: str | None
+    node_ids: tuple[str, ...]
+    node_counts: tuple[int, ...]
+    adj_offsets: tuple[int, ...]
+    adj_targets: tuple[int, ...]
+    edges: tuple[EdgeEntry, ...]
+    edge_offsets: tuple[int, ...]
+    edge_refs: tuple[int, ...]
+    intents: tuple[EdgeIntentEntry, ...]
+    intent_offsets: tuple[int, ...]
+    intent_refs: tuple[int, ...]
+    positions: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "positions", {rel_id: idx for idx, rel_id in enumerate(self.node_ids)})
+
+    def neighbors(self, pos: int) -> tuple[int, ...]:
+        return self.adj_targets[self.adj_offsets[pos] : self.adj_offsets[pos + 1]]
+
+    def incident_edges(self, pos: int) -> tuple[int, ...]:
+        return self.edge_refs[self.edge_offsets[pos] : self.edge_offsets[pos + 1]]
+
+    def incident_intents(self, pos: int) -> tuple[int, ...]:
+        return self.intent_refs[self.intent_offsets[pos] : self.intent_offsets[pos + 1]]
+
+    def canon_id(self, rel_id: str) -> str:
+        return f"{self.id_prefix}_{rel_id}"
+
+
+def _csr(size: int, pairs: list[tuple[int, int]]) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    buckets: list[set[int]] = [set() for _ in range(size)]
+    for pos, value in pairs:
+        buckets[pos].add(value)
+    offsets = [0]
+    targets: list[int] = []
+    for bucket in buckets:
+        targets.extend(sorted(bucket))
+        offsets.append(len(targets))
+    return tuple(offsets), tuple(targets)
+
+
+def _empty_index(digest: str, **fields: object) -> TopologyIndex:
+    values: dict[str, object] = {
+        "pre_error": None,
+        "node_error": None,
+        "graph_error": None,
+        "profile": None,
+        "stage": None,
+        "id_prefix": None,
+        "node_ids": (),
+        "node_counts": (),
+        "adj_offsets": (0,),
+        "adj_targets": (),
+        "edges": (),
+        "edge_offsets": (0,),
+        "edge_refs": (),
+        "intents": (),
+        "intent_offsets": (0,),
+        "intent_refs": (),
+    }
+    values.update(fields)
+    return TopologyIndex(digest=digest, **values)
+
+
+def build_topology_index(text: str) -> TopologyIndex:
+    digest = _text_digest(text)
+    try:
+        if _has_block_comment(text):
+            raise ValueError("E_CONTEXT_PACK_BLOCK_COMMENT_UNSUPPORTED")
+        doc = parse_text(text)
+        annotations = _parse_annotations(doc)
+        profile, stage, id_prefix = _parse_file_header(annotations, doc.first_stmt)
+        if profile is None:
+            raise ValueError("E_CONTEXT_PACK_FILE_HEADER_MISSING")
+        if profile != "topology":
+            raise ValueError(f"E_CONTEXT_PACK_PROFILE_INVALID: {profile}")
+        if not id_prefix:
+            raise ValueError("E_CONTEXT_PACK_ID_PREFIX_MISSING")
+        if not RELID_RE.match(id_prefix):
+            raise ValueError("E_CONTEXT_PACK_ID_PREFIX_INVALID")
+    except ValueError as exc:
+        return _empty_index(digest, pre_error=str(exc))
+
+    header = {"profile": profile, "stage": stage, "id_prefix": id_prefix}
+    try:
+        for kind, _, _ in annotations:
+            if kind in {"Flow", "Terminal"}:
+                raise ValueError(f"E_CONTEXT_PACK_UNSUPPORTED_KIND: {kind}")
+        nodes = _parse_nodes(annotations)
+    except ValueError as exc:
+        return _empty_index(digest, node_error=str(exc), **header)
+
+    counts: dict[str, int] = {}
+    for node in nodes:
+        counts[node.rel_id] = counts.get(node.rel_id, 0) + 1
+    node_ids = tuple(counts)
+    header.update({"node_ids": node_ids, "node_counts": tuple(counts.values())})
+    try:
+        edges = _parse_edges(annotations, set(node_ids))
+        intents = _parse_edge_intents(annotations, set(node_ids))
+    except ValueError as exc:
+        return _empty_index(digest, graph_error=str(exc), **header)
+
+    positions = {rel_id: idx for idx, rel_id in enumerate(node_ids)}
+    adjacency: list[tuple[int, int]] = []
+    edge_pairs: list[tuple[int, int]] = []
+    for idx, edge in enumerate(edges):
+        from_pos = positions[edge.from_id]
+        to_pos = positions[edge.to_id]
+        adjacency.append((from_pos, to_pos))
+        adjacency.append((to_pos, from_pos))
+        edge_pairs.append((from_pos, idx))
+        edge_pairs.append((to_pos, idx))
+    intent_pairs: list[tuple[int, int]] = []
+    for idx, intent in enumerate(intents):
+        intent_pairs.append((positions[intent.from_id], idx))
+        intent_pairs.append((positions[intent.to_id], idx))
+    adj_offsets, adj_targets = _csr(len(node_ids), adjacency)
+    edge_offsets, edge_refs = _csr(len(node_ids), edge_pairs)
+    intent_offsets, intent_refs = _csr(len(node_ids), intent_pairs)
+    return _empty_index(
+        digest,
+        adj_offsets=adj_offsets,
+        adj_targets=adj_targets,
+        edges=tuple(edges),
+        edge_offsets=edge_offsets,
+        edge_refs=edge_refs,
+        intents=tuple(intents),
+        intent_offsets=intent_offsets,
+        intent_refs=intent_refs,
+        **header,
+    )
 
-    target_ref = parse_internal_ref(target)
-    if not target_ref or target_ref.kind != "Node":
-        raise ValueError(f"E_CONTEXT_PACK_TARGET_INVALID: {target}")
 
-    for kind, _, _ in annotations:
-        if kind in {"Flow", "Terminal"}:
-            raise ValueError(f"E_CONTEXT_PACK_UNSUPPORTED_KIND: {kind}")
+def index_to_dict(index: TopologyIndex) -> dict[str, object]:
+    return {
+        "version": INDEX_VERSION,
+        "digest": index.digest,
+        "pre_error": index.pre_error,
+        "node_error": index.node_error,
+        "graph_error": index.graph_error,
+        "profile": index.profile,
+        "stage": index.stage,
+        "id_prefix": index.id_prefix,
+        "node_ids": list(index.node_ids),
+        "node_counts": list(index.node_counts),
+        "adj_offsets": list(index.adj_offsets),
+        "adj_targets": list(index.adj_targets),
+        "edges": [
+            [edge.from_id, edge.to_id, edge.direction, edge.channel, list(edge.contract_refs)]
+            for edge in index.edges
+        ],
+        "edge_offsets": list(index.edge_offsets),
+        "edge_refs": list(index.edge_refs),
+        "intents": [
+            [
+                intent.intent_id,
+                intent.from_id,
+                intent.to_id,
+                intent.direction,
+                intent.channel,
+                intent.note,
+                intent.owner,
+                intent.contract_hint,
+            ]
+            for intent in index.intents
+        ],
+        "intent_offsets": list(index.intent_offsets),
+        "intent_refs": list(index.intent_refs),
+    }
+
+
+def index_from_dict(data: dict[str, object]) -> TopologyIndex:
+    if data.get("version") != INDEX_VERSION:
+        raise ValueError("E_TOPOLOGY_INDEX_VERSION")
+    try:
+        edges = tuple(
+            EdgeEntry(from_id, to_id, direction, channel, tuple(refs))
+            for from_id, to_id, direction, channel, refs in data["edges"]
+        )
+        intents = tuple(EdgeIntentEntry(*item) for item in data["intents"])
+        return TopologyIndex(
+            digest=data["digest"],
+            pre_error=data["pre_error"],
+            node_error=data["node_error"],
+            graph_error=data["graph_error"],
+            profile=data["profile"],
+            stage=data["stage"],
+            id_prefix=data["id_prefix"],
+            node_ids=tuple(data["node_ids"]),
+            node_counts=tuple(data["node_counts"]),
+            adj_offsets=tuple(data["adj_offsets"]),
+            adj_targets=tuple(data["adj_targets"]),
+            edges=edges,
+            edge_offsets=tuple(data["edge_offsets"]),
+            edge_refs=tuple(data["edge_refs"]),
+            intents=intents,
+            intent_offsets=tuple(data["intent_offsets"]),
+            intent_refs=tuple(data["intent_refs"]),
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("E_TOPOLOGY_INDEX_INVALID") from exc
 
-    nodes = _parse_nodes(annotations)
-    node_ids = {node.rel_id for node in nodes}
-    if target_ref.rel_id not in node_ids:
-        raise ValueError(f"E_CONTEXT_PACK_TARGET_NOT_FOUND: {target_ref.rel_id}")
 
-    edges = _parse_edges(annotations, node_ids)
-    intents = _parse_edge_intents(annotations, node_ids)
+_INDEX_CACHE: dict[str, TopologyIndex] = {}
 
-    adjacency: dict[str, set[str]] = {node.rel_id: set() for node in nodes}
-    for edge in edges:
-        adjacency.setdefault(edge.from_id, set()).add(edge.to_id)
-        adjacency.setdefault(edge.to_id, set()).add(edge.from_id)
 
-    visited = {target_ref.rel_id}
-    frontier = {target_ref.rel_id}
+def _text_digest(text: str) -> str:
+    return "sha256:" + sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_topology_index(
+    path: Path,
+    cache_root: Path | None = None,
+    cache_rel: Path = INDEX_DIR_REL,
+) -> TopologyIndex:
+    text = path.read_text(encoding="utf-8")
+    digest = _text_digest(text)
+    index = _INDEX_CACHE.get(digest)
+    if index is not None:
+        return index
+    disk = None
+    if cache_root is not None:
+        key = sha256(f"{digest}\n{toolchain_digest()}".encode("utf-8")).hexdigest()
+        disk = DiskCache(cache_root, cache_rel / f"{key}.json", INDEX_VERSION, toolchain=True)
+        data = disk.load()
+        if data is not None:
+            try:
+                index = index_from_dict(data)
+            except ValueError:
+                index = None
+            if index is not None and index.digest != digest:
+                index = None
+    if index is None:
+        index = build_topology_index(text)
+        if disk is not None:
+            disk.save(index_to_dict(index))
+    _INDEX_CACHE[digest] = index
+    return index
+
+
+def clear_cache() -> None:
+    _INDEX_CACHE.clear()
+
+
+def _neighbourhood(index: TopologyIndex, pos: int, hops: int) -> set[int]:
+    visited = {pos}
+    frontier = [pos]
     for _ in range(max(0, hops)):
-        next_frontier: set[str] = set()
-        for node_id in frontier:
-            next_frontier.update(adjacency.get(node_id, set()))
-        next_frontier -= visited
-        visited.update(next_frontier)
+        next_frontier: list[int] = []
+        for node_pos in frontier:
+            for neighbor in index.neighbors(node_pos):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    next_frontier.append(neighbor)
+        if not next_frontier:
+            break
         frontier = next_frontier
+    return visited
+
 
-    node_sort_id = {node.rel_id: f"{id_prefix}_{node.rel_id}" for node in nodes}
-    scope_nodes = [node for node in nodes if node.rel_id in visited]
-    scope_nodes.sort(key=lambda n: node_sort_id.get(n.rel_id, n.rel_id))
+def index_error(index: TopologyIndex) -> str | None:
+    return index.pre_error or index.node_error or index.graph_error
 
-    scope_edges = [edge for edge in edges if edge.from_id in visited and edge.to_id in visited]
+
+def resolve_target(index: TopologyIndex, target: str) -> int:
+    if index.pre_error:
+        raise ValueError(index.pre_error)
+    target_ref = parse_internal_ref(target)
+    if not target_ref or target_ref.kind != "Node":
+        raise ValueError(f"E_CONTEXT_PACK_TARGET_INVALID: {target}")
+    if index.node_error:
+        raise ValueError(index.node_error)
+    pos = index.positions.get(target_ref.rel_id)
+    if pos is None:
+        raise ValueError(f"E_CONTEXT_PACK_TARGET_NOT_FOUND: {target_ref.rel_id}")
+    if index.graph_error:
+        raise ValueError(index.graph_error)
+    return pos
+
+
+def render_context_pack(index: TopologyIndex, target: str, hops: int = 1) -> str:
+    pos = resolve_target(index, target)
+    visited = _neighbourhood(index, pos, hops)
+    visited_ids = {index.node_ids[idx] for idx in visited}
+
+    scope_nodes: list[str] = []
+    for idx in visited:
+        scope_nodes.extend([index.node_ids[idx]] * index.node_counts[idx])
+    scope_nodes.sort(key=index.canon_id)
+
+    node_sort_id = {rel_id: index.canon_id(rel_id) for rel_id in visited_ids}
+    edge_ids = {edge_idx for idx in visited for edge_idx in index.incident_edges(idx)}
+    scope_edges = [
+        index.edges[edge_idx]
+        for edge_idx in sorted(edge_ids)
+        if index.edges[edge_idx].from_id in visited_ids and index.edges[edge_idx].to_id in visited_ids
+    ]
     scope_edges.sort(key=lambda e: _edge_sort_key(e, node_sort_id))
 
     contracts: list[str] = []
@@ -332,29 +559,30 @@ def extract_context_pack(path: Path, target: str, hops: int = 1) -> str:
             contracts.append(token)
     contracts = sorted(dict.fromkeys(contracts))
 
+    intent_ids = {intent_idx for idx in visited for intent_idx in index.incident_intents(idx)}
     scope_intents = [
-        intent
-        for intent in intents
-        if intent.from_id in visited and intent.to_id in visited
+        index.intents[intent_idx]
+        for intent_idx in sorted(intent_ids)
+        if index.intents[intent_idx].from_id in visited_ids and index.intents[intent_idx].to_id in visited_ids
     ]
     scope_intents.sort(key=lambda i: i.intent_id)
 
-    stage_value = stage or "L2"
+    stage_value = index.stage or "L2"
 
     out: list[str] = [
         "Context Pack",
         "Header:",
-        f"  target: @Node.{target_ref.rel_id}",
-        f"  profile: {profile}",
+        f"  target: @Node.{index.node_ids[pos]}",
+        f"  profile: {index.profile}",
         f"  stage: {stage_value}",
         "Nodes:",
     ]
     if not scope_nodes:
         out.append("  []")
     else:
-        for node in scope_nodes:
-            canon_id = node_sort_id.get(node.rel_id, "None")
-            out.append(f"  - rel_id: {node.rel_id}")
+        for rel_id in scope_nodes:
+            canon_id = node_sort_id.get(rel_id, "None")
+            out.append(f"  - rel_id: {rel_id}")
             out.append(f"    canon_id: {canon_id}")
 
     out.append("Edges:")
@@ -396,3 +624,22 @@ def extract_context_pack(path: Path, target: str, hops: int = 1) -> str:
         out.append("Open TODO: {}")
 
     return "\n".join(out) + "\n"
+
+
+def extract_context_pack(path: Path, target: str, hops: int = 1, cache_dir: Path | None = None) -> str:
+    return render_context_pack(load_topology_index(path, cache_dir, Path()), target, hops)
+
+
+def extract_all_context_packs(
+    path: Path,
+    hops: int = 1,
+    cache_dir: Path | None = None,
+) -> list[tuple[str, str]]:
+    index = load_topology_index(path, cache_dir, Path())
+    error = index_error(index)
+    if error:
+        raise ValueError(error)
+    return [
+        (rel_id, render_context_pack(index, f"@Node.{rel_id}", hops))
+        for rel_id in sorted(index.node_ids, key=index.canon_id)
+    ]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Generic, TypeVar
+
+from .io_atomic import atomic_write_text
+
+CHECK_PERSIST_ENV = "SDSL_CHECK_CACHE"
+SETTLE_NS = 2_000_000_000
+
+T = TypeVar("T")
+Stamp = tuple[int, int, int]
+
+
+def has_symlink_parent(path: Path, stop: Path) -> bool:
+    for parent in [path, *path.parents]:
+        if parent == stop:
+            break
+        if parent.is_symlink():
+            return True
+    return False
+
+
+def check_persist() -> bool:
+    return os.environ.get(CHECK_PERSIST_ENV, "").strip().lower() in {"1", "on", "true"}
+
+
+def file_stamp(path: Path) -> Stamp:
+    stat = path.stat()
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def settled(mtime_ns: int) -> bool:
+    return time.time_ns() - mtime_ns > SETTLE_NS
+
+
+def _toolchain() -> str:
+    from .gate_cache import toolchain_digest
+
+    return toolchain_digest()
+
+
+class DiskCache:
+    def __init__(
+        self,
+        project_root: Path,
+        rel_path: Path,
+        version: str,
+        toolchain: bool = False,
+        persist: bool = True,
+    ) -> None:
+        self.project_root = project_root
+        self.path = project_root / rel_path
+        self.version = version
+        self.toolchain = toolchain
+        self.persist = persist
+
+    def usable(self) -> bool:
+        parts = self.path.relative_to(self.project_root).parts
+        anchor = self.project_root / parts[0] if len(parts) > 1 else self.project_root
+        if not anchor.is_dir() or anchor.is_symlink():
+            return False
+        if has_symlink_parent(self.path.parent, self.project_root):
+            return False
+        return not self.path.is_symlink()
+
+    def load(self) -> dict[str, Any] | None:
+        if not self.usable() or not self.path.is_file():
+            return None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != self.version:
+            return None
+        if self.toolchain and data.get("toolchain") != _toolchain():
+            return None
+        return data
+
+    def save(self, body: dict[str, Any]) -> bool:
+        if not self.persist or not self.usable():
+            return False
+        payload: dict[str, Any] = {"version": self.version}
+        if self.toolchain:
+            payload["toolchain"] = _toolchain()
+        payload.update(body)
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.path, text)
+        except (OSError, ValueError):
+            return False
+        return True
+
+
+class StatEntries(Generic[T]):
+    def __init__(self) -> None:
+        self.entries: dict[str, tuple[Stamp, T]] = {}
+        self.dirty = False
+
+    def load(self, items: dict[str, Any], decode: Callable[[Any], T | None]) -> None:
+        for rel, item in items.items():
+            if not isinstance(item, list) or len(item) != 4:
+                continue
+            size, mtime_ns, inode, raw = item
+            if not all(isinstance(value, int) for value in (size, mtime_ns, inode)):
+                continue
+            value = decode(raw)
+            if value is not None:
+                self.entries[rel] = ((size, mtime_ns, inode), value)
+
+    def dump(self, encode: Callable[[T], Any]) -> dict[str, list]:
+        return {rel: [*stamp, encode(value)] for rel, (stamp, value) in sorted(self.entries.items())}
+
+    def get(self, rel: str, stamp: Stamp) -> T | None:
+        cached = self.entries.get(rel)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        return None
+
+    def put(self, rel: str, stamp: Stamp, value: T) -> None:
+        if settled(stamp[1]):
+            if self.entries.get(rel) != (stamp, value):
+                self.entries[rel] = (stamp, value)
+                self.dirty = True
+        elif rel in self.entries:
+            del self.entries[rel]
+            self.dirty = True
+
+    def prune(self, keep: Callable[[str], bool]) -> None:
+        stale = [rel for rel in self.entries if not keep(rel)]
+        for rel in stale:
+            del self.entries[rel]
+        if stale:
+            self.dirty = True
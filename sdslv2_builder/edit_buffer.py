@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterator, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class Edit:
+    start: int
+    end: int
+    value: str | tuple[str, ...]
+    seq: int
+
+
+class EditBuffer:
+    def __init__(self, base: str | Sequence[str]) -> None:
+        self.base = base
+        self.edits: list[Edit] = []
+
+    def __len__(self) -> int:
+        return len(self.edits)
+
+    def replace(self, start: int, end: int, value: str | Sequence[str]) -> None:
+        if not 0 <= start <= end <= len(self.base):
+            raise ValueError(f"E_EDIT_RANGE_INVALID: {start}-{end} (size {len(self.base)})")
+        if isinstance(self.base, str):
+            if not isinstance(value, str):
+                raise ValueError("E_EDIT_VALUE_INVALID: text edits take str")
+        elif isinstance(value, str):
+            raise ValueError("E_EDIT_VALUE_INVALID: line edits take a sequence of lines")
+        else:
+            value = tuple(value)
+        self.edits.append(Edit(start, end, value, len(self.edits)))
+
+    def insert(self, pos: int, value: str | Sequence[str]) -> None:
+        self.replace(pos, pos, value)
+
+    def delete(self, start: int, end: int) -> None:
+        self.replace(start, end, "" if isinstance(self.base, str) else ())
+
+    def ordered(self) -> list[Edit]:
+        edits = sorted(self.edits, key=lambda edit: (edit.start, edit.end, edit.seq))
+        for prev, edit in zip(edits, edits[1:]):
+            if edit.start < prev.end:
+                raise ValueError(
+                    f"E_EDIT_CONFLICT: {prev.start}-{prev.end} overlaps {edit.start}-{edit.end}"
+                )
+        return edits
+
+    def pieces(self) -> Iterator[str | Sequence[str]]:
+        pos = 0
+        for edit in self.ordered():
+            if edit.start > pos:
+                yield self.base[pos : edit.start]
+            if edit.value:
+                yield edit.value
+            pos = edit.end
+        if pos < len(self.base):
+            yield self.base[pos:]
+
+    def render(self) -> str | list[str]:
+        if isinstance(self.base, str):
+            return "".join(self.pieces())
+        return list(chain.from_iterable(self.pieces()))
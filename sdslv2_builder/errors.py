@@ -1,6 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import json
+import os
+import sys
+from typing import Iterable, Iterator, Mapping, TextIO
+
+DIAG_FORMAT_ENV = "SDSL_DIAG_FORMAT"
+DIAG_CAP_ENV = "SDSL_DIAG_CAP"
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
 
 
 def _escape_json_pointer_segment(segment: str) -> str:
@@ -35,3 +44,122 @@ class BuilderError(Exception):
     def __init__(self, diagnostic: Diagnostic) -> None:
         super().__init__(f"{diagnostic.code}: {diagnostic.message}")
         self.diagnostic = diagnostic
+
+
+def parse_caps(raw: str | None) -> tuple[int | None, dict[str, int]]:
+    default: int | None = None
+    per_code: dict[str, int] = {}
+    for item in (raw or "").split(","):
+        key, sep, value = item.strip().rpartition("=")
+        try:
+            cap = int(value)
+        except ValueError:
+            continue
+        if cap < 0:
+            continue
+        if sep:
+            per_code[key.strip()] = cap
+        else:
+            default = cap
+    return default, per_code
+
+
+class DiagnosticSink:
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        fmt: str = FORMAT_JSON,
+        cap: int | None = None,
+        caps: Mapping[str, int] | None = None,
+    ) -> None:
+        if fmt not in {FORMAT_JSON, FORMAT_NDJSON}:
+            raise ValueError(f"E_DIAG_FORMAT_INVALID: {fmt}")
+        self.stream = stream if stream is not None else sys.stderr
+        self.fmt = fmt
+        self.cap = cap
+        self.caps = dict(caps or {})
+        self.counts: dict[str, int] = {}
+        self.suppressed: dict[str, int] = {}
+        self.total = 0
+        self._buffer: list[dict[str, str]] = []
+        self._closed = False
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _limit(self, code: str) -> int | None:
+        return self.caps.get(code, self.cap)
+
+    def _write(self, item: dict[str, str]) -> None:
+        if self.fmt == FORMAT_NDJSON:
+            self.stream.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self.stream.flush()
+        else:
+            self._buffer.append(item)
+
+    def append(self, diag: Diagnostic) -> None:
+        if self._closed:
+            raise ValueError("E_DIAG_SINK_CLOSED")
+        self.total += 1
+        count = self.counts.get(diag.code, 0) + 1
+        self.counts[diag.code] = count
+        limit = self._limit(diag.code)
+        if limit is not None and count > limit:
+            self.suppressed[diag.code] = self.suppressed.get(diag.code, 0) + 1
+            return
+        self._write(diag.to_dict())
+
+    def extend(self, diags: Iterable[Diagnostic]) -> None:
+        for diag in diags:
+            self.append(diag)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for code, count in self.suppressed.items():
+            summary = Diagnostic(
+                code=code,
+                message="Diagnostics suppressed by cap",
+                expected=f"<= {self._limit(code)}",
+                got=str(count),
+                path="",
+            )
+            self._write(summary.to_dict())
+        if self.fmt == FORMAT_JSON:
+            print(json.dumps(self._buffer, ensure_ascii=False, indent=2), file=self.stream)
+            self._buffer = []
+
+
+def diagnostic_sink(stream: TextIO | None = None) -> DiagnosticSink:
+    fmt = os.environ.get(DIAG_FORMAT_ENV, "").strip().lower() or FORMAT_JSON
+    if fmt not in {FORMAT_JSON, FORMAT_NDJSON}:
+        fmt = FORMAT_JSON
+    cap, caps = parse_caps(os.environ.get(DIAG_CAP_ENV))
+    return DiagnosticSink(stream=stream, fmt=fmt, cap=cap, caps=caps)
+
+
+def print_diagnostics(diags: Iterable[Diagnostic], stream: TextIO | None = None) -> None:
+    sink = diagnostic_sink(stream)
+    sink.extend(diags)
+    sink.close()
+
+
+def iter_diagnostics(text: str) -> Iterator[dict]:
+    if text.lstrip().startswith("["):
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError("E_DIAG_STREAM_INVALID") from exc
+        if not isinstance(payload, list):
+            raise ValueError("E_DIAG_STREAM_INVALID")
+        yield from payload
+        return
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError("E_DIAG_STREAM_INVALID") from exc
+        yield item
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from pathlib import Path
+
+HASH_OK = "OK"
+HASH_RANGE = "RANGE"
+HASH_READ = "READ"
+
+_SOURCE_CACHE: dict[str, tuple[tuple[int, int], list[str]]] = {}
+
+
+def normalize_text(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_source_lines(path: Path) -> list[str]:
+    stat = path.stat()
+    key = str(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _SOURCE_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    lines = normalize_text(path.read_text(encoding="utf-8")).split("\n")
+    _SOURCE_CACHE[key] = (signature, lines)
+    return lines
+
+
+def clear_cache() -> None:
+    _SOURCE_CACHE.clear()
+
+
+def hash_lines(lines: list[str], start: int, end: int) -> str | None:
+    if start < 1 or end < start or end > len(lines):
+        return None
+    payload = "\n".join(line.rstrip(" \t") for line in lines[start - 1 : end])
+    digest = sha256(payload.encode("utf-8")).hexdigest()
+    return f"sha256:{digest}"
+
+
+def hash_source_group(path: str, ranges: list[tuple[int, int]]) -> list[tuple[str, str]]:
+    try:
+        lines = read_source_lines(Path(path))
+    except (OSError, UnicodeDecodeError) as exc:
+        return [(HASH_READ, str(exc))] * len(ranges)
+    memo: dict[tuple[int, int], tuple[str, str]] = {}
+    results: list[tuple[str, str]] = []
+    for span in ranges:
+        result = memo.get(span)
+        if result is None:
+            digest = hash_lines(lines, span[0], span[1])
+            result = (HASH_RANGE, "") if digest is None else (HASH_OK, digest)
+            memo[span] = result
+        results.append(result)
+    return results
+
+
+def hash_locators(requests: list[tuple[Path, int, int]], jobs: int = 1) -> list[tuple[str, str]]:
+    groups: dict[str, list[int]] = {}
+    for idx, (path, _, _) in enumerate(requests):
+        groups.setdefault(str(path), []).append(idx)
+    tasks = [(path, [requests[idx][1:] for idx in indexes]) for path, indexes in groups.items()]
+    if jobs <= 1 or len(tasks) <= 1:
+        outcomes = [hash_source_group(path, ranges) for path, ranges in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            outcomes = list(pool.map(hash_source_group, *zip(*tasks)))
+    results: list[tuple[str, str]] = [(HASH_READ, "")] * len(requests)
+    for indexes, outcome in zip(groups.values(), outcomes):
+        for idx, result in zip(indexes, outcome):
+            results[idx] = result
+    return results
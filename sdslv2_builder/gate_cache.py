@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from hashlib import sha256
+import json
+import os
+from pathlib import Path
+
+from .disk_cache import has_symlink_parent
+from .errors import DIAG_CAP_ENV, DIAG_FORMAT_ENV
+from .gate_exec import GateResult
+from .input_hash import hash_inputs
+from .io_atomic import atomic_write_text
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR_REL = Path("OUTPUT") / ".gate_cache"
+CACHE_VERSION = "gate-cache-v1"
+TOOLCHAIN_DIRS = [
+    "L0_builder",
+    "L1_builder",
+    "L2_builder",
+    "scripts",
+    "sdslv2_builder",
+    "ssot_kernel_builder",
+]
+INPUT_SUFFIXES = (".json", ".sdsl2", ".yaml", ".yml")
+
+_TOOLCHAIN_DIGEST: str | None = None
+
+
+def _walk_files(base: Path, suffix: str | tuple[str, ...] | None = None) -> list[Path]:
+    if base.is_symlink():
+        return []
+    if base.is_file():
+        return [base]
+    files: list[Path] = []
+    if not base.is_dir():
+        return files
+    for dirpath, dirnames, filenames in os.walk(base, followlinks=False):
+        current = Path(dirpath)
+        dirnames[:] = sorted(
+            name for name in dirnames if name != "__pycache__" and not (current / name).is_symlink()
+        )
+        for name in sorted(filenames):
+            path = current / name
+            if suffix and not name.endswith(suffix):
+                continue
+            if path.is_symlink() or not path.is_file():
+                continue
+            files.append(path)
+    return files
+
+
+def toolchain_digest() -> str:
+    global _TOOLCHAIN_DIGEST
+    if _TOOLCHAIN_DIGEST is None:
+        files: list[Path] = []
+        for name in TOOLCHAIN_DIRS:
+            files.extend(_walk_files(ROOT / name, ".py"))
+        _TOOLCHAIN_DIGEST = hash_inputs(ROOT, files, persist=False)
+    return _TOOLCHAIN_DIGEST
+
+
+class GateCache:
+    def __init__(
+        self,
+        project_root: Path,
+        enabled: bool = True,
+        base_inputs: tuple[str, ...] = (),
+    ) -> None:
+        self.project_root = project_root
+        self.base_inputs = base_inputs
+        self.cache_dir = project_root / CACHE_DIR_REL
+        self.enabled = enabled and self._usable()
+        self.status: dict[str, str] = {}
+
+    def _usable(self) -> bool:
+        output_root = self.cache_dir.parent
+        if not output_root.is_dir() or output_root.is_symlink():
+            return False
+        if has_symlink_parent(output_root, self.project_root):
+            return False
+        return not self.cache_dir.is_symlink()
+
+    def fingerprint(self, cmd: list[str], inputs: tuple[str, ...]) -> str | None:
+        if not self.enabled or not inputs:
+            return None
+        scopes = list(dict.fromkeys([*self.base_inputs, *inputs]))
+        files: list[Path] = []
+        for rel in scopes:
+            files.extend(_walk_files(self.project_root / rel, INPUT_SUFFIXES))
+        try:
+            input_hash = hash_inputs(self.project_root, files)
+        except (OSError, UnicodeDecodeError, ValueError):
+            return None
+        payload = {
+            "version": CACHE_VERSION,
+            "toolchain": toolchain_digest(),
+            "argv": cmd[1:],
+            "diag": [os.environ.get(DIAG_FORMAT_ENV, ""), os.environ.get(DIAG_CAP_ENV, "")],
+            "scopes": scopes,
+            "input_hash": input_hash,
+        }
+        text = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return sha256(text.encode("utf-8")).hexdigest()
+
+    def load(self, name: str, fingerprint: str | None) -> GateResult | None:
+        if fingerprint is None:
+            return None
+        path = self.cache_dir / f"{fingerprint}.json"
+        result: GateResult | None = None
+        if path.is_file() and not path.is_symlink():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+                data = None
+            if (
+                isinstance(data, dict)
+                and data.get("version") == CACHE_VERSION
+                and isinstance(data.get("returncode"), int)
+                and isinstance(data.get("stdout"), str)
+                and isinstance(data.get("stderr"), str)
+            ):
+                result = GateResult(data["returncode"], data["stdout"], data["stderr"])
+        if result is None:
+            self.status[name] = "MISS"
+        else:
+            self.status[name] = "HIT"
+        return result
+
+    def store(self, name: str, fingerprint: str | None, result: GateResult) -> None:
+        if fingerprint is None:
+            return
+        payload = {
+            "version": CACHE_VERSION,
+            "gate": name,
+            "returncode": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+        }
+        text = json.dumps(payload, ensure_ascii=False, sort_keys=True, indent=2) + "\n"
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            if not self._usable():
+                return
+            atomic_write_text(self.cache_dir / f"{fingerprint}.json", text)
+        except (OSError, ValueError):
+            return
+
+    def pop_status(self, name: str) -> str | None:
+        return self.status.pop(name, None)
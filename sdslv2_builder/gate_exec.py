@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+import cProfile
+from dataclasses import dataclass
+import importlib
+import inspect
+import io
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from typing import TYPE_CHECKING, Callable, Iterator
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+if TYPE_CHECKING:
+    from .gate_cache import GateCache
+
+ROOT = Path(__file__).resolve().parents[1]
+RSS_SCALE = 1024 if sys.platform == "darwin" else 1
+
+
+@dataclass(frozen=True)
+class GateResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    mode: str = "cache"
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    max_rss_kb: int | None = None
+    stopped: str | None = None
+    rss_growth_kb: int | None = None
+
+
+@dataclass(frozen=True)
+class DiagStop:
+    allow: frozenset[str] = frozenset()
+
+    def blocking(self, line: str) -> str | None:
+        text = line.strip()
+        if not text.startswith("{"):
+            return None
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        code = item.get("code") if isinstance(item, dict) else None
+        if isinstance(code, str) and code not in self.allow:
+            return code
+        return None
+
+
+SOFT_DIAG_TOOLS: dict[str, str | None] = {
+    "topology_resolution_lint": "--fail-on-missing",
+    "contract_resolution_lint": "--fail-on-missing",
+    "token_registry_check": "--fail-on-unresolved",
+    "exception_lint": None,
+}
+
+
+def diag_stop(cmd: list[str] | tuple[str, ...], allow: frozenset[str] = frozenset()) -> DiagStop | None:
+    tool = Path(cmd[1]).stem if len(cmd) > 1 else ""
+    if tool in SOFT_DIAG_TOOLS:
+        strict_flag = SOFT_DIAG_TOOLS[tool]
+        if strict_flag is None or strict_flag not in cmd:
+            return None
+    return DiagStop(allow)
+
+
+@dataclass(frozen=True)
+class GateSpec:
+    name: str
+    cmd: tuple[str, ...]
+    deps: tuple[str, ...] = ()
+    inputs: tuple[str, ...] = ()
+    stop: DiagStop | None = None
+
+
+class GateStopped(BaseException):
+    def __init__(self, code: str) -> None:
+        super().__init__(code)
+        self.code = code
+
+
+class _DiagTap(io.StringIO):
+    def __init__(self, stop: DiagStop) -> None:
+        super().__init__()
+        self.stop = stop
+        self._partial = ""
+
+    def write(self, text: str) -> int:
+        size = super().write(text)
+        self._partial += text
+        if "\n" in self._partial:
+            *lines, self._partial = self._partial.split("\n")
+            for line in lines:
+                code = self.stop.blocking(line)
+                if code is not None:
+                    raise GateStopped(code)
+        return size
+
+
+def _module_name(script: Path) -> str | None:
+    try:
+        rel = script.resolve().relative_to(ROOT)
+    except ValueError:
+        return None
+    if rel.suffix != ".py":
+        return None
+    parts = rel.with_suffix("").parts
+    if not parts or not all(part.isidentifier() for part in parts):
+        return None
+    return ".".join(parts)
+
+
+def resolve_entry(script: Path) -> Callable[[list[str] | None], int] | None:
+    name = _module_name(script)
+    if name is None:
+        return None
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return None
+    entry = getattr(module, "main", None)
+    if not callable(entry):
+        return None
+    try:
+        inspect.signature(entry).bind(None)
+    except (TypeError, ValueError):
+        return None
+    return entry
+
+
+def _exit_code(exc: SystemExit, stderr: io.StringIO) -> int:
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+def _drain(
+    stream: io.TextIOBase,
+    sink: list[str],
+    stop: DiagStop | None = None,
+    halt: Callable[[str], None] | None = None,
+) -> None:
+    if stop is None or halt is None:
+        sink.append(stream.read())
+    else:
+        for line in stream:
+            sink.append(line)
+            code = stop.blocking(line)
+            if code is not None:
+                halt(code)
+                sink.append(stream.read())
+                break
+    stream.close()
+
+
+def _self_rss_kb() -> int | None:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // RSS_SCALE
+
+
+def run_subprocess(cmd: list[str], cwd: Path, stop: DiagStop | None = None) -> GateResult:
+    start = time.perf_counter()
+    if stop is None and not hasattr(os, "wait4"):
+        proc = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+        return GateResult(proc.returncode, proc.stdout, proc.stderr, "subprocess", time.perf_counter() - start)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cwd)
+    stdout: list[str] = []
+    stderr: list[str] = []
+    stopped: list[str] = []
+    lock = threading.Lock()
+
+    def halt(code: str) -> None:
+        with lock:
+            if stopped or proc.returncode is not None:
+                return
+            stopped.append(code)
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    readers = [
+        threading.Thread(target=_drain, args=(proc.stdout, stdout)),
+        threading.Thread(target=_drain, args=(proc.stderr, stderr, stop, halt)),
+    ]
+    for reader in readers:
+        reader.start()
+    cpu_s = 0.0
+    max_rss_kb: int | None = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        with lock:
+            proc.returncode = os.waitstatus_to_exitcode(status)
+        cpu_s = usage.ru_utime + usage.ru_stime
+        max_rss_kb = usage.ru_maxrss // RSS_SCALE
+    else:
+        proc.wait()
+    for reader in readers:
+        reader.join()
+    return GateResult(
+        2 if stopped else proc.returncode,
+        "".join(stdout),
+        "".join(stderr),
+        "subprocess",
+        time.perf_counter() - start,
+        cpu_s,
+        max_rss_kb,
+        stopped[0] if stopped else None,
+    )
+
+
+def run_in_process(
+    cmd: list[str],
+    cwd: Path,
+    profile_path: Path | None = None,
+    stop: DiagStop | None = None,
+) -> GateResult:
+    entry = resolve_entry(Path(cmd[1])) if len(cmd) > 1 else None
+    if entry is None:
+        return run_subprocess(cmd, cwd, stop)
+    stdout = io.StringIO()
+    stderr = _DiagTap(stop) if stop is not None else io.StringIO()
+    stopped: str | None = None
+    prev_cwd = os.getcwd()
+    prev_argv = sys.argv
+    profiler = cProfile.Profile() if profile_path is not None and sys.getprofile() is None else None
+    rss_start = _self_rss_kb()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        os.chdir(cwd)
+        sys.argv = cmd[1:]
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            if profiler is not None:
+                profiler.enable()
+            try:
+                returncode = entry(cmd[2:])
+            except GateStopped as exc:
+                stopped = exc.code
+                returncode = 2
+            except SystemExit as exc:
+                returncode = _exit_code(exc, stderr)
+            except Exception:
+                traceback.print_exc(file=stderr)
+                returncode = 1
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    finally:
+        sys.argv = prev_argv
+        os.chdir(prev_cwd)
+    wall_s = time.perf_counter() - start
+    cpu_s = time.process_time() - cpu_start
+    rss_end = _self_rss_kb()
+    rss_growth_kb = rss_end - rss_start if rss_start is not None and rss_end is not None else None
+    if profiler is not None:
+        try:
+            profile_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(profile_path))
+        except OSError:
+            pass
+    if not isinstance(returncode, int):
+        returncode = 0 if returncode is None else 1
+    return GateResult(
+        returncode,
+        stdout.getvalue(),
+        stderr.getvalue(),
+        "in_process",
+        wall_s,
+        cpu_s,
+        None,
+        stopped,
+        rss_growth_kb,
+    )
+
+
+def run_gate_command(
+    cmd: list[str],
+    cwd: Path,
+    isolate: bool = False,
+    profile_path: Path | None = None,
+    stop: DiagStop | None = None,
+) -> GateResult:
+    if isolate:
+        return run_subprocess(cmd, cwd, stop)
+    return run_in_process(cmd, cwd, profile_path, stop)
+
+
+def run_cached(
+    name: str,
+    cmd: list[str],
+    cwd: Path,
+    inputs: tuple[str, ...] = (),
+    isolate: bool = False,
+    cache: GateCache | None = None,
+    profile_path: Path | None = None,
+    stop: DiagStop | None = None,
+) -> GateResult:
+    fingerprint = cache.fingerprint(cmd, inputs) if cache is not None else None
+    if cache is not None and fingerprint is not None:
+        cached = cache.load(name, fingerprint)
+        if cached is not None:
+            return cached
+    result = run_gate_command(cmd, cwd, isolate=isolate, profile_path=profile_path, stop=stop)
+    if cache is not None and result.stopped is None:
+        cache.store(name, fingerprint, result)
+    return result
+
+
+def _check_graph(specs: list[GateSpec]) -> None:
+    names = [spec.name for spec in specs]
+    declared: set[str] = set()
+    for spec in specs:
+        if spec.name in declared:
+            raise ValueError(f"E_GATE_GRAPH_DUPLICATE: {spec.name}")
+        for dep in spec.deps:
+            if dep in names and dep not in declared:
+                raise ValueError(f"E_GATE_GRAPH_DEP_ORDER: {spec.name} -> {dep}")
+        declared.add(spec.name)
+
+
+def run_gate_graph(
+    specs: list[GateSpec],
+    cwd: Path,
+    passed: Callable[[GateSpec, GateResult], bool],
+    jobs: int = 1,
+    isolate: bool = False,
+    cache: GateCache | None = None,
+    profile_dir: Path | None = None,
+) -> Iterator[tuple[GateSpec, GateResult]]:
+    _check_graph(specs)
+
+    def profile_path(spec: GateSpec) -> Path | None:
+        return profile_dir / f"{spec.name}.pstats" if profile_dir is not None else None
+
+    if jobs <= 1:
+        for spec in specs:
+            result = run_cached(
+                spec.name,
+                list(spec.cmd),
+                cwd,
+                spec.inputs,
+                isolate=isolate,
+                cache=cache,
+                profile_path=profile_path(spec),
+                stop=spec.stop,
+            )
+            yield spec, result
+            if not passed(spec, result):
+                return
+        return
+
+    order = {spec.name: idx for idx, spec in enumerate(specs)}
+    pending = list(specs)
+    submitted: dict[str, Future] = {}
+    fingerprints: dict[str, str | None] = {}
+    results: dict[str, GateResult] = {}
+    status: dict[str, bool] = {}
+    by_name = {spec.name: spec for spec in specs}
+    pool = ProcessPoolExecutor(max_workers=jobs)
+
+    def submit_ready() -> None:
+        failed = [order[name] for name, ok in status.items() if not ok]
+        cutoff = min(failed) if failed else len(specs)
+        for spec in list(pending):
+            if order[spec.name] >= cutoff:
+                continue
+            if all(status.get(dep) is True for dep in spec.deps if dep in order):
+                pending.remove(spec)
+                fingerprint = cache.fingerprint(list(spec.cmd), spec.inputs) if cache is not None else None
+                cached = cache.load(spec.name, fingerprint) if cache is not None else None
+                if cached is not None:
+                    future: Future = Future()
+                    future.set_result(cached)
+                    submitted[spec.name] = future
+                    continue
+                fingerprints[spec.name] = fingerprint
+                submitted[spec.name] = pool.submit(
+                    run_gate_command, list(spec.cmd), cwd, isolate, profile_path(spec), spec.stop
+                )
+
+    try:
+        submit_ready()
+        for spec in specs:
+            while spec.name not in results:
+                running = {fut: name for name, fut in submitted.items() if name not in results}
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running[fut]
+                    results[name] = fut.result()
+                    if cache is not None and name in fingerprints and results[name].stopped is None:
+                        cache.store(name, fingerprints[name], results[name])
+                    status[name] = passed(by_name[name], results[name])
+                submit_ready()
+            yield spec, results[spec.name]
+            if not status[spec.name]:
+                return
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+import sys
+
+from .gate_exec import GateResult
+from .io_atomic import atomic_write_text
+
+PROFILE_VERSION = "gate-profile-v2"
+PROFILE_REL = Path("OUTPUT") / "gate_profile.json"
+PSTATS_DIR_REL = Path("OUTPUT") / ".gate_profile"
+INPUT_FLAGS = {"--input", "--decisions-path", "--evidence-path", "--ssot-registry", "--contract-registry"}
+
+
+@dataclass(frozen=True)
+class GateRecord:
+    name: str
+    returncode: int
+    source: str
+    wall_s: float
+    cpu_s: float
+    max_rss_kb: int | None
+    rss_growth_kb: int | None
+    input_files: int
+    input_bytes: int
+
+
+def _has_symlink_parent(path: Path, stop: Path) -> bool:
+    for parent in [path, *path.parents]:
+        if parent == stop:
+            return False
+        if parent.is_symlink():
+            return True
+    return False
+
+
+def _kb(value: int | None) -> str:
+    return "-" if value is None else str(value)
+
+
+def _input_paths(project_root: Path, cmd: list[str], inputs: tuple[str, ...]) -> list[Path]:
+    raw = [item for item in inputs if item]
+    for idx, arg in enumerate(cmd[:-1]):
+        if arg in INPUT_FLAGS:
+            raw.append(cmd[idx + 1])
+    paths: list[Path] = []
+    for item in raw:
+        path = Path(item)
+        if not path.is_absolute():
+            path = project_root / path
+        path = Path(os.path.normpath(path))
+        try:
+            path.relative_to(project_root)
+        except ValueError:
+            continue
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def input_size(project_root: Path, cmd: list[str], inputs: tuple[str, ...] = ()) -> tuple[int, int]:
+    seen: set[Path] = set()
+    total = 0
+    for path in _input_paths(project_root, cmd, inputs):
+        if not path.exists() or _has_symlink_parent(path, project_root):
+            continue
+        if path.is_file():
+            files = [path]
+        else:
+            files = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                base = Path(dirpath)
+                dirnames[:] = sorted(name for name in dirnames if not (base / name).is_symlink())
+                files.extend(base / name for name in filenames if not (base / name).is_symlink())
+        for file in files:
+            if file in seen:
+                continue
+            seen.add(file)
+            try:
+                total += file.stat().st_size
+            except OSError:
+                continue
+    return len(seen), total
+
+
+class GateProfile:
+    def __init__(self, runner: str, project_root: Path, pstats: bool = False) -> None:
+        self.runner = runner
+        self.project_root = project_root
+        self.pstats_dir = project_root / PSTATS_DIR_REL / runner if pstats else None
+        self.records: list[GateRecord] = []
+
+    def pstats_path(self, name: str) -> Path | None:
+        if self.pstats_dir is None:
+            return None
+        index = sum(1 for record in self.records if record.name == name)
+        suffix = f".{index}" if index else ""
+        return self.pstats_dir / f"{name}{suffix}.pstats"
+
+    def record(
+        self,
+        name: str,
+        cmd: list[str],
+        inputs: tuple[str, ...],
+        result: GateResult,
+        cache_status: str | None = None,
+    ) -> None:
+        files, size = input_size(self.project_root, cmd, inputs)
+        self.records.append(
+            GateRecord(
+                name=name,
+                returncode=result.returncode,
+                source="cache" if cache_status == "HIT" else result.mode,
+                wall_s=round(result.wall_s, 6),
+                cpu_s=round(result.cpu_s, 6),
+                max_rss_kb=result.max_rss_kb,
+                rss_growth_kb=result.rss_growth_kb,
+                input_files=files,
+                input_bytes=size,
+            )
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "gates": [asdict(record) for record in self.records],
+            "total_wall_s": round(sum(record.wall_s for record in self.records), 6),
+            "total_cpu_s": round(sum(record.cpu_s for record in self.records), 6),
+        }
+
+    def write(self) -> Path | None:
+        output_root = self.project_root / "OUTPUT"
+        path = self.project_root / PROFILE_REL
+        if not output_root.is_dir() or output_root.is_symlink() or path.is_symlink():
+            return None
+        data: dict = {}
+        if path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+                data = {}
+        if not isinstance(data, dict) or data.get("version") != PROFILE_VERSION:
+            data = {}
+        runners = data.get("runners") if isinstance(data.get("runners"), dict) else {}
+        runners[self.runner] = self.to_dict()
+        payload = {"version": PROFILE_VERSION, "runners": dict(sorted(runners.items()))}
+        try:
+            atomic_write_text(path, json.dumps(payload, ensure_ascii=False, indent=2) + "\n")
+        except (OSError, ValueError):
+            return None
+        return path
+
+    def summary_lines(self) -> list[str]:
+        header = (
+            f"{'gate':<28} {'src':<10} {'rc':>3} {'wall_s':>9} {'cpu_s':>9} {'rss_kb':>9} {'rss_grow':>9} "
+            f"{'files':>6} {'bytes':>11}"
+        )
+        lines = [f"[PROFILE] {self.runner}", header]
+        for record in sorted(self.records, key=lambda item: (-item.wall_s, item.name)):
+            lines.append(
+                f"{record.name:<28} {record.source:<10} {record.returncode:>3} {record.wall_s:>9.3f} "
+                f"{record.cpu_s:>9.3f} {_kb(record.max_rss_kb):>9} {_kb(record.rss_growth_kb):>9} "
+                f"{record.input_files:>6} {record.input_bytes:>11}"
+            )
+        totals = self.to_dict()
+        lines.append(f"{'total':<28} {'':<10} {'':>3} {totals['total_wall_s']:>9.3f} {totals['total_cpu_s']:>9.3f}")
+        return lines
+
+    def finish(self, summary: bool = False) -> None:
+        self.write()
+        if summary:
+            for line in self.summary_lines():
+                print(line, file=sys.stderr)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import time
+from typing import Iterator
+
+from . import context_pack, evidence_hash, git_meta, op_yaml, sdsl_ast, ssot_kernel
+from .gate_exec import GateSpec
+
+WATCH_ROOTS = (".sdsl", "decisions", "drafts", "policy", "sdsl2")
+SKIP_DIRS = {".git", "OUTPUT", "__pycache__"}
+
+Snapshot = dict[str, tuple[int, int]]
+
+
+def reset_process_caches() -> None:
+    sdsl_ast.clear_cache()
+    op_yaml.clear_parse_cache()
+    context_pack.clear_cache()
+    evidence_hash.clear_cache()
+    ssot_kernel.clear_cache()
+    git_meta.clear_cache()
+
+
+def scope_rel(project_root: Path, scope: str) -> str | None:
+    path = Path(scope)
+    if path.is_absolute():
+        try:
+            path = path.relative_to(project_root)
+        except ValueError:
+            return None
+    rel = Path(os.path.normpath(path)).as_posix()
+    if rel.startswith("..") or rel == "OUTPUT" or rel.startswith("OUTPUT/"):
+        return None
+    return "" if rel == "." else rel
+
+
+def snapshot(project_root: Path, roots: list[str]) -> Snapshot:
+    stamps: Snapshot = {}
+    for root in roots:
+        base = project_root / root
+        if base.is_symlink() or not base.exists():
+            continue
+        if base.is_file():
+            try:
+                stat = base.stat()
+            except OSError:
+                continue
+            stamps[root] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            current = Path(dirpath)
+            dirnames[:] = [
+                name for name in dirnames if name not in SKIP_DIRS and not (current / name).is_symlink()
+            ]
+            for name in filenames:
+                path = current / name
+                if path.is_symlink():
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                stamps[path.relative_to(project_root).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def changed_paths(before: Snapshot, after: Snapshot) -> list[str]:
+    changed = {path for path, stamp in after.items() if before.get(path) != stamp}
+    changed.update(path for path in before if path not in after)
+    return sorted(changed)
+
+
+def _touches(path: str, scope: str) -> bool:
+    return scope == "" or path == scope or path.startswith(scope + "/")
+
+
+def affected_specs(
+    specs: list[GateSpec],
+    scopes: dict[str, tuple[str, ...]],
+    changed: list[str],
+    base_scopes: tuple[str, ...] = (),
+) -> list[GateSpec]:
+    if any(_touches(path, scope) for path in changed for scope in base_scopes):
+        return list(specs)
+    selected: set[str] = set()
+    for spec in specs:
+        gate_scopes = scopes.get(spec.name)
+        if (
+            gate_scopes is None
+            or any(dep in selected for dep in spec.deps)
+            or any(_touches(path, scope) for path in changed for scope in gate_scopes)
+        ):
+            selected.add(spec.name)
+    return [spec for spec in specs if spec.name in selected]
+
+
+def watch_roots(scopes: dict[str, tuple[str, ...]], base_scopes: tuple[str, ...] = ()) -> list[str]:
+    roots = set(WATCH_ROOTS)
+    for items in scopes.values():
+        roots.update(items)
+    roots.update(base_scopes)
+    ordered = sorted(root for root in roots if root)
+    return [root for root in ordered if not any(_touches(root, other) for other in ordered if other != root)]
+
+
+def poll_changes(
+    project_root: Path,
+    roots: list[str],
+    interval: float,
+    settle: float = 0.2,
+    before: Snapshot | None = None,
+) -> Iterator[list[str]]:
+    if before is None:
+        before = snapshot(project_root, roots)
+    while True:
+        time.sleep(interval)
+        after = snapshot(project_root, roots)
+        if after == before:
+            continue
+        while True:
+            time.sleep(settle)
+            settled = snapshot(project_root, roots)
+            if settled == after:
+                break
+            after = settled
+        changed = changed_paths(before, after)
+        before = after
+        if changed:
+            yield changed
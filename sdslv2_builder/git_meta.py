@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import re
+import subprocess
+
+ENV_KEY = "SDSL_GIT_HEAD"
+UNKNOWN = "UNKNOWN"
+GIT_MISSING = "GIT_MISSING"
+REV_MISSING = "MISSING"
+REV_EMPTY = "EMPTY"
+
+OBJECT_ID_RE = re.compile(r"^(?:[0-9a-f]{40}|[0-9a-f]{64})$")
+
+_CACHE: dict[str, tuple[tuple[str | None, str | None], str | None]] = {}
+
+
+def _find_git_dir(root: Path) -> Path | None:
+    for base in [root, *root.parents]:
+        dotgit = base / ".git"
+        if dotgit.is_dir():
+            return dotgit
+        if dotgit.is_file():
+            try:
+                text = dotgit.read_text(encoding="utf-8").strip()
+            except (OSError, UnicodeDecodeError):
+                return None
+            if not text.startswith("gitdir:"):
+                return None
+            git_dir = Path(text[len("gitdir:") :].strip())
+            if not git_dir.is_absolute():
+                git_dir = (base / git_dir).resolve()
+            return git_dir if git_dir.is_dir() else None
+    return None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    commondir = git_dir / "commondir"
+    if not commondir.is_file():
+        return git_dir
+    try:
+        raw = commondir.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return git_dir
+    path = Path(raw)
+    return path if path.is_absolute() else (git_dir / path).resolve()
+
+
+def _packed_ref(common_dir: Path, ref: str) -> str | None:
+    packed = common_dir / "packed-refs"
+    if not packed.is_file():
+        return None
+    try:
+        lines = packed.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+    for line in lines:
+        if not line or line[0] in "#^":
+            continue
+        parts = line.split(" ", 1)
+        if len(parts) == 2 and parts[1] == ref:
+            return parts[0]
+    return None
+
+
+def _read_head(root: Path) -> str | None:
+    if "GIT_DIR" in os.environ or "GIT_CEILING_DIRECTORIES" in os.environ:
+        return None
+    git_dir = _find_git_dir(root)
+    if git_dir is None:
+        return None
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if OBJECT_ID_RE.match(head):
+        return head
+    if not head.startswith("ref:"):
+        return None
+    ref = head[len("ref:") :].strip()
+    if not ref.startswith("refs/"):
+        return None
+    common_dir = _common_dir(git_dir)
+    for base in (git_dir, common_dir):
+        ref_path = base / ref
+        if ref_path.is_file():
+            try:
+                value = ref_path.read_text(encoding="utf-8").strip()
+            except (OSError, UnicodeDecodeError):
+                return None
+            return value if OBJECT_ID_RE.match(value) else None
+    value = _packed_ref(common_dir, ref)
+    return value if value and OBJECT_ID_RE.match(value) else None
+
+
+def _head_stamp(root: Path) -> str | None:
+    if "GIT_DIR" in os.environ or "GIT_CEILING_DIRECTORIES" in os.environ:
+        return None
+    git_dir = _find_git_dir(root)
+    if git_dir is None:
+        return None
+    head_path = git_dir / "HEAD"
+    try:
+        head = head_path.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    paths = [head_path]
+    if head.startswith("ref:"):
+        ref = head[len("ref:") :].strip()
+        common_dir = _common_dir(git_dir)
+        paths.extend([git_dir / ref, common_dir / ref, common_dir / "packed-refs"])
+    stamps: list[str] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stamps.append("-")
+            continue
+        stamps.append(f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}")
+    return head + "|" + ",".join(stamps)
+
+
+def _run_rev_parse(root: Path) -> tuple[str | None, str | None]:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(root), "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        return None, GIT_MISSING
+    if proc.returncode != 0:
+        return None, REV_MISSING
+    rev = proc.stdout.strip()
+    if not rev:
+        return None, REV_EMPTY
+    return rev, None
+
+
+def _load_handoff() -> dict[str, list]:
+    raw = os.environ.get(ENV_KEY)
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def git_head(root: Path) -> tuple[str | None, str | None]:
+    key = str(root.resolve())
+    stamp = _head_stamp(Path(key))
+    cached = _CACHE.get(key)
+    if cached is not None and cached[1] == stamp:
+        return cached[0]
+    entry = _load_handoff().get(key)
+    if isinstance(entry, list) and len(entry) == 3 and entry[2] == stamp:
+        result = (entry[0], entry[1])
+    else:
+        rev = _read_head(Path(key))
+        result = (rev, None) if rev else _run_rev_parse(Path(key))
+        handoff = _load_handoff()
+        handoff[key] = [*result, stamp]
+        os.environ[ENV_KEY] = json.dumps(handoff, sort_keys=True, separators=(",", ":"))
+    _CACHE[key] = (result, stamp)
+    return result
+
+
+def git_rev(root: Path) -> str:
+    rev, _ = git_head(root)
+    return rev or UNKNOWN
+
+
+def clear_cache() -> None:
+    _CACHE.clear()
+    os.environ.pop(ENV_KEY, None)
@@ -5,6 +5,12 @@ from hashlib import sha256
 import os
 from pathlib import Path
 
+from .disk_cache import DiskCache, StatEntries, file_stamp, has_symlink_parent
+
+CACHE_ENV = "SDSL_INPUT_HASH_CACHE"
+CACHE_REL = Path("OUTPUT") / ".input_hash_cache.json"
+CACHE_VERSION = "input-hash-cache-v1"
+
 
 @dataclass(frozen=True)
 class InputHashResult:
@@ -27,21 +33,12 @@ def _content_hash(path: Path) -> str:
     return sha256(normalized.encode("utf-8")).hexdigest()
 
 
-def _has_symlink_parent(path: Path, stop: Path) -> bool:
-    for parent in [path, *path.parents]:
-        if parent == stop:
-            break
-        if parent.is_symlink():
-            return True
-    return False
-
-
 def _validate_path(path: Path, root: Path) -> None:
     if not path.exists():
         raise FileNotFoundError(f"INPUT_HASH_MISSING:{path}")
     if path.is_symlink():
         raise ValueError(f"INPUT_HASH_SYMLINK:{path}")
-    if _has_symlink_parent(path, root):
+    if has_symlink_parent(path, root):
         raise ValueError(f"INPUT_HASH_SYMLINK_PARENT:{path}")
     if not path.is_file():
         raise ValueError(f"INPUT_HASH_NOT_FILE:{path}")
@@ -51,6 +48,56 @@ def _validate_path(path: Path, root: Path) -> None:
         raise ValueError(f"INPUT_HASH_OUTSIDE_ROOT:{path}") from None
 
 
+def _cache_mode() -> str:
+    value = os.environ.get(CACHE_ENV, "").strip().lower()
+    if value in {"off", "0", "false"}:
+        return "off"
+    if value == "strict":
+        return "strict"
+    return "on"
+
+
+class _DigestCache:
+    def __init__(self, root: Path, strict: bool, persist: bool) -> None:
+        self.root = root
+        self.strict = strict
+        self.disk = DiskCache(root, CACHE_REL, CACHE_VERSION, persist=persist)
+        self.digests: StatEntries[str] = StatEntries()
+        data = self.disk.load()
+        if data is not None and isinstance(data.get("entries"), dict):
+            self.digests.load(data["entries"], lambda raw: raw if isinstance(raw, str) else None)
+
+    def digest(self, path: Path, rel: str) -> str:
+        stamp = file_stamp(path)
+        cached = self.digests.get(rel, stamp)
+        if cached is not None and not self.strict:
+            return cached
+        digest = _content_hash(path)
+        if cached is not None and cached != digest:
+            raise ValueError(f"INPUT_HASH_CACHE_STALE:{path}")
+        self.digests.put(rel, stamp, digest)
+        return digest
+
+    def save(self) -> None:
+        if self.digests.dirty and self.disk.save({"entries": self.digests.dump(lambda digest: digest)}):
+            self.digests.dirty = False
+
+
+def hash_inputs(root: Path, inputs: list[Path], persist: bool = True) -> str:
+    mode = _cache_mode()
+    cache = _DigestCache(root, mode == "strict", persist) if mode != "off" else None
+    parts: list[str] = []
+    for path in sorted(dict.fromkeys(inputs), key=lambda p: _rel_path(root, p)):
+        rel = _rel_path(root, path)
+        digest = cache.digest(path, rel) if cache is not None else _content_hash(path)
+        parts.append(f"{rel}\n{digest}\n")
+    if cache is not None:
+        cache.save()
+    payload = "".join(parts)
+    digest = sha256(payload.encode("utf-8")).hexdigest()
+    return f"sha256:{digest}"
+
+
 def _ssot_files(root: Path) -> list[Path]:
     files: list[Path] = []
     for profile in ["contract", "topology"]:
@@ -86,6 +133,7 @@ def compute_input_hash(
     extra_inputs: list[Path] | None = None,
     include_policy: bool = False,
     include_decisions: bool = True,
+    persist: bool = True,
 ) -> InputHashResult:
     inputs = _base_inputs(root, include_decisions)
     if include_policy:
@@ -102,12 +150,4 @@ def compute_input_hash(
             _validate_path(path, root)
             inputs.append(path)
     inputs = sorted(dict.fromkeys(inputs), key=lambda p: _rel_path(root, p))
-
-    parts: list[str] = []
-    for path in inputs:
-        rel = _rel_path(root, path)
-        digest = _content_hash(path)
-        parts.append(f"{rel}\n{digest}\n")
-    payload = "".join(parts)
-    digest = sha256(payload.encode("utf-8")).hexdigest()
-    return InputHashResult(input_hash=f"sha256:{digest}", inputs=inputs)
+    return InputHashResult(input_hash=hash_inputs(root, inputs, persist), inputs=inputs)
@@ -3,9 +3,19 @@ from __future__ import annotations
 import os
 import tempfile
 from pathlib import Path
+from typing import Iterable
 
 
 def atomic_write_text(path: Path, text: str, encoding: str = "utf-8", symlink_code: str = "E_ATOMIC_WRITE_SYMLINK") -> None:
+    atomic_write_chunks(path, (text,), encoding=encoding, symlink_code=symlink_code)
+
+
+def atomic_write_chunks(
+    path: Path,
+    chunks: Iterable[str],
+    encoding: str = "utf-8",
+    symlink_code: str = "E_ATOMIC_WRITE_SYMLINK",
+) -> None:
     tmp_path: Path | None = None
     existing_mode: int | None = None
     try:
@@ -17,10 +27,11 @@ def atomic_write_text(path: Path, text: str, encoding: str = "utf-8", symlink_co
             except OSError:
                 existing_mode = None
         with tempfile.NamedTemporaryFile("w", encoding=encoding, delete=False, dir=path.parent) as tmp:
-            tmp.write(text)
+            tmp_path = Path(tmp.name)
+            for chunk in chunks:
+                tmp.write(chunk)
             tmp.flush()
             os.fsync(tmp.fileno())
-            tmp_path = Path(tmp.name)
         if existing_mode is not None:
             os.chmod(tmp_path, existing_mode)
         if path.exists() and path.is_symlink():
@@ -12,16 +12,18 @@ from .refs import ContractRef, InternalRef, parse_contract_ref, parse_internal_r
 
 RELID_RE = re.compile(r"^[A-Z][A-Z0-9_]{2,63}$")
 DIRECTION_VOCAB = {"pub", "sub", "req", "rep", "rw", "call"}
+INT_RE = re.compile(r"^-?\d+$")
+FLOAT_RE = re.compile(r"^-?\d+\.\d+$")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NodeInput:
     rel_id: str
     kind: str
     bind: InternalRef | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EdgeInput:
     from_id: str
     to_id: str
@@ -52,9 +54,9 @@ def _parse_scalar(value: str) -> Any:
         return {}
     if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
         return value[1:-1].replace(r"\\", "\\").replace(r"\"", '"')
-    if re.match(r"^-?\d+$", value):
+    if INT_RE.match(value):
         return int(value)
-    if re.match(r"^-?\d+\.\d+$", value):
+    if FLOAT_RE.match(value):
         return float(value)
     return value
 
@@ -398,12 +400,14 @@ def validate_ledger(data: dict[str, Any], output_root: Path) -> tuple[TopologyIn
     edges: list[EdgeInput] = []
     edge_pk_seen: set[tuple[str, str, str, tuple[str, ...]]] = set()
 
+    edge_fields = {"from", "to", "direction", "contract_refs"}
     for idx, edge in enumerate(edges_raw):
-        path = json_pointer("edges", str(idx))
-        edge_obj = _ensure_dict(edge, diagnostics, path)
-        allowed = {"from", "to", "direction", "contract_refs"}
+        if isinstance(edge, dict):
+            edge_obj = edge
+        else:
+            edge_obj = _ensure_dict(edge, diagnostics, json_pointer("edges", str(idx)))
         for key in edge_obj.keys():
-            if key not in allowed:
+            if key not in edge_fields:
                 _add_diag(
                     diagnostics,
                     "E_LEDGER_UNKNOWN_FIELD",
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+READ_CHUNK = 1 << 20
+LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+LineSource = Callable[[], Iterable[str]]
+
+
+def iter_file_lines(path: Path, chunk_size: int = READ_CHUNK) -> Iterator[str]:
+    carry = ""
+    with path.open("r", encoding="utf-8") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            lines = (carry + chunk).splitlines() if carry else chunk.splitlines()
+            carry = "" if chunk[-1] in LINE_BREAKS else lines.pop()
+            yield from lines
+    if carry:
+        yield carry
+
+
+def file_source(path: Path) -> LineSource:
+    return lambda: iter_file_lines(path)
+
+
+def text_source(text: str) -> LineSource:
+    lines = text.splitlines()
+    return lambda: lines
+
+
+class LineWindow:
+    def __init__(self, lines: Iterable[str]) -> None:
+        self._source = iter(lines)
+        self._buffer: list[str] = []
+        self._head = 0
+        self._base = 0
+        self._current: str | None = None
+        self._current_idx = -1
+
+    def get(self, idx: int) -> str | None:
+        if idx == self._current_idx:
+            return self._current
+        offset = idx - self._base + self._head
+        if offset < self._head:
+            raise IndexError(idx)
+        while offset >= len(self._buffer):
+            line = next(self._source, None)
+            if line is None:
+                return None
+            self._buffer.append(line)
+        return self._buffer[offset]
+
+    def rest(self) -> Iterator[str]:
+        pending = self._buffer[self._head :]
+        self._buffer.clear()
+        self._head = 0
+        self._current_idx = -1
+        yield from pending
+        yield from self._source
+
+    def __iter__(self) -> Iterator[tuple[int, str]]:
+        source = self._source
+        buffer = self._buffer
+        idx = self._base
+        while True:
+            if self._head < len(buffer):
+                line = buffer[self._head]
+                self._head += 1
+                if self._head == len(buffer):
+                    buffer.clear()
+                    self._head = 0
+            else:
+                line = next(source, None)
+                if line is None:
+                    return
+            self._base = idx + 1
+            self._current = line
+            self._current_idx = idx
+            yield idx, line
+            idx += 1
@@ -1,26 +1,47 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
+from typing import Iterator
 
-from .errors import Diagnostic, json_pointer
+from .errors import Diagnostic, diagnostic_sink, json_pointer
+from .line_stream import LineSource, LineWindow, file_source, text_source
 from .refs import parse_contract_ref, parse_internal_ref
 
 
 RELID_RE = re.compile(r"^[A-Z][A-Z0-9_]{2,63}$")
 DIRECTION_VOCAB = {"pub", "sub", "req", "rep", "rw", "call"}
 ALLOWED_KINDS = {"File", "DocMeta", "Node", "Edge", "EdgeIntent", "Rule"}
-
-
-def _print_diagnostics(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
-
-
-def _capture_metadata(lines: list[str], start_line: int, start_col: int) -> tuple[str, int]:
+STRING_BODY_RE = {
+    '"': re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S),
+    "'": re.compile(r"[^'\\]*(?:\\.[^'\\]*)*", re.S),
+}
+STRING_TOKEN = r'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\''
+META_RUN_RE = re.compile(r"(?:" + STRING_TOKEN + r"|[^\"'{}/]|/(?!/))*", re.S)
+VALUE_RUN_RE = re.compile(r"(?:" + STRING_TOKEN + r"|[^\"'{}\[\](),])*", re.S)
+NESTED_RUN_RE = re.compile(r"(?:" + STRING_TOKEN + r"|[^\"'{}\[\]()])*", re.S)
+ITEM_RUN_RE = re.compile(r"(?:" + STRING_TOKEN + r"|[^\"',])*", re.S)
+PAIR_GAP_RE = re.compile(r"[ \t\r\n,]*")
+KEY_RE = re.compile(r"\w*")
+SPACE_RE = re.compile(r"\s*")
+OPENERS = {"{": "}", "[": "]", "(": ")"}
+
+
+def _skip_string(text: str, pos: int, quote: str, escaped: bool = False) -> tuple[int, str | None, bool]:
+    end = len(text)
+    if escaped:
+        if pos >= end:
+            return pos, quote, True
+        pos += 1
+    body_end = STRING_BODY_RE[quote].match(text, pos).end()
+    if body_end < end and text[body_end] == quote:
+        return body_end + 1, None, False
+    return end, quote, body_end < end
+
+
+def _capture_metadata_span(lines: list[str], start_line: int, start_col: int) -> tuple[str, int, int]:
     depth = 0
     in_string: str | None = None
     escaped = False
@@ -28,36 +49,104 @@ def _capture_metadata(lines: list[str], start_line: int, start_col: int) -> tupl
     for li in range(start_line, len(lines)):
         line = lines[li]
         j = start_col if li == start_line else 0
-        while j < len(line):
-            ch = line[j]
+        seg_start = j
+        end = len(line)
+        while j < end:
             if in_string is not None:
-                out.append(ch)
-                if escaped:
-                    escaped = False
-                elif ch == "\\":
-                    escaped = True
-                elif ch == in_string:
-                    in_string = None
-                j += 1
+                j, in_string, escaped = _skip_string(line, j, in_string, escaped)
                 continue
+            if depth != 0:
+                j = META_RUN_RE.match(line, j).end()
+                if j >= end:
+                    break
+            ch = line[j]
             if ch in ('"', "'"):
                 in_string = ch
-                out.append(ch)
                 j += 1
                 continue
-            if ch == "/" and j + 1 < len(line) and line[j + 1] == "/":
+            if ch == "/" and line.startswith("/", j + 1):
                 break
+            j += 1
             if ch == "{":
                 depth += 1
             elif ch == "}":
                 depth -= 1
-            out.append(ch)
+            if depth == 0:
+                out.append(line[seg_start:j])
+                return "".join(out), li, j
+        out.append(line[seg_start:j])
+        if depth > 0:
+            out.append("\n")
+    return "", start_line, start_col
+
+
+def _capture_metadata_window(window: LineWindow, start_line: int, start_col: int) -> tuple[str, int, int]:
+    depth = 0
+    in_string: str | None = None
+    escaped = False
+    out: list[str] = []
+    li = start_line
+    line = window.get(li)
+    while line is not None:
+        j = start_col if li == start_line else 0
+        seg_start = j
+        end = len(line)
+        while j < end:
+            if in_string is not None:
+                j, in_string, escaped = _skip_string(line, j, in_string, escaped)
+                continue
+            if depth != 0:
+                j = META_RUN_RE.match(line, j).end()
+                if j >= end:
+                    break
+            ch = line[j]
+            if ch in ('"', "'"):
+                in_string = ch
+                j += 1
+                continue
+            if ch == "/" and line.startswith("/", j + 1):
+                break
             j += 1
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
             if depth == 0:
-                return "".join(out), li
+                out.append(line[seg_start:j])
+                return "".join(out), li, j
+        out.append(line[seg_start:j])
         if depth > 0:
             out.append("\n")
-    return "", start_line
+        li += 1
+        line = window.get(li)
+    return "", start_line, start_col
+
+
+def _capture_metadata(lines: list[str], start_line: int, start_col: int) -> tuple[str, int]:
+    meta, end_line, _ = _capture_metadata_span(lines, start_line, start_col)
+    return meta, end_line
+
+
+def _scan_value(inner: str, pos: int) -> int:
+    end = len(inner)
+    depths = {"}": 0, "]": 0, ")": 0}
+    nested = 0
+    while True:
+        pos = (NESTED_RUN_RE if nested else VALUE_RUN_RE).match(inner, pos).end()
+        if pos >= end:
+            return end
+        ch = inner[pos]
+        if ch in ('"', "'"):
+            return end
+        if ch == ",":
+            return pos
+        if ch in OPENERS:
+            depths[OPENERS[ch]] += 1
+            nested += 1
+        elif depths[ch] > 0:
+            depths[ch] -= 1
+            nested -= 1
+        pos += 1
 
 
 def _parse_metadata_pairs(meta: str) -> list[tuple[str, str]]:
@@ -67,66 +156,20 @@ def _parse_metadata_pairs(meta: str) -> list[tuple[str, str]]:
     inner = meta[1:-1]
     pairs: list[tuple[str, str]] = []
     i = 0
-    in_string: str | None = None
-    escaped = False
-    depth_brace = 0
-    depth_bracket = 0
-    depth_paren = 0
     while i < len(inner):
-        while i < len(inner) and inner[i] in " \t\r\n,":
-            i += 1
+        i = PAIR_GAP_RE.match(inner, i).end()
         if i >= len(inner):
             break
-        key_start = i
-        while i < len(inner) and (inner[i].isalnum() or inner[i] == "_"):
-            i += 1
-        key = inner[key_start:i]
+        key_end = KEY_RE.match(inner, i).end()
+        key = inner[i:key_end]
         if not key:
             break
-        while i < len(inner) and inner[i].isspace():
-            i += 1
+        i = SPACE_RE.match(inner, key_end).end()
         if i >= len(inner) or inner[i] != ":":
             break
         i += 1
         val_start = i
-        in_string = None
-        escaped = False
-        depth_brace = 0
-        depth_bracket = 0
-        depth_paren = 0
-        while i < len(inner):
-            ch = inner[i]
-            if in_string is not None:
-                if escaped:
-                    escaped = False
-                elif ch == "\\":
-                    escaped = True
-                elif ch == in_string:
-                    in_string = None
-                i += 1
-                continue
-            if ch in ('"', "'"):
-                in_string = ch
-                i += 1
-                continue
-            if ch == "{":
-                depth_brace += 1
-            elif ch == "}":
-                if depth_brace > 0:
-                    depth_brace -= 1
-            elif ch == "[":
-                depth_bracket += 1
-            elif ch == "]":
-                if depth_bracket > 0:
-                    depth_bracket -= 1
-            elif ch == "(":
-                depth_paren += 1
-            elif ch == ")":
-                if depth_paren > 0:
-                    depth_paren -= 1
-            if depth_brace == 0 and depth_bracket == 0 and depth_paren == 0 and ch == ",":
-                break
-            i += 1
+        i = _scan_value(inner, i)
         value = inner[val_start:i].strip()
         pairs.append((key, value))
         if i < len(inner) and inner[i] == ",":
@@ -140,31 +183,13 @@ def _split_list_items(value: str) -> list[str]:
         return []
     inner = value[1:-1]
     items: list[str] = []
-    i = 0
-    in_string: str | None = None
-    escaped = False
     start = 0
-    while i < len(inner):
-        ch = inner[i]
-        if in_string is not None:
-            if escaped:
-                escaped = False
-            elif ch == "\\":
-                escaped = True
-            elif ch == in_string:
-                in_string = None
-            i += 1
-            continue
-        if ch in ('"', "'"):
-            in_string = ch
-            i += 1
-            continue
-        if ch == ",":
-            items.append(inner[start:i].strip())
-            i += 1
-            start = i
-            continue
-        i += 1
+    while True:
+        pos = ITEM_RUN_RE.match(inner, start).end()
+        if pos >= len(inner) or inner[pos] != ",":
+            break
+        items.append(inner[start:pos].strip())
+        start = pos + 1
     tail = inner[start:].strip()
     if tail:
         items.append(tail)
@@ -175,22 +200,41 @@ def _diag(diags: list[Diagnostic], code: str, message: str, expected: str, got:
     diags.append(Diagnostic(code=code, message=message, expected=expected, got=got, path=path))
 
 
-def lint_text(text: str, path: Path) -> list[Diagnostic]:
-    diags: list[Diagnostic] = []
-    lines = text.splitlines()
-    file_lines = [idx for idx, line in enumerate(lines) if line.lstrip().startswith("@File")]
-
-    first_stmt = None
-    for idx, line in enumerate(lines):
-        if line.strip() == "" or line.lstrip().startswith("//"):
+def _scan_file_header(source: LineSource) -> tuple[int | None, int, int | None, str | None, str | None]:
+    first_file: int | None = None
+    file_count = 0
+    first_stmt: int | None = None
+    profile = None
+    id_prefix = None
+    window = LineWindow(source())
+    for idx, line in window:
+        stripped = line.lstrip()
+        if first_stmt is None and stripped != "" and not stripped.startswith("//"):
+            first_stmt = idx
+        if not stripped.startswith("@File"):
             continue
-        first_stmt = idx
+        first_file = idx
+        brace_idx = line.find("{")
+        if brace_idx != -1:
+            meta, _, _ = _capture_metadata_window(window, idx, brace_idx)
+            for key, value in _parse_metadata_pairs(meta):
+                if key == "profile":
+                    profile = value.strip().strip('"')
+                if key == "id_prefix":
+                    id_prefix = value.strip().strip('"')
+        file_count = 1 + sum(1 for rest in window.rest() if "@File" in rest and rest.lstrip().startswith("@File"))
         break
+    return first_file, file_count, first_stmt, profile, id_prefix
+
+
+def iter_lint(source: LineSource, path: Path) -> Iterator[Diagnostic]:
+    diags: list[Diagnostic] = []
+    first_file, file_count, first_stmt, profile, id_prefix = _scan_file_header(source)
 
-    if not file_lines:
+    if first_file is None:
         _diag(diags, "E_FILE_HEADER_MISSING", "Missing @File header", "@File", "missing", json_pointer())
     else:
-        if first_stmt is not None and file_lines[0] != first_stmt:
+        if first_stmt is not None and first_file != first_stmt:
             _diag(
                 diags,
                 "E_FILE_HEADER_NOT_FIRST",
@@ -199,7 +243,7 @@ def lint_text(text: str, path: Path) -> list[Diagnostic]:
                 "later statement",
                 json_pointer(),
             )
-        if len(file_lines) > 1:
+        if file_count > 1:
             _diag(
                 diags,
                 "E_FILE_HEADER_DUPLICATE",
@@ -208,20 +252,6 @@ def lint_text(text: str, path: Path) -> list[Diagnostic]:
                 "multiple",
                 json_pointer(),
             )
-
-    profile = None
-    id_prefix = None
-    if file_lines:
-        line = lines[file_lines[0]]
-        brace_idx = line.find("{")
-        if brace_idx != -1:
-            meta, _ = _capture_metadata(lines, file_lines[0], brace_idx)
-            pairs = _parse_metadata_pairs(meta)
-            for key, value in pairs:
-                if key == "profile":
-                    profile = value.strip().strip('"')
-                if key == "id_prefix":
-                    id_prefix = value.strip().strip('"')
         if profile != "topology":
             _diag(
                 diags,
@@ -247,11 +277,13 @@ def lint_text(text: str, path: Path) -> list[Diagnostic]:
     edge_index = 0
     rule_index = 0
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if not line.lstrip().startswith("@"):
-            i += 1
+    window = LineWindow(source())
+    resume = 0
+    for i, line in window:
+        if diags:
+            yield from diags
+            diags.clear()
+        if i < resume or not line.lstrip().startswith("@"):
             continue
         kind = line.lstrip().split(None, 1)[0][1:]
         if kind not in ALLOWED_KINDS:
@@ -265,11 +297,10 @@ def lint_text(text: str, path: Path) -> list[Diagnostic]:
             )
         brace_idx = line.find("{")
         if brace_idx == -1:
-            i += 1
             continue
-        meta, end_line = _capture_metadata(lines, i, brace_idx)
+        meta, end_line, _ = _capture_metadata_window(window, i, brace_idx)
         pairs = _parse_metadata_pairs(meta)
-        i = end_line + 1
+        resume = end_line + 1
 
         kv = {k: v for k, v in pairs}
         if kind == "Node":
@@ -477,7 +508,15 @@ def lint_text(text: str, path: Path) -> list[Diagnostic]:
         edge_pks.add(pk)
         edge_index += 1
 
-    return diags
+    yield from diags
+
+
+def lint_text(text: str, path: Path) -> list[Diagnostic]:
+    return list(iter_lint(text_source(text), path))
+
+
+def lint_file(path: Path) -> Iterator[Diagnostic]:
+    return iter_lint(file_source(path), path)
 
 
 def iter_sdsl_files(path: Path) -> list[Path]:
@@ -497,13 +536,12 @@ def main() -> int:
         print("E_INPUT_NOT_FOUND: no .sdsl2 files", file=sys.stderr)
         return 2
 
-    all_diags: list[Diagnostic] = []
+    sink = diagnostic_sink()
     for file_path in files:
-        text = file_path.read_text(encoding="utf-8")
-        all_diags.extend(lint_text(text, file_path))
+        sink.extend(lint_file(file_path))
 
-    if all_diags:
-        _print_diagnostics(all_diags)
+    if sink.total:
+        sink.close()
         return 2
     return 0
 
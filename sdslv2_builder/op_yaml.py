@@ -1,36 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import sha256
 from pathlib import Path
 from typing import Any
 import re
 
 
+NUMBER_RE = re.compile(r"^-?\d+(\.\d+)?$")
+_CONSTANTS: dict[str, Any] = {"null": None, "true": True, "false": False}
+
+
 def _parse_scalar(value: str) -> Any:
     value = value.strip()
-    if value == "null":
-        return None
-    if value == "true":
-        return True
-    if value == "false":
-        return False
+    if value in _CONSTANTS:
+        return _CONSTANTS[value]
     if value == "[]":
         return []
     if value == "{}":
         return {}
     if len(value) >= 2 and value[0] == value[-1] == '"':
         return value[1:-1].replace(r"\\", "\\").replace(r"\"", '"')
-    if re.match(r"^-?\d+$", value):
-        return int(value)
-    if re.match(r"^-?\d+\.\d+$", value):
-        return float(value)
+    head = value[:1]
+    if head == "-" or head.isdigit():
+        match = NUMBER_RE.match(value)
+        if match:
+            return float(value) if match.group(1) else int(value)
     return value
 
 
-def _count_indent(line: str) -> int:
-    return len(line) - len(line.lstrip(" "))
-
-
 @dataclass(frozen=True)
 class DuplicateKey:
     path: str
@@ -38,6 +37,60 @@ class DuplicateKey:
     line: int
 
 
+class FrozenDict(dict):
+    __slots__ = ()
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("E_YAML_FROZEN")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> tuple:
+        return FrozenDict, (dict(self),)
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> Any:
+        return thaw(self)
+
+
+class FrozenList(list):
+    __slots__ = ()
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("E_YAML_FROZEN")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __reduce__(self) -> tuple:
+        return FrozenList, (list(self),)
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> Any:
+        return thaw(self)
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
 def _json_pointer(parts: list[str]) -> str:
     if not parts:
         return ""
@@ -45,160 +98,190 @@ def _json_pointer(parts: list[str]) -> str:
     return "/" + "/".join(escaped)
 
 
-def _parse_block(
+@dataclass
+class _Frame:
+    indent: int
+    path: list[str]
+    block_type: str | None = None
+    items: list[Any] = field(default_factory=list)
+    mapping: dict[str, Any] = field(default_factory=dict)
+    resume: tuple = ()
+
+
+def _parse_document(
     lines: list[str],
-    start: int,
-    indent: int,
-    path: list[str] | None = None,
     duplicates: list[DuplicateKey] | None = None,
     allow_duplicates: bool = True,
-) -> tuple[Any, int]:
-    i = start
-    block_type = None
-    items: list[Any] = []
-    mapping: dict[str, Any] = {}
-    if path is None:
-        path = []
-
-    while i < len(lines):
-        line = lines[i]
-        if line.strip() == "":
-            i += 1
-            continue
-        cur_indent = _count_indent(line)
-        if cur_indent < indent:
-            break
-        if cur_indent > indent:
-            raise ValueError(f"YAML_INDENT_ERROR:{i + 1}")
-        content = line[cur_indent:]
-        if content.startswith("-"):
-            if block_type is None:
-                block_type = "list"
-            if block_type != "list":
-                raise ValueError(f"YAML_MIXED_BLOCK:{i + 1}")
-            rest = content[1:].lstrip()
-            item_index = str(len(items))
-            if rest == "":
-                value, i = _parse_block(
-                    lines,
-                    i + 1,
-                    indent + 2,
-                    path + [item_index],
-                    duplicates,
-                    allow_duplicates,
-                )
+) -> Any:
+    total = len(lines)
+    indents = [len(line) - len(line.lstrip(" ")) if line.strip() else None for line in lines]
+    next_content = [total] * (total + 1)
+    for idx in range(total - 1, -1, -1):
+        next_content[idx] = idx if indents[idx] is not None else next_content[idx + 1]
+
+    stack = [_Frame(0, [])]
+    i = 0
+    pending: tuple[Any] | None = None
+
+    def add_duplicate(path: list[str], key: str, line_no: int) -> None:
+        duplicates.append(DuplicateKey(path=_json_pointer(path), key=key, line=line_no))
+        if not allow_duplicates:
+            raise ValueError(f"YAML_DUPLICATE_KEY:{line_no}:{key}")
+
+    def finish_item(frame: _Frame, value: dict[str, Any], item_index: str) -> bool:
+        nonlocal i
+        probe = next_content[i]
+        if probe < total:
+            probe_indent = indents[probe]
+            is_list_item = lines[probe].lstrip().startswith("-")
+            if probe_indent == frame.indent + 2 and not is_list_item:
+                i = probe
+                frame.resume = ("item_extra", value, item_index, probe)
+                stack.append(_Frame(frame.indent + 2, frame.path + [item_index]))
+                return False
+            if probe_indent > frame.indent and is_list_item:
+                raise ValueError(f"YAML_UNSUPPORTED_LIST_ITEM:{probe + 1}")
+        frame.items.append(value)
+        return True
+
+    while True:
+        frame = stack[-1]
+        if pending is not None:
+            (result,) = pending
+            pending = None
+            kind = frame.resume[0]
+            if kind == "item":
+                frame.items.append(result)
+            elif kind == "item_key":
+                _, value, key, item_index = frame.resume
+                value[key] = result
+                if not finish_item(frame, value, item_index):
+                    continue
+            elif kind == "item_extra":
+                _, value, item_index, probe = frame.resume
+                if not isinstance(result, dict):
+                    raise ValueError(f"YAML_LIST_ITEM_NOT_DICT:{probe + 1}")
+                if duplicates is not None:
+                    for extra_key in result.keys():
+                        if extra_key in value:
+                            add_duplicate(frame.path + [item_index, extra_key], extra_key, probe + 1)
+                value.update(result)
+                frame.items.append(value)
             else:
-                if ":" in rest:
+                _, key, line_no = frame.resume
+                if duplicates is not None and key in frame.mapping:
+                    add_duplicate(frame.path + [key], key, line_no)
+                frame.mapping[key] = result
+            frame.resume = ()
+            continue
+
+        i = next_content[i]
+        if i >= total or indents[i] < frame.indent:
+            finished: Any = frame.items if frame.block_type == "list" else frame.mapping
+        else:
+            indent = frame.indent
+            line = lines[i]
+            if indents[i] > indent:
+                raise ValueError(f"YAML_INDENT_ERROR:{i + 1}")
+            content = line[indent:]
+            if content.startswith("-"):
+                if frame.block_type is None:
+                    frame.block_type = "list"
+                if frame.block_type != "list":
+                    raise ValueError(f"YAML_MIXED_BLOCK:{i + 1}")
+                rest = content[1:].lstrip()
+                item_index = str(len(frame.items))
+                if rest == "":
+                    i += 1
+                    frame.resume = ("item",)
+                    stack.append(_Frame(indent + 2, frame.path + [item_index]))
+                elif ":" in rest:
                     key, tail = rest.split(":", 1)
                     key = key.strip()
                     tail = tail.lstrip()
                     if not key:
                         raise ValueError(f"YAML_MISSING_KEY:{i + 1}")
-                    value = {}
+                    value: dict[str, Any] = {}
+                    i += 1
                     if tail == "":
-                        nested, i = _parse_block(
-                            lines,
-                            i + 1,
-                            indent + 2,
-                            path + [item_index, key],
-                            duplicates,
-                            allow_duplicates,
-                        )
-                        value[key] = nested
+                        frame.resume = ("item_key", value, key, item_index)
+                        stack.append(_Frame(indent + 2, frame.path + [item_index, key]))
                     else:
                         value[key] = _parse_scalar(tail)
-                        i += 1
-
-                    probe = i
-                    while probe < len(lines) and lines[probe].strip() == "":
-                        probe += 1
-                    if probe < len(lines):
-                        probe_indent = _count_indent(lines[probe])
-                        if probe_indent == indent + 2 and not lines[probe].lstrip().startswith("-"):
-                            extra, i = _parse_block(
-                                lines,
-                                probe,
-                                indent + 2,
-                                path + [item_index],
-                                duplicates,
-                                allow_duplicates,
-                            )
-                            if not isinstance(extra, dict):
-                                raise ValueError(f"YAML_LIST_ITEM_NOT_DICT:{probe + 1}")
-                            if duplicates is not None:
-                                for extra_key in extra.keys():
-                                    if extra_key in value:
-                                        duplicates.append(
-                                            DuplicateKey(
-                                                path=_json_pointer(path + [item_index, extra_key]),
-                                                key=extra_key,
-                                                line=probe + 1,
-                                            )
-                                        )
-                                        if not allow_duplicates:
-                                            raise ValueError(f"YAML_DUPLICATE_KEY:{probe + 1}:{extra_key}")
-                            value.update(extra)
-                        elif probe_indent > indent and lines[probe].lstrip().startswith("-"):
-                            raise ValueError(f"YAML_UNSUPPORTED_LIST_ITEM:{probe + 1}")
+                        finish_item(frame, value, item_index)
                 else:
-                    value = _parse_scalar(rest)
+                    frame.items.append(_parse_scalar(rest))
                     i += 1
-            items.append(value)
-            continue
+                continue
 
-        if block_type is None and ":" not in content:
-            return _parse_scalar(content), i + 1
-
-        if block_type is None:
-            block_type = "dict"
-        if block_type != "dict":
-            raise ValueError(f"YAML_MIXED_BLOCK:{i + 1}")
-        if ":" not in content:
-            raise ValueError(f"YAML_MISSING_COLON:{i + 1}")
-        line_no = i + 1
-        key, rest = content.split(":", 1)
-        key = key.strip()
-        rest = rest.lstrip()
-        if rest == "":
-            value, i = _parse_block(
-                lines,
-                i + 1,
-                indent + 2,
-                path + [key],
-                duplicates,
-                allow_duplicates,
-            )
-        else:
-            value = _parse_scalar(rest)
-            i += 1
-        if duplicates is not None and key in mapping:
-            duplicates.append(
-                DuplicateKey(path=_json_pointer(path + [key]), key=key, line=line_no)
-            )
-            if not allow_duplicates:
-                raise ValueError(f"YAML_DUPLICATE_KEY:{line_no}:{key}")
-        mapping[key] = value
-    return (items if block_type == "list" else mapping), i
-
-
-def load_yaml(path: Path) -> Any:
-    data, _ = load_yaml_with_duplicates(path, allow_duplicates=True)
+            if frame.block_type is None and ":" not in content:
+                finished = _parse_scalar(content)
+                i += 1
+            else:
+                if frame.block_type is None:
+                    frame.block_type = "dict"
+                if frame.block_type != "dict":
+                    raise ValueError(f"YAML_MIXED_BLOCK:{i + 1}")
+                if ":" not in content:
+                    raise ValueError(f"YAML_MISSING_COLON:{i + 1}")
+                line_no = i + 1
+                key, rest = content.split(":", 1)
+                key = key.strip()
+                rest = rest.lstrip()
+                i += 1
+                if rest == "":
+                    frame.resume = ("key", key, line_no)
+                    stack.append(_Frame(indent + 2, frame.path + [key]))
+                    continue
+                if duplicates is not None and key in frame.mapping:
+                    add_duplicate(frame.path + [key], key, line_no)
+                frame.mapping[key] = _parse_scalar(rest)
+                continue
+
+        stack.pop()
+        if not stack:
+            return finished
+        pending = (finished,)
+
+
+PARSE_CACHE_MAX_ENTRIES = 256
+
+_PARSE_CACHE: OrderedDict[tuple[str, bool], tuple[Any, tuple[DuplicateKey, ...]]] = OrderedDict()
+
+
+def load_yaml(path: Path, frozen: bool = False) -> Any:
+    data, _ = load_yaml_with_duplicates(path, allow_duplicates=True, frozen=frozen)
     return data
 
 
 def load_yaml_with_duplicates(
     path: Path,
     allow_duplicates: bool = True,
+    frozen: bool = False,
 ) -> tuple[Any, list[DuplicateKey]]:
     text = path.read_text(encoding="utf-8")
     if path.suffix.lower() == ".json":
         import json
 
-        return json.loads(text), []
-    lines = text.splitlines()
-    duplicates: list[DuplicateKey] = []
-    data, _ = _parse_block(lines, 0, 0, [], duplicates, allow_duplicates)
-    return data, duplicates
+        data = json.loads(text)
+        return (freeze(data) if frozen else data), []
+    key = (sha256(text.encode("utf-8")).hexdigest(), allow_duplicates)
+    cached = _PARSE_CACHE.get(key)
+    if cached is None:
+        duplicates: list[DuplicateKey] = []
+        data = _parse_document(text.splitlines(), duplicates, allow_duplicates)
+        cached = (freeze(data), tuple(duplicates))
+        _PARSE_CACHE[key] = cached
+        while len(_PARSE_CACHE) > PARSE_CACHE_MAX_ENTRIES:
+            _PARSE_CACHE.popitem(last=False)
+    else:
+        _PARSE_CACHE.move_to_end(key)
+    data, duplicates = cached
+    return (data if frozen else thaw(data)), list(duplicates)
+
+
+def clear_parse_cache() -> None:
+    _PARSE_CACHE.clear()
 
 
 def _needs_quotes(value: str) -> bool:
@@ -212,7 +295,7 @@ def _needs_quotes(value: str) -> bool:
         return True
     if value in {"null", "true", "false", "[]", "{}"}:
         return True
-    if re.match(r"^-?\d+(\.\d+)?$", value):
+    if NUMBER_RE.match(value):
         return True
     return False
 
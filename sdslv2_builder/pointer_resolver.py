@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+POINTER_FOUND = "found"
+POINTER_MISSING = "missing"
+POINTER_OUT_OF_RANGE = "out_of_range"
+POINTER_BAD_INDEX = "bad_index"
+POINTER_NOT_INDEXABLE = "not_indexable"
+
+
+@dataclass(frozen=True, slots=True)
+class PointerStatus:
+    code: str
+    detail: str = ""
+
+    @property
+    def found(self) -> bool:
+        return self.code == POINTER_FOUND
+
+
+FOUND = PointerStatus(POINTER_FOUND)
+MISSING = PointerStatus(POINTER_MISSING)
+OUT_OF_RANGE = PointerStatus(POINTER_OUT_OF_RANGE)
+
+_Trie = tuple[dict[str, "_Trie"], list[int]]
+
+
+def _step(value: Any, segment: str) -> tuple[PointerStatus | None, Any]:
+    if isinstance(value, dict):
+        if segment not in value:
+            return MISSING, None
+        return None, value[segment]
+    if isinstance(value, list):
+        if not segment.isdigit():
+            return PointerStatus(POINTER_BAD_INDEX, segment), None
+        idx = int(segment)
+        if idx < 0 or idx >= len(value):
+            return OUT_OF_RANGE, None
+        return None, value[idx]
+    return PointerStatus(POINTER_NOT_INDEXABLE, type(value).__name__), None
+
+
+def _mark(node: _Trie, status: PointerStatus, results: list[PointerStatus]) -> None:
+    stack = [node]
+    while stack:
+        children, ends = stack.pop()
+        for idx in ends:
+            results[idx] = status
+        stack.extend(children.values())
+
+
+def resolve_pointers(data: Any, pointers: Sequence[Sequence[str]]) -> list[PointerStatus]:
+    root: _Trie = ({}, [])
+    for idx, parts in enumerate(pointers):
+        node = root
+        for segment in parts:
+            child = node[0].get(segment)
+            if child is None:
+                child = node[0][segment] = ({}, [])
+            node = child
+        node[1].append(idx)
+    results = [FOUND] * len(pointers)
+    stack: list[tuple[_Trie, Any]] = [(root, data)]
+    while stack:
+        (children, _), value = stack.pop()
+        for segment, child in children.items():
+            status, item = _step(value, segment)
+            if status is None:
+                stack.append((child, item))
+            else:
+                _mark(child, status, results)
+    return results
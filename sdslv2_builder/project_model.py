@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping
+
+
+@dataclass(frozen=True, slots=True)
+class DecisionTable:
+    ids: tuple[str, ...]
+    from_ids: tuple[str, ...]
+    to_ids: tuple[str, ...]
+    directions: tuple[str, ...]
+    contract_refs: tuple[tuple[str, ...], ...]
+    by_id: Mapping[str, int]
+    by_contract: Mapping[str, tuple[int, ...]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, idx: int) -> tuple[str, str, str, str, tuple[str, ...]]:
+        return (self.ids[idx], self.from_ids[idx], self.to_ids[idx], self.directions[idx], self.contract_refs[idx])
+
+    def unique_rows(self) -> Iterator[tuple[str, int]]:
+        return iter(self.by_id.items())
+
+
+@dataclass(frozen=True, slots=True)
+class EvidenceTable:
+    with_items: frozenset[str]
+    contract_claims: frozenset[tuple[str, str]]
+
+    def has_items(self, decision_id: str) -> bool:
+        return decision_id in self.with_items
+
+    def has_contract_claim(self, decision_id: str, ref: str) -> bool:
+        return (decision_id, ref) in self.contract_claims
+
+
+def _str(value: object) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def _group(pairs: list[tuple[str, int]]) -> Mapping[str, tuple[int, ...]]:
+    grouped: dict[str, list[int]] = {}
+    for key, row in pairs:
+        rows = grouped.setdefault(key, [])
+        if not rows or rows[-1] != row:
+            rows.append(row)
+    return MappingProxyType({key: tuple(rows) for key, rows in grouped.items()})
+
+
+def decision_table(decisions: Any) -> DecisionTable:
+    edges = decisions.get("edges", []) if isinstance(decisions, dict) else []
+    ids: list[str] = []
+    from_ids: list[str] = []
+    to_ids: list[str] = []
+    directions: list[str] = []
+    refs_column: list[tuple[str, ...]] = []
+    contract_pairs: list[tuple[str, int]] = []
+    for edge in edges if isinstance(edges, list) else []:
+        if not isinstance(edge, dict) or not isinstance(edge.get("id"), str):
+            continue
+        row = len(ids)
+        raw_refs = edge.get("contract_refs")
+        refs = tuple(ref for ref in raw_refs if isinstance(ref, str)) if isinstance(raw_refs, list) else ()
+        from_id = _str(edge.get("from"))
+        to_id = _str(edge.get("to"))
+        ids.append(edge["id"])
+        from_ids.append(from_id)
+        to_ids.append(to_id)
+        directions.append(_str(edge.get("direction")))
+        refs_column.append(refs)
+        contract_pairs.extend((ref, row) for ref in refs)
+    return DecisionTable(
+        ids=tuple(ids),
+        from_ids=tuple(from_ids),
+        to_ids=tuple(to_ids),
+        directions=tuple(directions),
+        contract_refs=tuple(refs_column),
+        by_id=MappingProxyType({edge_id: row for row, edge_id in enumerate(ids)}),
+        by_contract=_group(contract_pairs),
+    )
+
+
+def evidence_table(evidence_data: Any) -> EvidenceTable:
+    evidence = evidence_data.get("evidence", {}) if isinstance(evidence_data, dict) else {}
+    with_items: set[str] = set()
+    contract_claims: set[tuple[str, str]] = set()
+    for key, items in evidence.items() if isinstance(evidence, dict) else ():
+        if not isinstance(key, str) or not isinstance(items, list):
+            continue
+        if items:
+            with_items.add(key)
+        for item in items:
+            claims = item.get("claims") if isinstance(item, dict) else None
+            for claim in claims if isinstance(claims, list) else ():
+                if (
+                    isinstance(claim, dict)
+                    and claim.get("kind") == "contract_ref"
+                    and claim.get("decision_id") == key
+                    and isinstance(claim.get("value"), str)
+                ):
+                    contract_claims.add((key, claim["value"]))
+    return EvidenceTable(with_items=frozenset(with_items), contract_claims=frozenset(contract_claims))
@@ -1,20 +1,18 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
-from .errors import Diagnostic
+from .errors import Diagnostic, print_diagnostics
 from .ledger import load_ledger, validate_ledger
-from .topology import build_topology_model
-from .io_atomic import atomic_write_text
-from .writer import write_topology
+from .topology import TopologyModel, build_topology_model
+from .io_atomic import atomic_write_chunks
+from .writer import iter_topology, write_topology
 
 
 def _print_diagnostics(diags: list[Diagnostic]) -> None:
-    payload = [d.to_dict() for d in diags]
-    print(json.dumps(payload, ensure_ascii=False, indent=2), file=sys.stderr)
+    print_diagnostics(diags)
 
 
 def _ensure_output_root(path: Path) -> Path:
@@ -25,11 +23,36 @@ def _ensure_output_root(path: Path) -> Path:
     return root
 
 
-def main() -> int:
+def load_topology(
+    ledger_path: Path,
+    output_root: Path,
+) -> tuple[Path | None, TopologyModel | None, list[Diagnostic]]:
+    data = load_ledger(ledger_path)
+    topology_input, diagnostics = validate_ledger(data, output_root)
+    del data
+    if diagnostics or topology_input is None:
+        return None, None, diagnostics
+    output_path = topology_input.output_path
+    if output_path is None:
+        output_path = output_root / topology_input.id_prefix / "topology.sdsl2"
+    return output_path, build_topology_model(topology_input), []
+
+
+def build_from_ledger(
+    ledger_path: Path,
+    output_root: Path,
+) -> tuple[Path | None, str | None, list[Diagnostic]]:
+    output_path, model, diagnostics = load_topology(ledger_path, output_root)
+    if model is None:
+        return None, None, diagnostics
+    return output_path, write_topology(model), []
+
+
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--ledger", required=True, help="Path to topology ledger (v0.1).")
     ap.add_argument("--out-dir", required=True, help="Output directory (must be OUTPUT).")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     ledger_path = Path(args.ledger)
     if not ledger_path.exists():
@@ -37,23 +60,16 @@ def main() -> int:
         return 2
 
     output_root = _ensure_output_root(Path(args.out_dir))
-    data = load_ledger(ledger_path)
-    topology_input, diagnostics = validate_ledger(data, output_root)
+    output_path, model, diagnostics = load_topology(ledger_path, output_root)
     if diagnostics:
         _print_diagnostics(diagnostics)
         return 2
-    if topology_input is None:
+    if output_path is None or model is None:
         print("E_LEDGER_SCHEMA_INVALID: no topology input", file=sys.stderr)
         return 2
 
-    model = build_topology_model(topology_input)
-    text = write_topology(model)
-
-    output_path = topology_input.output_path
-    if output_path is None:
-        output_path = output_root / topology_input.id_prefix / "topology.sdsl2"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    atomic_write_text(output_path, text, encoding="utf-8")
+    atomic_write_chunks(output_path, iter_topology(model), encoding="utf-8")
     return 0
 
 
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from .disk_cache import DiskCache, StatEntries, file_stamp
+
+INDEX_DIR_REL = Path("OUTPUT") / ".topology_scope_index"
+INDEX_VERSION = "topology-scope-index-v2"
+
+
+@dataclass(frozen=True)
+class ScopeEntry:
+    nodes: frozenset[str]
+    id_prefix: str
+    annotation_error: str | None = None
+    header_error: str | None = None
+
+
+def _optional_str(value: object) -> bool:
+    return value is None or isinstance(value, str)
+
+
+def _decode(raw: object) -> ScopeEntry | None:
+    if not isinstance(raw, list) or len(raw) != 4:
+        return None
+    nodes, id_prefix, annotation_error, header_error = raw
+    if not isinstance(nodes, list) or not all(isinstance(node, str) for node in nodes):
+        return None
+    if not isinstance(id_prefix, str) or not _optional_str(annotation_error) or not _optional_str(header_error):
+        return None
+    return ScopeEntry(frozenset(nodes), id_prefix, annotation_error, header_error)
+
+
+def _encode(entry: ScopeEntry) -> list:
+    return [sorted(entry.nodes), entry.id_prefix, entry.annotation_error, entry.header_error]
+
+
+class ScopeIndex:
+    def __init__(
+        self,
+        project_root: Path,
+        namespace: str,
+        describe: Callable[[Path], ScopeEntry],
+        persist: bool = True,
+    ) -> None:
+        self.project_root = project_root
+        self.describe = describe
+        self.disk = DiskCache(project_root, INDEX_DIR_REL / f"{namespace}.json", INDEX_VERSION, True, persist)
+        self.entries: StatEntries[ScopeEntry] = StatEntries()
+        self.seen: set[str] = set()
+        data = self.disk.load()
+        if data is not None and isinstance(data.get("entries"), dict):
+            self.entries.load(data["entries"], _decode)
+
+    def entry(self, path: Path) -> ScopeEntry:
+        rel = path.relative_to(self.project_root).as_posix()
+        self.seen.add(rel)
+        stamp = file_stamp(path)
+        cached = self.entries.get(rel, stamp)
+        if cached is not None:
+            return cached
+        entry = self.describe(path)
+        self.entries.put(rel, stamp, entry)
+        return entry
+
+    def save(self) -> None:
+        self.entries.prune(lambda rel: rel in self.seen)
+        if self.entries.dirty and self.disk.save({"entries": self.entries.dump(_encode)}):
+            self.entries.dirty = False
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+import re
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping
+
+from .line_stream import LineWindow
+from .lint import _capture_metadata_span, _capture_metadata_window, _parse_metadata_pairs, _split_list_items
+from .refs import InternalRef, parse_internal_ref
+
+ANNOTATION_KIND_RE = re.compile(r"^\s*@(?P<kind>[A-Za-z_][A-Za-z0-9_]*)\b")
+
+
+def strip_quotes(value: str | None) -> str | None:
+    if value is None:
+        return None
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+@dataclass(frozen=True)
+class Span:
+    start_line: int
+    start_col: int
+    end_line: int
+    end_col: int
+
+
+@dataclass(frozen=True)
+class Annotation:
+    kind: str
+    raw_kind: str
+    kind_matched: bool
+    meta: Mapping[str, str] | None
+    pairs: tuple[tuple[str, str], ...]
+    dupes: tuple[str, ...]
+    span: Span
+    nested: bool
+
+    @property
+    def start_line(self) -> int:
+        return self.span.start_line
+
+    @property
+    def end_line(self) -> int:
+        return self.span.end_line
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        if self.meta is None:
+            return default
+        return self.meta.get(key, default)
+
+    def value(self, key: str) -> str | None:
+        return strip_quotes(self.get(key))
+
+    def list_items(self, key: str) -> list[str] | None:
+        raw = self.get(key)
+        if raw is None:
+            return None
+        return _split_list_items(raw)
+
+    def meta_dict(self) -> dict[str, str] | None:
+        if self.meta is None:
+            return None
+        return dict(self.meta)
+
+    @property
+    def rel_id(self) -> str | None:
+        return self.value("id")
+
+
+@dataclass(frozen=True)
+class FileHeader(Annotation):
+    @property
+    def profile(self) -> str | None:
+        return self.value("profile")
+
+    @property
+    def id_prefix(self) -> str | None:
+        return self.value("id_prefix")
+
+    @property
+    def stage(self) -> str | None:
+        return self.value("stage")
+
+
+@dataclass(frozen=True)
+class NodeDecl(Annotation):
+    @property
+    def node_kind(self) -> str | None:
+        return self.value("kind")
+
+
+@dataclass(frozen=True)
+class _EndpointDecl(Annotation):
+    @property
+    def from_ref(self) -> InternalRef | None:
+        raw = self.get("from")
+        return parse_internal_ref(raw) if raw else None
+
+    @property
+    def to_ref(self) -> InternalRef | None:
+        raw = self.get("to")
+        return parse_internal_ref(raw) if raw else None
+
+    @property
+    def direction(self) -> str | None:
+        return self.value("direction")
+
+    @property
+    def channel(self) -> str | None:
+        return self.value("channel")
+
+
+@dataclass(frozen=True)
+class EdgeDecl(_EndpointDecl):
+    @property
+    def contract_refs(self) -> tuple[str, ...]:
+        items = self.list_items("contract_refs") or []
+        return tuple(strip_quotes(item) or "" for item in items)
+
+
+@dataclass(frozen=True)
+class EdgeIntentDecl(_EndpointDecl):
+    pass
+
+
+@dataclass(frozen=True)
+class RuleDecl(Annotation):
+    @property
+    def bind(self) -> str | None:
+        return self.get("bind")
+
+
+@dataclass(frozen=True)
+class Decl(Annotation):
+    pass
+
+
+KIND_CLASSES: dict[str, type[Annotation]] = {
+    "File": FileHeader,
+    "Node": NodeDecl,
+    "Edge": EdgeDecl,
+    "EdgeIntent": EdgeIntentDecl,
+    "Rule": RuleDecl,
+}
+
+
+@dataclass(frozen=True)
+class SdslDocument:
+    digest: str
+    lines: tuple[str, ...]
+    annotations: tuple[Annotation, ...]
+    blocks: tuple[Annotation, ...]
+    first_stmt: int | None
+
+    def of_kind(self, kind: str) -> list[Annotation]:
+        return [ann for ann in self.blocks if ann.kind == kind]
+
+    @property
+    def file_headers(self) -> list[FileHeader]:
+        return [ann for ann in self.blocks if isinstance(ann, FileHeader)]
+
+    @property
+    def nodes(self) -> list[NodeDecl]:
+        return [ann for ann in self.blocks if isinstance(ann, NodeDecl)]
+
+    @property
+    def edges(self) -> list[EdgeDecl]:
+        return [ann for ann in self.blocks if isinstance(ann, EdgeDecl)]
+
+    @property
+    def edge_intents(self) -> list[EdgeIntentDecl]:
+        return [ann for ann in self.blocks if isinstance(ann, EdgeIntentDecl)]
+
+    @property
+    def rules(self) -> list[RuleDecl]:
+        return [ann for ann in self.blocks if isinstance(ann, RuleDecl)]
+
+
+def _parse_annotation(lines: list[str] | LineWindow, idx: int, line: str, stripped: str, nested: bool) -> Annotation:
+    raw_kind = stripped.split(None, 1)[0][1:]
+    match = ANNOTATION_KIND_RE.match(stripped)
+    kind = match.group("kind") if match else raw_kind
+    start_col = len(line) - len(stripped)
+    cls = KIND_CLASSES.get(kind, Decl)
+    brace_idx = line.find("{")
+    if brace_idx == -1:
+        return cls(
+            kind=kind,
+            raw_kind=raw_kind,
+            kind_matched=match is not None,
+            meta=None,
+            pairs=(),
+            dupes=(),
+            span=Span(idx, start_col, idx, len(line)),
+            nested=nested,
+        )
+    if isinstance(lines, LineWindow):
+        meta, end_line, end_col = _capture_metadata_window(lines, idx, brace_idx)
+    else:
+        meta, end_line, end_col = _capture_metadata_span(lines, idx, brace_idx)
+    if end_line == idx and not meta:
+        end_col = len(line)
+    pairs = tuple(_parse_metadata_pairs(meta))
+    meta_map: dict[str, str] = {}
+    dupes: list[str] = []
+    for key, value in pairs:
+        if key in meta_map and key not in dupes:
+            dupes.append(key)
+        meta_map[key] = value
+    return cls(
+        kind=kind,
+        raw_kind=raw_kind,
+        kind_matched=match is not None,
+        meta=MappingProxyType(meta_map),
+        pairs=pairs,
+        dupes=tuple(dupes),
+        span=Span(idx, start_col, end_line, end_col),
+        nested=nested,
+    )
+
+
+def _parse_lines(lines: list[str], digest: str) -> SdslDocument:
+    annotations: list[Annotation] = []
+    blocks: list[Annotation] = []
+    first_stmt: int | None = None
+    block_end = -1
+    for idx, line in enumerate(lines):
+        stripped = line.lstrip()
+        if first_stmt is None and stripped.strip() != "" and not stripped.startswith("//"):
+            first_stmt = idx
+        if not stripped.startswith("@"):
+            continue
+        nested = idx <= block_end
+        ann = _parse_annotation(lines, idx, line, stripped, nested)
+        annotations.append(ann)
+        if not nested:
+            blocks.append(ann)
+            block_end = ann.end_line
+    return SdslDocument(
+        digest=digest,
+        lines=tuple(lines),
+        annotations=tuple(annotations),
+        blocks=tuple(blocks),
+        first_stmt=first_stmt,
+    )
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[Annotation]:
+    window = LineWindow(lines)
+    block_end = -1
+    for idx, line in window:
+        if idx <= block_end:
+            continue
+        stripped = line.lstrip()
+        if not stripped.startswith("@"):
+            continue
+        ann = _parse_annotation(window, idx, line, stripped, False)
+        block_end = ann.end_line
+        yield ann
+
+
+CACHE_MAX_ENTRIES = 512
+
+_CACHE: OrderedDict[str, SdslDocument] = OrderedDict()
+
+
+def _text_digest(text: str) -> str:
+    return "sha256:" + sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cached(key: str, lines: list[str], digest: str) -> SdslDocument:
+    doc = _CACHE.get(key)
+    if doc is not None:
+        _CACHE.move_to_end(key)
+        return doc
+    doc = _parse_lines(lines, digest)
+    _CACHE[key] = doc
+    while len(_CACHE) > CACHE_MAX_ENTRIES:
+        _CACHE.popitem(last=False)
+    return doc
+
+
+def parse_text(text: str) -> SdslDocument:
+    digest = _text_digest(text)
+    return _cached(digest, text.splitlines(), digest)
+
+
+def parse_lines(lines: list[str]) -> SdslDocument:
+    digest = _text_digest("\n".join(lines))
+    return _cached(f"{digest}:{len(lines)}", list(lines), digest)
+
+
+def parse_file(path: Path) -> SdslDocument:
+    return parse_text(path.read_text(encoding="utf-8"))
+
+
+def clear_cache() -> None:
+    _CACHE.clear()
+
+
+def strict_annotations(doc: SdslDocument, code_prefix: str) -> list[Annotation]:
+    annotations: list[Annotation] = []
+    for ann in doc.annotations:
+        if not ann.kind_matched:
+            continue
+        if ann.meta is None:
+            raise ValueError(f"{code_prefix}_METADATA_MISSING: line {ann.start_line + 1}")
+        if ann.dupes:
+            raise ValueError(f"{code_prefix}_DUPLICATE_KEY: line {ann.start_line + 1} key {ann.dupes[0]}")
+        annotations.append(ann)
+    return annotations
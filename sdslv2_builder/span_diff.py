@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from difflib import Match, SequenceMatcher
+from heapq import heapify, heappop, heappush
+from itertools import accumulate
+from typing import Iterator, Sequence
+
+from .edit_buffer import Edit, EditBuffer
+from .line_stream import LINE_BREAKS
+
+Run = tuple[int, int, int]
+Rect = tuple[int, int, int, int]
+Region = tuple[int, int, Sequence[str]]
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _long_runs(a: Sequence[str], b: Sequence[str], b2j: dict[str, list[int]], rect: Rect) -> list[Run]:
+    lo_i, hi_i, lo_j, hi_j = rect
+    pairs: dict[tuple[str, str], list[int]] = {}
+    for j in range(lo_j, hi_j - 1):
+        if b[j] in b2j and b[j + 1] in b2j:
+            pairs.setdefault((b[j], b[j + 1]), []).append(j)
+    runs: list[Run] = []
+    for i in range(lo_i, hi_i - 1):
+        for j in pairs.get((a[i], a[i + 1]), ()):
+            if i > lo_i and j > lo_j and a[i - 1] == b[j - 1] and a[i - 1] in b2j:
+                continue
+            k = 2
+            while i + k < hi_i and j + k < hi_j and a[i + k] == b[j + k] and a[i + k] in b2j:
+                k += 1
+            runs.append((i, j, k))
+    return runs
+
+
+class _Gaps:
+    def __init__(self, rect: Rect) -> None:
+        self.rect = rect
+        self.starts: list[int] = []
+        self.blocks: list[Run] = []
+
+    def bounds(self, g: int) -> Rect:
+        if g:
+            i, j, k = self.blocks[g - 1]
+            lo_i, lo_j = i + k, j + k
+        else:
+            lo_i, lo_j = self.rect[0], self.rect[2]
+        if g < len(self.blocks):
+            hi_i, hi_j, _ = self.blocks[g]
+        else:
+            hi_i, hi_j = self.rect[1], self.rect[3]
+        return lo_i, hi_i, lo_j, hi_j
+
+    def clip(self, run: Run) -> list[Run]:
+        i0, j0, size = run
+        pieces: list[Run] = []
+        g = bisect_right(self.starts, i0)
+        while g <= len(self.blocks):
+            lo_i, hi_i, lo_j, hi_j = self.bounds(g)
+            if lo_i >= i0 + size:
+                break
+            start = max(0, lo_i - i0, lo_j - j0)
+            stop = min(size, hi_i - i0, hi_j - j0)
+            if start < stop:
+                pieces.append((i0 + start, j0 + start, stop - start))
+            g += 1
+        return pieces
+
+    def add(self, block: Run) -> None:
+        pos = bisect_right(self.starts, block[0])
+        self.starts.insert(pos, block[0])
+        self.blocks.insert(pos, block)
+
+
+def _extend(a: Sequence[str], b: Sequence[str], run: Run, bounds: Rect) -> Run:
+    lo_i, hi_i, lo_j, hi_j = bounds
+    i, j, k = run
+    while i > lo_i and j > lo_j and a[i - 1] == b[j - 1]:
+        i, j, k = i - 1, j - 1, k + 1
+    while i + k < hi_i and j + k < hi_j and a[i + k] == b[j + k]:
+        k += 1
+    return i, j, k
+
+
+def _rect_blocks(a: Sequence[str], b: Sequence[str], b2j: dict[str, list[int]], rect: Rect) -> list[Run]:
+    gaps = _Gaps(rect)
+    heap = [(-k, i, j) for i, j, k in _long_runs(a, b, b2j, rect)]
+    heapify(heap)
+    while heap:
+        size, i, j = heappop(heap)
+        run = (i, j, -size)
+        pieces = gaps.clip(run)
+        if pieces != [run]:
+            for pi, pj, pk in pieces:
+                if pk > 1:
+                    heappush(heap, (-pk, pi, pj))
+            continue
+        gaps.add(_extend(a, b, run, gaps.bounds(bisect_right(gaps.starts, i))))
+    i = rect[0]
+    while i < rect[1]:
+        lo_i, hi_i, lo_j, hi_j = bounds = gaps.bounds(bisect_right(gaps.starts, i))
+        if i < lo_i:
+            i = lo_i
+            continue
+        js = b2j.get(a[i], ())
+        pos = bisect_left(js, lo_j)
+        if pos < len(js) and js[pos] < hi_j:
+            gaps.add(_extend(a, b, (i, js[pos], 1), bounds))
+        i += 1
+    found = list(gaps.blocks)
+    for g in range(len(gaps.blocks) + 1):
+        lo_i, hi_i, lo_j, hi_j = bounds = gaps.bounds(g)
+        if lo_i < hi_i and lo_j < hi_j and a[lo_i] == b[lo_j]:
+            found.append(_extend(a, b, (lo_i, lo_j, 0), bounds))
+    return found
+
+
+def _windows(a: list[str], b: list[str], regions: list[Region]) -> list[Rect] | None:
+    windows: list[Rect] = []
+    shift = prev = 0
+    for start, end, new in regions:
+        lo_i, hi_i, lo_j, hi_j = start, end, start + shift, start + shift + len(new)
+        if a[prev:start] != b[prev + shift : lo_j] or b[lo_j:hi_j] != list(new):
+            return None
+        shift += len(new) - (end - start)
+        prev = end
+        while lo_i < hi_i and lo_j < hi_j and a[lo_i] == b[lo_j]:
+            lo_i, lo_j = lo_i + 1, lo_j + 1
+        while lo_i < hi_i and lo_j < hi_j and a[hi_i - 1] == b[hi_j - 1]:
+            hi_i, hi_j = hi_i - 1, hi_j - 1
+        if lo_i == hi_i and lo_j == hi_j:
+            continue
+        if windows and windows[-1][1] == lo_i:
+            lo_i, _, lo_j, _ = windows.pop()
+        windows.append((lo_i, hi_i, lo_j, hi_j))
+    if a[prev:] != b[prev + shift :]:
+        return None
+    return windows
+
+
+def _interiors(windows: list[Rect], la: int, lb: int) -> list[Run]:
+    interiors: list[Run] = []
+    prev_i = prev_j = 0
+    for lo_i, hi_i, lo_j, hi_j in [*windows, (la, la, lb, lb)]:
+        if lo_i > prev_i:
+            interiors.append((prev_i, prev_j, lo_i - prev_i))
+        prev_i, prev_j = hi_i, hi_j
+    return interiors
+
+
+def _separable(a: list[str], b: list[str], b2j: dict[str, list[int]], windows: list[Rect]) -> bool:
+    la, lb = len(a), len(b)
+    a_counts = Counter(a)
+    for i, _, k in _interiors(windows, la, lb):
+        if not any(line in b2j for line in a[i : i + k]):
+            return False
+    for lo_i, hi_i, lo_j, hi_j in windows:
+        if 0 < lo_i < la and lo_j < lb and a[lo_i] == b[lo_j]:
+            return False
+        if 0 < hi_j and hi_i < la and hi_j < lb and a[hi_i - 1] == b[hi_j - 1]:
+            return False
+        if lo_i == hi_i and 0 < lo_i < la:
+            x, y = a[lo_i - 1], a[lo_i]
+            if x in b2j and y in b2j and len(b2j[x]) > 1 and len(b2j[y]) > 1:
+                return False
+        if lo_j == hi_j and 0 < lo_j < lb:
+            x, y = b[lo_j - 1], b[lo_j]
+            if x in b2j and y in b2j and a_counts[x] > 1 and a_counts[y] > 1:
+                return False
+        seen_a = Counter(line for line in a[lo_i:hi_i] if line in b2j)
+        seen_b = Counter(line for line in b[lo_j:hi_j] if line in b2j)
+        for line in seen_a.keys() | seen_b.keys():
+            if seen_a[line] != a_counts[line] or seen_b[line] != len(b2j[line]):
+                return False
+    return True
+
+
+def _contained(a: list[str], b: list[str], rect: Rect, blocks: list[Run]) -> bool:
+    lo_i, hi_i, lo_j, hi_j = rect
+    for i, j, k in blocks:
+        if (i == lo_i or j == lo_j) and i and j and a[i - 1] == b[j - 1]:
+            return False
+        if (i + k == hi_i or j + k == hi_j) and i + k < len(a) and j + k < len(b) and a[i + k] == b[j + k]:
+            return False
+    return True
+
+
+def _window_blocks(matcher: SequenceMatcher, windows: list[Rect]) -> list[Run] | None:
+    a, b, b2j = matcher.a, matcher.b, matcher.b2j
+    if not _separable(a, b, b2j, windows):
+        return None
+    found = _interiors(windows, len(a), len(b))
+    for rect in windows:
+        blocks = _rect_blocks(a, b, b2j, rect)
+        if not _contained(a, b, rect, blocks):
+            return None
+        found.extend(blocks)
+    return found
+
+
+def _matching_blocks(matcher: SequenceMatcher, windows: list[Rect] | None = None) -> list[Match]:
+    a, b = matcher.a, matcher.b
+    found = _window_blocks(matcher, windows) if windows is not None else None
+    if found is None:
+        found = _rect_blocks(a, b, matcher.b2j, (0, len(a), 0, len(b)))
+    blocks: list[Run] = []
+    for i, j, k in sorted(found):
+        if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+            blocks[-1] = (blocks[-1][0], blocks[-1][1], blocks[-1][2] + k)
+        else:
+            blocks.append((i, j, k))
+    blocks.append((len(a), len(b), 0))
+    return [Match._make(block) for block in blocks]
+
+
+def _unified(
+    a: Sequence[str],
+    b: Sequence[str],
+    fromfile: str,
+    tofile: str,
+    n: int,
+    windows: list[Rect] | None = None,
+) -> Iterator[str]:
+    matcher = SequenceMatcher(None, a, b)
+    matcher.matching_blocks = _matching_blocks(matcher, windows)
+    started = False
+    for group in matcher.get_grouped_opcodes(n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}"
+            yield f"+++ {tofile}"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            for line in a[i1:i2]:
+                yield "-" + line
+            for line in b[j1:j2]:
+                yield "+" + line
+
+
+def _line_regions(edits: list[Edit]) -> list[Region]:
+    regions: list[Region] = []
+    for edit in edits:
+        if regions and edit.start <= regions[-1][1]:
+            start, _, new = regions[-1]
+            regions[-1] = (start, edit.end, [*new, *edit.value])
+        else:
+            regions.append((edit.start, edit.end, edit.value))
+    return regions
+
+
+def _text_regions(text: str, edits: list[Edit]) -> list[Region]:
+    chunks = text.splitlines(keepends=True)
+    offsets = [0, *accumulate(len(chunk) for chunk in chunks)]
+    count = len(chunks)
+    tail = count - 1 if chunks and chunks[-1][-1] not in LINE_BREAKS else count
+    groups: list[tuple[int, int, list[Edit]]] = []
+    for edit in edits:
+        first = min(bisect_right(offsets, edit.start) - 1, tail)
+        if first > 0 and edit.start == offsets[first] and chunks[first - 1].endswith("\r"):
+            first -= 1
+        last = min(bisect_right(offsets, edit.end), count)
+        if groups and first <= groups[-1][1]:
+            start, end, members = groups[-1]
+            members.append(edit)
+            groups[-1] = (start, max(end, last), members)
+        else:
+            groups.append((first, last, [edit]))
+    regions: list[Region] = []
+    for first, last, members in groups:
+        parts: list[str] = []
+        pos = offsets[first]
+        for edit in members:
+            parts.append(text[pos : edit.start])
+            parts.append(edit.value)
+            pos = edit.end
+        parts.append(text[pos : offsets[last]])
+        regions.append((first, last, "".join(parts).splitlines()))
+    return regions
+
+
+def edit_diff(edits: EditBuffer, fromfile: str, tofile: str, n: int = 3) -> Iterator[str]:
+    ordered = edits.ordered()
+    if isinstance(edits.base, str):
+        a, b = edits.base.splitlines(), edits.render().splitlines()
+        regions = _text_regions(edits.base, ordered)
+    else:
+        a, b = list(edits.base), edits.render()
+        regions = _line_regions(ordered)
+    return _unified(a, b, fromfile, tofile, n, _windows(a, b, regions))
+
+
+def line_diff(a: Sequence[str], b: Sequence[str], fromfile: str, tofile: str, n: int = 3) -> Iterator[str]:
+    return _unified(a, b, fromfile, tofile, n)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from hashlib import sha256
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Sequence
+
+from .disk_cache import DiskCache
+from .pointer_resolver import FOUND, PointerStatus, resolve_pointers
+
+KERNEL_DIR_REL = Path("OUTPUT") / ".ssot_kernel"
+KERNEL_VERSION = "ssot-kernel-v2"
+
+_UNPARSED = object()
+
+
+class SsotKernel:
+    __slots__ = ("digest", "canonical", "tokens", "_text", "_data", "_nodes")
+
+    def __init__(
+        self,
+        digest: str,
+        text: str,
+        canonical: bool,
+        tokens: Mapping[str, str],
+        data: Any = _UNPARSED,
+    ) -> None:
+        self.digest = digest
+        self.canonical = canonical
+        self.tokens = tokens
+        self._text = text
+        self._data = data
+        self._nodes: Mapping[tuple[str, ...], Any] | None = None
+
+    @property
+    def data(self) -> Any:
+        if self._data is _UNPARSED:
+            self._data = json.loads(self._text)
+        return self._data
+
+    @property
+    def nodes(self) -> Mapping[tuple[str, ...], Any]:
+        if self._nodes is None:
+            self._nodes = MappingProxyType(_index(self.data))
+        return self._nodes
+
+    def resolve(self, pointers: Sequence[Sequence[str]]) -> list[PointerStatus]:
+        nodes = self.nodes
+        keys = [tuple(parts) for parts in pointers]
+        misses = [idx for idx, key in enumerate(keys) if key not in nodes]
+        results = [FOUND] * len(keys)
+        for idx, status in zip(misses, resolve_pointers(self.data, [keys[idx] for idx in misses])):
+            results[idx] = status
+        return results
+
+
+_KERNELS: dict[str, SsotKernel] = {}
+
+
+def canonical_json(data: object) -> str:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")) + "\n"
+
+
+def escape_pointer(segment: str) -> str:
+    return segment.replace("~", "~0").replace("/", "~1")
+
+
+def _index(data: Any) -> dict[tuple[str, ...], Any]:
+    nodes: dict[tuple[str, ...], Any] = {(): data}
+    stack: list[tuple[tuple[str, ...], Any]] = [((), data)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict):
+            items = list(value.items())
+        elif isinstance(value, list):
+            items = [(str(idx), item) for idx, item in enumerate(value)]
+        else:
+            continue
+        for key, item in items:
+            child = (*path, key)
+            nodes[child] = item
+            stack.append((child, item))
+    return nodes
+
+
+def _token_pointers(data: Any) -> dict[str, str]:
+    tokens = data.get("tokens") if isinstance(data, dict) else None
+    if not isinstance(tokens, dict):
+        return {}
+    return {token: "/tokens/" + escape_pointer(token) for token in sorted(tokens)}
+
+
+def _artifact(project_root: Path, digest: str) -> DiskCache:
+    return DiskCache(project_root, KERNEL_DIR_REL / f"{digest}.json", KERNEL_VERSION)
+
+
+def _read_artifact(project_root: Path, digest: str, text: str) -> SsotKernel | None:
+    payload = _artifact(project_root, digest).load()
+    if payload is None or payload.get("digest") != digest:
+        return None
+    canonical = payload.get("canonical")
+    tokens = payload.get("tokens")
+    if not isinstance(canonical, bool) or not isinstance(tokens, dict):
+        return None
+    if not all(isinstance(pointer, str) for pointer in tokens.values()):
+        return None
+    return SsotKernel(digest, text, canonical, MappingProxyType(tokens))
+
+
+def _compile(digest: str, text: str) -> SsotKernel:
+    data = json.loads(text)
+    return SsotKernel(digest, text, text == canonical_json(data), MappingProxyType(_token_pointers(data)), data)
+
+
+def compile_kernel(project_root: Path, text: str) -> SsotKernel:
+    digest = sha256(text.encode("utf-8")).hexdigest()
+    kernel = _compile(digest, text)
+    artifact = _artifact(project_root, digest)
+    body = {"digest": digest, "canonical": kernel.canonical, "tokens": dict(kernel.tokens)}
+    if artifact.save(body):
+        for stale in artifact.path.parent.glob("*.json"):
+            if stale.stem == digest or not stale.is_file() or stale.is_symlink():
+                continue
+            try:
+                stale.unlink()
+            except OSError:
+                continue
+    _KERNELS[digest] = kernel
+    return kernel
+
+
+def load_kernel(project_root: Path, text: str) -> SsotKernel:
+    digest = sha256(text.encode("utf-8")).hexdigest()
+    kernel = _KERNELS.get(digest)
+    if kernel is None:
+        kernel = _read_artifact(project_root, digest, text) or _compile(digest, text)
+        _KERNELS[digest] = kernel
+    return kernel
+
+
+def clear_cache() -> None:
+    _KERNELS.clear()
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+
+from .disk_cache import DiskCache
+from .lint import _capture_metadata, _parse_metadata_pairs, _split_list_items
+from .refs import parse_contract_ref, parse_ssot_ref
+from .sdsl_ast import ANNOTATION_KIND_RE, iter_blocks, strip_quotes
+
+INDEX_DIR_REL = Path("OUTPUT") / ".token_index"
+INDEX_VERSION = "token-index-v2"
+BIND_FIELDS = ("contract", "contract_refs", "to")
+
+
+@dataclass(frozen=True, slots=True)
+class TokenOccurrence:
+    token: str
+    line: int
+    field: str
+
+
+@dataclass(frozen=True, slots=True)
+class BlockFields:
+    kind: str
+    line: int
+    has_meta: bool
+    dupes: tuple[str, ...]
+    fields: tuple[tuple[str, str], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class FileTokens:
+    digest: str
+    occurrences: tuple[TokenOccurrence, ...]
+    loose_lines: frozenset[int]
+    strict_error: str | None = None
+    blocks: tuple[BlockFields, ...] = ()
+
+
+def _value_tokens(value: str) -> list[str]:
+    items: list[str]
+    if value.strip().startswith("[") and value.strip().endswith("]"):
+        items = _split_list_items(value)
+    else:
+        items = [value]
+    tokens: list[str] = []
+    for item in items:
+        raw = strip_quotes(item) or ""
+        ref = parse_contract_ref(raw) or parse_ssot_ref(raw)
+        if ref and ref.token not in tokens:
+            tokens.append(ref.token)
+    return tokens
+
+
+def _describe(digest: str, text: str) -> FileTokens:
+    lines = text.splitlines()
+    occurrences: list[TokenOccurrence] = []
+    loose: set[int] = set()
+    strict_error: str | None = None
+    for idx, line in enumerate(lines):
+        stripped = line.lstrip()
+        if not stripped.startswith("@"):
+            continue
+        line_no = idx + 1
+        matched = ANNOTATION_KIND_RE.match(stripped) is not None
+        if not matched:
+            loose.add(line_no)
+        brace_idx = line.find("{")
+        if brace_idx == -1:
+            if matched and strict_error is None:
+                strict_error = f"METADATA_MISSING: line {line_no}"
+            continue
+        meta, _ = _capture_metadata(lines, idx, brace_idx)
+        keys: set[str] = set()
+        for key, value in _parse_metadata_pairs(meta):
+            if key in keys and matched and strict_error is None:
+                strict_error = f"DUPLICATE_KEY: line {line_no} key {key}"
+            keys.add(key)
+            occurrences.extend(TokenOccurrence(token, line_no, key) for token in _value_tokens(value))
+    blocks = tuple(
+        BlockFields(
+            ann.raw_kind,
+            ann.start_line,
+            ann.meta is not None,
+            ann.dupes,
+            tuple((key, ann.meta[key]) for key in BIND_FIELDS if ann.meta is not None and key in ann.meta),
+        )
+        for ann in iter_blocks(lines)
+    )
+    return FileTokens(digest, tuple(occurrences), frozenset(loose), strict_error, blocks)
+
+
+def _parse_block(item: object) -> BlockFields | None:
+    if not isinstance(item, list) or len(item) != 5:
+        return None
+    kind, line, has_meta, dupes, fields = item
+    if not isinstance(kind, str) or not isinstance(line, int) or not isinstance(has_meta, bool):
+        return None
+    if not isinstance(dupes, list) or not all(isinstance(key, str) for key in dupes):
+        return None
+    if not isinstance(fields, list):
+        return None
+    pairs: list[tuple[str, str]] = []
+    for pair in fields:
+        if not isinstance(pair, list) or len(pair) != 2 or not all(isinstance(part, str) for part in pair):
+            return None
+        pairs.append((pair[0], pair[1]))
+    return BlockFields(kind, line, has_meta, tuple(dupes), tuple(pairs))
+
+
+def _parse_entry(item: object) -> FileTokens | None:
+    if not isinstance(item, list) or len(item) != 5:
+        return None
+    digest, strict_error, loose, occurrences, blocks = item
+    if not isinstance(digest, str) or not (strict_error is None or isinstance(strict_error, str)):
+        return None
+    if not isinstance(loose, list) or not all(isinstance(line, int) for line in loose):
+        return None
+    if not isinstance(occurrences, list) or not isinstance(blocks, list):
+        return None
+    parsed: list[TokenOccurrence] = []
+    for occ in occurrences:
+        if not isinstance(occ, list) or len(occ) != 3:
+            return None
+        token, line, field = occ
+        if not isinstance(token, str) or not isinstance(line, int) or not isinstance(field, str):
+            return None
+        parsed.append(TokenOccurrence(token, line, field))
+    parsed_blocks: list[BlockFields] = []
+    for raw_block in blocks:
+        block = _parse_block(raw_block)
+        if block is None:
+            return None
+        parsed_blocks.append(block)
+    return FileTokens(digest, tuple(parsed), frozenset(loose), strict_error, tuple(parsed_blocks))
+
+
+class TokenIndex:
+    def __init__(self, project_root: Path, persist: bool = True) -> None:
+        self.project_root = project_root
+        self.disk = DiskCache(project_root, INDEX_DIR_REL / "index.json", INDEX_VERSION, True, persist)
+        self.entries: dict[str, FileTokens] = {}
+        self.seen: set[str] = set()
+        self.dirty = False
+        data = self.disk.load()
+        files = data.get("files") if data is not None else None
+        if isinstance(files, dict):
+            for rel, item in files.items():
+                entry = _parse_entry(item)
+                if entry is not None:
+                    self.entries[rel] = entry
+
+    def entry(self, path: Path, text: str) -> FileTokens:
+        rel = path.relative_to(self.project_root).as_posix()
+        self.seen.add(rel)
+        digest = sha256(text.encode("utf-8")).hexdigest()
+        cached = self.entries.get(rel)
+        if cached is not None and cached.digest == digest:
+            return cached
+        entry = _describe(digest, text)
+        self.entries[rel] = entry
+        self.dirty = True
+        return entry
+
+    def occurrences(self, prefix: str, strict: bool = False) -> dict[str, list[tuple[str, int, str]]]:
+        found: dict[str, list[tuple[str, int, str]]] = {}
+        for rel in sorted(self.seen):
+            entry = self.entries[rel]
+            if strict and entry.strict_error is not None:
+                continue
+            for occ in entry.occurrences:
+                if not occ.token.startswith(prefix):
+                    continue
+                if strict and occ.line in entry.loose_lines:
+                    continue
+                found.setdefault(occ.token, []).append((rel, occ.line, occ.field))
+        return found
+
+    def save(self) -> None:
+        stale = [
+            rel for rel in self.entries if rel not in self.seen and not (self.project_root / rel).is_file()
+        ]
+        for rel in stale:
+            del self.entries[rel]
+        if not (self.dirty or stale):
+            return
+        files = {
+            rel: [
+                entry.digest,
+                entry.strict_error,
+                sorted(entry.loose_lines),
+                [[occ.token, occ.line, occ.field] for occ in entry.occurrences],
+                [
+                    [block.kind, block.line, block.has_meta, list(block.dupes), [list(pair) for pair in block.fields]]
+                    for block in entry.blocks
+                ],
+            ]
+            for rel, entry in sorted(self.entries.items())
+        }
+        if self.disk.save({"files": files}):
+            self.dirty = False
@@ -1,26 +1,31 @@
 from __future__ import annotations
 
 import hashlib
+import json
 from dataclasses import dataclass
 
-from .jcs import dumps as jcs_dumps
-from .ledger import EdgeInput, NodeInput, TopologyInput
+from .ledger import EdgeInput, TopologyInput
 
+KEY_SEP = "\x00"
 
-@dataclass(frozen=True)
+_JSON_STR = json.JSONEncoder(ensure_ascii=False).encode
+
+
+@dataclass(frozen=True, slots=True)
 class Node:
     rel_id: str
     kind: str
     bind: str | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Edge:
     edge_id: str
     from_id: str
     to_id: str
     direction: str
-    contract_refs: list[str]
+    contract_refs: tuple[str, ...]
+    sort_key: str = ""
 
 
 @dataclass(frozen=True)
@@ -31,20 +36,32 @@ class TopologyModel:
     edges: list[Edge]
 
 
-def _edge_pk(edge: EdgeInput) -> dict[str, object]:
-    return {
-        "from": edge.from_id,
-        "to": edge.to_id,
-        "direction": edge.direction,
-        "contract_refs": [ref.token for ref in edge.contract_refs],
-    }
+def _edge_id(from_id: str, to_id: str, direction: str, refs: tuple[str, ...]) -> str:
+    payload = (
+        '{"contract_refs":['
+        + ",".join(_JSON_STR(ref) for ref in refs)
+        + '],"direction":'
+        + _JSON_STR(direction)
+        + ',"from":'
+        + _JSON_STR(from_id)
+        + ',"to":'
+        + _JSON_STR(to_id)
+        + "}"
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16].upper()
+    return f"E_{digest}"
 
 
 def compute_edge_id(edge: EdgeInput) -> str:
-    pk = _edge_pk(edge)
-    payload = jcs_dumps(pk).encode("utf-8")
-    digest = hashlib.sha256(payload).hexdigest()[:16].upper()
-    return f"E_{digest}"
+    refs = tuple(ref.token for ref in edge.contract_refs)
+    return _edge_id(edge.from_id, edge.to_id, edge.direction, refs)
+
+
+def edge_sort_key(from_id: str, to_id: str, direction: str, refs: tuple[str, ...]) -> str:
+    fields = (from_id, to_id, direction, *refs)
+    if any(KEY_SEP in field for field in fields):
+        return ""
+    return KEY_SEP.join(fields)
 
 
 def build_topology_model(input_data: TopologyInput) -> TopologyModel:
@@ -55,14 +72,15 @@ def build_topology_model(input_data: TopologyInput) -> TopologyModel:
 
     edges: list[Edge] = []
     for edge in input_data.edges:
-        edge_id = compute_edge_id(edge)
+        refs = tuple(ref.token for ref in edge.contract_refs)
         edges.append(
             Edge(
-                edge_id=edge_id,
+                edge_id=_edge_id(edge.from_id, edge.to_id, edge.direction, refs),
                 from_id=edge.from_id,
                 to_id=edge.to_id,
                 direction=edge.direction,
-                contract_refs=[ref.token for ref in edge.contract_refs],
+                contract_refs=refs,
+                sort_key=edge_sort_key(edge.from_id, edge.to_id, edge.direction, refs),
             )
         )
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from typing import Iterator
 
 from .topology import Edge, Node, TopologyModel
 
@@ -9,7 +9,7 @@ def _format_kv(key: str, value: str) -> str:
     return f'{key}:{value}'
 
 
-def _format_contract_refs(items: list[str]) -> str:
+def _format_contract_refs(items: tuple[str, ...] | list[str]) -> str:
     inner = ",".join(f'"{item}"' for item in items)
     return f'[{inner}]'
 
@@ -33,17 +33,16 @@ def _format_node(node: Node) -> list[str]:
     return lines
 
 
-def _format_edge(edge: Edge) -> list[str]:
-    lines = [
-        "@Edge {",
-        f'  id:"{edge.edge_id}",',
-        f"  from:@Node.{edge.from_id},",
-        f"  to:@Node.{edge.to_id},",
-        f'  direction:"{edge.direction}",',
-        f"  contract_refs:{_format_contract_refs(edge.contract_refs)},",
-        "}",
-    ]
-    return lines
+def _format_edge(edge: Edge) -> str:
+    return (
+        "@Edge {\n"
+        f'  id:"{edge.edge_id}",\n'
+        f"  from:@Node.{edge.from_id},\n"
+        f"  to:@Node.{edge.to_id},\n"
+        f'  direction:"{edge.direction}",\n'
+        f"  contract_refs:{_format_contract_refs(edge.contract_refs)},\n"
+        "}\n"
+    )
 
 
 def _sort_nodes(nodes: list[Node]) -> list[Node]:
@@ -51,26 +50,28 @@ def _sort_nodes(nodes: list[Node]) -> list[Node]:
 
 
 def _sort_edges(edges: list[Edge]) -> list[Edge]:
+    if all(edge.sort_key for edge in edges):
+        return sorted(edges, key=lambda e: e.sort_key)
     return sorted(edges, key=lambda e: (e.from_id, e.to_id, e.direction, tuple(e.contract_refs)))
 
 
-def write_topology(model: TopologyModel) -> str:
+def iter_topology(model: TopologyModel) -> Iterator[str]:
     if not isinstance(model, TopologyModel):
         raise TypeError("MODEL_TYPE_INVALID")
 
-    lines: list[str] = []
     header_parts = [
         'profile:"topology"',
         f'id_prefix:"{model.id_prefix}"',
     ]
     if model.stage:
         header_parts.append(f'stage:"{model.stage}"')
-    lines.append(f"@File {{ {', '.join(header_parts)} }}")
+    yield f"@File {{ {', '.join(header_parts)} }}\n"
 
     for node in _sort_nodes(model.nodes):
-        lines.extend(_format_node(node))
+        yield "\n".join(_format_node(node)) + "\n"
     for edge in _sort_edges(model.edges):
-        lines.extend(_format_edge(edge))
+        yield _format_edge(edge)
 
-    text = "\n".join(lines).rstrip() + "\n"
-    return text
+
+def write_topology(model: TopologyModel) -> str:
+    return "".join(iter_topology(model))
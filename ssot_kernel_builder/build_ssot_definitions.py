@@ -4,9 +4,7 @@
 from __future__ import annotations
 
 import argparse
-from hashlib import sha256
 import json
-import subprocess
 import sys
 from pathlib import Path
 import re
@@ -14,29 +12,16 @@ import re
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+from sdslv2_builder.git_meta import git_rev
+from sdslv2_builder.input_hash import hash_inputs
 from sdslv2_builder.io_atomic import atomic_write_text
+from sdslv2_builder.ssot_kernel import canonical_json, compile_kernel
 
 DEFAULT_DEFINITIONS = "ssot_kernel_builder/ssot_definitions.ts"
 DEFAULT_OUT_DEFINITIONS = "OUTPUT/ssot/ssot_definitions.json"
 DEFAULT_OUT_REGISTRY_MAP = "OUTPUT/ssot/ssot_registry_map.json"
 
 
-def _git_rev(root: Path) -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=root,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return "UNKNOWN"
-    if proc.returncode != 0:
-        return "UNKNOWN"
-    return proc.stdout.strip() or "UNKNOWN"
-
-
 def _ensure_inside(project_root: Path, path: Path, code: str) -> None:
     try:
         path.resolve().relative_to(project_root.resolve())
@@ -61,7 +46,16 @@ def _extract_definitions_object(text: str) -> dict:
     brace_start = text.find("{", anchor_idx)
     if brace_start == -1:
         raise ValueError("E_SSOT_DEF_OBJECT_START_NOT_FOUND")
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text, brace_start)
+    except json.JSONDecodeError:
+        return _scan_definitions_object(text, brace_start)
+    if not isinstance(data, dict):
+        raise ValueError("E_SSOT_DEF_JSON_NOT_OBJECT")
+    return data
 
+
+def _scan_definitions_object(text: str, brace_start: int) -> dict:
     in_string = False
     escape = False
     in_line_comment = False
@@ -134,42 +128,13 @@ def _extract_definitions_object(text: str) -> dict:
     return data
 
 
-def _normalize_text(text: str) -> str:
-    return text.replace("\r\n", "\n").replace("\r", "\n")
-
-
-def _rel_path(root: Path, path: Path) -> str:
-    rel = path.resolve().relative_to(root.resolve())
-    return rel.as_posix()
-
-
-def _content_hash(path: Path) -> str:
-    text = path.read_text(encoding="utf-8")
-    normalized = _normalize_text(text)
-    return sha256(normalized.encode("utf-8")).hexdigest()
-
-
-def _compute_input_hash(project_root: Path, inputs: list[Path]) -> str:
-    parts: list[str] = []
-    for path in sorted(inputs, key=lambda p: _rel_path(project_root, p)):
-        rel = _rel_path(project_root, path)
-        digest = _content_hash(path)
-        parts.append(f"{rel}\n{digest}\n")
-    payload = "".join(parts)
-    digest = sha256(payload.encode("utf-8")).hexdigest()
-    return f"sha256:{digest}"
-
-
-def _escape_pointer(segment: str) -> str:
-    return segment.replace("~", "~0").replace("/", "~1")
-
-
-def _write_json(path: Path, payload: dict, symlink_code: str) -> None:
-    text = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")) + "\n"
+def _write_json(path: Path, payload: dict, symlink_code: str) -> str:
+    text = canonical_json(payload)
     atomic_write_text(path, text, symlink_code=symlink_code)
+    return text
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--project-root", default=None, help="Project root (defaults to repo root)")
     ap.add_argument(
@@ -183,7 +148,7 @@ def main() -> int:
     ap.add_argument("--schema-version", default="1.0", help="schema_version for distribution boundary")
     ap.add_argument("--source-rev", default=None, help="Override git source_rev")
     ap.add_argument("--allow-unknown-source-rev", action="store_true", help="Allow UNKNOWN source_rev")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     project_root = Path(args.project_root).resolve() if args.project_root else ROOT
     if args.kernel_root:
@@ -238,7 +203,7 @@ def main() -> int:
 
     source_rev = (args.source_rev or "").strip()
     if not source_rev:
-        source_rev = _git_rev(project_root)
+        source_rev = git_rev(project_root)
     if source_rev == "UNKNOWN" and not args.allow_unknown_source_rev:
         print("E_SSOT_DEF_SOURCE_REV_UNKNOWN", file=sys.stderr)
         return 2
@@ -300,7 +265,7 @@ def main() -> int:
         return 2
     registry_base = dist_path or DEFAULT_OUT_DEFINITIONS
 
-    input_hash = _compute_input_hash(kernel_root, [definitions_path])
+    input_hash = hash_inputs(kernel_root, [definitions_path])
     payload = {
         "schema_version": args.schema_version,
         "source_rev": source_rev,
@@ -313,10 +278,11 @@ def main() -> int:
     out_registry_map.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        _write_json(out_definitions, payload, "E_SSOT_DEF_OUTPUT_SYMLINK")
+        definitions_text = _write_json(out_definitions, payload, "E_SSOT_DEF_OUTPUT_SYMLINK")
     except OSError as exc:
         print(f"E_SSOT_DEF_WRITE_FAILED:{exc}", file=sys.stderr)
         return 2
+    kernel = compile_kernel(project_root, definitions_text)
 
     registry_map: dict[str, str] = {
         "schema_version": args.schema_version,
@@ -324,8 +290,7 @@ def main() -> int:
         "input_hash": input_hash,
         "generator_id": "ssot_kernel_builder.build_ssot_definitions",
     }
-    for token in sorted(tokens.keys()):
-        pointer = "/tokens/" + _escape_pointer(token)
+    for token, pointer in kernel.tokens.items():
         registry_map[token] = f"{registry_base}#{pointer}"
 
     try: